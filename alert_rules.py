@@ -0,0 +1,267 @@
+"""Log alert rules compiled into a combined matcher.
+
+Rules come from each server's config (``alert_rules``) and from the global
+``alert_rules.json`` in the config directory, which applies to every server.
+Plain-text rules, the common case ("OOM", "ECONNREFUSED"), are merged into one
+regex shaped like a prefix trie, so ``re`` follows a single path per position
+instead of trying every alternative. The cost per line stays flat as rules are
+added. The trie sits in a lookahead, so a literal inside or at the start of
+another ("limit" in "rate limit exceeded") still fires its own rules.
+Case-insensitive ones are matched the same way against the lowercased chunk.
+Regex rules are joined into one alternation as well; a hit is attributed to a
+rule by re-checking only the matching line. Capturing groups are made
+non-capturing for that; only regexes with backreferences, whose group numbers
+the alternation would shift, are scanned on their own.
+
+Shared by the GUI and the daemon; it must not import Qt.
+"""
+
+import json
+import re
+import time
+from bisect import bisect_right
+from itertools import accumulate
+from pathlib import Path
+
+from models import AlertRule
+
+ALERT_RULES_FILE_NAME = "alert_rules.json"
+ALERT_INTERVAL_S = 30.0  # one alert per rule and server per interval; later matches are counted
+MAX_ALERT_LINE_CHARS = 300
+
+
+def alert_rules_path(state_dir) -> Path:
+    return Path(state_dir) / ALERT_RULES_FILE_NAME
+
+
+def load_global_rules(path) -> list[AlertRule]:
+    """Load the rules that apply to every server; a missing file means none"""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return []
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] Loading alert rules: {e}")
+        return []
+    if not isinstance(data, list):
+        print(f"[ERROR] Loading alert rules: expected a list of rules in {path}")
+        return []
+    return [AlertRule.from_dict(item) for item in data if isinstance(item, dict)]
+
+
+def rule_source(rule: AlertRule) -> str:
+    """Return the regular expression a rule matches"""
+    source = rule.pattern if rule.regex else re.escape(rule.pattern)
+    return f"(?i:{source})" if rule.ignore_case else source
+
+
+def trie_regex(words) -> str:
+    """Return a regex matching any of ``words``, factored by common prefix; longer words win"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        alternatives = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not alternatives:
+            return ""
+        body = alternatives[0] if len(alternatives) == 1 else f"(?:{'|'.join(alternatives)})"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+def without_groups(source: str) -> str | None:
+    """Return a regex with its capturing groups made non-capturing, or None if it refers back to a group"""
+    out = []
+    i = 0
+    in_class = False
+    while i < len(source):
+        char = source[i]
+        if char == "\\":
+            following = source[i + 1 : i + 2]
+            if not in_class and following.isdigit() and following != "0":
+                return None  # \1 is a backreference (\0 is an octal escape)
+            out.append(source[i : i + 2])
+            i += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            # A "]" right after "[" or "[^" is literal
+            end = i + 1 + source.startswith("^", i + 1)
+            end += source.startswith("]", end)
+            out.append(source[i:end])
+            in_class = True
+            i = end
+            continue
+        elif char == "(" and source.startswith(("(?P=", "(?("), i):
+            return None  # named backreference or a conditional on a group
+        elif char == "(" and source.startswith("(?P<", i):
+            out.append("(?:")
+            i = source.index(">", i) + 1
+            continue
+        elif char == "(" and not source.startswith("(?", i):
+            char = "(?:"
+        out.append(char)
+        i += 1
+    return "".join(out)
+
+
+def _prefixes(words) -> dict[str, list[str]]:
+    """Map each word to the words it starts with, itself included"""
+    return {word: [other for other in words if word.startswith(other)] for word in words}
+
+
+def _line_starts(text) -> list[int]:
+    return list(accumulate((len(line) + 1 for line in text.split("\n")[:-1]), initial=0))
+
+
+def _line_at(text, position):
+    start = text.rfind("\n", 0, position) + 1
+    end = text.find("\n", position)
+    return start, text[start : end if end >= 0 else len(text)].rstrip("\r")
+
+
+def _flatten_groups(rule, compiled):
+    """Return the rule's regex without capturing groups, or ``compiled`` if they cannot be removed"""
+    source = without_groups(rule.pattern)
+    if source is None:
+        return compiled
+    flat = AlertRule(rule.name, source, regex=True, ignore_case=rule.ignore_case)
+    try:
+        flattened = re.compile(rule_source(flat), re.MULTILINE)
+    except re.error:
+        return compiled
+    return compiled if flattened.groups else flattened
+
+
+class AlertMatcher:
+    """Every alert rule of one server, matched with a fixed number of scans per chunk of output"""
+
+    def __init__(self, rules):
+        self.errors = []  # rules that were skipped, for the server's log
+        literal = {}  # pattern: rules
+        folded = {}  # lowercased pattern: case-insensitive rules
+        regex_rules = []  # (rule, compiled pattern without capturing groups)
+        self._standalone = []  # (rule, compiled pattern) of regexes with backreferences
+        for rule in rules:
+            if not rule.pattern:
+                continue
+            if not rule.regex:
+                target = folded if rule.ignore_case else literal
+                target.setdefault(rule.pattern.lower() if rule.ignore_case else rule.pattern, []).append(rule)
+                continue
+            try:
+                compiled = re.compile(rule_source(rule), re.MULTILINE)
+            except re.error as e:
+                self.errors.append(f"alert rule '{rule.name}' ignored: {e}")
+                continue
+            if compiled.groups:
+                compiled = _flatten_groups(rule, compiled)
+            (self._standalone if compiled.groups else regex_rules).append((rule, compiled))
+        self._literal_rules = literal
+        self._folded_rules = folded
+        self._regex_rules = regex_rules
+        self._literal_prefixes = _prefixes(literal)
+        self._folded_prefixes = _prefixes(folded)
+        # A zero-width match at every position finds literals that overlap
+        self._literal = re.compile(f"(?=({trie_regex(literal)}))") if literal else None
+        self._folded = re.compile(f"(?=({trie_regex(folded)}))") if folded else None
+        self._regex = None
+        if regex_rules:
+            self._regex = re.compile("|".join(f"(?:{pattern.pattern})" for _, pattern in regex_rules), re.MULTILINE)
+
+    def __bool__(self):
+        return any((self._literal, self._folded, self._regex, self._standalone))
+
+    def scan(self, text: str) -> list[tuple[AlertRule, str, int]]:
+        """Return (rule, first matching line, number of matching lines) for each rule a chunk matched"""
+        hits = {}  # rule: [first line, matching lines, start of the last line counted]
+        if self._literal is not None:
+            self._scan_literals(hits, self._literal, self._literal_prefixes, self._literal_rules, text, text)
+        if self._folded is not None:
+            self._scan_literals(hits, self._folded, self._folded_prefixes, self._folded_rules, text, text.lower())
+        if self._regex is not None:
+            for match in self._regex.finditer(text):
+                line_start, line = _line_at(text, match.start())
+                for rule, pattern in self._regex_rules:
+                    if pattern.search(line):
+                        self._count(hits, rule, line_start, line)
+        for rule, pattern in self._standalone:
+            for match in pattern.finditer(text):
+                self._count(hits, rule, *_line_at(text, match.start()))
+        return [(rule, hit[0], hit[1]) for rule, hit in hits.items()]
+
+    def _scan_literals(self, hits, pattern, prefixes, rules_by_text, text, scanned):
+        line_starts = None  # (of scanned, of text), computed for the first match if needed
+        for match in pattern.finditer(scanned):
+            position = match.start()
+            if len(scanned) != len(text):
+                # Lowercasing changed the length; find the same line by number instead
+                if line_starts is None:
+                    line_starts = _line_starts(scanned), _line_starts(text)
+                position = line_starts[1][bisect_right(line_starts[0], position) - 1]
+            line_start, line = _line_at(text, position)
+            # The trie matched the longest literal here; shorter ones it starts with match too
+            for literal in prefixes[match.group(1)]:
+                for rule in rules_by_text[literal]:
+                    self._count(hits, rule, line_start, line)
+
+    @staticmethod
+    def _count(hits, rule, line_start, line):
+        hit = hits.get(rule)
+        if hit is None:
+            hits[rule] = [line[:MAX_ALERT_LINE_CHARS], 1, line_start]
+        elif hit[2] != line_start:
+            hit[1] += 1
+            hit[2] = line_start
+
+
+class AlertMonitor:
+    """Per-server matchers built once per run, with rate limiting of repeated alerts"""
+
+    def __init__(self, global_rules_path=None):
+        self.global_rules_path = global_rules_path
+        self._global_rules = None
+        self._matchers = {}  # server_id: AlertMatcher of the current run
+        self._last_alert = {}  # (server_id, rule name): time.monotonic() of the last alert
+        self._suppressed = {}  # (server_id, rule name): matching lines since the last alert
+
+    def reset(self, server_id) -> None:
+        """Forget the server's matcher and alert history, e.g. when it starts again"""
+        self._matchers.pop(server_id, None)
+        for key in [key for key in self._last_alert if key[0] == server_id]:
+            self._last_alert.pop(key, None)
+            self._suppressed.pop(key, None)
+
+    def matcher(self, server_id, config) -> tuple[AlertMatcher, bool]:
+        """Return the server's matcher and whether it was just built"""
+        matcher = self._matchers.get(server_id)
+        if matcher is not None:
+            return matcher, False
+        if self._global_rules is None:
+            self._global_rules = load_global_rules(self.global_rules_path) if self.global_rules_path else []
+        rules = list(getattr(config, "alert_rules", None) or []) + self._global_rules
+        matcher = self._matchers[server_id] = AlertMatcher(rules)
+        return matcher, True
+
+    def check(self, server_id, matcher, text) -> list[tuple[AlertRule, str, int]]:
+        """Return the alerts to raise for a chunk; repeats within ALERT_INTERVAL_S are only counted"""
+        if not matcher:
+            return []
+        alerts = []
+        now = time.monotonic()
+        for rule, line, count in matcher.scan(text):
+            key = (server_id, rule.name)
+            count += self._suppressed.pop(key, 0)
+            if now - self._last_alert.get(key, float("-inf")) < ALERT_INTERVAL_S:
+                self._suppressed[key] = count
+                continue
+            self._last_alert[key] = now
+            alerts.append((rule, line, count))
+        return alerts
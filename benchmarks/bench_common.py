@@ -0,0 +1,124 @@
+"""Helpers shared by the benchmark scripts: result headers, memory and percentiles.
+
+Every benchmark writes one JSON document with the same header so results from
+different commits can be compared with ``--compare``.
+"""
+
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def git_commit() -> str | None:
+    """Return the commit the tree is at, or None outside a git checkout"""
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            timeout=10,
+            check=False,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def result_header(benchmark: str) -> dict:
+    return {
+        "benchmark": benchmark,
+        "timestamp": time.time(),
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+    }
+
+
+def peak_rss_kb() -> int | None:
+    """Return the peak resident set size of this process in kB"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux kilobytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def current_rss_kb() -> int | None:
+    """Return the current resident set size of this process in kB (Linux only)"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def percentile(values, pct: float) -> float | None:
+    """Return the ``pct`` percentile of ``values`` using the nearest-rank method"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def distribution(values) -> dict:
+    """Summarize samples as count, mean and p50/p90/p99/max"""
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values),
+        "p50": percentile(values, 50),
+        "p90": percentile(values, 90),
+        "p99": percentile(values, 99),
+        "max": max(values),
+    }
+
+
+def run_child(argv, env, timeout: float = 600) -> subprocess.CompletedProcess:
+    """Run this interpreter with ``argv`` and capture its output"""
+    return subprocess.run(  # noqa: S603
+        [sys.executable, *argv], env=env, capture_output=True, text=True, timeout=timeout, check=False
+    )
+
+
+def _flatten(value, prefix=""):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key == "params":
+                continue
+            yield from _flatten(item, f"{prefix}.{key}" if prefix else str(key))
+    elif isinstance(value, int | float) and not isinstance(value, bool):
+        yield prefix, value
+
+
+def compare(previous: dict, current: dict, key: str = "results") -> list[str]:
+    """Return one line per numeric metric that exists in both result documents"""
+    old = dict(_flatten(previous.get(key, {})))
+    lines = [f"Comparing {previous.get('commit') or '?'} -> {current.get('commit') or '?'}"]
+    for name, value in _flatten(current.get(key, {})):
+        if name not in old:
+            continue
+        before = old[name]
+        change = f"{(value - before) / before * 100:+.1f}%" if before else "n/a"
+        lines.append(f"  {name:<60} {before:>14.4g} -> {value:<14.4g} {change}")
+    return lines
+
+
+def write_results(path: Path | None, result: dict, compare_with: Path | None = None) -> None:
+    """Write ``result`` as JSON and print the change against an earlier result file"""
+    if path:
+        Path(path).write_text(json.dumps(result, indent=2))
+        print(f"Results written to {path}")
+    if compare_with:
+        for line in compare(json.loads(Path(compare_with).read_text()), result):
+            print(line)
@@ -0,0 +1,373 @@
+"""Fleet-scale end-to-end load test for the MCP Manager window.
+
+For each fleet size a fresh offscreen interpreter writes that many
+``ServerConfig``s pointing at ``fake_mcp_server.py`` and drives
+``MCPManagerWindow`` through the same paths as a user:
+
+startup, add (through the editor dialog), clone, start all, MCP requests
+(``initialize``, ``tools/list``, ``ping`` over stdin), a steady state with
+logging and random crashes, stop all and config save.
+
+It records per-operation latency percentiles, event-loop lag per phase (a
+10 ms timer's lateness), RSS after each phase, and the number of crashes and
+servers left running. MCP requests are sent one at a time, each timed from its
+write to its reply. Start all launches servers on the GUI thread, and each
+launch blocks until ``QProcess.waitForStarted`` returns. The longest event-loop
+stall of that phase is reported as ``start_all_blocked_ms``, and the part of it
+spent waiting for processes to start as ``spawn_wait_ms``. Comparing fleet
+sizes shows where the window stops scaling.
+
+    python benchmarks/bench_fleet.py --servers 100 --servers 500 --output fleet.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import bench_common
+
+RESULT_MARKER = "BENCH_RESULT "
+# Options passed on to the child interpreter that runs a fleet
+SCENARIO_OPTIONS = (
+    "adds",
+    "clones",
+    "saves",
+    "rpc_sample",
+    "steady_s",
+    "log_interval",
+    "crash_rate",
+    "seed",
+    "timeout",
+)
+FAKE_SERVER = Path(__file__).resolve().parent / "fake_mcp_server.py"
+LAG_PROBE_MS = 10
+MCP_REQUESTS = ("initialize", "tools/list", "ping")
+REQUEST_TIMEOUT_S = 10.0  # a request unanswered by then counts as unanswered
+
+
+def write_config(config_dir: Path, count: int, args) -> None:
+    config_dir.mkdir(parents=True, exist_ok=True)
+    servers = [
+        {
+            "id": f"fake-{i:04d}",
+            "name": f"Fake {i}",
+            "command": sys.executable,
+            "arguments": [
+                str(FAKE_SERVER),
+                f"--name=fake-{i:04d}",
+                f"--log-interval={args.log_interval}",
+                f"--crash-rate={args.crash_rate}",
+                f"--seed={args.seed + i}",
+            ],
+            "env_vars": {},
+            "working_dir": "",
+        }
+        for i in range(count)
+    ]
+    (config_dir / "mcp_servers.json").write_text(json.dumps(servers))
+
+
+class Harness:
+    """Drive one MCPManagerWindow and collect the measurements"""
+
+    def __init__(self, app, window, args):
+        from PyQt6.QtCore import Qt, QTimer
+
+        self.app = app
+        self.window = window
+        self.args = args
+        self.ops = {}  # operation: [ms]
+        self.lag = {}  # phase: [ms]
+        self.rss = {}  # phase: kB after the phase
+        self.phase = "startup"
+        self.crashes = 0
+        self.rpc_replies = {}  # (server_id, request id): time the reply arrived
+        self.booted = set()  # servers whose fake MCP server printed its start line
+        self.spawn_ms = []  # time each launch blocked the event loop
+        self.rng = random.Random(args.seed)  # noqa: S311
+
+        self._last_tick = time.perf_counter()
+        self.probe = QTimer()
+        self.probe.setTimerType(Qt.TimerType.PreciseTimer)
+        self.probe.timeout.connect(self._on_probe)
+        self.probe.start(LAG_PROBE_MS)
+        window.process_manager.output_received.connect(self._on_output)
+        window.process_manager.stderr_received.connect(self._on_stderr)
+        launcher = window.process_manager.core.launcher
+        spawn = launcher.spawn
+
+        def timed_spawn(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return spawn(*args, **kwargs)
+            finally:
+                self.spawn_ms.append((time.perf_counter() - t0) * 1000)
+
+        launcher.spawn = timed_spawn
+
+    def _on_probe(self):
+        now = time.perf_counter()
+        self.lag.setdefault(self.phase, []).append(max(0.0, (now - self._last_tick) * 1000 - LAG_PROBE_MS))
+        self._last_tick = now
+
+    def _on_output(self, server_id, text):
+        now = time.perf_counter()
+        for line in text.splitlines():
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(message, dict) and "id" in message:
+                self.rpc_replies[(server_id, message["id"])] = now
+
+    def _on_stderr(self, server_id, text):
+        if " started" in text:
+            self.booted.add(server_id)
+        self.crashes += text.count(" crashing")
+
+    def begin(self, phase):
+        self.phase = phase
+        self._last_tick = time.perf_counter()
+
+    def end(self, phase):
+        # A phase that blocked the loop throughout has no probe ticks yet; its lateness still counts
+        self._on_probe()
+        self.rss[phase] = bench_common.current_rss_kb()
+
+    def timed(self, operation, func):
+        t0 = time.perf_counter()
+        result = func()
+        self.ops.setdefault(operation, []).append((time.perf_counter() - t0) * 1000)
+        return result
+
+    def wait(self, seconds, until=None):
+        """Run the event loop for ``seconds`` or until ``until()`` is true; returns True if it became true"""
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            if until is not None and until():
+                return True
+            self.app.processEvents()
+            time.sleep(0.001)
+        return until is not None and until()
+
+    def select(self, server_id):
+        from PyQt6.QtCore import Qt
+
+        for row in range(self.window.server_list.count()):
+            if self.window.server_list.item(row).data(Qt.ItemDataRole.UserRole) == server_id:
+                self.window.server_list.setCurrentRow(row)
+                return
+
+    def add_server(self, index):
+        from PyQt6.QtCore import QTimer
+        from PyQt6.QtWidgets import QApplication
+
+        server_id = f"added-{index:03d}"
+
+        def fill_dialog():
+            dialog = QApplication.activeModalWidget()
+            if dialog is None:
+                QTimer.singleShot(5, fill_dialog)
+                return
+            dialog.id_input.setText(server_id)
+            dialog.name_input.setText(f"Added {index}")
+            dialog.command_input.setText(sys.executable)
+            dialog._populate_table(dialog.args_table, [str(FAKE_SERVER), f"--name={server_id}"])
+            dialog.accept()
+
+        QTimer.singleShot(0, fill_dialog)
+        self.timed("add", self.window._add_new_server)
+
+    def clone_server(self):
+        self.select(self.rng.choice(self.window.servers).id)
+        self.timed("clone", self.window._clone_server)
+
+    def start_all(self):
+        window = self.window
+        spawned = len(self.spawn_ms)
+        t0 = time.perf_counter()
+        window._on_start_all_clicked()
+        self.ops.setdefault("start_all_call", []).append((time.perf_counter() - t0) * 1000)
+        finished = self.wait(self.args.timeout, lambda: not window.startup_scheduler.is_active())
+        self.ops.setdefault("start_all", []).append((time.perf_counter() - t0) * 1000)
+        self.ops["spawn"] = self.spawn_ms[spawned:]
+        return finished
+
+    def mcp_requests(self):
+        """Send initialize, tools/list and ping to a sample of running servers, one at a time, and time each reply"""
+        running = list(self.window.process_manager.processes)
+        sample = self.rng.sample(running, min(self.args.rpc_sample, len(running)))
+        # Time the requests, not interpreter start-up
+        self.wait(self.args.timeout, lambda: self.booted.issuperset(sample))
+        unanswered = 0
+        for request_id, (server_id, method) in enumerate((s, m) for s in sample for m in MCP_REQUESTS):
+            message = {"jsonrpc": "2.0", "id": request_id, "method": method, "params": {}}
+            key = (server_id, request_id)
+            t0 = time.perf_counter()
+            if not self.window.process_manager.write_stdin(server_id, (json.dumps(message) + "\n").encode()):
+                unanswered += 1
+                continue
+            if self.wait(REQUEST_TIMEOUT_S, lambda key=key: key in self.rpc_replies):
+                self.ops.setdefault(f"mcp_{method}", []).append((self.rpc_replies[key] - t0) * 1000)
+            else:
+                unanswered += 1
+        return unanswered
+
+    def stop_all(self):
+        window = self.window
+        t0 = time.perf_counter()
+        window._on_stop_all_clicked()
+        self.ops.setdefault("stop_all_call", []).append((time.perf_counter() - t0) * 1000)
+        coordinator = window.stop_all_coordinator
+        stopped = self.wait(
+            self.args.timeout,
+            lambda: not window.process_manager.processes and (coordinator is None or not coordinator.is_active()),
+        )
+        self.ops.setdefault("stop_all", []).append((time.perf_counter() - t0) * 1000)
+        return stopped
+
+
+def run_fleet(args) -> dict:
+    """Run the whole scenario for one fleet size inside this process"""
+    sys.path.insert(0, str(bench_common.REPO_ROOT))
+    from PyQt6.QtWidgets import QApplication
+
+    import mcp_manager
+
+    app = QApplication([])
+    started = time.perf_counter()
+    window = mcp_manager.MCPManagerWindow()
+    harness = Harness(app, window, args)
+    loaded = []
+    window.startup_finished.connect(lambda: loaded.append(time.perf_counter()))
+    window.show()
+    harness.wait(args.timeout, lambda: loaded)
+    harness.ops["startup"] = [(loaded[0] - started) * 1000] if loaded else []
+    harness.end("startup")
+
+    harness.begin("edit")
+    for i in range(args.adds):
+        harness.add_server(i)
+    for _ in range(args.clones):
+        harness.clone_server()
+    harness.end("edit")
+
+    harness.begin("start_all")
+    start_complete = harness.start_all()
+    harness.end("start_all")
+
+    harness.begin("mcp")
+    unanswered = harness.mcp_requests()
+    harness.end("mcp")
+
+    harness.begin("steady")
+    harness.wait(args.steady_s)
+    harness.end("steady")
+    running_before_stop = len(window.process_manager.processes)
+
+    harness.begin("stop_all")
+    stop_complete = harness.stop_all()
+    harness.end("stop_all")
+
+    harness.begin("save")
+    for _ in range(args.saves):
+        harness.timed("save", window._save_servers_to_file)
+    harness.end("save")
+
+    harness.probe.stop()
+    window._shutdown_complete = True
+    if window.control_server is not None:
+        window.control_server.close()
+    return {
+        "configured": len(window.servers),
+        "start_all_completed": start_complete,
+        "stop_all_completed": stop_complete,
+        "running_before_stop": running_before_stop,
+        "left_running": len(window.process_manager.processes),
+        "crashes": harness.crashes,
+        "unanswered_requests": unanswered,
+        "start_all_blocked_ms": max(harness.lag.get("start_all", [0.0])),
+        "spawn_wait_ms": sum(harness.ops.get("spawn", [])),
+        "ops_ms": {name: bench_common.distribution(values) for name, values in harness.ops.items()},
+        "lag_ms": {phase: bench_common.distribution(values) for phase, values in harness.lag.items()},
+        "rss_kb": {**harness.rss, "peak": bench_common.peak_rss_kb()},
+    }
+
+
+def run_isolated(args, count: int) -> dict:
+    with tempfile.TemporaryDirectory() as home:
+        write_config(Path(home) / "py-mcp-manager", count, args)
+        env = dict(os.environ, XDG_CONFIG_HOME=home, QT_QPA_PLATFORM="offscreen")
+        if args.shell:
+            env["SHELL"] = args.shell
+        options = [f"--{name.replace('_', '-')}={getattr(args, name)}" for name in SCENARIO_OPTIONS]
+        out = bench_common.run_child([__file__, "--run", *options], env, timeout=args.timeout * 6 + args.steady_s)
+    for line in out.stdout.splitlines():
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER) :])
+    print(
+        out.stdout[-2000:], out.stderr[-3000:], f"fleet of {count} did not report a result", sep="\n", file=sys.stderr
+    )
+    raise SystemExit(1)
+
+
+def print_summary(results: dict) -> None:
+    for name, r in results.items():
+        print(
+            f"{name}: {r['running_before_stop']} running, {r['crashes']} crash(es), "
+            f"{r['unanswered_requests']} unanswered request(s), {r['left_running']} left running, "
+            f"peak RSS {r['rss_kb']['peak']} kB"
+        )
+        print(
+            f"  start all blocked the event loop for up to {r['start_all_blocked_ms']:.0f} ms "
+            f"({r['spawn_wait_ms']:.0f} ms in total waiting for processes to start)"
+        )
+        for op, stats in r["ops_ms"].items():
+            print(f"  {op:<16} p50 {stats['p50']:9.1f} ms  p99 {stats['p99']:9.1f} ms  n={stats['count']}")
+        for phase, stats in r["lag_ms"].items():
+            print(
+                f"  lag {phase:<12} p50 {stats['p50']:9.1f} ms  p99 {stats['p99']:9.1f} ms  max {stats['max']:.1f} ms"
+            )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--servers", type=int, action="append", help="Fleet size; repeat to sweep (default 100)")
+    parser.add_argument("--adds", type=int, default=5, help="Servers added through the editor dialog")
+    parser.add_argument("--clones", type=int, default=10, help="Servers cloned")
+    parser.add_argument("--saves", type=int, default=5, help="Explicit config saves")
+    parser.add_argument("--rpc-sample", type=int, default=20, help="Servers that receive MCP requests")
+    parser.add_argument("--steady-s", type=float, default=10.0, help="Seconds to run between start all and stop all")
+    parser.add_argument("--log-interval", type=float, default=0.5, help="Seconds between fake server log lines")
+    parser.add_argument("--crash-rate", type=float, default=0.002, help="Crash probability per server per second")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=120.0, help="Seconds to wait for start all / stop all")
+    parser.add_argument(
+        "--shell", default="" if os.name == "nt" else "/bin/sh", help="Login shell for the fake servers"
+    )
+    parser.add_argument("--output", type=Path, help="Write results as JSON to this file")
+    parser.add_argument("--compare", type=Path, help="Print the change against an earlier results file")
+    parser.add_argument("--run", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.run:
+        print(RESULT_MARKER + json.dumps(run_fleet(args)), flush=True)
+        return 0
+
+    results = {}
+    for count in args.servers or [100]:
+        print(f"Running fleet of {count} server(s)", flush=True)
+        results[f"fleet-{count}"] = run_isolated(args, count)
+    print_summary(results)
+    params = {name: getattr(args, name) for name in SCENARIO_OPTIONS}
+    result = {**bench_common.result_header("fleet"), "params": params, "results": results}
+    bench_common.write_results(args.output, result, args.compare)
+    return 1 if any(r["left_running"] or not r["start_all_completed"] for r in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
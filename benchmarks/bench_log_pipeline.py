@@ -0,0 +1,291 @@
+"""Benchmark for the process output and log pipeline.
+
+Each scenario runs in a fresh interpreter with ``QT_QPA_PLATFORM=offscreen``.
+A headless ``ProcessManager`` starts synthetic servers (this script in
+``--emit`` mode) that print timestamped lines at a configurable rate, line
+size and character mix, and the benchmark measures:
+
+- ingest throughput (lines/s and MB/s between the first and last chunk),
+- latency from the child writing a line to ``logs_updated`` being emitted,
+- the size of the log store (compressed, and as plain strings) and the peak RSS of the process,
+- time for the main window's log pane to show the collected log, in full and
+  for one appended line,
+- U+FFFD replacement characters in the stored log (UTF-8 split across reads).
+
+    python benchmarks/bench_log_pipeline.py --output logs.json
+    python benchmarks/bench_log_pipeline.py --scenario ascii-paced --set rate=5000 --compare logs.json
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import bench_common
+
+RESULT_MARKER = "BENCH_RESULT "
+LINE_START = re.compile(r"(?m)^(\d+\.\d{6}) (\d+) ")
+
+# rate is lines per second per server (0: as fast as possible); batch is lines per write
+SCENARIOS = {
+    "ascii-burst": {"servers": 1, "rate": 0, "lines": 50000, "line_size": 120, "charset": "ascii", "batch": 64},
+    "ascii-paced": {"servers": 1, "rate": 2000, "lines": 4000, "line_size": 120, "charset": "ascii", "batch": 1},
+    "utf8-burst": {"servers": 1, "rate": 0, "lines": 20000, "line_size": 200, "charset": "mixed", "batch": 64},
+    "cjk-emoji": {"servers": 1, "rate": 1000, "lines": 3000, "line_size": 80, "charset": "wide", "batch": 4},
+    "long-lines": {"servers": 1, "rate": 0, "lines": 2000, "line_size": 8192, "charset": "ascii", "batch": 8},
+    "fan-in": {"servers": 8, "rate": 500, "lines": 2000, "line_size": 150, "charset": "mixed", "batch": 1},
+}
+CHARSETS = {
+    "ascii": "abcdefghijklmnopqrstuvwxyz0123456789 ",
+    "mixed": "abcdefghij klmnopqrst éüßñ 中文 😀 uvwxyz",
+    "wide": "日本語のログ出力 中文日志 한국어 😀🚀✨ ",
+}
+RENDER_REPEATS = 3
+
+
+def make_payload(charset: str, size: int) -> str:
+    alphabet = CHARSETS[charset]
+    return (alphabet * (size // len(alphabet) + 1))[:size]
+
+
+def emit(args) -> None:
+    """Synthetic server: print ``<unix time> <seq> <payload>`` lines"""
+    payload = make_payload(args.charset, args.line_size)
+    out = sys.stdout.buffer
+    interval = 1 / args.rate if args.rate else 0
+    start = time.monotonic()
+    pending = []
+    for seq in range(args.lines):
+        if interval:
+            delay = start + seq * interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        pending.append(f"{time.time():.6f} {seq} {payload}\n".encode())
+        if len(pending) >= args.batch:
+            out.write(b"".join(pending))
+            out.flush()
+            pending.clear()
+    out.write(b"".join(pending))
+    out.flush()
+
+
+def _analyse(chunks, params) -> dict:
+    """Turn (output chunk, time of logs_updated) pairs of one server into line statistics"""
+    latencies = []
+    seqs = set()
+    carry = ""
+    for chunk, updated_at in chunks:
+        text = carry + chunk
+        complete, _, carry = text.rpartition("\n")
+        for match in LINE_START.finditer(complete):
+            latencies.append((updated_at - float(match.group(1))) * 1000)
+            seqs.add(int(match.group(2)))
+    return {"latencies_ms": latencies, "lines": len(seqs), "missing": params["lines"] - len(seqs)}
+
+
+def _render(app, logs, server_id) -> dict:
+    """Time the main window's log pane showing ``logs``"""
+    from PyQt6.QtCore import QEventLoop, QTimer
+
+    import mcp_manager
+    from log_buffer import LogBuffer
+
+    window = mcp_manager.MCPManagerWindow()
+    loop = QEventLoop()
+    window.startup_finished.connect(loop.quit)
+    QTimer.singleShot(10000, loop.quit)
+    window.show()
+    loop.exec()
+
+    window.process_manager.logs[server_id] = LogBuffer(logs)
+    window.selected_server_id = server_id
+    pane = window.log_display.viewport()
+    full, update = [], []
+    for _ in range(RENDER_REPEATS):
+        t0 = time.perf_counter()
+        window._show_logs_for_server_id(server_id)
+        pane.repaint()
+        full.append((time.perf_counter() - t0) * 1000)
+    for i in range(RENDER_REPEATS):
+        t0 = time.perf_counter()
+        window.process_manager.append_log(server_id, f"appended line {i}")
+        pane.repaint()
+        update.append((time.perf_counter() - t0) * 1000)
+        app.processEvents()
+
+    window._shutdown_complete = True
+    if window.control_server is not None:
+        window.control_server.close()
+    return {
+        "log_chars": len(window.log_display.toPlainText()),
+        "full_ms": bench_common.distribution(full),
+        "append_ms": bench_common.distribution(update),
+    }
+
+
+def run_scenario(params) -> dict:
+    """Run one scenario inside this process and return its metrics"""
+    sys.path.insert(0, str(bench_common.REPO_ROOT))
+    from PyQt6.QtCore import QTimer
+    from PyQt6.QtWidgets import QApplication
+
+    from models import LogBudget, ServerConfig
+    from process_manager import ProcessManager
+
+    app = QApplication([])
+    manager = ProcessManager()
+    chunks = {}  # server_id: [(chunk, time logs_updated was emitted)]
+    pending = {}  # server_id: chunk whose logs_updated is still to come
+
+    # Keep the slots trivial so they do not distort the latency they measure
+    manager.output_received.connect(lambda sid, text: pending.__setitem__(sid, text))
+    manager.logs_updated.connect(
+        lambda sid: sid in pending and chunks.setdefault(sid, []).append((pending.pop(sid), time.time()))
+    )
+
+    baseline_rss = bench_common.current_rss_kb()
+    args = [
+        str(Path(__file__).resolve()),
+        "--emit",
+        f"--rate={params['rate']}",
+        f"--lines={params['lines']}",
+        f"--line-size={params['line_size']}",
+        f"--charset={params['charset']}",
+        f"--batch={params['batch']}",
+    ]
+    server_ids = [f"emitter-{i}" for i in range(params["servers"])]
+    started = time.monotonic()
+    for server_id in server_ids:
+        # No log budget: the benchmark measures the full pipeline, not the suppression of a flood
+        config = ServerConfig(server_id, server_id, sys.executable, args, {}, log_budget=LogBudget(0, 0))
+        manager.start_server(config)
+
+    def check_done():
+        if not manager.processes or time.monotonic() - started > params.get("timeout_s", 300):
+            app.quit()
+
+    poll = QTimer()
+    poll.timeout.connect(check_done)
+    poll.start(20)
+    app.exec()
+    poll.stop()
+    wall_s = time.monotonic() - started
+    timed_out = bool(manager.processes)
+    # The event loop is over, so nothing would deliver a graceful stop's SIGKILL escalation
+    for server_id in list(manager.processes):
+        manager.force_stop(server_id)
+
+    latencies, lines, missing = [], 0, 0
+    for server_id in server_ids:
+        stats = _analyse(chunks.get(server_id, []), params)
+        latencies += stats["latencies_ms"]
+        lines += stats["lines"]
+        missing += stats["missing"]
+    arrivals = [updated_at for server_chunks in chunks.values() for _, updated_at in server_chunks]
+    ingest_s = max(arrivals) - min(arrivals) if len(arrivals) > 1 else None
+    line_bytes = len(f"{time.time():.6f} 0 {make_payload(params['charset'], params['line_size'])}\n".encode())
+    store = [entry for server_id in server_ids for entry in manager.logs.get(server_id, [])]
+
+    result = {
+        "wall_s": wall_s,
+        "timed_out": timed_out,
+        "lines": lines,
+        "missing_lines": missing,
+        "chunks": sum(len(c) for c in chunks.values()),
+        "ingest_s": ingest_s,
+        "lines_per_s": lines / ingest_s if ingest_s else None,
+        "mb_per_s": lines * line_bytes / ingest_s / 1e6 if ingest_s else None,
+        "latency_ms": bench_common.distribution(latencies),
+        "replacement_chars": sum(entry.count("\ufffd") for entry in store),
+        "log_text_kb": (sys.getsizeof(store) + sum(sys.getsizeof(entry) for entry in store)) // 1024,
+        "log_store_kb": sum(manager.logs[server_id].stored_bytes() for server_id in server_ids) // 1024,
+        "rss_baseline_kb": baseline_rss,
+        "rss_peak_kb": bench_common.peak_rss_kb(),
+    }
+    result["render"] = _render(app, manager.logs.get(server_ids[0], []), server_ids[0])
+    return result
+
+
+def run_isolated(name: str, params: dict, shell: str) -> dict:
+    with tempfile.TemporaryDirectory() as home:
+        env = dict(os.environ, XDG_CONFIG_HOME=home, QT_QPA_PLATFORM="offscreen")
+        if shell:
+            env["SHELL"] = shell
+        out = bench_common.run_child([__file__, "--run", json.dumps(params)], env)
+    for line in out.stdout.splitlines():
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER) :])
+    print(out.stdout[-2000:], out.stderr[-2000:], f"scenario {name} did not report a result", sep="\n", file=sys.stderr)
+    raise SystemExit(1)
+
+
+def _fmt(value, spec=".1f"):
+    return "-" if value is None else format(value, spec)
+
+
+def print_summary(results: dict) -> None:
+    print(
+        f"{'scenario':<12} {'lines/s':>10} {'MB/s':>7} {'p50 ms':>8} {'p99 ms':>8} {'store kB':>9} {'peak kB':>9} "
+        f"{'render ms':>9} {'append ms':>9} {'U+FFFD':>7}"
+    )
+    for name, r in results.items():
+        print(
+            f"{name:<12} {_fmt(r['lines_per_s'], '.0f'):>10} {_fmt(r['mb_per_s'], '.2f'):>7} "
+            f"{_fmt(r['latency_ms'].get('p50'), '.2f'):>8} {_fmt(r['latency_ms'].get('p99'), '.2f'):>8} "
+            f"{r['log_store_kb']:>9} {_fmt(r['rss_peak_kb'], 'd'):>9} "
+            f"{_fmt(r['render']['full_ms'].get('p50')):>9} {_fmt(r['render']['append_ms'].get('p50')):>9} "
+            f"{r['replacement_chars']:>7}"
+        )
+
+
+def parse_overrides(pairs) -> dict:
+    overrides = {}
+    for pair in pairs or []:
+        key, _, value = pair.partition("=")
+        overrides[key] = value if key == "charset" else int(value)
+    return overrides
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="Run only this scenario")
+    parser.add_argument("--set", action="append", metavar="KEY=VALUE", help="Override a scenario parameter")
+    parser.add_argument(
+        "--shell", default="" if os.name == "nt" else "/bin/sh", help="Login shell for the synthetic servers"
+    )
+    parser.add_argument("--output", type=Path, help="Write results as JSON to this file")
+    parser.add_argument("--compare", type=Path, help="Print the change against an earlier results file")
+    parser.add_argument("--run", help=argparse.SUPPRESS)
+    parser.add_argument("--emit", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--rate", type=float, default=0, help=argparse.SUPPRESS)
+    parser.add_argument("--lines", type=int, default=1000, help=argparse.SUPPRESS)
+    parser.add_argument("--line-size", type=int, default=100, help=argparse.SUPPRESS)
+    parser.add_argument("--charset", choices=sorted(CHARSETS), default="ascii", help=argparse.SUPPRESS)
+    parser.add_argument("--batch", type=int, default=1, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.emit:
+        emit(args)
+        return 0
+    if args.run:
+        print(RESULT_MARKER + json.dumps(run_scenario(json.loads(args.run))), flush=True)
+        return 0
+
+    overrides = parse_overrides(args.set)
+    results = {}
+    for name in args.scenario or SCENARIOS:
+        params = {**SCENARIOS[name], **overrides}
+        print(f"Running {name}: {params}", flush=True)
+        results[name] = {"params": params, **run_isolated(name, params, args.shell)}
+    print_summary(results)
+    bench_common.write_results(
+        args.output, {**bench_common.result_header("log_pipeline"), "results": results}, args.compare
+    )
+    return 1 if any(r["timed_out"] or r["missing_lines"] for r in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""Replay a recorded server output stream through the log pipeline.
+
+Recordings are made from the GUI (Export > Record Output...) and hold a
+server's raw stdout/stderr chunks with their timing. Each run replays the file
+in a fresh interpreter with ``QT_QPA_PLATFORM=offscreen`` through
+``ProcessManager`` (the same ingest path as a live server) and measures:
+
+- wall time, and chunks, MB and lines per second,
+- the time ``ProcessManager`` spends on each chunk,
+- the size of the log store and the peak RSS of the process,
+- time for the main window's log pane to show the replayed log.
+
+The server's log budget is off unless ``--budget`` is given, so floods are
+measured in full.
+
+    python benchmarks/bench_replay.py prod.mcprec --output replay.json
+    python benchmarks/bench_replay.py prod.mcprec --speed 10 --compare replay.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import bench_common
+
+RESULT_MARKER = "BENCH_RESULT "
+SERVER_ID = "replayed"
+
+
+def run_replay(path: str, speed: float, budget: bool) -> dict:
+    """Replay one recording inside this process and return its metrics"""
+    sys.path.insert(0, str(bench_common.REPO_ROOT))
+    from bench_log_pipeline import _render
+    from PyQt6.QtWidgets import QApplication
+
+    from models import LogBudget, ServerConfig
+    from output_replay import OutputReplay
+    from process_manager import ProcessManager
+
+    app = QApplication([])
+    manager = ProcessManager()
+    config = ServerConfig(SERVER_ID, SERVER_ID, "replay", [], {})
+    if not budget:
+        config.log_budget = LogBudget(0, 0)
+
+    chunk_ms = []
+    ingest = manager.ingest_output
+
+    def timed_ingest(server_id, stream, data):
+        t0 = time.perf_counter()
+        ingest(server_id, stream, data)
+        chunk_ms.append((time.perf_counter() - t0) * 1000)
+
+    manager.ingest_output = timed_ingest
+    updates = []
+    manager.logs_updated.connect(lambda sid: updates.append(sid))
+
+    baseline_rss = bench_common.current_rss_kb()
+    replay = OutputReplay(manager, path, SERVER_ID, config, speed)
+    replay.finished.connect(lambda *_: app.quit())
+    started = time.monotonic()
+    replay.start()
+    app.exec()
+    wall_s = time.monotonic() - started
+
+    logs = manager.logs[SERVER_ID]
+    lines = sum(entry.count("\n") + 1 for entry in logs)
+    return {
+        "wall_s": wall_s,
+        "recorded_s": replay.recorded_s,
+        "chunks": replay.chunks,
+        "mb": replay.bytes / 1e6,
+        "chunks_per_s": replay.chunks / wall_s if wall_s else None,
+        "mb_per_s": replay.bytes / 1e6 / wall_s if wall_s else None,
+        "lines_per_s": lines / wall_s if wall_s else None,
+        "logs_updated": len(updates),
+        "chunk_ms": bench_common.distribution(chunk_ms),
+        "suppressed_lines": manager.stats.suppressed_lines.get(SERVER_ID, 0),
+        "log_store_kb": logs.stored_bytes() // 1024,
+        "rss_baseline_kb": baseline_rss,
+        "rss_peak_kb": bench_common.peak_rss_kb(),
+        "render": _render(app, logs, SERVER_ID),
+    }
+
+
+def run_isolated(path: Path, speed: float, budget: bool) -> dict:
+    with tempfile.TemporaryDirectory() as home:
+        env = dict(os.environ, XDG_CONFIG_HOME=home, QT_QPA_PLATFORM="offscreen")
+        child = [__file__, "--run", json.dumps({"path": str(path), "speed": speed, "budget": budget})]
+        out = bench_common.run_child(child, env)
+    for line in out.stdout.splitlines():
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER) :])
+    print(
+        out.stdout[-2000:], out.stderr[-2000:], f"replay of {path} did not report a result", sep="\n", file=sys.stderr
+    )
+    raise SystemExit(1)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("recording", type=Path, nargs="?", help="Output recording (.mcprec) to replay")
+    parser.add_argument("--speed", type=float, default=0, help="Replay speed factor (0: as fast as possible)")
+    parser.add_argument("--budget", action="store_true", help="Apply the default log budget")
+    parser.add_argument("--output", type=Path, help="Write results as JSON to this file")
+    parser.add_argument("--compare", type=Path, help="Print the change against an earlier results file")
+    parser.add_argument("--run", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.run:
+        params = json.loads(args.run)
+        print(RESULT_MARKER + json.dumps(run_replay(params["path"], params["speed"], params["budget"])), flush=True)
+        return 0
+    if args.recording is None:
+        parser.error("a recording is required")
+
+    result = run_isolated(args.recording, args.speed, args.budget)
+    print(
+        f"{result['chunks']:,} chunks ({result['mb']:.1f} MB) in {result['wall_s']:.2f}s: "
+        f"{result['mb_per_s']:.1f} MB/s, {result['lines_per_s']:.0f} lines/s, "
+        f"chunk p50 {result['chunk_ms']['p50']:.3f} ms p99 {result['chunk_ms']['p99']:.3f} ms, "
+        f"store {result['log_store_kb']} kB, peak RSS {result['rss_peak_kb']} kB, "
+        f"render {result['render']['full_ms']['p50']:.1f} ms"
+    )
+    header = bench_common.result_header("replay")
+    params = {"recording": str(args.recording), "speed": args.speed, "budget": args.budget}
+    bench_common.write_results(
+        args.output, {**header, "results": {"replay": {"params": params, **result}}}, args.compare
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""Startup benchmark for the MCP Manager GUI.
+
+Launches the GUI in fresh interpreters (offscreen by default) against a
+generated configuration and measures, from process spawn:
+
+- time until ``mcp_manager`` and PyQt6 are imported,
+- time to first paint of the main window,
+- time until the servers are loaded and the window is fully usable.
+
+Exits with status 1 when the median time-to-first-paint exceeds the budget, or
+when the configuration was loaded before the window first painted.
+
+    python benchmarks/bench_startup.py --runs 5 --servers 100 --max-first-paint-ms 1000 --output startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import bench_common
+
+RESULT_MARKER = "BENCH_RESULT "
+
+
+def write_config(config_dir: Path, count: int) -> None:
+    config_dir.mkdir(parents=True, exist_ok=True)
+    servers = [
+        {
+            "id": f"server-{i:04d}",
+            "name": f"Server {i}",
+            "command": "true",
+            "arguments": ["--port", str(3000 + i)],
+            "env_vars": {"INDEX": str(i)},
+            "working_dir": "",
+        }
+        for i in range(count)
+    ]
+    (config_dir / "mcp_servers.json").write_text(json.dumps(servers))
+
+
+def run_child() -> None:
+    """Measure one startup inside this process and print the result line"""
+    t0 = float(os.environ["MCP_BENCH_T0"])
+    sys.path.insert(0, str(bench_common.REPO_ROOT))
+
+    from PyQt6.QtCore import QEvent, QObject, QTimer
+    from PyQt6.QtWidgets import QApplication
+
+    import mcp_manager
+
+    marks = {"imported_s": time.time() - t0}
+
+    class FirstPaint(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Type.Paint and "first_paint_s" not in marks:
+                marks["first_paint_s"] = time.time() - t0
+            return False
+
+    app = QApplication([])
+    paint_filter = FirstPaint()
+    app.installEventFilter(paint_filter)
+    window = mcp_manager.MCPManagerWindow()
+
+    def finished():
+        marks["startup_finished_s"] = time.time() - t0
+        marks["servers_loaded"] = len(window.servers)
+        # Let pending paints land, then leave without stopping anything
+        QTimer.singleShot(50, app.quit)
+
+    window.startup_finished.connect(finished)
+    window.show()
+    QTimer.singleShot(30000, app.quit)
+    app.exec()
+    window._shutdown_complete = True
+    if window.control_server is not None:
+        window.control_server.close()
+    try:
+        import resource
+
+        marks["max_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except ImportError:
+        pass
+    print(RESULT_MARKER + json.dumps(marks), flush=True)
+
+
+def run_once(servers: int, platform: str) -> dict:
+    with tempfile.TemporaryDirectory() as home:
+        write_config(Path(home) / "py-mcp-manager", servers)
+        env = dict(os.environ, XDG_CONFIG_HOME=home, QT_QPA_PLATFORM=platform)
+        env["MCP_BENCH_T0"] = repr(time.time())
+        out = bench_common.run_child([__file__, "--child"], env, timeout=60)
+    for line in out.stdout.splitlines():
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER) :])
+    print(
+        out.stdout[-2000:],
+        out.stderr[-2000:],
+        "startup benchmark child did not report a result",
+        sep="\n",
+        file=sys.stderr,
+    )
+    raise SystemExit(1)
+
+
+def summarize(runs: list[dict]) -> dict:
+    summary = {}
+    for key in ("imported_s", "first_paint_s", "startup_finished_s", "max_rss_kb"):
+        values = [r[key] for r in runs if key in r]
+        if values:
+            summary[key] = {"median": statistics.median(values), "min": min(values), "max": max(values)}
+    return summary
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--servers", type=int, default=50, help="Number of configured servers")
+    parser.add_argument("--platform", default="offscreen", help="Qt platform plugin (offscreen, xcb, cocoa, ...)")
+    parser.add_argument("--max-first-paint-ms", type=float, default=1000.0, help="Budget for the median first paint")
+    parser.add_argument("--output", type=Path, help="Write results as JSON to this file")
+    parser.add_argument("--compare", type=Path, help="Print the change against an earlier results file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        run_child()
+        return 0
+
+    runs = [run_once(args.servers, args.platform) for _ in range(args.runs)]
+    summary = summarize(runs)
+    result = {
+        **bench_common.result_header("startup"),
+        "platform": args.platform,
+        "servers": args.servers,
+        "runs": runs,
+        "results": summary,
+    }
+    for key, stats in summary.items():
+        scale, unit = (1000, "ms") if key.endswith("_s") else (1, "kB")
+        low, high = stats["min"] * scale, stats["max"] * scale
+        print(f"{key:<20} median {stats['median'] * scale:9.1f} {unit}  (min {low:.1f}, max {high:.1f})")
+    bench_common.write_results(args.output, result, args.compare)
+
+    failures = []
+    first_paint_ms = summary["first_paint_s"]["median"] * 1000
+    if first_paint_ms > args.max_first_paint_ms:
+        failures.append(f"median time to first paint {first_paint_ms:.0f} ms exceeds {args.max_first_paint_ms:.0f} ms")
+    if any(r["startup_finished_s"] < r["first_paint_s"] for r in runs):
+        failures.append("configuration was loaded before the window first painted")
+    if any(r.get("servers_loaded") != args.servers for r in runs):
+        failures.append("not every configured server was loaded")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""Minimal MCP stdio server used by the fleet benchmark.
+
+Speaks newline-delimited JSON-RPC 2.0 on stdin/stdout and answers
+``initialize``, ``tools/list`` and ``ping``; other requests get a
+method-not-found error and notifications are ignored. It writes a log line to
+stderr every ``--log-interval`` seconds, crashes with probability
+``--crash-rate`` per second, and exits when stdin closes. Only the standard
+library is used so each instance stays small.
+
+    python benchmarks/fake_mcp_server.py --name demo --log-interval 0.5 --crash-rate 0.01
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+PROTOCOL_VERSION = "2024-11-05"
+
+
+def handle(message: dict, args) -> dict | None:
+    """Return the response to one JSON-RPC message, or None for notifications"""
+    if "id" not in message:
+        return None
+    method = message.get("method")
+    if method == "initialize":
+        result = {
+            "protocolVersion": PROTOCOL_VERSION,
+            "capabilities": {"tools": {"listChanged": False}, "logging": {}},
+            "serverInfo": {"name": f"fake-mcp-{args.name}", "version": "1.0.0"},
+        }
+    elif method == "tools/list":
+        result = {
+            "tools": [
+                {
+                    "name": f"tool_{i}",
+                    "description": f"Synthetic tool {i} of {args.name}",
+                    "inputSchema": {"type": "object", "properties": {"value": {"type": "string"}}},
+                }
+                for i in range(args.tools)
+            ]
+        }
+    elif method == "ping":
+        result = {}
+    else:
+        return {"jsonrpc": "2.0", "id": message["id"], "error": {"code": -32601, "message": f"Unknown method {method}"}}
+    return {"jsonrpc": "2.0", "id": message["id"], "result": result}
+
+
+def serve_stdin(args) -> None:
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            message = json.loads(line)
+        except ValueError:
+            response = {"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": "Parse error"}}
+        else:
+            response = handle(message, args) if isinstance(message, dict) else None
+        if response is not None:
+            sys.stdout.write(json.dumps(response) + "\n")
+            sys.stdout.flush()
+    # The client closed stdin: shut down like a real stdio server
+    os._exit(0)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--name", default=str(os.getpid()))
+    parser.add_argument("--tools", type=int, default=5, help="Number of tools reported by tools/list")
+    parser.add_argument("--log-interval", type=float, default=1.0, help="Seconds between log lines (0: no logs)")
+    parser.add_argument("--crash-rate", type=float, default=0.0, help="Probability of crashing per second")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible crashes")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)  # noqa: S311
+    threading.Thread(target=serve_stdin, args=(args,), daemon=True).start()
+    print(f"fake-mcp {args.name} started", file=sys.stderr, flush=True)
+
+    tick = args.log_interval or 1.0
+    count = 0
+    while True:
+        time.sleep(tick)
+        count += 1
+        if args.log_interval:
+            print(f"fake-mcp {args.name} heartbeat {count}", file=sys.stderr, flush=True)
+        if rng.random() < args.crash_rate * tick:
+            print(f"fake-mcp {args.name} crashing", file=sys.stderr, flush=True)
+            os._exit(rng.choice((1, 2, 70)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""Location, loading and saving of the server configuration file.
+
+Shared by the GUI and the headless daemon, so it must not import Qt.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+from models import ServerConfig
+
+CONFIG_FILE_NAME = "mcp_servers.json"
+APP_NAME = "py-mcp-manager"
+
+
+def default_config_dir() -> Path:
+    """Return platform-appropriate config directory for this app."""
+    home = Path.home()
+    if sys.platform == "darwin":
+        # macOS: ~/Library/Application Support/<AppName>
+        return home / "Library" / "Application Support" / APP_NAME
+    if sys.platform == "win32":
+        # Windows: %APPDATA%\<AppName>
+        appdata = os.getenv("APPDATA")
+        if appdata:
+            return Path(appdata) / APP_NAME
+        # Fallback to home directory
+        return home / APP_NAME
+    # Linux and others: ~/.config/<AppName>
+    xdg = os.getenv("XDG_CONFIG_HOME")
+    base = Path(xdg) if xdg else (home / ".config")
+    return base / APP_NAME
+
+
+def config_file_path(config_dir: Path | None = None) -> Path:
+    """Return the config file path, creating its directory if needed"""
+    directory = Path(config_dir) if config_dir else default_config_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / CONFIG_FILE_NAME
+
+
+def load_servers(path: Path) -> list[ServerConfig] | None:
+    """Load server configurations; None if the file is missing or unreadable"""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] Loading config file: {e}")
+        return None
+    if not isinstance(data, list):
+        print(f"[ERROR] Loading config file: expected a list of servers in {path}")
+        return None
+    servers = []
+    for item in data:
+        if isinstance(item, dict):
+            try:
+                servers.append(ServerConfig.from_dict(item))
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"[ERROR] Skipping invalid server entry: {e}")
+    return servers
+
+
+def save_servers(path: Path, servers) -> None:
+    """Write server configurations to the config file"""
+    with open(path, "w") as f:
+        json.dump([s.to_dict() for s in servers], f, indent=2)
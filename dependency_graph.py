@@ -0,0 +1,159 @@
+"""Dependency graph helpers for ordered server startup.
+
+The graph maps each server ID to the IDs it depends on. Startup happens in
+topological waves: wave 0 holds servers without dependencies, wave N servers
+whose deepest prerequisite sits in wave N-1.
+"""
+
+
+class DependencyCycleError(Exception):
+    """Exception raised when server dependencies form a cycle."""
+
+    def __init__(self, cycle: list[str]) -> None:
+        self.cycle = cycle
+        self.message = f"Dependency cycle: {' -> '.join(cycle)}"
+        super().__init__(self.message)
+
+
+class UnknownDependencyError(Exception):
+    """Exception raised when a server depends on a server that does not exist."""
+
+    def __init__(self, server_id: str, dependency: str) -> None:
+        self.server_id = server_id
+        self.dependency = dependency
+        self.message = f"Server '{server_id}' depends on unknown server '{dependency}'"
+        super().__init__(self.message)
+
+
+class UnknownServerError(UnknownDependencyError):
+    """Exception raised when servers to start are not in the graph."""
+
+    def __init__(self, server_ids: list[str]) -> None:
+        self.server_ids = server_ids
+        self.message = f"Unknown server(s): {', '.join(server_ids)}"
+        Exception.__init__(self, self.message)
+
+
+def build_graph(configs) -> dict[str, list[str]]:
+    """Return {server_id: [dependency IDs]} for a list of ServerConfig objects"""
+    return {c.id: list(dict.fromkeys(c.depends_on)) for c in configs}
+
+
+def find_cycle(graph: dict[str, list[str]]) -> list[str] | None:
+    """Return one dependency cycle as a list of IDs (first ID repeated at the end), or None"""
+    visiting, done = set(), set()
+    stack: list[str] = []
+
+    def visit(node):
+        visiting.add(node)
+        stack.append(node)
+        for dep in graph.get(node, []):
+            if dep in visiting:
+                return [*stack[stack.index(dep) :], dep]
+            if dep not in done and dep in graph:
+                cycle = visit(dep)
+                if cycle:
+                    return cycle
+        stack.pop()
+        visiting.discard(node)
+        done.add(node)
+        return None
+
+    for node in graph:
+        if node not in done:
+            cycle = visit(node)
+            if cycle:
+                return cycle
+    return None
+
+
+def validate(graph: dict[str, list[str]]) -> None:
+    """Raise if the graph references unknown servers or contains a cycle"""
+    for server_id, deps in graph.items():
+        for dep in deps:
+            if dep not in graph:
+                raise UnknownDependencyError(server_id, dep)
+    cycle = find_cycle(graph)
+    if cycle:
+        raise DependencyCycleError(cycle)
+
+
+def with_prerequisites(graph: dict[str, list[str]], targets) -> set[str]:
+    """Return the targets plus everything they transitively depend on"""
+    needed: set[str] = set()
+    stack = list(targets)
+    while stack:
+        node = stack.pop()
+        if node in needed:
+            continue
+        needed.add(node)
+        stack.extend(graph.get(node, []))
+    return needed
+
+
+def plan_waves(graph: dict[str, list[str]], targets=None) -> list[list[str]]:
+    """Group the targets (and their prerequisites) into topological startup waves"""
+    validate(graph)
+    unknown = sorted(set(targets or ()) - graph.keys())
+    if unknown:
+        raise UnknownServerError(unknown)
+    nodes = with_prerequisites(graph, graph if targets is None else targets)
+    level: dict[str, int] = {}
+
+    def depth(node):
+        if node not in level:
+            deps = graph.get(node, [])
+            level[node] = 1 + max((depth(d) for d in deps), default=-1)
+        return level[node]
+
+    waves: list[list[str]] = []
+    for node in sorted(nodes):
+        d = depth(node)
+        while len(waves) <= d:
+            waves.append([])
+        waves[d].append(node)
+    return waves
+
+
+def critical_path(graph: dict[str, list[str]], durations: dict[str, float]) -> tuple[list[str], float]:
+    """Return the chain of servers that bounds cold-start time and its total duration.
+
+    ``durations`` holds each server's start-to-ready time. A server becomes ready
+    ``duration`` seconds after its slowest prerequisite, so the critical path is
+    the longest weighted chain through the graph.
+    """
+    finish: dict[str, float] = {}
+    previous: dict[str, str | None] = {}
+
+    def finish_time(node):
+        if node not in finish:
+            deps = [d for d in graph.get(node, []) if d in durations]
+            slowest = max(deps, key=finish_time, default=None)
+            previous[node] = slowest
+            finish[node] = (finish_time(slowest) if slowest else 0.0) + durations.get(node, 0.0)
+        return finish[node]
+
+    if not durations:
+        return [], 0.0
+    end = max(durations, key=finish_time)
+    path = []
+    node: str | None = end
+    while node is not None:
+        path.append(node)
+        node = previous[node]
+    return list(reversed(path)), finish[end]
+
+
+def format_report(report: dict) -> str:
+    """Render a startup report (as produced by the startup scheduler) as text"""
+    lines = [f"Cold start finished in {report['total_s']:.2f}s"]
+    for i, wave in enumerate(report["waves"]):
+        duration = wave.get("duration_s")
+        timing = f"{duration:.2f}s" if duration is not None else "incomplete"
+        lines.append(f"Wave {i + 1} ({timing}): {', '.join(wave['servers'])}")
+    if report["critical_path"]:
+        chain = " -> ".join(f"{sid} ({report['ready_s'][sid]:.2f}s)" for sid in report["critical_path"])
+        lines.append(f"Critical path ({report['critical_path_s']:.2f}s): {chain}")
+    for server_id, reason in report["failed"].items():
+        lines.append(f"Failed: {server_id}: {reason}")
+    return "\n".join(lines)
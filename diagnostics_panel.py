@@ -0,0 +1,198 @@
+from pathlib import Path
+
+from PyQt6.QtCore import QTimer, QUrl, pyqtSignal
+from PyQt6.QtGui import QDesktopServices
+from PyQt6.QtWidgets import (
+    QFileDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QMenu,
+    QMessageBox,
+    QPushButton,
+    QTreeWidget,
+    QTreeWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from instrumentation import Instrumentation
+from profiling import Profiler, ProfilingError
+
+REFRESH_INTERVAL_MS = 1000
+TIMED_PROFILE_S = 30
+
+
+def _ms(value):
+    return "-" if value is None else f"{value:.1f}"
+
+
+def _bytes(value):
+    for unit in ("B", "kB", "MB"):
+        if value < 1024:
+            return f"{value:.0f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GB"
+
+
+class DiagnosticsPanel(QWidget):
+    """Live view of the window's instrumentation with JSON export and a profiling menu"""
+
+    message = pyqtSignal(str)  # outcome of an export or profiling action
+
+    def __init__(self, instrumentation: Instrumentation, profiler: Profiler, parent=None):
+        super().__init__(parent)
+        self.instrumentation = instrumentation
+        self.profiler = profiler
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(6)
+
+        header = QHBoxLayout()
+        self.summary_label = QLabel()
+        header.addWidget(self.summary_label, 1)
+        reset_button = QPushButton("Reset")
+        reset_button.clicked.connect(self._on_reset)
+        export_button = QPushButton("Export JSON...")
+        export_button.clicked.connect(self._on_export)
+        self.profiling_button = QPushButton("Profiling")
+        self.profiling_menu = QMenu(self.profiling_button)
+        self.profiling_menu.aboutToShow.connect(self._update_profiling_menu)
+        self.profiling_button.setMenu(self.profiling_menu)
+        header.addWidget(reset_button)
+        header.addWidget(export_button)
+        header.addWidget(self.profiling_button)
+        layout.addLayout(header)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["Metric", "Value", "p50 ms", "p99 ms", "Max ms"])
+        self.tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.tree.setRootIsDecorated(True)
+        layout.addWidget(self.tree)
+
+        # Refresh only while the tab is visible
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.refresh_timer.start(REFRESH_INTERVAL_MS)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def _section(self, title, expanded):
+        section = QTreeWidgetItem(self.tree, [title])
+        section.setExpanded(expanded.get(title, True))
+        return section
+
+    @staticmethod
+    def _histogram_row(parent, name, histogram, value=None):
+        QTreeWidgetItem(
+            parent,
+            [
+                name,
+                value if value is not None else f"{histogram['count']} samples",
+                _ms(histogram["p50"]),
+                _ms(histogram["p99"]),
+                _ms(histogram["max"] if histogram["count"] else None),
+            ],
+        )
+
+    def refresh(self):
+        """Rebuild the tree from a fresh snapshot, keeping sections expanded or collapsed"""
+        snapshot = self.instrumentation.snapshot()
+        loop = snapshot["event_loop"]
+        ingested = snapshot["bytes_ingested"]
+        self.summary_label.setText(
+            f"Uptime {snapshot['uptime_s']:.0f}s, event-loop lag p99 {_ms(loop['lag_ms']['p99'])} ms, "
+            f"{loop['stalls']} stall(s), {_bytes(ingested['per_s'])}/s ingested"
+        )
+        expanded = {
+            self.tree.topLevelItem(i).text(0): self.tree.topLevelItem(i).isExpanded()
+            for i in range(self.tree.topLevelItemCount())
+        }
+        self.tree.clear()
+
+        section = self._section("Event loop", expanded)
+        self._histogram_row(section, "Lag", loop["lag_ms"])
+        last = loop["last_stall"]
+        QTreeWidgetItem(section, ["Stalls", f"{loop['stalls']}" + (f" (last {last['ms']} ms)" if last else "")])
+
+        section = self._section("Signals", expanded)
+        for name, counter in snapshot["signals"].items():
+            QTreeWidgetItem(section, [name, f"{counter['per_s']:.1f}/s ({counter['total']} total)"])
+
+        section = self._section("Bytes ingested", expanded)
+        QTreeWidgetItem(section, ["All servers", f"{_bytes(ingested['per_s'])}/s ({_bytes(ingested['total'])} total)"])
+        for server_id, total in sorted(ingested["servers"].items(), key=lambda item: -item[1]):
+            QTreeWidgetItem(section, [server_id, _bytes(total)])
+
+        section = self._section("Timings", expanded)
+        for name, histogram in snapshot["timings_ms"].items():
+            self._histogram_row(section, name, histogram)
+
+    def _update_profiling_menu(self):
+        """Offer the profiling actions that fit what is running now"""
+        status = self.profiler.status()
+        menu = self.profiling_menu
+        menu.clear()
+        if status["cpu"]:
+            menu.addAction("Stop CPU profile", lambda: self._run_profiler("cpu-stop"))
+        else:
+            menu.addAction(
+                f"Profile CPU for {TIMED_PROFILE_S} s", lambda: self._run_profiler("cpu-start", TIMED_PROFILE_S)
+            )
+            menu.addAction("Start CPU profile", lambda: self._run_profiler("cpu-start"))
+        menu.addAction("Take memory snapshot", lambda: self._run_profiler("memory-snapshot"))
+        if status["memory"]:
+            menu.addAction("Stop memory tracing", lambda: self._run_profiler("memory-stop"))
+        if status["sampling"]:
+            menu.addAction("Stop stack sampling", lambda: self._run_profiler("sample-stop"))
+        else:
+            menu.addAction(
+                f"Sample stacks for {TIMED_PROFILE_S} s", lambda: self._run_profiler("sample-start", TIMED_PROFILE_S)
+            )
+        menu.addSeparator()
+        menu.addAction(
+            "Open artifacts folder",
+            lambda: QDesktopServices.openUrl(QUrl.fromLocalFile(str(self.profiler.output_dir))),
+        )
+
+    def _run_profiler(self, action, seconds=None):
+        try:
+            result = self.profiler.run(action, seconds)
+        except ProfilingError as e:
+            self.message.emit(e.message)
+            return
+        artifacts = ", ".join(Path(path).name for path in result["artifacts"])
+        if action.endswith("-start"):
+            when = f"in {seconds} s" if seconds else "when stopped"
+            self.message.emit(f"Profiling started; {artifacts} will be written {when}")
+        elif artifacts:
+            self.message.emit(f"Wrote {artifacts} to {self.profiler.output_dir}")
+        else:
+            self.message.emit("Memory tracing stopped")
+
+    def _on_reset(self):
+        self.instrumentation.reset()
+        self.refresh()
+
+    def _on_export(self):
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Export Diagnostics", "mcp-manager-diagnostics.json", "JSON Files (*.json)"
+        )
+        if not file_path:
+            return
+        if not file_path.endswith(".json"):
+            file_path += ".json"
+        try:
+            Path(file_path).write_text(self.instrumentation.to_json())
+        except OSError as e:
+            print(f"[ERROR] Exporting diagnostics: {e}")
+            QMessageBox.critical(self, "Export Failed", f"Failed to export diagnostics: {e}")
+            return
+        self.message.emit(f"Diagnostics exported to {file_path}")
@@ -0,0 +1,201 @@
+"""Append-only journal of server lifecycle events.
+
+Every start, readiness result, stop request, exit, crash, resource limit hit and
+alert is appended as one compact JSON line to ``events.jsonl`` in the config
+directory. The journal is read back into memory on first query and indexed by
+server and time, so questions like "crashes in the last 24h by server" are
+answered with a binary search instead of a scan of the logs. Events older than
+RETENTION_S are dropped when the file is compacted on load.
+
+Shared by the GUI, the daemon and ``mcp-manager events``; it must not import Qt.
+"""
+
+import json
+import os
+import time
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+
+EVENTS_FILE_NAME = "events.jsonl"
+# start, start_failed, ready, ready_failed, stop (requested), exit (clean or requested), crash, limit_hit, reattach,
+# alert (an alert rule matched the server's output)
+EVENT_TYPES = (
+    "start",
+    "start_failed",
+    "ready",
+    "ready_failed",
+    "stop",
+    "exit",
+    "crash",
+    "limit_hit",
+    "reattach",
+    "alert",
+)
+RETENTION_S = 30 * 24 * 3600
+COMPACT_BYTES = 4 * 1024 * 1024  # rewrite without expired events once the file is this large
+
+
+class LifecycleEvent:
+    """One journal entry; stored with single-letter keys to keep the file small"""
+
+    __slots__ = ("cause", "duration_s", "exit_code", "server_id", "timestamp", "type")
+
+    def __init__(self, timestamp, server_id, type, exit_code=None, duration_s=None, cause=None):  # noqa: A002
+        self.timestamp = timestamp
+        self.server_id = server_id
+        self.type = type
+        self.exit_code = exit_code
+        self.duration_s = duration_s
+        self.cause = cause
+
+    def to_dict(self):
+        data = {"t": round(self.timestamp, 3), "s": self.server_id, "e": self.type}
+        if self.exit_code is not None:
+            data["c"] = self.exit_code
+        if self.duration_s is not None:
+            data["d"] = round(self.duration_s, 3)
+        if self.cause:
+            data["r"] = self.cause
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(float(data["t"]), str(data["s"]), str(data["e"]), data.get("c"), data.get("d"), data.get("r"))
+
+    def describe(self) -> dict:
+        """Return the event with readable keys, e.g. for JSON output"""
+        return {
+            "timestamp": self.timestamp,
+            "server": self.server_id,
+            "type": self.type,
+            "exit_code": self.exit_code,
+            "duration_s": self.duration_s,
+            "cause": self.cause,
+        }
+
+
+class _Series:
+    """Events in time order with a parallel list of timestamps for bisection"""
+
+    def __init__(self):
+        self.times = []
+        self.events = []
+
+    def append(self, event):
+        self.times.append(event.timestamp)
+        self.events.append(event)
+
+    def between(self, since=None, until=None):
+        lo = 0 if since is None else bisect_left(self.times, since)
+        hi = len(self.times) if until is None else bisect_right(self.times, until)
+        return self.events[lo:hi]
+
+
+class EventJournal:
+    """Append lifecycle events to disk and answer queries from an in-memory index"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.revision = 0  # increments on every recorded event, for views that poll
+        self._loaded = False
+        self._all = _Series()
+        self._by_server = {}  # server_id: _Series
+        self._last_time = 0.0
+
+    def record(self, server_id, event_type, exit_code=None, duration_s=None, cause=None) -> LifecycleEvent:
+        """Append an event stamped with the current time"""
+        # Keep the journal ordered even if the wall clock steps backwards
+        self._last_time = max(time.time(), self._last_time)
+        event = LifecycleEvent(self._last_time, server_id, event_type, exit_code, duration_s, cause)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write(json.dumps(event.to_dict(), separators=(",", ":")) + "\n")
+        except OSError as e:
+            print(f"[ERROR] Writing event journal: {e}")
+        if self._loaded:
+            self._index(event)
+        self.revision += 1
+        return event
+
+    def _index(self, event):
+        self._all.append(event)
+        series = self._by_server.get(event.server_id)
+        if series is None:
+            series = self._by_server[event.server_id] = _Series()
+        series.append(event)
+        self._last_time = max(self._last_time, event.timestamp)
+
+    def load(self, compact: bool = True) -> None:
+        """Read the journal file into the index, compacting it when it has grown large.
+
+        Only the process that writes the journal may compact it; readers pass ``compact=False``.
+        """
+        self._loaded = True
+        self._all = _Series()
+        self._by_server = {}
+        try:
+            with open(self.path) as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            print(f"[ERROR] Reading event journal: {e}")
+            return
+        events = []
+        for line in lines:
+            try:
+                events.append(LifecycleEvent.from_dict(json.loads(line)))
+            except (ValueError, KeyError, TypeError):
+                continue  # a torn last line or a foreign edit
+        events.sort(key=lambda event: event.timestamp)
+        cutoff = time.time() - RETENTION_S
+        kept = [event for event in events if event.timestamp >= cutoff]
+        for event in kept:
+            self._index(event)
+        if compact and len(kept) < len(events) and self.path.stat().st_size >= COMPACT_BYTES:
+            self._rewrite(kept)
+
+    def _rewrite(self, events):
+        try:
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                f.writelines(json.dumps(event.to_dict(), separators=(",", ":")) + "\n" for event in events)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[ERROR] Compacting event journal: {e}")
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self.load()
+
+    def servers(self) -> list[str]:
+        """Return the IDs of every server with at least one event"""
+        self._ensure_loaded()
+        return sorted(self._by_server)
+
+    def query(self, server_id=None, types=None, since=None, until=None, limit=None) -> list[LifecycleEvent]:
+        """Return matching events in time order; ``limit`` keeps the newest ones"""
+        self._ensure_loaded()
+        if server_id is None:
+            series = self._all
+        else:
+            series = self._by_server.get(server_id)
+            if series is None:
+                return []
+        events = series.between(since, until)
+        if types is not None:
+            types = {types} if isinstance(types, str) else set(types)
+            events = [event for event in events if event.type in types]
+        return events[-limit:] if limit else events
+
+    def count_by_server(self, types=None, since=None, until=None) -> dict[str, int]:
+        """Return {server_id: number of matching events}, most frequent first"""
+        counts = {}
+        for event in self.query(types=types, since=since, until=until):
+            counts[event.server_id] = counts.get(event.server_id, 0) + 1
+        return dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+
+
+def journal_path(state_dir) -> Path:
+    return Path(state_dir) / EVENTS_FILE_NAME
@@ -0,0 +1,137 @@
+import time
+
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import (
+    QComboBox,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QTreeWidget,
+    QTreeWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from event_journal import EVENT_TYPES, EventJournal
+
+POLL_INTERVAL_MS = 1000
+MAX_ROWS = 1000  # newest events shown; the summary still counts every match
+PERIODS = (("Last hour", 3600), ("Last 24 hours", 24 * 3600), ("Last 7 days", 7 * 24 * 3600), ("All", None))
+
+
+def _duration(seconds):
+    if seconds is None:
+        return ""
+    if seconds < 60:
+        return f"{seconds:.2f}s"
+    if seconds < 3600:
+        return f"{seconds / 60:.1f}m"
+    return f"{seconds / 3600:.1f}h"
+
+
+class EventsPanel(QWidget):
+    """Filterable view of the lifecycle event journal with per-server crash counts"""
+
+    def __init__(self, journal: EventJournal, parent=None):
+        super().__init__(parent)
+        self.journal = journal
+        self._shown_revision = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(6)
+
+        filters = QHBoxLayout()
+        self.server_filter = QComboBox()
+        self.period_filter = QComboBox()
+        for label, seconds in PERIODS:
+            self.period_filter.addItem(label, seconds)
+        self.period_filter.setCurrentIndex(1)
+        self.type_filter = QComboBox()
+        self.type_filter.addItem("All events", None)
+        for event_type in EVENT_TYPES:
+            self.type_filter.addItem(event_type.replace("_", " ").capitalize(), event_type)
+        for combo in (self.server_filter, self.period_filter, self.type_filter):
+            combo.currentIndexChanged.connect(self.refresh)
+            filters.addWidget(combo)
+        filters.addStretch()
+        layout.addLayout(filters)
+
+        self.summary_label = QLabel()
+        self.summary_label.setWordWrap(True)
+        layout.addWidget(self.summary_label)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["Time", "Server", "Event", "Exit code", "Duration", "Cause"])
+        self.tree.setRootIsDecorated(False)
+        self.tree.header().setSectionResizeMode(5, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.tree)
+
+        # New events are picked up while the tab is visible
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self._poll)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._update_server_filter()
+        self.refresh()
+        self.poll_timer.start(POLL_INTERVAL_MS)
+
+    def hideEvent(self, event):
+        self.poll_timer.stop()
+        super().hideEvent(event)
+
+    def select_server(self, server_id):
+        index = self.server_filter.findData(server_id)
+        if index >= 0:
+            self.server_filter.setCurrentIndex(index)
+
+    def _update_server_filter(self):
+        current = self.server_filter.currentData()
+        self.server_filter.blockSignals(True)
+        self.server_filter.clear()
+        self.server_filter.addItem("All servers", None)
+        for server_id in self.journal.servers():
+            self.server_filter.addItem(server_id, server_id)
+        self.server_filter.setCurrentIndex(max(0, self.server_filter.findData(current)))
+        self.server_filter.blockSignals(False)
+
+    def _poll(self):
+        if self.journal.revision != self._shown_revision:
+            if self.server_filter.count() - 1 != len(self.journal.servers()):
+                self._update_server_filter()
+            self.refresh()
+
+    def refresh(self):
+        """Rebuild the table and summary for the current filters"""
+        self._shown_revision = self.journal.revision
+        period = self.period_filter.currentData()
+        since = time.time() - period if period else None
+        server_id = self.server_filter.currentData()
+        event_type = self.type_filter.currentData()
+
+        crashes = self.journal.count_by_server("crash", since=since)
+        period_text = self.period_filter.currentText().lower()
+        if crashes:
+            counts = ", ".join(f"{sid} {n}" for sid, n in crashes.items())
+            self.summary_label.setText(f"Crashes ({period_text}): {counts}")
+        else:
+            self.summary_label.setText(f"No crashes ({period_text})")
+
+        events = self.journal.query(server_id, event_type, since=since)
+        self.tree.clear()
+        items = []
+        for event in reversed(events[-MAX_ROWS:]):
+            items.append(
+                QTreeWidgetItem([
+                    time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(event.timestamp)),
+                    event.server_id,
+                    event.type,
+                    "" if event.exit_code is None else str(event.exit_code),
+                    _duration(event.duration_s),
+                    event.cause or "",
+                ])
+            )
+        self.tree.addTopLevelItems(items)
+        for column in range(5):
+            self.tree.resizeColumnToContents(column)
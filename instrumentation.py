@@ -0,0 +1,224 @@
+"""Lightweight runtime instrumentation: event-loop lag, signal rates, ingested bytes and timings.
+
+Everything except ``LagMonitor`` is free of Qt so the same counters can be
+used by the headless core, which measures its loop with ``watch_asyncio_lag``. Recording is cheap enough for hot paths: a counter
+update is a clock read and an integer add.
+"""
+
+import functools
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+
+BUCKETS_MS = (0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+RECENT_SAMPLES = 512  # samples kept for percentiles
+RATE_WINDOW_S = 10
+LAG_INTERVAL_MS = 100
+STALL_THRESHOLD_MS = 250
+
+
+class Histogram:
+    """Latency histogram in milliseconds with fixed buckets and recent-sample percentiles"""
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)  # last bucket: above the largest bound
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+    def observe(self, ms: float) -> None:
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+        self.recent.append(ms)
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def percentile(self, pct: float) -> float | None:
+        """Return the ``pct`` percentile of the recent samples"""
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+    def to_dict(self) -> dict:
+        labels = [f"le_{bound}" for bound in BUCKETS_MS] + ["inf"]
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "buckets": dict(zip(labels, self.buckets, strict=True)),
+        }
+
+
+class RateCounter:
+    """Total count plus the rate over the last RATE_WINDOW_S seconds"""
+
+    def __init__(self):
+        self.total = 0
+        self._bins = deque()  # [second, count] pairs, oldest first
+
+    def add(self, n: int = 1, now: float | None = None) -> None:
+        self.total += n
+        second = int(time.monotonic() if now is None else now)
+        if self._bins and self._bins[-1][0] == second:
+            self._bins[-1][1] += n
+            return
+        self._bins.append([second, n])
+        while self._bins and self._bins[0][0] <= second - RATE_WINDOW_S:
+            self._bins.popleft()
+
+    def rate(self, now: float | None = None) -> float:
+        """Return events per second over the rate window"""
+        horizon = int(time.monotonic() if now is None else now) - RATE_WINDOW_S
+        return sum(count for second, count in self._bins if second > horizon) / RATE_WINDOW_S
+
+    def to_dict(self) -> dict:
+        return {"total": self.total, "per_s": self.rate()}
+
+
+class Instrumentation:
+    """Registry of the counters and histograms shown in the diagnostics tab"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop every recorded value"""
+        self.started = time.time()
+        self.signals = {}  # signal name: RateCounter
+        self.bytes = RateCounter()
+        self.bytes_by_server = {}  # server_id: bytes of output ingested
+        self.timings = {}  # operation: Histogram
+        self.lag = Histogram()
+        self.stalls = 0
+        self.last_stall = None  # {"at": unix time, "ms": lateness}
+
+    def count(self, signal: str, n: int = 1) -> None:
+        counter = self.signals.get(signal)
+        if counter is None:
+            counter = self.signals[signal] = RateCounter()
+        counter.add(n)
+
+    def add_bytes(self, server_id: str, n: int) -> None:
+        self.bytes.add(n)
+        self.bytes_by_server[server_id] = self.bytes_by_server.get(server_id, 0) + n
+
+    def observe(self, operation: str, ms: float) -> None:
+        histogram = self.timings.get(operation)
+        if histogram is None:
+            histogram = self.timings[operation] = Histogram()
+        histogram.observe(ms)
+
+    @contextmanager
+    def timed(self, operation: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(operation, (time.perf_counter() - start) * 1000)
+
+    def record_lag(self, ms: float) -> None:
+        self.lag.observe(ms)
+        if ms >= STALL_THRESHOLD_MS:
+            self.stalls += 1
+            self.last_stall = {"at": time.time(), "ms": round(ms, 1)}
+            print(f"[DEBUG] Event loop stalled for {ms:.0f} ms")
+
+    def snapshot(self) -> dict:
+        """Return every metric as a JSON-serializable dictionary"""
+        return {
+            "timestamp": time.time(),
+            "uptime_s": round(time.time() - self.started, 1),
+            "event_loop": {"lag_ms": self.lag.to_dict(), "stalls": self.stalls, "last_stall": self.last_stall},
+            "signals": {name: counter.to_dict() for name, counter in sorted(self.signals.items())},
+            "bytes_ingested": {**self.bytes.to_dict(), "servers": dict(sorted(self.bytes_by_server.items()))},
+            "timings_ms": {name: histogram.to_dict() for name, histogram in sorted(self.timings.items())},
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+
+
+class ServerStats:
+    """Per-server counters exported as Prometheus metrics; unlike Instrumentation they are never reset"""
+
+    def __init__(self):
+        self.starts = {}  # server_id: number of launches
+        self.log_bytes = {}  # server_id: bytes of output ingested
+        self.log_lines = {}  # server_id: lines of output ingested
+        self.suppressed_lines = {}  # server_id: lines left out of the log over its budget
+        self.suppressed_bytes = {}  # server_id: bytes left out of the log over its budget
+
+    def record_start(self, server_id: str) -> None:
+        self.starts[server_id] = self.starts.get(server_id, 0) + 1
+
+    def record_output(self, server_id: str, n_bytes: int, n_lines: int) -> None:
+        self.log_bytes[server_id] = self.log_bytes.get(server_id, 0) + n_bytes
+        self.log_lines[server_id] = self.log_lines.get(server_id, 0) + n_lines
+
+    def record_suppressed(self, server_id: str, n_lines: int, n_bytes: int) -> None:
+        self.suppressed_lines[server_id] = self.suppressed_lines.get(server_id, 0) + n_lines
+        self.suppressed_bytes[server_id] = self.suppressed_bytes.get(server_id, 0) + n_bytes
+
+
+def timed_method(operation: str):
+    """Time a method into ``self.instrumentation`` when the object has one"""
+
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            instrumentation = getattr(self, "instrumentation", None)
+            if instrumentation is None:
+                return func(self, *args, **kwargs)
+            with instrumentation.timed(operation):
+                return func(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+class LagMonitor:
+    """Measure Qt event-loop latency as the lateness of a precise repeating timer"""
+
+    def __init__(self, instrumentation: Instrumentation, interval_ms: int = LAG_INTERVAL_MS, parent=None):
+        from PyQt6.QtCore import Qt, QTimer
+
+        self.instrumentation = instrumentation
+        self.interval_ms = interval_ms
+        self._last = None
+        self.timer = QTimer(parent)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self._on_tick)
+
+    def start(self):
+        self._last = time.perf_counter()
+        self.timer.start(self.interval_ms)
+
+    def stop(self):
+        self.timer.stop()
+
+    def _on_tick(self):
+        now = time.perf_counter()
+        self.instrumentation.record_lag(max(0.0, (now - self._last) * 1000 - self.interval_ms))
+        self._last = now
+
+
+async def watch_asyncio_lag(instrumentation: Instrumentation, interval_ms: int = LAG_INTERVAL_MS):
+    """Measure asyncio event-loop latency as the lateness of a repeated sleep; runs until cancelled"""
+    import asyncio
+
+    interval_s = interval_ms / 1000
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval_s)
+        instrumentation.record_lag(max(0.0, (time.perf_counter() - start - interval_s) * 1000))
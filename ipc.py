@@ -0,0 +1,251 @@
+"""Local control protocol between ``mcp-manager`` commands and a running manager.
+
+Messages are JSON objects sent as frames: a 4-byte big-endian length followed
+by compact UTF-8 JSON. The GUI (QLocalServer) and the daemon (asyncio) listen
+on the same Unix socket in the config directory, which also makes sure only
+one manager runs per config directory. This module must not import Qt so the
+command-line client stays fast.
+
+Requests are ``{"op": ..., "servers": [ids] | null, ...}``; ``null`` means all
+servers. Replies are ``{"ok": true, "result": ...}`` or ``{"ok": false,
+"error": ...}``. A ``logs`` request with ``"follow": true`` keeps the
+connection open after the reply and streams ``{"event": "log", "server": id,
+"line": ...}`` frames as output arrives. ``profile`` takes ``action``,
+``seconds`` and ``interval_ms`` and runs ``profiling.Profiler.run``.
+"""
+
+import json
+import os
+import socket
+import struct
+from pathlib import Path
+
+import config_store
+
+SOCKET_NAME = "manager.sock"
+MAX_SOCKET_PATH = 100  # sun_path is 104-108 bytes depending on the platform
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+CONNECT_TIMEOUT_S = 2.0
+OPS = ("ping", "activate", "start", "stop", "restart", "status", "logs", "profile")
+
+_HEADER = struct.Struct(">I")
+
+
+class IpcError(Exception):
+    """Exception raised for protocol errors and failed requests."""
+
+    def __init__(self, message: str = "Invalid control message") -> None:
+        self.message = message
+        super().__init__(self.message)
+
+
+class FrameTooLargeError(IpcError):
+    """Exception raised when a frame header announces an oversized message."""
+
+    def __init__(self, length: int) -> None:
+        super().__init__(f"Frame of {length} bytes exceeds the {MAX_FRAME_BYTES} byte limit")
+
+
+class MalformedFrameError(IpcError):
+    """Exception raised when a frame does not hold valid JSON."""
+
+    def __init__(self, detail: str = "") -> None:
+        super().__init__(f"Malformed frame: {detail}" if detail else "Malformed frame")
+
+
+class ConnectionClosedError(IpcError):
+    """Exception raised when the other side closes the control connection."""
+
+    def __init__(self) -> None:
+        super().__init__("Connection closed by the manager")
+
+
+class ManagerNotRunningError(IpcError):
+    """Exception raised when no manager is listening on the control socket."""
+
+    def __init__(self, path: Path | None = None) -> None:
+        where = f" at {path}" if path else ""
+        super().__init__(f"No running MCP Manager found{where} (start the GUI or 'mcp-manager daemon')")
+
+
+class ManagerNotRespondingError(IpcError):
+    """Exception raised when the manager does not answer on the control socket in time."""
+
+    def __init__(self, timeout: float | None = None) -> None:
+        within = f" within {timeout:g}s" if timeout else ""
+        super().__init__(f"The MCP Manager did not answer{within}")
+
+
+def socket_path(config_dir: Path | None = None) -> Path:
+    """Return the control socket path for a config directory"""
+    directory = Path(config_dir) if config_dir else config_store.default_config_dir()
+    path = directory / SOCKET_NAME
+    if len(str(path)) <= MAX_SOCKET_PATH:
+        return path
+    # Deep home directories overflow sun_path; fall back to a per-directory name in the temp dir
+    import hashlib
+    import tempfile
+
+    digest = hashlib.sha256(str(directory.resolve()).encode()).hexdigest()[:12]
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return Path(tempfile.gettempdir()) / f"py-mcp-manager-{uid}-{digest}.sock"
+
+
+def encode_frame(message: dict) -> bytes:
+    body = json.dumps(message, separators=(",", ":")).encode()
+    return _HEADER.pack(len(body)) + body
+
+
+class FrameDecoder:
+    """Incrementally split a byte stream into decoded messages"""
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> list[dict]:
+        self._buffer += data
+        messages = []
+        while len(self._buffer) >= _HEADER.size:
+            (length,) = _HEADER.unpack_from(self._buffer)
+            if length > MAX_FRAME_BYTES:
+                raise FrameTooLargeError(length)
+            end = _HEADER.size + length
+            if len(self._buffer) < end:
+                break
+            body = bytes(self._buffer[_HEADER.size : end])
+            del self._buffer[:end]
+            try:
+                messages.append(json.loads(body))
+            except ValueError as e:
+                raise MalformedFrameError(str(e)) from e
+        return messages
+
+
+def validate_request(request) -> str | None:
+    """Return an error message if ``request`` is not a well-formed request"""
+    if not isinstance(request, dict) or request.get("op") not in OPS:
+        return f"Unknown operation; expected one of {', '.join(OPS)}"
+    servers = request.get("servers")
+    if servers is not None and not (isinstance(servers, list) and all(isinstance(s, str) for s in servers)):
+        return "'servers' must be a list of server IDs or null"
+    return None
+
+
+def resolve_servers(request: dict, known_ids) -> tuple[list[str], str | None]:
+    """Return the server IDs a request targets (all when null) and an error for unknown IDs"""
+    known = list(known_ids)
+    servers = request.get("servers")
+    if servers is None:
+        return known, None
+    unknown = [s for s in servers if s not in known]
+    if unknown:
+        return [], f"Unknown server(s): {', '.join(unknown)}"
+    return list(dict.fromkeys(servers)), None
+
+
+def reply(result=None) -> dict:
+    return {"ok": True, "result": result}
+
+
+def error_reply(message: str) -> dict:
+    return {"ok": False, "error": message}
+
+
+class Client:
+    """Blocking control-socket client used by the command-line interface"""
+
+    def __init__(self, path: Path | None = None, timeout: float = CONNECT_TIMEOUT_S):
+        self.path = Path(path) if path else socket_path()
+        self.timeout = timeout
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        try:
+            self._sock.connect(str(self.path))
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            self._sock.close()
+            raise ManagerNotRunningError(self.path) from e
+        except OSError as e:
+            self._sock.close()
+            raise self._socket_error(e, timeout) from e
+        self._decoder = FrameDecoder()
+        self._pending: list[dict] = []
+
+    def close(self):
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _socket_error(self, error: OSError, timeout: float | None) -> IpcError:
+        """Return the IpcError to raise for a failed socket call"""
+        if isinstance(error, TimeoutError):
+            return ManagerNotRespondingError(timeout)
+        if isinstance(error, BrokenPipeError | ConnectionResetError):
+            return ConnectionClosedError()
+        return IpcError(f"Cannot talk to the MCP Manager at {self.path}: {error.strerror or error}")
+
+    def send(self, message: dict) -> None:
+        try:
+            self._sock.sendall(encode_frame(message))
+        except OSError as e:
+            raise self._socket_error(e, self.timeout) from e
+
+    def receive(self, timeout: float | None = -1) -> dict:
+        """Return the next message; ``timeout=None`` waits indefinitely, the default uses the client timeout"""
+        timeout = self.timeout if timeout == -1 else timeout
+        self._sock.settimeout(timeout)
+        while not self._pending:
+            try:
+                data = self._sock.recv(65536)
+            except OSError as e:
+                raise self._socket_error(e, timeout) from e
+            if not data:
+                raise ConnectionClosedError
+            self._pending.extend(self._decoder.feed(data))
+        return self._pending.pop(0)
+
+    def request(self, op: str, servers=None, **fields) -> object:
+        """Send a request and return its result, raising IpcError on failure"""
+        self.send({"op": op, "servers": servers, **fields})
+        response = self.receive()
+        if not response.get("ok"):
+            raise IpcError(response.get("error") or "Request failed")
+        return response.get("result")
+
+    def events(self):
+        """Yield streamed event frames until the manager closes the connection"""
+        while True:
+            try:
+                yield self.receive(timeout=None)
+            except IpcError:
+                return
+
+
+def instance_running(path: Path) -> bool:
+    """Return True if a manager answers on the control socket"""
+    try:
+        with Client(path, timeout=0.5) as client:
+            client.request("ping")
+    except ManagerNotRespondingError:
+        # Something accepted the connection but is busy; never steal its socket
+        return True
+    except (IpcError, OSError):
+        return False
+    return True
+
+
+def claim_socket(path: Path) -> bool:
+    """Prepare to listen on ``path``: False if another manager owns it, else stale files are removed"""
+    if instance_running(path):
+        return False
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"[ERROR] Removing stale control socket {path}: {e}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return True
@@ -0,0 +1,197 @@
+import os
+
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtNetwork import QLocalServer
+
+import dependency_graph
+import ipc
+from shutdown_coordinator import ShutdownCoordinator
+
+
+class StartupInProgressError(ipc.IpcError):
+    """Exception raised when a start is requested while a startup is still running."""
+
+    def __init__(self) -> None:
+        super().__init__("A startup is already in progress")
+
+
+class ControlServer(QObject):
+    """Serve ``mcp-manager`` control requests for the GUI over QLocalServer.
+
+    Requests are answered from the window's servers, process manager and
+    startup scheduler. Followed logs are pushed from ``logs_updated`` so the
+    client never polls.
+    """
+
+    activate_requested = pyqtSignal()
+
+    def __init__(self, window, path, parent=None):
+        super().__init__(parent)
+        self.window = window
+        self.process_manager = window.process_manager
+        self.path = path
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        self.server.newConnection.connect(self._on_new_connection)
+        self._decoders = {}  # socket: FrameDecoder
+        self._followers = {}  # socket: {server_id: (log list, entries already sent)}
+        self._coordinators = set()  # ShutdownCoordinators of pending stop/restart requests
+        self.process_manager.logs_updated.connect(self._on_logs_updated)
+
+    def listen(self):
+        """Start listening; False if another manager owns the socket or listening failed"""
+        if not ipc.claim_socket(self.path):
+            return False
+        if not self.server.listen(str(self.path)):
+            print(f"[ERROR] Control socket {self.path}: {self.server.errorString()}")
+            return False
+        print(f"[DEBUG] Control socket listening on {self.path}")
+        return True
+
+    def close(self):
+        for sock in list(self._decoders):
+            sock.abort()
+        self.server.close()
+
+    def _on_new_connection(self):
+        while self.server.hasPendingConnections():
+            sock = self.server.nextPendingConnection()
+            self._decoders[sock] = ipc.FrameDecoder()
+            sock.readyRead.connect(lambda s=sock: self._on_ready_read(s))
+            sock.disconnected.connect(lambda s=sock: self._on_disconnected(s))
+
+    def _on_disconnected(self, sock):
+        self._decoders.pop(sock, None)
+        self._followers.pop(sock, None)
+        sock.deleteLater()
+
+    def _on_ready_read(self, sock):
+        decoder = self._decoders.get(sock)
+        if decoder is None:
+            return
+        try:
+            requests = decoder.feed(bytes(sock.readAll()))
+        except ipc.IpcError as e:
+            print(f"[ERROR] Control connection: {e.message}")
+            sock.abort()
+            return
+        for request in requests:
+            self._handle_request(sock, request)
+
+    def _send(self, sock, message):
+        sock.write(ipc.encode_frame(message))
+        sock.flush()
+
+    def _handle_request(self, sock, request):
+        error = ipc.validate_request(request)
+        server_ids = []
+        if not error:
+            server_ids, error = ipc.resolve_servers(request, [s.id for s in self.window.servers])
+        if not error:
+            try:
+                result = self._dispatch(sock, request, server_ids)
+            except ipc.IpcError as e:
+                error = e.message
+        self._send(sock, ipc.error_reply(error) if error else ipc.reply(result))
+
+    def _dispatch(self, sock, request, server_ids):
+        """Run a control operation and return its result"""
+        op = request["op"]
+        if op == "ping":
+            return {"kind": "gui", "pid": os.getpid()}
+        if op == "activate":
+            self.activate_requested.emit()
+            return None
+        if op == "start":
+            self._start(server_ids)
+            return {"starting": server_ids}
+        if op == "stop":
+            running = [sid for sid in server_ids if sid in self.process_manager.processes]
+            if running:
+                self._stop(running)
+            return {"stopping": running}
+        if op == "restart":
+            running = [sid for sid in server_ids if sid in self.process_manager.processes]
+            if running:
+                self._stop(running, then_start=server_ids)
+            else:
+                self._start(server_ids)
+            return {"restarting": server_ids}
+        if op == "status":
+            return [self._describe(sid) for sid in server_ids]
+        if op == "profile":
+            return self._profile(request)
+        return self._logs(sock, server_ids, request.get("lines"), bool(request.get("follow")))
+
+    def _start(self, server_ids):
+        scheduler = self.window.startup_scheduler
+        if scheduler.is_active():
+            raise StartupInProgressError
+        try:
+            scheduler.start(self.window.servers, server_ids)
+        except (dependency_graph.DependencyCycleError, dependency_graph.UnknownDependencyError) as e:
+            raise ipc.IpcError(e.message) from e
+
+    def _stop(self, server_ids, then_start=None):
+        coordinator = ShutdownCoordinator(self.process_manager, parent=self)
+        self._coordinators.add(coordinator)
+
+        def finished(unconfirmed):
+            self._coordinators.discard(coordinator)
+            coordinator.deleteLater()
+            if unconfirmed:
+                print(f"[ERROR] Could not confirm that these servers stopped: {unconfirmed}")
+            if then_start:
+                try:
+                    self._start(then_start)
+                except ipc.IpcError as e:
+                    print(f"[ERROR] Restart: {e.message}")
+
+        coordinator.finished.connect(finished)
+        coordinator.start(server_ids)
+
+    def _profile(self, request):
+        from profiling import ProfilingError
+
+        try:
+            return self.window._get_profiler().run(
+                request.get("action"), request.get("seconds"), request.get("interval_ms")
+            )
+        except ProfilingError as e:
+            raise ipc.IpcError(e.message) from e
+
+    def _describe(self, server_id):
+        server = self.window._find_server_by_id(server_id)
+        info = self.process_manager.core.describe(server_id)
+        info["name"] = server.name if server else server_id
+        return info
+
+    @staticmethod
+    def _lines(entries):
+        # Log entries are output chunks and may hold several lines each
+        return [line for entry in entries for line in str(entry).splitlines()]
+
+    def _logs(self, sock, server_ids, lines, follow):
+        tail = {server_id: self.process_manager.core.log_lines(server_id, lines) for server_id in server_ids}
+        if follow:
+            self._followers[sock] = {
+                sid: (self.process_manager.logs.get(sid), len(self.process_manager.logs.get(sid, [])))
+                for sid in server_ids
+            }
+        return tail
+
+    def _on_logs_updated(self, server_id):
+        current = self.process_manager.logs.get(server_id)
+        if current is None:
+            return
+        for sock, followed in self._followers.items():
+            if server_id not in followed:
+                continue
+            entries, sent = followed[server_id]
+            if entries is not current or sent > len(current):
+                # The log was replaced (server restarted) or cleared
+                sent = 0
+            for line in self._lines(current[sent:]):
+                sock.write(ipc.encode_frame({"event": "log", "server": server_id, "line": line}))
+            followed[server_id] = (current, len(current))
+            sock.flush()
@@ -0,0 +1,127 @@
+"""Per-server log ingest budgets enforced with token buckets.
+
+A server stuck in a tight error loop can print tens of MB/s. Every chunk of its
+output costs a decode, a log append, JSON indexing, alert matching and a log pane
+refresh, so ``LogThrottle`` admits chunks against two token buckets (lines/s and
+bytes/s from the server's ``LogBudget``). A bucket holds BURST_S seconds of its
+rate, and a chunk is admitted while a bucket is not in debt, so one large chunk
+can overdraw it and delays the next ones instead of being split. Suppressed
+chunks are only counted, and repeats of the same line are collapsed. A summary
+replaces them in the log at most every SUMMARY_INTERVAL_S:
+"suppressed 12,345 lines (1.2 MB) in 5.0s over the log budget; last line repeated
+900 times: ...".
+Shared by the GUI and the daemon; it must not import Qt.
+"""
+
+import time
+
+from models import LogBudget
+
+BURST_S = 2.0  # seconds of budget a quiet server can spend at once
+SUMMARY_INTERVAL_S = 5.0
+MAX_SUMMARY_LINE_CHARS = 200
+
+
+class TokenBucket:
+    """Tokens refilled at ``rate`` per second, holding at most BURST_S seconds of them"""
+
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, rate, now):
+        self.rate = rate
+        self.capacity = rate * BURST_S
+        self.tokens = self.capacity
+        self.updated = now
+
+    def refill(self, now) -> bool:
+        """Add the tokens earned since the last call; returns True if the bucket is not in debt"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return self.tokens >= 0
+
+
+def _format_bytes(n):
+    if n < 1024:
+        return f"{n:,} B"
+    if n < 1024 * 1024:
+        return f"{n / 1024:.1f} KB"
+    return f"{n / (1024 * 1024):.1f} MB"
+
+
+class LogThrottle:
+    """Admit a server's output chunks within its LogBudget and summarize the suppressed ones"""
+
+    def __init__(self, budget: LogBudget | None = None, now=None):
+        budget = budget or LogBudget()
+        now = time.monotonic() if now is None else now
+        self._lines = TokenBucket(budget.lines_per_s, now) if budget.lines_per_s else None
+        self._bytes = TokenBucket(budget.bytes_per_s, now) if budget.bytes_per_s else None
+        self.suppressed_lines = 0  # totals since the throttle was created
+        self.suppressed_bytes = 0
+        self._window_start = None  # time.monotonic() of the first chunk suppressed since the last summary
+        self._window_end = None  # and of the last one
+        self._window_lines = 0
+        self._window_bytes = 0
+        self._last_line = None
+        self._repeats = 0  # consecutive suppressed copies of _last_line
+
+    @property
+    def pending(self) -> bool:
+        """True while suppressed output waits for its summary"""
+        return self._window_start is not None
+
+    def admit(self, text: str, n_lines: int, n_bytes: int, now=None) -> bool:
+        """Return True if a chunk fits the budget; otherwise count it as suppressed"""
+        if self._lines is None and self._bytes is None:
+            return True
+        now = time.monotonic() if now is None else now
+        # Refill both buckets first so one in debt does not leave the other unrefilled
+        lines_ok = self._lines is None or self._lines.refill(now)
+        bytes_ok = self._bytes is None or self._bytes.refill(now)
+        if lines_ok and bytes_ok:
+            if self._lines is not None:
+                self._lines.tokens -= max(n_lines, 1)
+            if self._bytes is not None:
+                self._bytes.tokens -= n_bytes
+            return True
+        self._suppress(text, n_lines, n_bytes, now)
+        return False
+
+    def _suppress(self, text, n_lines, n_bytes, now):
+        if self._window_start is None:
+            self._window_start = now
+        self._window_end = now
+        self._window_lines += n_lines
+        self._window_bytes += n_bytes
+        self.suppressed_lines += n_lines
+        self.suppressed_bytes += n_bytes
+        for line in text.splitlines():
+            if line == self._last_line:
+                self._repeats += 1
+            else:
+                self._last_line = line
+                self._repeats = 1
+
+    def summary(self, now=None, force=False) -> str | None:
+        """Return the summary of the output suppressed in the current window once it is due"""
+        if self._window_start is None:
+            return None
+        now = time.monotonic() if now is None else now
+        if not force and now - self._window_start < SUMMARY_INTERVAL_S:
+            return None
+        message = (
+            f"suppressed {self._window_lines:,} lines ({_format_bytes(self._window_bytes)}) "
+            f"in {self._window_end - self._window_start:.1f}s over the log budget"
+        )
+        if self._last_line is not None:
+            line = self._last_line[:MAX_SUMMARY_LINE_CHARS]
+            if self._repeats > 1:
+                message += f"; last line repeated {self._repeats:,} times: {line}"
+            else:
+                message += f"; last line: {line}"
+        self._window_start = None
+        self._window_lines = 0
+        self._window_bytes = 0
+        self._last_line = None
+        self._repeats = 0
+        return message
@@ -0,0 +1,313 @@
+"""Timestamped server logs and their merged, time-ordered view.
+
+``LogBuffer`` is the sequence of log entries kept per server. Every entry gets
+the ``time.monotonic()`` of its capture, stored in a parallel array. Entries are
+kept in fixed-size chunks that are compressed with zlib once full; the logs of
+stopped servers are recompressed with lzma on a background thread, and chunks
+are decompressed on demand into a small shared cache. JSON lines written to
+stderr are also parsed into a ``structured_log.StructuredLog`` attached to the
+buffer. ``MergedLog`` interleaves several buffers into
+one row index ordered by capture time with a streaming k-way heap merge. It only
+merges entries appended since the last update and only up to a row budget per
+call, so callers can keep the UI responsive over millions of lines. Free of Qt.
+"""
+
+import heapq
+import lzma
+import queue
+import sys
+import threading
+import time
+import zlib
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from collections.abc import Sequence
+from itertools import accumulate, chain, islice, pairwise, repeat
+
+from structured_log import StructuredLog
+
+# Added to a time.monotonic() capture time to show it as wall-clock time
+WALL_CLOCK_OFFSET = time.time() - time.monotonic()
+CHUNK_CHARS = 64 * 1024  # the open tail of a log is sealed and compressed at this size
+ZLIB_LEVEL = 1  # sealing runs at ingest; stopped servers get the better ratio from lzma
+LZMA_PRESET = 6  # about 80 ms per chunk, so it runs on the compactor thread
+CACHE_CHARS = 4 * 1024 * 1024  # decompressed chunk text kept for reads, shared by all logs
+
+
+class SealedChunk:
+    """Full log entries compressed together; ``offsets`` locate each entry in the joined text"""
+
+    __slots__ = ("chars", "cold", "count", "offsets", "payload")
+
+    def __init__(self, entries):
+        text = "\n".join(entries)
+        self.count = len(entries)
+        self.chars = len(text)
+        # offsets[i] is where entry i starts; the last one is one past the end of the text
+        self.offsets = array("I", accumulate((len(entry) + 1 for entry in entries), initial=0))
+        self.payload = ("zlib", zlib.compress(text.encode("utf-8", "surrogatepass"), ZLIB_LEVEL))
+        self.cold = False  # queued for or done with lzma recompression
+
+    def decompress(self) -> str:
+        # Read once: the compactor thread may swap the payload
+        codec, data = self.payload
+        raw = lzma.decompress(data) if codec == "lzma" else zlib.decompress(data)
+        return raw.decode("utf-8", "surrogatepass")
+
+    def entries(self, text) -> list[str]:
+        return [text[start : end - 1] for start, end in pairwise(self.offsets)]
+
+    def entry(self, text, index) -> str:
+        return text[self.offsets[index] : self.offsets[index + 1] - 1]
+
+    def stored_bytes(self) -> int:
+        return len(self.payload[1]) + len(self.offsets) * self.offsets.itemsize
+
+
+class _ChunkCache:
+    """Decompressed text of the most recently read chunks, bounded by total characters"""
+
+    def __init__(self, max_chars):
+        self.max_chars = max_chars
+        self.chars = 0
+        self._texts = OrderedDict()  # SealedChunk: text, least recently used first
+
+    def text(self, chunk) -> str:
+        text = self._texts.get(chunk)
+        if text is not None:
+            self._texts.move_to_end(chunk)
+            return text
+        text = self._texts[chunk] = chunk.decompress()
+        self.chars += len(text)
+        while self.chars > self.max_chars and len(self._texts) > 1:
+            _, evicted = self._texts.popitem(last=False)
+            self.chars -= len(evicted)
+        return text
+
+    def discard(self, chunk) -> None:
+        text = self._texts.pop(chunk, None)
+        if text is not None:
+            self.chars -= len(text)
+
+
+class _Compactor:
+    """Daemon thread recompressing chunks of stopped servers with lzma; zlib and lzma release the GIL"""
+
+    def __init__(self):
+        self._jobs = None
+
+    def submit(self, chunk) -> None:
+        if self._jobs is None:
+            self._jobs = queue.SimpleQueue()
+            threading.Thread(target=self._run, args=(self._jobs,), name="mcp-log-compactor", daemon=True).start()
+        chunk.cold = True
+        self._jobs.put(chunk)
+
+    @staticmethod
+    def _run(jobs):
+        while True:
+            chunk = jobs.get()
+            try:
+                codec, data = chunk.payload
+                if codec == "zlib":
+                    chunk.payload = ("lzma", lzma.compress(zlib.decompress(data), preset=LZMA_PRESET))
+            except Exception as e:
+                print(f"[ERROR] Compressing log chunk: {e}")
+
+
+_cache = _ChunkCache(CACHE_CHARS)
+_compactor = _Compactor()
+
+
+class LogBuffer(Sequence):
+    """A server's log entries with the monotonic time each one was captured.
+
+    Entries are appended to an open tail; once it holds CHUNK_CHARS characters it
+    is sealed into a zlib-compressed SealedChunk. Reading a sealed entry
+    decompresses its chunk into a shared LRU cache.
+    """
+
+    __slots__ = ("_chunks", "_sealed", "_starts", "_tail", "_tail_chars", "structured", "times")
+
+    def __init__(self, entries=()):
+        self.times = array("d")
+        self.structured = None  # StructuredLog, created with the first JSON line
+        self._reset()
+        for entry in entries:
+            self.append(entry)
+
+    def _reset(self):
+        self._chunks = []  # SealedChunk in entry order
+        self._starts = array("I")  # chunk: index of its first entry
+        self._sealed = 0  # entries in sealed chunks
+        self._tail = []  # entries not sealed yet
+        self._tail_chars = 0
+
+    def __len__(self):
+        return self._sealed + len(self._tail)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if index >= self._sealed:
+            return self._tail[index - self._sealed]
+        if index < 0:
+            raise IndexError(index)
+        k = bisect_right(self._starts, index) - 1
+        chunk = self._chunks[k]
+        return chunk.entry(_cache.text(chunk), index - self._starts[k])
+
+    def __iter__(self):
+        for chunk in self._chunks:
+            yield from chunk.entries(_cache.text(chunk))
+        yield from self._tail
+
+    def append(self, entry):
+        if not self._tail and self._chunks and self._chunks[-1].chars < CHUNK_CHARS:
+            self._thaw()
+        self._tail.append(entry)
+        self._tail_chars += len(entry)
+        self.times.append(time.monotonic())
+        if self._tail_chars >= CHUNK_CHARS:
+            self.seal()
+
+    def clear(self):
+        self._reset()
+        self.times = array("d")
+        self.structured = None
+
+    def seal(self) -> None:
+        """Compress the open entries into a chunk, e.g. when the server has gone quiet"""
+        if not self._tail:
+            return
+        self._chunks.append(SealedChunk(self._tail))
+        self._starts.append(self._sealed)
+        self._sealed += len(self._tail)
+        self._tail = []
+        self._tail_chars = 0
+
+    def _thaw(self):
+        # A short chunk sealed early is reopened so chunks stay close to full
+        chunk = self._chunks.pop()
+        self._starts.pop()
+        self._sealed -= chunk.count
+        self._tail = chunk.entries(_cache.text(chunk))
+        self._tail_chars = chunk.chars - chunk.count + 1
+        _cache.discard(chunk)
+
+    def freeze(self) -> None:
+        """Seal everything and recompress it with lzma in the background, for a stopped server"""
+        self.seal()
+        for chunk in self._chunks:
+            if not chunk.cold:
+                _compactor.submit(chunk)
+
+    def snapshot(self) -> list:
+        """Return the sealed chunks and a copy of the open entries, safe to read on another thread"""
+        return [*self._chunks, list(self._tail)] if self._tail else list(self._chunks)
+
+    def text(self) -> str:
+        """Return all entries joined by newlines"""
+        return "\n".join(chain((_cache.text(chunk) for chunk in self._chunks), self._tail))
+
+    def stored_bytes(self) -> int:
+        """Approximate memory held by the entries and their capture times"""
+        tail = sum(sys.getsizeof(entry) for entry in self._tail) + sys.getsizeof(self._tail)
+        return sum(chunk.stored_bytes() for chunk in self._chunks) + tail + self.times.itemsize * len(self.times)
+
+    def index_json(self, text: str) -> None:
+        """Parse the JSON log lines of ``text``, the output stored in the last entry"""
+        if self.structured is None:
+            if "{" not in text:
+                return
+            self.structured = StructuredLog()
+        self.structured.ingest(len(self) - 1, text, self.times[-1] + WALL_CLOCK_OFFSET)
+
+    def line(self, index: int, line: int) -> str:
+        """Return one line of an entry"""
+        entry = self[index]
+        if entry.endswith("\n"):
+            entry = entry[:-1]
+        text = entry.split("\n")[line] if line or "\n" in entry else entry
+        return text.rstrip("\r")
+
+
+class MergedLog:
+    """Rows of several servers' logs in capture-time order, one row per line"""
+
+    def __init__(self):
+        self.server_ids = []
+        self._buffers = []
+        self._cursors = []  # entries of each buffer already merged
+        self._pending = None  # heap merge of the current tails, consumed in batches
+        self._rows_source = array("H")  # row: index into server_ids
+        self._rows_entry = array("I")  # row: entry index in the buffer
+        self._rows_line = array("I")  # row: line number within the entry
+
+    def __len__(self):
+        return len(self._rows_source)
+
+    def set_sources(self, buffers: dict) -> None:
+        """Merge {server_id: LogBuffer} from scratch"""
+        self.server_ids = list(buffers)
+        self._buffers = list(buffers.values())
+        self._reset()
+
+    def _reset(self):
+        self._cursors = [0] * len(self._buffers)
+        self._pending = None
+        self._rows_source = array("H")
+        self._rows_entry = array("I")
+        self._rows_line = array("I")
+
+    def is_stale(self, buffers: dict) -> bool:
+        """True if the sources changed, or a source buffer was replaced or cleared, since they were merged"""
+        if list(buffers) != self.server_ids:
+            return True
+        return any(
+            buffers.get(server_id) is not buffer or len(buffer) < cursor
+            for server_id, buffer, cursor in zip(self.server_ids, self._buffers, self._cursors, strict=True)
+        )
+
+    def update(self, budget: int | None = None) -> bool:
+        """Merge up to ``budget`` newly captured entries; returns True while more are waiting"""
+        if self._pending is None:
+            tails = []
+            for k, buffer in enumerate(self._buffers):
+                start, end = self._cursors[k], len(buffer)
+                if end > start:
+                    tails.append(zip(buffer.times[start:end], repeat(k), range(start, end)))
+                    self._cursors[k] = end
+            if not tails:
+                return False
+            self._pending = heapq.merge(*tails) if len(tails) > 1 else tails[0]
+        merged = 0
+        for _, k, i in islice(self._pending, budget):
+            merged += 1
+            entry = self._buffers[k][i]
+            lines = entry.count("\n", 0, len(entry) - 1) + 1  # a trailing newline does not start a line
+            if lines == 1:
+                self._rows_source.append(k)
+                self._rows_entry.append(i)
+                self._rows_line.append(0)
+            else:
+                self._rows_source.extend(repeat(k, lines))
+                self._rows_entry.extend(repeat(i, lines))
+                self._rows_line.extend(range(lines))
+        if budget is None or merged < budget:
+            self._pending = None
+            return any(len(buffer) > cursor for buffer, cursor in zip(self._buffers, self._cursors, strict=True))
+        return True
+
+    def source(self, index: int) -> int:
+        """Return the position in server_ids of the server a row came from"""
+        return self._rows_source[index]
+
+    def row(self, index: int) -> tuple[str, float, str]:
+        """Return (server_id, wall-clock capture time, line) of a row"""
+        k, i, line = self._rows_source[index], self._rows_entry[index], self._rows_line[index]
+        buffer = self._buffers[k]
+        return self.server_ids[k], buffer.times[i] + WALL_CLOCK_OFFSET, buffer.line(i, line)
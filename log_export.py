@@ -0,0 +1,227 @@
+"""Streaming log export and diagnostic bundles.
+
+Logs are written piece by piece from a snapshot of the log store: sealed chunks
+are decompressed one at a time without going through the read cache, so an
+export never builds the whole log as one string the way ``get_logs`` does. A
+diagnostic bundle is a tar.gz of every server's log, the lifecycle event
+journal, the server configurations with secrets redacted, and a sample of
+resource usage and log counters. Snapshots and samples are taken on the GUI
+thread; an ``ExportJob`` then writes them on a background thread and exposes its
+progress for polling. Free of Qt.
+"""
+
+import io
+import json
+import os
+import platform
+import re
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import process_tree
+from log_buffer import SealedChunk
+
+REDACTED = "<redacted>"
+# Argument names whose values are replaced in the bundled configuration
+SECRET_NAME = re.compile(r"(?i)token|secret|passw|api[_-]?key|auth|credential|private")
+
+
+class ExportCancelledError(Exception):
+    def __init__(self) -> None:
+        super().__init__("Export cancelled")
+
+
+def log_file_name(server_id: str) -> str:
+    return (re.sub(r"[^A-Za-z0-9_.-]", "_", server_id) or "server") + ".log"
+
+
+def snapshot_logs(logs) -> list:
+    """Return the pieces of a server's log to write later, possibly on another thread"""
+    if logs is None:
+        return []
+    return logs.snapshot()
+
+
+def write_log(snapshot, f, step=None) -> None:
+    """Write a snapshot to a binary file as ``get_logs`` would show it, one piece at a time"""
+    first = True
+    for piece in snapshot:
+        text = piece.decompress() if isinstance(piece, SealedChunk) else "\n".join(piece)
+        if not first:
+            f.write(b"\n")
+        f.write(text.encode("utf-8", "replace"))
+        first = False
+        if step is not None:
+            step()
+    if not first:
+        f.write(b"\n")
+
+
+def sanitize_servers(servers) -> list[dict]:
+    """Return server configurations with environment values and secret-looking arguments redacted"""
+    result = []
+    for server in servers:
+        data = server.to_dict()
+        data.pop("status", None)
+        data["env_vars"] = dict.fromkeys(data.get("env_vars") or {}, REDACTED)
+        arguments = []
+        secret_next = False
+        for argument in data.get("arguments") or []:
+            name, sep, _ = argument.partition("=")
+            if secret_next:
+                arguments.append(REDACTED)
+                secret_next = False
+            elif sep and name.startswith("-") and SECRET_NAME.search(name):
+                arguments.append(f"{name}={REDACTED}")
+            else:
+                arguments.append(argument)
+                secret_next = argument.startswith("-") and bool(SECRET_NAME.search(argument))
+        data["arguments"] = arguments
+        result.append(data)
+    return result
+
+
+def sample_resources(manager, server_ids) -> dict:
+    """Return each server's state, resource usage and log counters from a ServerCore"""
+    now = time.monotonic()
+    stats = manager.stats
+    pgids = {sid: manager.process_groups[sid] for sid in server_ids if sid in manager.process_groups}
+    usage = process_tree.group_usage(pgids.values()) if pgids and process_tree.has_procfs() else {}
+    servers = {}
+    for server_id in server_ids:
+        running = server_id in manager.processes
+        started = manager.start_times.get(server_id)
+        rss, cpu = usage.get(pgids.get(server_id), (None, None))
+        logs = manager.logs.get(server_id)
+        servers[server_id] = {
+            "status": manager.get_status(server_id),
+            "running": running,
+            "ready": manager.is_ready(server_id),
+            "uptime_s": round(now - started, 1) if running and started else None,
+            "rss_bytes": rss,
+            "cpu_seconds": cpu,
+            "limit_hit": manager.limit_hits.get(server_id),
+            "starts": stats.starts.get(server_id, 0),
+            "log_bytes": stats.log_bytes.get(server_id, 0),
+            "log_lines": stats.log_lines.get(server_id, 0),
+            "suppressed_lines": stats.suppressed_lines.get(server_id, 0),
+            "log_store_bytes": logs.stored_bytes() if logs is not None else None,
+        }
+    return {"timestamp": time.time(), "servers": servers}
+
+
+class ExportJob:
+    """Writing that runs on a background thread; ``done``/``total`` report its progress"""
+
+    def __init__(self, title: str, total: int, write):
+        self.title = title
+        self.total = max(total, 1)
+        self.done = 0
+        self.error = None  # message of the failure, set when the job did not complete
+        self.finished = False
+        self.cancelled = False  # set by the GUI; the job stops at its next step
+        self._write = write  # write(job)
+
+    def start(self) -> None:
+        threading.Thread(target=self._run, name="mcp-log-export", daemon=True).start()
+
+    def step(self) -> None:
+        if self.cancelled:
+            raise ExportCancelledError
+        self.done += 1
+
+    def _run(self):
+        try:
+            self._write(self)
+        except (ExportCancelledError, OSError, tarfile.TarError, ValueError) as e:
+            self.error = str(e)
+        finally:
+            self.finished = True
+
+
+def _write_atomically(path, write):
+    """Write to a temporary file next to ``path`` and move it into place only when complete"""
+    path = Path(path)
+    partial = path.with_name(path.name + ".part")
+    try:
+        write(partial)
+        os.replace(partial, path)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+
+
+def log_export_job(snapshots: dict, destination) -> ExportJob:
+    """Export one server's log to a file, or several servers' logs to one file each in a directory"""
+    destination = Path(destination)
+
+    def write_one(job, snapshot, path):
+        def write(partial):
+            with open(partial, "wb") as f:
+                write_log(snapshot, f, job.step)
+
+        _write_atomically(path, write)
+
+    def write(job):
+        if len(snapshots) == 1 and not destination.is_dir():
+            write_one(job, next(iter(snapshots.values())), destination)
+            return
+        destination.mkdir(parents=True, exist_ok=True)
+        for server_id, snapshot in snapshots.items():
+            write_one(job, snapshot, destination / log_file_name(server_id))
+
+    total = sum(len(snapshot) for snapshot in snapshots.values())
+    return ExportJob(f"Exporting logs to {destination}", total, write)
+
+
+def bundle_job(path, snapshots: dict, servers, journal_file, resources: dict, diagnostics=None) -> ExportJob:
+    """Write a diagnostic bundle (tar.gz) of logs, event journal, sanitized configuration and samples"""
+    path = Path(path)
+    root = path.name.removesuffix(".gz").removesuffix(".tar").removesuffix(".tgz") or "mcp-manager-diagnostics"
+    documents = {
+        "mcp_servers.json": sanitize_servers(servers),
+        "resources.json": resources,
+        "manifest.json": {
+            "created": time.time(),
+            "platform": platform.platform(),
+            "python": sys.version.split()[0],
+            "servers": list(snapshots),
+        },
+    }
+    if diagnostics is not None:
+        documents["diagnostics.json"] = diagnostics
+
+    def add_bytes(tar, name, data):
+        info = tarfile.TarInfo(f"{root}/{name}")
+        info.size = len(data)
+        info.mtime = int(time.time())
+        tar.addfile(info, io.BytesIO(data))
+
+    def write_tar(partial, job):
+        with tarfile.open(partial, "w:gz") as tar:
+            for server_id, snapshot in snapshots.items():
+                # tar needs each member's size up front: spool the log through a temporary file
+                with tempfile.TemporaryFile() as f:
+                    write_log(snapshot, f, job.step)
+                    info = tarfile.TarInfo(f"{root}/logs/{log_file_name(server_id)}")
+                    info.size = f.tell()
+                    info.mtime = int(time.time())
+                    f.seek(0)
+                    tar.addfile(info, f)
+            if journal_file is not None and Path(journal_file).exists():
+                tar.add(journal_file, arcname=f"{root}/{Path(journal_file).name}")
+            job.step()
+            for name, document in documents.items():
+                add_bytes(tar, name, json.dumps(document, indent=2, default=str).encode())
+                job.step()
+
+    total = sum(len(snapshot) for snapshot in snapshots.values()) + 1 + len(documents)
+    return ExportJob(
+        f"Writing diagnostic bundle {path.name}",
+        total,
+        lambda job: _write_atomically(path, lambda partial: write_tar(partial, job)),
+    )
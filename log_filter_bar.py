@@ -0,0 +1,92 @@
+import time
+
+from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtWidgets import QComboBox, QHBoxLayout, QLabel, QWidget
+
+from log_buffer import LogBuffer
+from structured_log import LEVELS
+
+MAX_FILTERED_LINES = 5000  # newest matches shown
+MIN_LEVELS = (
+    ("All levels", None),
+    ("Errors", "error"),
+    ("Warnings and errors", "warning"),
+    ("Info and above", "info"),
+    ("Debug and above", "debug"),
+)
+PERIODS = (("All time", None), ("Last 5 minutes", 300), ("Last hour", 3600), ("Last 24 hours", 24 * 3600))
+
+
+class LogFilterBar(QWidget):
+    """Level, logger and time filters over a server's structured (JSON) log lines"""
+
+    changed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._loggers = []
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.level_filter = QComboBox()
+        for label, level in MIN_LEVELS:
+            self.level_filter.addItem(label, level)
+        self.logger_filter = QComboBox()
+        self.logger_filter.addItem("All loggers", None)
+        self.period_filter = QComboBox()
+        for label, seconds in PERIODS:
+            self.period_filter.addItem(label, seconds)
+        for combo in (self.level_filter, self.logger_filter, self.period_filter):
+            combo.currentIndexChanged.connect(self.changed)
+            layout.addWidget(combo)
+        self.match_label = QLabel()
+        layout.addWidget(self.match_label)
+        layout.addStretch()
+
+    def is_active(self) -> bool:
+        return any(
+            combo.currentData() is not None for combo in (self.level_filter, self.logger_filter, self.period_filter)
+        )
+
+    def update_for(self, logs: LogBuffer | None) -> None:
+        """Show the bar only for a log with JSON lines and offer its loggers"""
+        structured = logs.structured if logs is not None else None
+        self.setVisible(structured is not None)
+        if structured is None:
+            return
+        loggers = structured.values("logger")
+        if loggers != self._loggers:
+            self._loggers = list(loggers)
+            current = self.logger_filter.currentData()
+            self.logger_filter.blockSignals(True)
+            self.logger_filter.clear()
+            self.logger_filter.addItem("All loggers", None)
+            for logger in sorted(loggers):
+                self.logger_filter.addItem(logger, logger)
+            self.logger_filter.setCurrentIndex(max(0, self.logger_filter.findData(current)))
+            self.logger_filter.blockSignals(False)
+
+    def filtered_text(self, logs: LogBuffer | None) -> str | None:
+        """Return the matching JSON lines of ``logs``, or None when no filter applies"""
+        structured = logs.structured if logs is not None else None
+        if structured is None or not self.is_active():
+            self.match_label.clear()
+            return None
+        level = self.level_filter.currentData()
+        period = self.period_filter.currentData()
+        record_ids = structured.query(
+            levels=LEVELS[LEVELS.index(level) :] if level else None,
+            loggers=self.logger_filter.currentData(),
+            since=time.time() - period if period else None,
+        )
+        self.match_label.setText(f"{len(record_ids):,} of {len(structured):,} JSON lines")
+        lines = []
+        for record_id in record_ids[-MAX_FILTERED_LINES:]:
+            text = structured.joined_line(record_id)
+            if text is None:
+                number = structured.lines[record_id]
+                text = logs.line(structured.entries[record_id], number)
+                if number == 0:
+                    text = text.removeprefix("ERROR: ")  # stderr entries carry the prefix on their first line
+            lines.append(text)
+        return "\n".join(lines)
@@ -0,0 +1,163 @@
+"""Server logs and statuses kept from the previous session.
+
+When the manager exits, the last MAX_HISTORY_BYTES of each server's log are
+written to ``history/<server id>.log`` in the config directory, together with
+``history/session.json``, which records each server's last status and, for
+persistent servers left running, how far their runtime logs had been read. On
+the next launch only ``session.json`` is read. A server's ``.log`` file is read
+backwards in HISTORY_PAGE_BYTES pages when its log is first shown and when the
+user scrolls to the top, so startup time does not depend on how much history
+there is. Servers that did not run in a session keep their earlier history.
+
+Free of Qt.
+"""
+
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+from log_buffer import SealedChunk
+
+HISTORY_DIR_NAME = "history"
+SESSION_FILE_NAME = "session.json"
+MAX_HISTORY_BYTES = 1024 * 1024  # tail of each server's log kept for the next session
+HISTORY_PAGE_BYTES = 64 * 1024  # read from the end of a history file per page
+
+
+def history_dir(state_dir) -> Path:
+    return Path(state_dir) / HISTORY_DIR_NAME
+
+
+def history_file_name(server_id: str) -> str:
+    return (re.sub(r"[^A-Za-z0-9_.-]", "_", server_id) or "server") + ".log"
+
+
+def tail_text(snapshot, max_bytes: int = MAX_HISTORY_BYTES) -> str:
+    """Return the last whole lines of a log snapshot, at most about ``max_bytes`` of them"""
+    pieces = []
+    size = 0
+    for piece in reversed(snapshot):
+        text = piece.decompress() if isinstance(piece, SealedChunk) else "\n".join(piece)
+        pieces.append(text)
+        size += len(text) + 1
+        if size >= max_bytes:
+            break
+    text = "\n".join(reversed(pieces))
+    if len(text) > max_bytes:
+        text = text[-max_bytes:]
+        text = text[text.find("\n") + 1 :] if "\n" in text else text
+    return text
+
+
+class LogHistory:
+    """One server's log from the previous session, read from the end of its file on demand"""
+
+    def __init__(self, path: Path, entry: dict):
+        self.path = Path(path)
+        self.status = entry.get("status") or "offline"
+        self.detail = entry.get("detail")  # resource limit hit of the last run
+        self.ended = entry.get("ended")  # time.time() when the session ended
+        self.offsets = entry.get("offsets") or {}  # runtime log offsets of a server left running
+        self.lines = []  # the lines read so far, oldest first
+        self._position = None  # file offset of the first line read; None until the first page
+
+    @property
+    def loaded(self) -> bool:
+        return self._position is not None
+
+    @property
+    def has_more(self) -> bool:
+        """True while older lines remain in the file"""
+        return self._position is None or self._position > 0
+
+    def describe(self) -> str:
+        ended = time.strftime("%Y-%m-%d %H:%M", time.localtime(self.ended)) if self.ended else "unknown"
+        detail = f" ({self.detail})" if self.detail else ""
+        return f"last session ended {ended}, status {self.status}{detail}"
+
+    def header(self) -> str:
+        return f"--- Previous session: {self.describe()} ---"
+
+    def load_older(self, max_bytes: int = HISTORY_PAGE_BYTES) -> list[str]:
+        """Read the page of lines before those read so far and return it"""
+        if not self.has_more:
+            return []
+        try:
+            with open(self.path, "rb") as f:
+                end = f.seek(0, os.SEEK_END) if self._position is None else self._position
+                start = max(0, end - max_bytes)
+                f.seek(start)
+                data = f.read(end - start)
+        except OSError as e:
+            print(f"[ERROR] Reading log history: {e}")
+            self._position = 0
+            return []
+        newline = data.find(b"\n")
+        if start > 0 and newline >= 0:
+            # Start at a whole line; the partial one is read with the next page
+            start += newline + 1
+            data = data[newline + 1 :]
+        self._position = start
+        lines = data.decode("utf-8", "replace").split("\n")
+        if not self.lines and lines and not lines[-1]:
+            lines.pop()  # the file ends with a newline
+        self.lines[:0] = lines
+        return lines
+
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+
+def load_session(state_dir) -> dict[str, LogHistory]:
+    """Read the previous session's statuses; no log file is opened until its lines are asked for"""
+    directory = history_dir(state_dir)
+    try:
+        with open(directory / SESSION_FILE_NAME) as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] Loading log history: {e}")
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {
+        server_id: LogHistory(directory / history_file_name(server_id), entry)
+        for server_id, entry in data.items()
+        if isinstance(entry, dict)
+    }
+
+
+def save_session(state_dir, server_ids, snapshots: dict, entries: dict, kept: dict) -> None:
+    """Write this session's log tails and statuses for the next launch.
+
+    ``snapshots`` and ``entries`` cover the servers that ran this session;
+    servers only in ``kept`` (LogHistory) keep their earlier history. Files of
+    servers in neither are removed.
+    """
+    directory = history_dir(state_dir)
+    session = {}
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        for server_id in server_ids:
+            path = directory / history_file_name(server_id)
+            if server_id in snapshots:
+                partial = path.with_name(path.name + ".part")
+                partial.write_text(tail_text(snapshots[server_id]) + "\n", encoding="utf-8", errors="replace")
+                os.replace(partial, path)
+                session[server_id] = entries[server_id]
+            elif server_id in kept:
+                history = kept[server_id]
+                session[server_id] = {"status": history.status, "detail": history.detail, "ended": history.ended}
+        names = {history_file_name(server_id) for server_id in session}
+        for path in directory.glob("*.log"):
+            if path.name not in names:
+                path.unlink(missing_ok=True)
+        partial = directory / (SESSION_FILE_NAME + ".part")
+        with open(partial, "w") as f:
+            json.dump(session, f, indent=2)
+        os.replace(partial, directory / SESSION_FILE_NAME)
+    except OSError as e:
+        print(f"[ERROR] Saving log history: {e}")
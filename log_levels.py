@@ -0,0 +1,46 @@
+"""Cheap classification of server stderr output.
+
+MCP stdio servers use stdout for the protocol, so stderr is their normal log
+channel and most of what arrives there is informational. ``StderrClassifier``
+decides whether a chunk of stderr holds a real error with a single precompiled
+regex search over the whole chunk, without splitting it into lines. Free of Qt.
+"""
+
+import re
+
+from models import StderrPolicy
+
+# Error-level lines as common loggers print them:
+# "ERROR ...", "[FATAL] ...", "2024-01-01 12:00:00 CRITICAL ...", "level=error", '"level":"error"',
+# Python tracebacks, and uncaught JavaScript/Python exceptions ("TypeError: ...")
+ERROR_PATTERN = re.compile(
+    r"\b(?:ERROR|FATAL|CRITICAL|PANIC|EMERG(?:ENCY)?)\b"
+    r"|(?i:\blevel\W{0,3}(?:error|fatal|critical|panic)\b)"
+    r"|^Traceback \(most recent call last\)"
+    r"|^\s*(?:Uncaught )?\w*(?:Error|Exception): ",
+    re.MULTILINE,
+)
+
+
+class StderrClassifier:
+    """Tell error output from ordinary logging according to a server's StderrPolicy"""
+
+    def __init__(self, policy: StderrPolicy | None = None):
+        policy = policy or StderrPolicy()
+        self.mode = policy.mode
+        self.warning = None  # set when the policy could not be used as configured
+        self._pattern = ERROR_PATTERN
+        if self.mode == "regex":
+            try:
+                self._pattern = re.compile(policy.pattern, re.MULTILINE)
+            except re.error as e:
+                self.mode = "levels"
+                self.warning = f"invalid stderr error pattern ({e}); falling back to log levels"
+
+    def is_error(self, text: str) -> bool:
+        """Return True if a chunk of stderr output reports an error"""
+        if self.mode == "always":
+            return True
+        if self.mode == "never":
+            return False
+        return self._pattern.search(text) is not None
@@ -0,0 +1,233 @@
+"""``mcp-manager`` command-line entry point.
+
+Without a subcommand the GUI is launched. ``daemon`` runs the servers headless,
+and ``start``, ``stop``, ``restart``, ``status``, ``logs`` and ``profile`` control an
+already running manager (GUI or daemon) over its control socket. ``events``
+queries the lifecycle event journal on disk and works whether or not a manager
+is running. All of these are dispatched before anything imports PyQt6, so they
+start quickly and need no display.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+CONTROL_COMMANDS = ("start", "stop", "restart", "status", "logs", "profile", "events")
+# profile actions as typed on the command line: protocol action
+PROFILE_ACTIONS = {
+    "cpu": "cpu-start",
+    "cpu-stop": "cpu-stop",
+    "memory": "memory-snapshot",
+    "memory-stop": "memory-stop",
+    "sample": "sample-start",
+    "sample-stop": "sample-stop",
+    "status": "status",
+}
+DEFAULT_LOG_LINES = 50
+DEFAULT_EVENTS_SINCE = "24h"
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+class InvalidDurationError(argparse.ArgumentTypeError):
+    """Exception raised for a --since value that is not a positive duration."""
+
+    def __init__(self, value: str) -> None:
+        super().__init__(f"invalid duration '{value}' (e.g. 30m, 24h, 7d or all)")
+
+
+def parse_since(value: str) -> float | None:
+    """Parse ``30m``, ``24h``, ``7d``, plain seconds or ``all`` into seconds (None for all)"""
+    if value == "all":
+        return None
+    unit = DURATION_UNITS.get(value[-1:])
+    try:
+        seconds = float(value[:-1]) * unit if unit else float(value)
+    except ValueError:
+        raise InvalidDurationError(value) from None
+    if seconds <= 0:
+        raise InvalidDurationError(value)
+    return seconds
+
+
+def build_control_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="mcp-manager", description="Control a running MCP Manager")
+    parser.add_argument("--config-dir", type=Path, help="Config directory of the manager (default: user config dir)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (
+        ("start", "Start servers and their dependencies"),
+        ("stop", "Stop servers"),
+        ("restart", "Restart servers"),
+        ("status", "Show server status"),
+        ("logs", "Show server logs"),
+    ):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("servers", nargs="*", metavar="ID", help="Server IDs")
+        command.add_argument("--all", action="store_true", help="Apply to every configured server")
+        if name == "logs":
+            command.add_argument("-f", "--follow", action="store_true", help="Keep streaming new output")
+            command.add_argument(
+                "-n", "--lines", type=int, default=DEFAULT_LOG_LINES, help="Number of existing lines to show"
+            )
+    profile = commands.add_parser(
+        "profile",
+        help="Profile the running manager",
+        description="cpu: cProfile; memory: tracemalloc snapshot, diffed with the previous one; "
+        "sample: stack sampler writing collapsed stacks. Artifacts go to the config directory.",
+    )
+    profile.add_argument("action", choices=PROFILE_ACTIONS)
+    profile.add_argument("--seconds", type=float, help="Stop cpu or sample profiling after this many seconds")
+    profile.add_argument("--interval-ms", type=float, help="Stack sampling interval (default 10)")
+
+    from event_journal import EVENT_TYPES
+
+    events = commands.add_parser(
+        "events",
+        help="Query the lifecycle event journal",
+        description="Show server lifecycle events (starts, exits, crashes, ...) from the journal in the config "
+        "directory; no running manager is needed.",
+    )
+    events.add_argument("servers", nargs="*", metavar="ID", help="Server IDs (default: all)")
+    events.add_argument(
+        "--since",
+        type=parse_since,
+        default=DEFAULT_EVENTS_SINCE,
+        help=f"Time window, e.g. 30m, 24h, 7d or all (default {DEFAULT_EVENTS_SINCE})",
+    )
+    events.add_argument("--type", action="append", dest="types", choices=EVENT_TYPES, help="Event type (repeatable)")
+    events.add_argument("--summary", action="store_true", help="Count matching events per server instead")
+    events.add_argument("--json", action="store_true", help="Print JSON")
+    return parser
+
+
+def _print_status(rows):
+    print(f"{'ID':<24} {'STATUS':<8} {'PID':>7} {'UPTIME':>9}  NOTE")
+    for row in rows:
+        pid = row["pid"] if row["pid"] is not None else "-"
+        uptime = f"{row['uptime_s']:.0f}s" if row.get("uptime_s") is not None else "-"
+        note = row.get("limit_hit") or ("" if row.get("ready") or row["pid"] is None else "not ready")
+        if row.get("suppressed_lines"):
+            note = ", ".join(filter(None, [note, f"{row['suppressed_lines']:,} lines suppressed"]))
+        print(f"{row['id']:<24} {row['status']:<8} {pid:>7} {uptime:>9}  {note}")
+
+
+def _print_log_line(server_id, line, prefixed):
+    print(f"[{server_id}] {line}" if prefixed else line, flush=True)
+
+
+def _print_profile(result):
+    running = [kind for kind in ("cpu", "memory", "sampling") if result.get(kind)]
+    for path in result["artifacts"]:
+        print(path)
+    print(f"Running profiles: {', '.join(running) or 'none'} (artifacts in {result['output_dir']})")
+
+
+def _run_profile_command(ipc, args) -> int:
+    try:
+        with ipc.Client(ipc.socket_path(args.config_dir)) as client:
+            result = client.request(
+                "profile", action=PROFILE_ACTIONS[args.action], seconds=args.seconds, interval_ms=args.interval_ms
+            )
+    except ipc.IpcError as e:
+        print(f"mcp-manager: {e.message}", file=sys.stderr)
+        return 1
+    _print_profile(result)
+    return 0
+
+
+def _run_events_command(args) -> int:
+    import json
+    import time
+
+    import config_store
+    from event_journal import EventJournal, journal_path
+
+    journal = EventJournal(journal_path(args.config_dir or config_store.default_config_dir()))
+    journal.load(compact=False)
+    since = time.time() - args.since if args.since else None
+    server_ids = args.servers or [None]
+    if args.summary:
+        counts = {}
+        for server_id, n in journal.count_by_server(args.types, since=since).items():
+            if server_id in args.servers or not args.servers:
+                counts[server_id] = n
+        if args.json:
+            print(json.dumps(counts, indent=2))
+        else:
+            for server_id, n in counts.items():
+                print(f"{server_id:<24} {n:>6}")
+        return 0
+    events = sorted(
+        (event for server_id in server_ids for event in journal.query(server_id, args.types, since=since)),
+        key=lambda event: event.timestamp,
+    )
+    if args.json:
+        print(json.dumps([event.describe() for event in events], indent=2))
+        return 0
+    for event in events:
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(event.timestamp))
+        details = [f"exit {event.exit_code}" if event.exit_code is not None else ""]
+        details.append(f"{event.duration_s:.2f}s" if event.duration_s is not None else "")
+        details.append(event.cause or "")
+        print(f"{stamp}  {event.server_id:<24} {event.type:<12} {'  '.join(d for d in details if d)}".rstrip())
+    return 0
+
+
+def _run_server_command(ipc, args) -> int:
+    if not args.servers and not args.all and args.command not in ("status", "logs"):
+        print(f"mcp-manager {args.command}: give server IDs or --all", file=sys.stderr)
+        return 2
+    servers = None if args.all or not args.servers else args.servers
+    try:
+        with ipc.Client(ipc.socket_path(args.config_dir)) as client:
+            if args.command == "status":
+                _print_status(client.request("status", servers))
+            elif args.command == "logs":
+                tail = client.request("logs", servers, lines=args.lines, follow=args.follow)
+                prefixed = len(tail) > 1
+                for server_id, lines in tail.items():
+                    for line in lines:
+                        _print_log_line(server_id, line, prefixed)
+                if args.follow:
+                    for event in client.events():
+                        _print_log_line(event["server"], event["line"], prefixed)
+            else:
+                result = client.request(args.command, servers)
+                (verb, ids), *_ = result.items()
+                print(f"{verb.capitalize()}: {', '.join(ids) if ids else 'nothing to do'}")
+    except ipc.IpcError as e:
+        print(f"mcp-manager: {e.message}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        return 130
+    return 0
+
+
+def run_control_command(argv) -> int:
+    """Run a start/stop/restart/status/logs/profile command against the running manager, or an events query"""
+    args = build_control_parser().parse_args(argv)
+    if args.command == "events":
+        return _run_events_command(args)
+
+    import ipc
+
+    if args.command == "profile":
+        return _run_profile_command(ipc, args)
+    return _run_server_command(ipc, args)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "daemon":
+        import mcp_daemon
+
+        sys.exit(mcp_daemon.main(argv[1:]))
+    if any(arg in CONTROL_COMMANDS for arg in argv[:3]):
+        sys.exit(run_control_command(argv))
+
+    from mcp_manager import main as gui_main
+
+    gui_main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,374 @@
+"""Headless ``mcp-manager daemon``: runs the configured servers without Qt.
+
+The daemon loads the same ``mcp_servers.json`` as the GUI, starts the servers in
+dependency order and keeps them running until it receives SIGINT or SIGTERM,
+at which point every server is stopped in parallel. While running it serves the
+control socket used by ``mcp-manager start|stop|restart|status|logs``.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import config_store
+import dependency_graph
+import ipc
+import metrics
+import process_tree
+from instrumentation import Instrumentation, watch_asyncio_lag
+from profiling import Profiler, ProfilingError
+from server_core import KILL_GRACE_S, STOP_TIMEOUT_S, Launcher, ServerCore
+
+READ_CHUNK_BYTES = 64 * 1024
+EXIT_POLL_INTERVAL_S = 0.1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="mcp-manager daemon", description="Run MCP servers without the GUI")
+    parser.add_argument("--config-dir", type=Path, help="Directory holding mcp_servers.json (default: user config dir)")
+    parser.add_argument(
+        "--server", action="append", dest="servers", metavar="ID", help="Start only this server (repeatable)"
+    )
+    parser.add_argument("--no-start", action="store_true", help="Do not start any server on launch")
+    parser.add_argument("--quiet", action="store_true", help="Do not echo server output to stdout")
+    parser.add_argument(
+        "--stop-timeout", type=float, default=STOP_TIMEOUT_S, help="Seconds before stopping servers are killed"
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help=f"Serve Prometheus metrics on 127.0.0.1:PORT/metrics (default: ${metrics.PORT_ENV_VAR})",
+    )
+    parser.add_argument(
+        "--metrics-textfile",
+        type=Path,
+        help=f"Write Prometheus metrics to this node-exporter textfile (default: ${metrics.TEXTFILE_ENV_VAR})",
+    )
+    return parser
+
+
+def _echo_event(event):
+    if event["type"] == "log":
+        for line in event["text"].splitlines():
+            print(f"[{event['server']}] {line}", flush=True)
+    elif event["type"] == "status":
+        print(f"[DEBUG] {event['server']} is {event['status']}", flush=True)
+
+
+class PipeProcess:
+    """Launcher handle of a child process whose pipes are read from the asyncio loop"""
+
+    def __init__(self, loop, popen: subprocess.Popen, on_output, on_exit):
+        self.loop = loop
+        self.popen = popen
+        self.pid = popen.pid
+        self._on_output = on_output
+        self._on_exit = on_exit
+        self._streams = {popen.stdout.fileno(): "stdout", popen.stderr.fileno(): "stderr"}
+        for fd in self._streams:
+            os.set_blocking(fd, False)
+            loop.add_reader(fd, self._read, fd)
+        os.set_blocking(popen.stdin.fileno(), False)
+        loop.call_later(EXIT_POLL_INTERVAL_S, self._poll)
+
+    def _read(self, fd) -> bool:
+        """Deliver one chunk from ``fd``; False when nothing was available"""
+        try:
+            data = os.read(fd, READ_CHUNK_BYTES)
+        except BlockingIOError:
+            return False
+        except OSError:
+            data = b""
+        if not data:
+            self.loop.remove_reader(fd)
+            del self._streams[fd]
+            return False
+        self._on_output(self._streams[fd], data)
+        return True
+
+    def _poll(self):
+        returncode = self.popen.poll()
+        if returncode is None:
+            self.loop.call_later(EXIT_POLL_INTERVAL_S, self._poll)
+            return
+        # Deliver what the process wrote before exiting; descendants may keep the pipes open
+        self.flush()
+        for fd in self._streams:
+            self.loop.remove_reader(fd)
+        self._streams.clear()
+        for pipe in (self.popen.stdin, self.popen.stdout, self.popen.stderr):
+            with contextlib.suppress(OSError):
+                pipe.close()
+        # subprocess reports death by signal as a negative return code
+        crashed = returncode < 0
+        self._on_exit(-returncode if crashed else returncode, crashed)
+
+    def write(self, data: bytes) -> bool:
+        try:
+            return os.write(self.popen.stdin.fileno(), data) == len(data)
+        except (OSError, ValueError):
+            return False
+
+    def terminate(self):
+        self.popen.terminate()
+
+    def kill(self):
+        self.popen.kill()
+
+    def flush(self):
+        for fd in list(self._streams):
+            while self._read(fd):
+                pass
+
+
+class AsyncioLauncher(Launcher):
+    """Launch servers as child processes watched from the asyncio loop.
+
+    Nothing is started detached: the daemon itself is the long-lived owner.
+    """
+
+    def __init__(self, loop):
+        self.loop = loop
+
+    def spawn(self, server_id, program, args, env, cwd, on_output, on_exit):
+        popen = subprocess.Popen(  # noqa: S603
+            [program, *args],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env={**os.environ, **env},
+            cwd=cwd,
+            start_new_session=process_tree.supports_process_groups(),
+        )
+        return PipeProcess(self.loop, popen, on_output, on_exit)
+
+
+def start_servers(core: ServerCore, server_ids=None) -> asyncio.Future:
+    """Start servers in dependency order; the future resolves to the startup report.
+
+    Raises DependencyCycleError or UnknownDependencyError for an invalid graph.
+    """
+    future = asyncio.get_running_loop().create_future()
+    core.start_servers(server_ids, lambda report: future.done() or future.set_result(report))
+    return future
+
+
+async def wait_stopped(core: ServerCore, server_ids, timeout=STOP_TIMEOUT_S):
+    """Wait until the servers exited, at most ``timeout`` plus the SIGKILL grace period"""
+    deadline = time.monotonic() + timeout + KILL_GRACE_S
+    while any(core.is_running(sid) for sid in server_ids) and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+
+
+class ControlServer:
+    """Serve control-socket requests against a ServerCore"""
+
+    def __init__(self, core: ServerCore, path: Path, profiler: Profiler):
+        self.core = core
+        self.path = path
+        self.profiler = profiler
+        self._server = None
+        self._background = set()  # start/stop tasks triggered by requests
+
+    async def start(self):
+        self._server = await asyncio.start_unix_server(self._handle_connection, path=str(self.path))
+        os.chmod(self.path, 0o600)
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        with contextlib.suppress(FileNotFoundError):
+            self.path.unlink()
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _start(self, server_ids):
+        try:
+            report = await start_servers(self.core, server_ids)
+        except (dependency_graph.DependencyCycleError, dependency_graph.UnknownDependencyError) as e:
+            print(f"[ERROR] Cannot start servers: {e.message}")
+            return
+        print(dependency_graph.format_report(report), flush=True)
+
+    async def _restart(self, server_ids):
+        running = [sid for sid in server_ids if self.core.is_running(sid)]
+        for sid in running:
+            self.core.stop_server(sid)
+        await wait_stopped(self.core, running)
+        await self._start(server_ids)
+
+    async def _handle_connection(self, reader, writer):
+        decoder = ipc.FrameDecoder()
+        try:
+            while data := await reader.read(65536):
+                for request in decoder.feed(data):
+                    if await self._handle_request(request, reader, writer):
+                        return
+        except (ipc.IpcError, ConnectionError) as e:
+            print(f"[ERROR] Control connection: {e}")
+        finally:
+            writer.close()
+
+    async def _handle_request(self, request, reader, writer) -> bool:
+        """Answer one request; returns True once a log stream ended the connection"""
+        error = ipc.validate_request(request)
+        server_ids = []
+        if not error:
+            server_ids, error = ipc.resolve_servers(request, self.core.configs)
+        if error:
+            writer.write(ipc.encode_frame(ipc.error_reply(error)))
+        elif request["op"] == "logs":
+            tail = {sid: self.core.log_lines(sid, request.get("lines")) for sid in server_ids}
+            writer.write(ipc.encode_frame(ipc.reply(tail)))
+            if request.get("follow"):
+                await self._follow_logs(set(server_ids), reader, writer)
+                return True
+        elif request["op"] == "profile":
+            try:
+                result = self.profiler.run(request.get("action"), request.get("seconds"), request.get("interval_ms"))
+            except ProfilingError as e:
+                writer.write(ipc.encode_frame(ipc.error_reply(e.message)))
+            else:
+                writer.write(ipc.encode_frame(ipc.reply(result)))
+        else:
+            writer.write(ipc.encode_frame(ipc.reply(self._dispatch(request["op"], server_ids))))
+        await writer.drain()
+        return False
+
+    def _dispatch(self, op, server_ids):
+        """Run a control operation and return its result"""
+        if op == "ping":
+            return {"kind": "daemon", "pid": os.getpid()}
+        if op == "start":
+            self._spawn(self._start(server_ids))
+            return {"starting": server_ids}
+        if op == "stop":
+            running = [sid for sid in server_ids if self.core.is_running(sid)]
+            for sid in running:
+                self.core.stop_server(sid)
+            return {"stopping": running}
+        if op == "restart":
+            self._spawn(self._restart(server_ids))
+            return {"restarting": server_ids}
+        if op == "status":
+            return [self.core.describe(sid) for sid in server_ids]
+        # activate: there is no window to raise
+        return None
+
+    async def _follow_logs(self, server_ids, reader, writer):
+        """Stream log events to the client until it disconnects"""
+
+        def forward(event):
+            if event["type"] == "log" and event["server"] in server_ids and not writer.is_closing():
+                for line in event["text"].splitlines():
+                    writer.write(ipc.encode_frame({"event": "log", "server": event["server"], "line": line}))
+
+        self.core.subscribe(forward)
+        try:
+            await writer.drain()
+            while await reader.read(65536):
+                pass
+        finally:
+            self.core.unsubscribe(forward)
+
+
+async def _refresh_metrics(exporter):
+    while True:
+        await asyncio.sleep(metrics.REFRESH_INTERVAL_S)
+        exporter.refresh()
+
+
+def _load_servers(config_dir, validate=True, server_ids=None):
+    """Load the server configurations, or None after printing why.
+
+    None means there is no configuration, ``server_ids`` names unknown servers or the graph is invalid.
+    """
+    servers = config_store.load_servers(config_store.config_file_path(config_dir))
+    if servers is None:
+        print(f"[ERROR] No server configuration found in {config_dir}")
+        return None
+    unknown = sorted(set(server_ids or ()) - {server.id for server in servers})
+    if unknown:
+        print(f"[ERROR] Unknown server(s): {', '.join(unknown)}")
+        return None
+    try:
+        if validate:
+            dependency_graph.validate(dependency_graph.build_graph(servers))
+    except (dependency_graph.DependencyCycleError, dependency_graph.UnknownDependencyError) as e:
+        print(f"[ERROR] Cannot start servers: {e.message}")
+        return None
+    return servers
+
+
+async def run(args) -> int:
+    """Run the daemon until it is asked to stop; returns the process exit code"""
+    config_dir = args.config_dir or config_store.default_config_dir()
+    # An invalid graph is refused before anything listens on the socket or exports metrics
+    servers = _load_servers(config_dir, validate=not args.no_start, server_ids=args.servers)
+    if servers is None:
+        return 1
+    control_path = ipc.socket_path(config_dir)
+    if not ipc.claim_socket(control_path):
+        print(f"[ERROR] Another MCP Manager is already running for {config_dir}")
+        return 1
+    loop = asyncio.get_running_loop()
+    core = ServerCore(servers, state_dir=config_dir, launcher=AsyncioLauncher(loop), call_later=loop.call_later)
+    if not args.quiet:
+        core.subscribe(_echo_event)
+    profiler = Profiler(config_dir, call_later=loop.call_later)
+    profiler.start_from_env()
+    control = ControlServer(core, control_path, profiler)
+    await control.start()
+    instrumentation = Instrumentation()
+    exporter = metrics.MetricsExporter.from_env(
+        lambda: metrics.render(core, list(core.configs), instrumentation), args.metrics_port, args.metrics_textfile
+    )
+    metrics_tasks = []
+    if exporter is not None:
+        exporter.start()
+        metrics_tasks = [
+            asyncio.create_task(watch_asyncio_lag(instrumentation)),
+            asyncio.create_task(_refresh_metrics(exporter)),
+        ]
+
+    stop_requested = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(sig, stop_requested.set)
+
+    print(f"[DEBUG] Daemon managing {len(servers)} server(s) from {config_dir}")
+    if not args.no_start:
+        report = await start_servers(core, args.servers)
+        print(dependency_graph.format_report(report), flush=True)
+
+    await stop_requested.wait()
+    print(f"[DEBUG] Stopping {len(core.processes)} running server(s)", flush=True)
+    await control.close()
+    profiler.stop_all()
+    await wait_stopped(core, core.stop_all(args.stop_timeout), args.stop_timeout)
+    for task in metrics_tasks:
+        task.cancel()
+    if exporter is not None:
+        # Leave a final textfile that shows the servers as stopped
+        exporter.refresh()
+        exporter.close()
+    return 0
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
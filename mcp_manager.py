@@ -1,23 +1,26 @@
-import json
 import os
 import sys
-from pathlib import Path
 
 from PyQt6.QtCore import QSize, Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QKeySequence, QShortcut, QTextCursor
 from PyQt6.QtWidgets import (
     QAbstractItemView,
     QApplication,
+    QCheckBox,
     QDialog,
     QFileDialog,
     QFormLayout,
     QHBoxLayout,
     QHeaderView,
+    QInputDialog,
     QLabel,
     QLineEdit,
     QListWidget,
     QListWidgetItem,
     QMainWindow,
+    QMenu,
     QMessageBox,
+    QProgressDialog,
     QPushButton,
     QTableWidget,
     QTableWidgetItem,
@@ -27,11 +30,27 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
+import config_store
+import dependency_graph
+import ipc
+from instrumentation import Instrumentation, LagMonitor, timed_method
+from log_filter_bar import LogFilterBar
 from models import ServerConfig
 from process_manager import ProcessManager
-from server_editor_dialog import ServerEditorDialog
+from startup_scheduler import StartupScheduler
 from toast import ToastConfig, ToastManager
 
+# Dialogs, the Config tab's editor widgets, the merged log, console, events and diagnostics panels, log export, the
+# shutdown coordinator and the control server are imported where they are first used, after the window has painted
+
+# Set to 1 to show the hidden Diagnostics tab at startup (otherwise toggled with Ctrl+Shift+D)
+DIAGNOSTICS_ENV_VAR = "MCP_MANAGER_DIAGNOSTICS"
+# Profiles to start at launch (profiling.ENV_VAR); checked here so profiling is only imported when used
+PROFILE_ENV_VAR = "MCP_MANAGER_PROFILE"
+# Prometheus exporters (metrics.PORT_ENV_VAR, metrics.TEXTFILE_ENV_VAR); metrics is only imported when one is set
+METRICS_ENV_VARS = ("MCP_MANAGER_METRICS_PORT", "MCP_MANAGER_METRICS_TEXTFILE")
+EXPORT_POLL_INTERVAL_MS = 100  # progress refresh of a log export or diagnostic bundle
+
 
 class ServerListItemWidget(QWidget):
     def __init__(self, server_config: ServerConfig, parent=None):
@@ -61,6 +80,11 @@ class ServerListItemWidget(QWidget):
         text_row.setContentsMargins(0, 0, 0, 0)
         text_row.setSpacing(6)
         text_row.addWidget(self.name_label)
+        # Alert rules matched by the current run
+        self.alert_badge = QLabel()
+        self.alert_badge.setObjectName("AlertBadge")
+        self.alert_badge.setVisible(False)
+        text_row.addWidget(self.alert_badge)
         text_row.addStretch()
         text_box.addLayout(text_row)
 
@@ -81,9 +105,22 @@ class ServerListItemWidget(QWidget):
         self.dot.setStyleSheet(f"background-color: {color}; border-radius: 6px;")
         self.dot.setToolTip(status.capitalize())
 
-    def update_status(self, status: str):
-        self._status = status
-        self._apply_dot_style(status)
+    def update_status(self, status: str, detail: str | None = None):
+        # Restyling repolishes the widget; skip it when nothing changed
+        if status != self._status:
+            self._status = status
+            self._apply_dot_style(status)
+        if detail:
+            self.dot.setToolTip(f"{status.capitalize()}: {detail}")
+
+    def set_alerts(self, alerts: dict):
+        """Show the alert rules the server matched ({rule name: last matching line}); empty hides the badge"""
+        self.alert_badge.setVisible(bool(alerts))
+        if not alerts:
+            return
+        names = list(alerts)
+        self.alert_badge.setText(names[-1] if len(names) == 1 else f"{names[-1]} +{len(names) - 1}")
+        self.alert_badge.setToolTip("\n".join(f"{name}: {line}" for name, line in alerts.items()))
 
 
 class ServerEditorPanel(QWidget):
@@ -91,6 +128,14 @@ class ServerEditorPanel(QWidget):
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        from server_editor_dialog import (
+            AlertRulesEditor,
+            LogBudgetEditor,
+            ResourceLimitsEditor,
+            StartupSettingsEditor,
+            StderrPolicyEditor,
+        )
+
         self.current_config = None
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -116,6 +161,9 @@ class ServerEditorPanel(QWidget):
         dir_layout.addWidget(browse_btn)
         form_layout.addRow("Working Directory:", dir_layout)
 
+        self.persistent_input = QCheckBox("Keep running when MCP Manager exits")
+        form_layout.addRow("", self.persistent_input)
+
         layout.addLayout(form_layout)
 
         # Arguments table
@@ -159,6 +207,26 @@ class ServerEditorPanel(QWidget):
         layout.addWidget(self.env_table)
         layout.addLayout(env_btns)
 
+        # Resource limits
+        self.limits_editor = ResourceLimitsEditor(self)
+        layout.addWidget(self.limits_editor)
+
+        # Dependencies and readiness
+        self.startup_editor = StartupSettingsEditor(self)
+        layout.addWidget(self.startup_editor)
+
+        # Which stderr output counts as an error
+        self.stderr_editor = StderrPolicyEditor(self)
+        layout.addWidget(self.stderr_editor)
+
+        # Log patterns that raise alerts
+        self.alerts_editor = AlertRulesEditor(self)
+        layout.addWidget(self.alerts_editor)
+
+        # Output rate admitted to the log
+        self.log_budget_editor = LogBudgetEditor(self)
+        layout.addWidget(self.log_budget_editor)
+
         # Action buttons
         btn_row = QHBoxLayout()
         btn_row.addStretch()
@@ -178,15 +246,27 @@ class ServerEditorPanel(QWidget):
             self.name_input.clear()
             self.command_input.clear()
             self.dir_input.clear()
+            self.persistent_input.setChecked(False)
             self._populate_table(self.args_table, [])
             self._populate_table(self.env_table, [])
+            self.limits_editor.load_limits(None)
+            self.startup_editor.load_settings(None)
+            self.stderr_editor.load_policy(None)
+            self.alerts_editor.load_rules([])
+            self.log_budget_editor.load_budget(None)
             return
         self.id_input.setText(config.id)
         self.name_input.setText(config.name)
         self.command_input.setText(config.command)
         self.dir_input.setText(config.working_dir)
+        self.persistent_input.setChecked(config.persistent)
         self._populate_table(self.args_table, config.arguments)
         self._populate_table(self.env_table, list(config.env_vars.items()))
+        self.limits_editor.load_limits(config.resource_limits)
+        self.startup_editor.load_settings(config)
+        self.stderr_editor.load_policy(config.stderr)
+        self.alerts_editor.load_rules(config.alert_rules)
+        self.log_budget_editor.load_budget(config.log_budget)
 
     def _populate_table(self, table, items):
         table.setRowCount(len(items))
@@ -239,6 +319,10 @@ class ServerEditorPanel(QWidget):
             errors.append("Server ID is required")
         if not self.command_input.text().strip():
             errors.append("Command is required")
+        errors.extend(self.limits_editor.validate())
+        errors.extend(self.startup_editor.validate(self.id_input.text().strip()))
+        errors.extend(self.stderr_editor.validate())
+        errors.extend(self.alerts_editor.validate())
         return errors
 
     def _on_save(self):
@@ -246,49 +330,33 @@ class ServerEditorPanel(QWidget):
         if errors:
             QMessageBox.critical(self, "Validation Error", "\n".join(errors))
             return
-        config = ServerConfig(
-            server_id=self.id_input.text().strip(),
-            name=self.name_input.text().strip(),
-            command=self.command_input.text().strip(),
-            arguments=self._get_table_items(self.args_table),
-            env_vars=self._get_env_vars(),
-            working_dir=self.dir_input.text().strip(),
-        )
+        # Start from a copy so settings without an editor field are preserved
+        config = self.current_config.copy() if self.current_config else ServerConfig("", "", "", [], {}, "")
+        config.id = self.id_input.text().strip()
+        config.name = self.name_input.text().strip()
+        config.command = self.command_input.text().strip()
+        config.arguments = self._get_table_items(self.args_table)
+        config.env_vars = self._get_env_vars()
+        config.working_dir = self.dir_input.text().strip()
+        config.persistent = self.persistent_input.isChecked()
+        config.resource_limits = self.limits_editor.get_limits()
+        config.depends_on = self.startup_editor.get_depends_on()
+        config.readiness = self.startup_editor.get_readiness()
+        config.stderr = self.stderr_editor.get_policy()
+        config.alert_rules = self.alerts_editor.get_rules()
+        config.log_budget = self.log_budget_editor.get_budget()
         self.saved.emit(config)
 
     def _on_reset(self):
         self.load_config(self.current_config)
 
 
-CONFIG_FILE_NAME = "mcp_servers.json"
-APP_NAME = "py-mcp-manager"
-
-
-def _default_config_dir() -> Path:
-    """Return platform-appropriate config directory for this app."""
-    home = Path.home()
-    if sys.platform == "darwin":
-        # macOS: ~/Library/Application Support/<AppName>
-        return home / "Library" / "Application Support" / APP_NAME
-    if sys.platform == "win32":
-        # Windows: %APPDATA%\<AppName>
-        appdata = os.getenv("APPDATA")
-        if appdata:
-            return Path(appdata) / APP_NAME
-        # Fallback to home directory
-        return home / APP_NAME
-    # Linux and others: ~/.config/<AppName>
-    xdg = os.getenv("XDG_CONFIG_HOME")
-    base = Path(xdg) if xdg else (home / ".config")
-    return base / APP_NAME
-
-
 class MCPManagerWindow(QMainWindow):
+    startup_finished = pyqtSignal()  # servers loaded and reattached after the first paint
+
     def get_config_file(self):
         # Ensure the directory exists
-        config_dir = _default_config_dir()
-        config_dir.mkdir(parents=True, exist_ok=True)
-        return str(config_dir / CONFIG_FILE_NAME)
+        return str(config_store.config_file_path())
 
     def __init__(self):
         super().__init__()
@@ -296,13 +364,33 @@ class MCPManagerWindow(QMainWindow):
         self.setGeometry(100, 100, 1200, 800)
         self.setObjectName("MainWindow")
 
-        self.process_manager = ProcessManager()
+        # Event-loop lag, signal rates, ingested bytes and hot-path timings for the Diagnostics tab
+        self.instrumentation = Instrumentation()
+        self.lag_monitor = LagMonitor(self.instrumentation, parent=self)
+        self.profiler = None  # profiling.Profiler, created on first use
+        if os.environ.get(PROFILE_ENV_VAR):
+            self._get_profiler().start_from_env()
+
+        self.process_manager = ProcessManager(state_dir=config_store.default_config_dir())
+        self.process_manager.core.instrumentation = self.instrumentation
         self.servers = []  # List of ServerConfig objects
         self.server_item_widgets = {}  # server_id: ServerListItemWidget
+        self.server_alerts = {}  # server_id: {alert rule name: last matching line} of the current run
         self.status_timer = QTimer()
         self.status_timer.timeout.connect(self._check_statuses)
         self.status_timer.start(5000)  # Check status every 5 seconds
 
+        # Application exit stops servers in parallel before the window closes
+        self.shutdown_coordinator = None
+        self._shutdown_progress = None
+        self._session_statuses = None  # server_id: status when the window was closed
+        self._shutdown_complete = False
+
+        # Dependency-ordered startup and bulk stop
+        self.startup_scheduler = StartupScheduler(self.process_manager, self)
+        self.startup_scheduler.finished.connect(self._on_startup_finished)
+        self.stop_all_coordinator = None
+
         self.central_widget = QWidget()
         self.setCentralWidget(self.central_widget)
 
@@ -335,10 +423,51 @@ class MCPManagerWindow(QMainWindow):
         self.process_manager.output_received.connect(self._handle_server_output)
         self.process_manager.error_occurred.connect(self._handle_server_error)
         self.process_manager.logs_updated.connect(self._on_logs_updated)
+        self.process_manager.limit_hit.connect(self._on_limit_hit)
+        self.process_manager.readiness_failed.connect(self._on_readiness_failed)
+        self.process_manager.alert_raised.connect(self._on_alert_raised)
+        for name in ("logs_updated", "status_changed", "output_received", "error_occurred"):
+            getattr(self.process_manager, name).connect(lambda *_, name=name: self.instrumentation.count(name))
+        self.lag_monitor.start()
+
+        # Loading servers, reattaching and the control socket wait until the window has painted
+        self.control_server = None
+        self.metrics_exporter = None
+        self._startup_scheduled = False
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._startup_scheduled:
+            # The first frame is on its way to the screen; do the slow work on the next loop pass
+            self._startup_scheduled = True
+            QTimer.singleShot(0, self._finish_startup)
+
+    def _finish_startup(self):
+        """Load configuration and restore runtime state once the window is on screen"""
+        # Last session's statuses; a server's old log is read when it is first shown
+        self.process_manager.restore_session()
 
         # Load servers from config file and populate list
         self._load_servers_from_file()
 
+        # Reattach to servers that kept running across a manager restart
+        self._reattach_servers()
+
+        # Surface server processes that outlived a previous session
+        self._report_orphans()
+
+        # Accept mcp-manager start/stop/restart/status/logs commands
+        from ipc_server import ControlServer
+
+        self.control_server = ControlServer(self, ipc.socket_path(), self)
+        self.control_server.activate_requested.connect(self._on_activate_requested)
+        if not self.control_server.listen():
+            self.toasts.warning("Command-line control is unavailable")
+
+        if any(os.environ.get(name) for name in METRICS_ENV_VARS):
+            self._start_metrics_exporter()
+        self.startup_finished.emit()
+
     def _create_main_panes(self):
         # Main horizontal splitter-like layout without header/footer
         main_row = QHBoxLayout()
@@ -401,29 +530,95 @@ class MCPManagerWindow(QMainWindow):
         controls_row.addWidget(self.delete_button)
         controls_row.addStretch()
 
+        self.start_all_button = QPushButton("Start All")
+        self.stop_all_button = QPushButton("Stop All")
+        for b in (self.start_all_button, self.stop_all_button):
+            b.setObjectName("ActionButton")
+            b.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.start_all_button.clicked.connect(self._on_start_all_clicked)
+        self.stop_all_button.clicked.connect(self._on_stop_all_clicked)
+        controls_row.addWidget(self.start_all_button)
+        controls_row.addWidget(self.stop_all_button)
+
+        # Log export and diagnostic bundle, written on a background thread
+        self.export_button = QPushButton("Export")
+        self.export_button.setObjectName("ActionButton")
+        self.export_button.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.export_menu = QMenu(self.export_button)
+        self.export_menu.aboutToShow.connect(self._update_export_menu)
+        self.export_button.setMenu(self.export_menu)
+        controls_row.addWidget(self.export_button)
+        self.export_job = None
+        self._export_progress = None
+        self.output_replays = {}  # server_id: output_replay.OutputReplay
+        self.export_timer = QTimer(self)
+        self.export_timer.timeout.connect(self._poll_export_job)
+
         right_layout.addLayout(controls_row)
 
         self.tabs = QTabWidget()
         right_layout.addWidget(self.tabs)
 
         # Logs tab
-        logs_tab = QWidget()
-        logs_layout = QVBoxLayout(logs_tab)
+        self.logs_tab = QWidget()
+        logs_layout = QVBoxLayout(self.logs_tab)
         logs_layout.setContentsMargins(0, 0, 0, 0)
         logs_layout.setSpacing(6)
 
+        # Filters over JSON log lines, shown once the selected server has written some
+        self.log_filter_bar = LogFilterBar()
+        self.log_filter_bar.setVisible(False)
+        self.log_filter_bar.changed.connect(self._on_log_filter_changed)
+        logs_layout.addWidget(self.log_filter_bar)
+
         self.log_display = QTextEdit()
         self.log_display.setReadOnly(True)
         self.log_display.setObjectName("LogDisplay")
+        # Older lines of the previous session are paged in at the top
+        self.log_display.verticalScrollBar().valueChanged.connect(self._on_log_scrolled)
+        self._history_shown = None  # server whose previous-session log is on screen
+        self._log_shown = None  # (server_id, LogBuffer, entries on screen) of an unfiltered log
 
         logs_layout.addWidget(self.log_display)
 
-        self.tabs.addTab(logs_tab, "Logs")
-
-        # Config tab
-        self.config_panel = ServerEditorPanel(self)
-        self.config_panel.saved.connect(self._on_config_saved)
-        self.tabs.addTab(self.config_panel, "Config")
+        self.tabs.addTab(self.logs_tab, "Logs")
+        self._logs_stale = False  # the selected server's log changed while another tab was shown
+
+        # All Logs tab: several servers' logs merged by time, built the first time the tab is opened
+        self.merged_logs_tab = QWidget()
+        merged_logs_layout = QVBoxLayout(self.merged_logs_tab)
+        merged_logs_layout.setContentsMargins(0, 0, 0, 0)
+        self.merged_log_panel = None
+        self.tabs.addTab(self.merged_logs_tab, "All Logs")
+
+        # Config tab: the editor panel is built the first time the tab is opened
+        self.config_tab = QWidget()
+        config_tab_layout = QVBoxLayout(self.config_tab)
+        config_tab_layout.setContentsMargins(0, 0, 0, 0)
+        self.tabs.addTab(self.config_tab, "Config")
+
+        # Console tab: JSON-RPC requests to the selected server, built the first time the tab is opened
+        self.console_tab = QWidget()
+        console_tab_layout = QVBoxLayout(self.console_tab)
+        console_tab_layout.setContentsMargins(0, 0, 0, 0)
+        self.console_panel = None
+        self.tabs.addTab(self.console_tab, "Console")
+
+        # Events tab: lifecycle event journal, built the first time the tab is opened
+        self.events_tab = QWidget()
+        events_tab_layout = QVBoxLayout(self.events_tab)
+        events_tab_layout.setContentsMargins(0, 0, 0, 0)
+        self.events_panel = None
+        if self.process_manager.events is not None:
+            self.tabs.addTab(self.events_tab, "Events")
+        self.tabs.currentChanged.connect(self._on_tab_changed)
+
+        # Hidden Diagnostics tab
+        self.diagnostics_panel = None
+        self.diagnostics_shortcut = QShortcut(QKeySequence("Ctrl+Shift+D"), self)
+        self.diagnostics_shortcut.activated.connect(self._toggle_diagnostics_tab)
+        if os.environ.get(DIAGNOSTICS_ENV_VAR) == "1":
+            QTimer.singleShot(0, self._toggle_diagnostics_tab)
 
         # Assemble row
         main_row.addWidget(left_widget, 1)
@@ -435,6 +630,68 @@ class MCPManagerWindow(QMainWindow):
         self.selected_server_id = None
         self._update_controls_enabled()
 
+    def _on_tab_changed(self, index):
+        if self.tabs.widget(index) is self.logs_tab and self._logs_stale:
+            self._logs_stale = False
+            if self.selected_server_id:
+                self._show_logs_for_server_id(self.selected_server_id)
+        elif self.tabs.widget(index) is self.config_tab:
+            self._ensure_config_panel()
+        elif self.tabs.widget(index) is self.merged_logs_tab and self.merged_log_panel is None:
+            from merged_log_panel import MergedLogPanel
+
+            self.merged_log_panel = MergedLogPanel(self.process_manager, self)
+            self.merged_log_panel.set_servers(s.id for s in self.servers)
+            self.merged_logs_tab.layout().addWidget(self.merged_log_panel)
+        elif self.tabs.widget(index) is self.console_tab and self.console_panel is None:
+            from rpc_console_panel import RpcConsolePanel
+
+            self.console_panel = RpcConsolePanel(self.process_manager, self)
+            self.console_panel.set_server(self.selected_server_id)
+            self.console_tab.layout().addWidget(self.console_panel)
+        elif self.tabs.widget(index) is self.events_tab and self.events_panel is None:
+            from events_panel import EventsPanel
+
+            self.events_panel = EventsPanel(self.process_manager.events, self)
+            self.events_tab.layout().addWidget(self.events_panel)
+
+    def _ensure_config_panel(self):
+        """Build the Config tab's editor panel on first use"""
+        if hasattr(self, "config_panel"):
+            return
+        self.config_panel = ServerEditorPanel(self)
+        self.config_panel.saved.connect(self._on_config_saved)
+        self.config_tab.layout().addWidget(self.config_panel)
+        server = self._find_server_by_id(self.selected_server_id) if self.selected_server_id else None
+        self.config_panel.load_config(server)
+        self.config_panel.setEnabled(bool(server and not self._is_running(server.id)))
+
+    def _toggle_diagnostics_tab(self):
+        """Show the hidden Diagnostics tab, or hide it again"""
+        if self.diagnostics_panel is None:
+            from diagnostics_panel import DiagnosticsPanel
+
+            self.diagnostics_panel = DiagnosticsPanel(self.instrumentation, self._get_profiler(), self)
+            self.diagnostics_panel.message.connect(self.toasts.info)
+        index = self.tabs.indexOf(self.diagnostics_panel)
+        if index >= 0:
+            self.tabs.removeTab(index)
+        else:
+            self.tabs.setCurrentIndex(self.tabs.addTab(self.diagnostics_panel, "Diagnostics"))
+
+    def _get_profiler(self):
+        """Return the profiler, which writes its artifacts next to the config file"""
+        if self.profiler is None:
+            from pathlib import Path
+
+            from profiling import Profiler
+
+            self.profiler = Profiler(
+                Path(self.get_config_file()).parent, call_later=lambda s, fn: QTimer.singleShot(int(s * 1000), fn)
+            )
+        return self.profiler
+
+    @timed_method("populate_server_list")
     def _populate_server_list(self):
         self.server_list.clear()
         self.server_item_widgets = {}
@@ -444,9 +701,13 @@ class MCPManagerWindow(QMainWindow):
             # Item sizing
             item.setSizeHint(QSize(10, 36))
             widget = ServerListItemWidget(s, self.server_list)
+            widget.update_status(s.status, self._status_detail(s.id))
             self.server_item_widgets[s.id] = widget
+            widget.set_alerts(self.server_alerts.get(s.id))
             self.server_list.addItem(item)
             self.server_list.setItemWidget(item, widget)
+        if self.merged_log_panel is not None:
+            self.merged_log_panel.set_servers(s.id for s in self.servers)
         # Select first item if available
         if self.server_list.count() > 0:
             self.server_list.setCurrentRow(0)
@@ -461,28 +722,97 @@ class MCPManagerWindow(QMainWindow):
             server_id = current.data(Qt.ItemDataRole.UserRole)
         self.selected_server_id = server_id
         self._update_controls_enabled()
+        if self.console_panel is not None:
+            self.console_panel.set_server(server_id)
         if server_id:
             self._show_logs_for_server_id(server_id)
             server = self._find_server_by_id(server_id)
             if server and hasattr(self, "config_panel"):
                 self.config_panel.load_config(server)
-                # Enable editing only when offline
-                self.config_panel.setEnabled(server.status == "offline")
+                # Enable editing only when the server is not running
+                self.config_panel.setEnabled(not self._is_running(server.id))
         else:
             if hasattr(self, "config_panel"):
                 self.config_panel.load_config(None)
                 self.config_panel.setEnabled(False)
 
+    @timed_method("show_logs")
     def _show_logs_for_server_id(self, server_id):
-        logs = self.process_manager.get_logs(server_id)
+        buffer = self.process_manager.logs.get(server_id)
+        self.log_filter_bar.update_for(buffer)
+        logs = self.log_filter_bar.filtered_text(buffer)
+        self._history_shown = None
+        self._log_shown = None
+        if logs is None:
+            logs = self.process_manager.get_logs(server_id)
+            history = self.process_manager.history.get(server_id)
+            if history is not None:
+                if not history.loaded:
+                    history.load_older()
+                logs = "\n".join(text for text in (history.header(), history.text(), logs) if text)
+                self._history_shown = server_id
+            if buffer:
+                self._log_shown = (server_id, buffer, len(buffer))
         self.log_display.setText(logs)
-        # Scroll to bottom
+        self._scroll_logs_to_end()
+
+    def _append_new_log_entries(self, server_id) -> bool:
+        """Append only the entries logged since the pane was rendered; False if it needs a full render"""
+        buffer = self.process_manager.logs.get(server_id)
+        if self._log_shown is None or self._log_shown[:2] != (server_id, buffer):
+            return False
+        shown = self._log_shown[2]
+        # A cleared pane, or the first JSON line arriving while a filter is selected, needs a full render
+        self.log_filter_bar.update_for(buffer)
+        if len(buffer) < shown or self.log_display.document().isEmpty():
+            return False
+        if buffer.structured is not None and self.log_filter_bar.is_active():
+            return False
+        if len(buffer) > shown:
+            cursor = QTextCursor(self.log_display.document())
+            cursor.movePosition(QTextCursor.MoveOperation.End)
+            cursor.insertText("\n" + "\n".join(buffer[shown:]))
+            self._log_shown = (server_id, buffer, len(buffer))
+        self._scroll_logs_to_end()
+        return True
+
+    def _scroll_logs_to_end(self):
         cursor = self.log_display.textCursor()
         cursor.movePosition(cursor.MoveOperation.End)
         self.log_display.setTextCursor(cursor)
 
+    def _on_log_scrolled(self, value):
+        """Read the previous page of the previous session's log once the view reaches the top"""
+        bar = self.log_display.verticalScrollBar()
+        server_id = self._history_shown
+        if server_id is None or server_id != self.selected_server_id or value != bar.minimum():
+            return
+        history = self.process_manager.history.get(server_id)
+        if history is None or not history.has_more:
+            return
+        lines = history.load_older()
+        if not lines:
+            return
+        # Insert below the header and keep the lines that were on screen in place
+        old_maximum = bar.maximum()
+        cursor = QTextCursor(self.log_display.document())
+        cursor.setPosition(min(len(history.header()) + 1, self.log_display.document().characterCount() - 1))
+        cursor.insertText("\n".join(lines) + "\n")
+        bar.setValue(bar.maximum() - old_maximum)
+
+    def _on_log_filter_changed(self):
+        if self.selected_server_id:
+            self._show_logs_for_server_id(self.selected_server_id)
+
     def _on_logs_updated(self, server_id):
-        if self.selected_server_id == server_id:
+        if self.selected_server_id != server_id:
+            return
+        # Re-rendering a hidden log pane would only slow down e.g. a load run in the Console tab
+        if self.tabs.currentWidget() is not self.logs_tab:
+            self._logs_stale = True
+            return
+        # Re-rendering the whole log would decompress every sealed chunk for each new line
+        if not self._append_new_log_entries(server_id):
             self._show_logs_for_server_id(server_id)
 
     # ruff: noqa: C901
@@ -492,7 +822,7 @@ class MCPManagerWindow(QMainWindow):
         server = self._find_server_by_id(self.selected_server_id)
         if not server:
             return
-        if server.status != "offline":
+        if self._is_running(server.id):
             QMessageBox.information(
                 self,
                 "Server Running",
@@ -513,11 +843,19 @@ class MCPManagerWindow(QMainWindow):
         updated_config.status = server.status
         old_id = server.id
         new_id = updated_config.id
+        # Validate the dependency graph with the edit applied (renames carry over to dependents)
+        candidates = [updated_config if s.id == old_id else s.copy() for s in self.servers]
+        if new_id != old_id:
+            for s in candidates:
+                s.depends_on = [new_id if dep == old_id else dep for dep in s.depends_on]
+        if not self._check_dependencies(candidates):
+            return
         # Replace in list
         for i, s in enumerate(self.servers):
             if s.id == old_id:
                 self.servers[i] = updated_config
-                break
+            elif new_id != old_id and old_id in s.depends_on:
+                s.depends_on = [new_id if dep == old_id else dep for dep in s.depends_on]
         # Migrate logs if ID changed
         if new_id != old_id:
             if hasattr(self.process_manager, "logs") and old_id in self.process_manager.logs:
@@ -536,7 +874,199 @@ class MCPManagerWindow(QMainWindow):
         # Ensure editor shows the saved config and enabled state
         if hasattr(self, "config_panel"):
             self.config_panel.load_config(updated_config)
-            self.config_panel.setEnabled(updated_config.status == "offline")
+            self.config_panel.setEnabled(not self._is_running(updated_config.id))
+
+    def _check_dependencies(self, configs):
+        """Warn and return False if the servers' dependencies are invalid"""
+        try:
+            dependency_graph.validate(dependency_graph.build_graph(configs))
+        except (dependency_graph.DependencyCycleError, dependency_graph.UnknownDependencyError) as e:
+            QMessageBox.warning(self, "Invalid Dependencies", e.message)
+            self.toasts.warning(e.message)
+            return False
+        return True
+
+    def _update_export_menu(self):
+        menu = self.export_menu
+        menu.clear()
+        busy = self.export_job is not None
+        action = menu.addAction("Selected Server's Log...", self._export_selected_log)
+        action.setEnabled(not busy and self.selected_server_id is not None)
+        menu.addAction("All Logs...", self._export_all_logs).setEnabled(not busy)
+        menu.addSeparator()
+        menu.addAction("Diagnostic Bundle...", self._export_bundle).setEnabled(not busy)
+        # Recording and replay of the selected server's raw output
+        menu.addSeparator()
+        server_id = self.selected_server_id
+        if server_id in self.process_manager.recorders:
+            menu.addAction("Stop Recording Output", self._stop_recording)
+        else:
+            menu.addAction("Record Output...", self._start_recording).setEnabled(self._is_running(server_id))
+        replay = self.output_replays.get(server_id)
+        if replay is not None and replay.is_active():
+            menu.addAction("Stop Replay", lambda: replay.stop("stopped"))
+        else:
+            action = menu.addAction("Replay Recording...", self._replay_recording)
+            action.setEnabled(server_id is not None and not self._is_running(server_id))
+
+    def _export_selected_log(self):
+        server_id = self.selected_server_id
+        if not server_id:
+            return
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Logs", f"{server_id}.log", "Log files (*.log *.txt);;All files (*)"
+        )
+        if not path:
+            return
+        from log_export import log_export_job, snapshot_logs
+
+        snapshots = {server_id: snapshot_logs(self.process_manager.logs.get(server_id))}
+        self._start_export_job(log_export_job(snapshots, path), f"Exported logs of '{server_id}'")
+
+    def _export_all_logs(self):
+        directory = QFileDialog.getExistingDirectory(self, "Export All Logs To")
+        if not directory:
+            return
+        from pathlib import Path
+
+        from log_export import log_export_job, snapshot_logs
+
+        snapshots = {
+            server_id: snapshot_logs(logs) for server_id, logs in self.process_manager.logs.items() if len(logs)
+        }
+        if not snapshots:
+            self.toasts.info("No logs to export")
+            return
+        # A directory always gets one file per server, even for a single log
+        self._start_export_job(log_export_job(snapshots, Path(directory)), f"Exported {len(snapshots)} log(s)")
+
+    def _export_bundle(self):
+        import time
+        from pathlib import Path
+
+        name = time.strftime("mcp-manager-diagnostics-%Y%m%d-%H%M%S.tar.gz")
+        path, _ = QFileDialog.getSaveFileName(self, "Save Diagnostic Bundle", name, "Bundles (*.tar.gz);;All files (*)")
+        if not path:
+            return
+        from event_journal import journal_path
+        from log_export import bundle_job, sample_resources, snapshot_logs
+
+        manager = self.process_manager
+        server_ids = [s.id for s in self.servers] + [sid for sid in manager.logs if not self._find_server_by_id(sid)]
+        snapshots = {sid: snapshot_logs(manager.logs.get(sid)) for sid in server_ids if sid in manager.logs}
+        job = bundle_job(
+            path,
+            snapshots,
+            self.servers,
+            journal_path(manager.state_dir) if manager.state_dir else None,
+            sample_resources(manager.core, server_ids),
+            self.instrumentation.snapshot(),
+        )
+        self._start_export_job(job, f"Diagnostic bundle saved to {Path(path).name}")
+
+    def _start_recording(self):
+        server_id = self.selected_server_id
+        if not server_id:
+            return
+        import time
+
+        from output_recording import FILE_SUFFIX
+
+        name = time.strftime(f"{server_id}-%Y%m%d-%H%M%S{FILE_SUFFIX}")
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Record Output", name, f"Output recordings (*{FILE_SUFFIX});;All files (*)"
+        )
+        if not path or not self._is_running(server_id):
+            return
+        try:
+            self.process_manager.start_recording(server_id, path)
+        except OSError as e:
+            print(f"[ERROR] Starting output recording: {e}")
+            self.toasts.error(f"Could not record output: {e}")
+            return
+        self.toasts.info(f"Recording the output of '{server_id}'")
+
+    def _stop_recording(self):
+        recorder = self.process_manager.stop_recording(self.selected_server_id)
+        if recorder is not None:
+            self.toasts.success(f"Recorded {recorder.describe()}")
+
+    def _replay_recording(self):
+        server_id = self.selected_server_id
+        if not server_id or self._is_running(server_id):
+            return
+        from pathlib import Path
+
+        from output_recording import FILE_SUFFIX, RecordingFormatError
+        from output_replay import SPEEDS, OutputReplay
+
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Replay Recording", "", f"Output recordings (*{FILE_SUFFIX});;All files (*)"
+        )
+        if not path:
+            return
+        labels = [label for label, _ in SPEEDS]
+        label, ok = QInputDialog.getItem(self, "Replay Speed", "Replay at:", labels, 0, False)
+        if not ok:
+            return
+        try:
+            replay = OutputReplay(
+                self.process_manager, path, server_id, self._find_server_by_id(server_id), dict(SPEEDS)[label]
+            )
+        except (OSError, RecordingFormatError) as e:
+            print(f"[ERROR] Opening output recording: {e}")
+            self.toasts.error(f"Could not replay: {e}")
+            return
+        replay.finished.connect(self._on_replay_finished)
+        if not replay.start():
+            self.toasts.warning(f"Stop '{server_id}' before replaying into it")
+            return
+        self.output_replays[server_id] = replay
+        self.tabs.setCurrentWidget(self.logs_tab)
+        self.toasts.info(f"Replaying {Path(path).name} into '{server_id}'")
+
+    def _on_replay_finished(self, server_id, summary):
+        replay = self.output_replays.pop(server_id, None)
+        if replay is not None:
+            replay.deleteLater()
+        self.toasts.info(f"Replay finished: {summary}")
+
+    def _start_export_job(self, job, done_message):
+        self.export_job = job
+        self._export_done_message = done_message
+        self._export_progress = QProgressDialog(job.title, "Cancel", 0, job.total, self)
+        self._export_progress.setWindowTitle("Export")
+        self._export_progress.setMinimumDuration(500)
+        self._export_progress.setAutoClose(False)
+        self._export_progress.canceled.connect(self._cancel_export_job)
+        job.start()
+        self.export_timer.start(EXPORT_POLL_INTERVAL_MS)
+
+    def _cancel_export_job(self):
+        if self.export_job is not None:
+            self.export_job.cancelled = True
+
+    def _poll_export_job(self):
+        job = self.export_job
+        if job is None:
+            self.export_timer.stop()
+            return
+        if not job.finished:
+            if not job.cancelled:
+                self._export_progress.setValue(min(job.done, job.total - 1))
+            return
+        self.export_timer.stop()
+        self.export_job = None
+        self._export_progress.blockSignals(True)
+        self._export_progress.close()
+        self._export_progress = None
+        if job.error is None:
+            self.toasts.success(self._export_done_message)
+        elif job.cancelled:
+            self.toasts.info("Export cancelled")
+        else:
+            print(f"[ERROR] {job.title}: {job.error}")
+            self.toasts.error(f"Export failed: {job.error}")
 
     def _on_clear_logs_clicked(self):
         if not self.selected_server_id:
@@ -548,6 +1078,9 @@ class MCPManagerWindow(QMainWindow):
     def _find_server_by_id(self, server_id):
         return next((s for s in self.servers if s.id == server_id), None)
 
+    def _is_running(self, server_id):
+        return server_id in self.process_manager.processes
+
     def _on_start_clicked(self):
         if not self.selected_server_id:
             return
@@ -556,13 +1089,74 @@ class MCPManagerWindow(QMainWindow):
             self.tabs.setCurrentIndex(0)
         self._show_logs_for_server_id(self.selected_server_id)
         server = self._find_server_by_id(self.selected_server_id)
-        if server and server.status == "offline":
+        if server and not self._is_running(server.id):
+            if server.depends_on:
+                # Bring up prerequisites first, in dependency order
+                if self._start_with_scheduler([server.id]):
+                    self.toasts.info(f"Starting '{server.name}' and its dependencies...")
+                return
             ok = self.process_manager.start_server(server)
             if ok:
                 self.toasts.info(f"Starting '{server.name}'...")
             else:
                 self.toasts.error(f"Failed to start '{server.name}'")
 
+    def _on_start_all_clicked(self):
+        if self._start_with_scheduler(None):
+            self.toasts.info(f"Starting {len(self.servers)} server(s) in dependency order...")
+
+    def _start_with_scheduler(self, targets):
+        """Start the targets (None: all servers) and their prerequisites; False if not started"""
+        if self.startup_scheduler.is_active():
+            self.toasts.info("A startup is already in progress")
+            return False
+        try:
+            self.startup_scheduler.start(self.servers, targets)
+        except (dependency_graph.DependencyCycleError, dependency_graph.UnknownDependencyError) as e:
+            print(f"[ERROR] Cannot start servers: {e.message}")
+            QMessageBox.warning(self, "Invalid Dependencies", e.message)
+            self.toasts.error(e.message)
+            return False
+        return True
+
+    def _on_startup_finished(self, report):
+        """Summarize a dependency-ordered startup"""
+        summary = dependency_graph.format_report(report)
+        print(f"[DEBUG] Startup report:\n{summary}")
+        self.statusBar().setToolTip(summary)
+        if report["failed"]:
+            self.toasts.warning(
+                f"Startup finished with {len(report['failed'])} failure(s): {', '.join(report['failed'])}"
+            )
+        else:
+            self.toasts.success(summary.splitlines()[0])
+
+    def _on_readiness_failed(self, server_id, reason):
+        server = self._find_server_by_id(server_id)
+        name = server.name if server else server_id
+        self.toasts.warning(f"'{name}' did not become ready: {reason}")
+
+    def _on_stop_all_clicked(self):
+        running = list(self.process_manager.processes)
+        if not running:
+            self.toasts.info("No servers are running")
+            return
+        if self.stop_all_coordinator is not None and self.stop_all_coordinator.is_active():
+            return
+        from shutdown_coordinator import ShutdownCoordinator
+
+        self.stop_all_coordinator = ShutdownCoordinator(self.process_manager, parent=self)
+        self.stop_all_coordinator.finished.connect(self._on_stop_all_finished)
+        self.stop_all_coordinator.start(running)
+        self.toasts.info(f"Stopping {len(running)} server(s)...")
+
+    def _on_stop_all_finished(self, unconfirmed):
+        if unconfirmed:
+            print(f"[ERROR] Could not confirm that these servers stopped: {unconfirmed}")
+            self.toasts.warning(f"Could not confirm stop of: {', '.join(unconfirmed)}")
+        else:
+            self.toasts.success("All servers stopped")
+
     def _on_stop_clicked(self):
         if not self.selected_server_id:
             return
@@ -571,7 +1165,7 @@ class MCPManagerWindow(QMainWindow):
             self.tabs.setCurrentIndex(0)
         self._show_logs_for_server_id(self.selected_server_id)
         server = self._find_server_by_id(self.selected_server_id)
-        if server and server.status != "offline":
+        if server and self._is_running(server.id):
             ok = self.process_manager.stop_server(server.id)
             if ok:
                 self.toasts.info(f"Stopping '{server.name}'...")
@@ -600,6 +1194,10 @@ class MCPManagerWindow(QMainWindow):
             self.process_manager.stop_server(server.id)
             # Remove from list and UI
             self.servers = [s for s in self.servers if s.id != server.id]
+            for s in self.servers:
+                if server.id in s.depends_on:
+                    s.depends_on = [dep for dep in s.depends_on if dep != server.id]
+                    print(f"[DEBUG] Removed dependency on '{server.id}' from '{s.id}'")
             self._save_servers_to_file()
             self._populate_server_list()
             # Clear logs view if deleted server was selected
@@ -612,42 +1210,58 @@ class MCPManagerWindow(QMainWindow):
         self.stop_button.setEnabled(False)
         self.delete_button.setEnabled(has_selection)
         if hasattr(self, "config_panel"):
-            # Enable config tab panel only if a server is selected and offline
+            # Enable config tab panel only if a server is selected and not running
             if has_selection:
                 server = self._find_server_by_id(self.selected_server_id)
-                self.config_panel.setEnabled(bool(server and server.status == "offline"))
+                self.config_panel.setEnabled(bool(server and not self._is_running(server.id)))
             else:
                 self.config_panel.setEnabled(False)
         if has_selection:
             server = self._find_server_by_id(self.selected_server_id)
             if server:
-                self.start_button.setEnabled(server.status == "offline")
-                self.stop_button.setEnabled(server.status != "offline")
+                running = self._is_running(server.id)
+                self.start_button.setEnabled(not running)
+                self.stop_button.setEnabled(running)
 
     def _load_servers_from_file(self):
         """Load server configurations from the config file"""
-        if os.path.exists(self.get_config_file()):
-            try:
-                with open(self.get_config_file()) as f:
-                    data = json.load(f)
-
-                if isinstance(data, list):
-                    self.servers = []
-                    for item in data:
-                        if isinstance(item, dict):
-                            self.servers.append(ServerConfig.from_dict(item))
-
-                    print(f"[DEBUG] Loaded servers from file: {[s.id for s in self.servers]}")
-                    # Populate the left-side server list
-                    self._populate_server_list()
-                    return
-            except Exception as e:
-                print(f"[ERROR] Loading config file: {e}")
+        servers = config_store.load_servers(self.get_config_file())
+        if servers is not None:
+            self.servers = servers
+            print(f"[DEBUG] Loaded servers from file: {[s.id for s in self.servers]}")
+            # Populate the left-side server list
+            self._populate_server_list()
+            return
 
         # If no config file exists or loading failed, load sample data
         print("[DEBUG] Loading sample data (no config file found)")
         self._load_sample_data()
 
+    def _reattach_servers(self):
+        """Reattach to servers recorded in the state journal that are still running"""
+        reattached = self.process_manager.reattach_servers(self.servers)
+        if not reattached:
+            return
+        print(f"[DEBUG] Reattached to running servers: {reattached}")
+        for server_id in reattached:
+            self._update_server_status(server_id, "online")
+        if self.selected_server_id in reattached:
+            self._show_logs_for_server_id(self.selected_server_id)
+        self.toasts.info(f"Reattached to {len(reattached)} running server(s)")
+
+    def _report_orphans(self):
+        """Report server process groups left running by an earlier session"""
+        orphans = self.process_manager.find_orphans()
+        if not orphans:
+            return
+        for server_id, pids in orphans.items():
+            pid_list = ", ".join(str(pid) for pid in pids)
+            print(f"[DEBUG] Orphaned processes for '{server_id}' from an earlier run: {pid_list}")
+            self.process_manager.append_log(
+                server_id, f"WARNING: orphaned process group(s) from an earlier run still running: {pid_list}"
+            )
+        self.toasts.warning(f"Found orphaned processes from an earlier run: {', '.join(sorted(orphans))}")
+
     def _load_sample_data(self):
         """Load sample server configurations for demonstration"""
         sample_server1 = ServerConfig(
@@ -676,18 +1290,19 @@ class MCPManagerWindow(QMainWindow):
         # Save the sample data to file for future use
         self._save_servers_to_file()
 
+    @timed_method("save_servers")
     def _save_servers_to_file(self):
         """Save current server configurations to the config file"""
         try:
-            configs = [s.to_dict() for s in self.servers]
             print(f"[DEBUG] Saving servers to {self.get_config_file()}: {[s.id for s in self.servers]}")
-            with open(self.get_config_file(), "w") as f:
-                json.dump(configs, f, indent=2)
+            config_store.save_servers(self.get_config_file(), self.servers)
         except Exception as e:
             print(f"[ERROR] Saving config file: {e}")
 
     def _add_new_server(self):
         """Open dialog to add a new server"""
+        from server_editor_dialog import ServerEditorDialog
+
         dialog = ServerEditorDialog(parent=self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             new_config = dialog.get_config()
@@ -700,6 +1315,8 @@ class MCPManagerWindow(QMainWindow):
                 )
                 self.toasts.warning(f"Duplicate ID: '{new_config.id}' already exists")
                 return
+            if not self._check_dependencies([*self.servers, new_config]):
+                return
             self.servers.append(new_config)
             self._save_servers_to_file()
             self.toasts.success(f"Added server '{new_config.name or new_config.id}'")
@@ -773,12 +1390,17 @@ class MCPManagerWindow(QMainWindow):
         if not server:
             return
 
+        changed = server.status != status
         server.status = status
 
         # Update item traffic light in the list
         widget = self.server_item_widgets.get(server_id) if hasattr(self, "server_item_widgets") else None
         if widget:
-            widget.update_status(status)
+            widget.update_status(status, self._status_detail(server_id))
+        if not changed:
+            return
+        if status == "starting" and self.server_alerts.pop(server_id, None) and widget:
+            widget.set_alerts(None)
 
         # Update controls based on new status
         if hasattr(self, "_update_controls_enabled"):
@@ -806,23 +1428,141 @@ class MCPManagerWindow(QMainWindow):
             else:
                 server.start_stop_button.setText("Start")
 
+    def _status_detail(self, server_id):
+        """Return the resource limit hit, or the previous session's status until the server runs again"""
+        manager = self.process_manager
+        if server_id in manager.limit_hits:
+            return manager.limit_hits[server_id]
+        history = manager.history.get(server_id)
+        if history is not None and server_id not in manager.processes and server_id not in manager.start_times:
+            return history.describe()
+        return None
+
+    def _on_alert_raised(self, server_id, rule_name, line):
+        """Toast an alert rule match and badge the server until its next start"""
+        alerts = self.server_alerts.setdefault(server_id, {})
+        alerts.pop(rule_name, None)  # the badge names the latest rule
+        alerts[rule_name] = line
+        widget = self.server_item_widgets.get(server_id) if hasattr(self, "server_item_widgets") else None
+        if widget:
+            widget.set_alerts(alerts)
+        server = self._find_server_by_id(server_id)
+        name = server.name if server else server_id
+        self.toasts.warning(f"'{name}' alert {rule_name}: {line[:120]}")
+
+    def _on_limit_hit(self, server_id, reason):
+        """Surface a resource limit hit reported by the process manager"""
+        server = self._find_server_by_id(server_id)
+        name = server.name if server else server_id
+        self.toasts.warning(f"'{name}' hit a resource limit: {reason}")
+
     def _handle_server_output(self, server_id, output):
         """Handle server output without showing alerts"""
         print(f"Server {server_id} output: {output}")
-        # Output is already stored in ProcessManager logs by _handle_stdout
-        # Just emit the logs_updated signal
-        if hasattr(self.process_manager, "logs") and server_id in self.process_manager.logs:
-            self.process_manager.logs_updated.emit(server_id)
+        # Output is already stored in ProcessManager logs, which emits logs_updated itself
 
     def _handle_server_error(self, server_id, error):
         """Handle server errors without showing alerts"""
         print(f"Server {server_id} error: {error}")
-        # Do not surface log-driven errors to status bar; only UI actions should update status
+        # Do not surface log-driven errors to status bar; only UI actions should update status.
+        # Stderr only gets here when its StderrPolicy classifies it as an error (rate-limited).
         self._update_server_status(server_id, "error")
-        # Error is already stored in ProcessManager logs by _handle_stderr
-        # Just emit the logs_updated signal
-        if hasattr(self.process_manager, "logs") and server_id in self.process_manager.logs:
-            self.process_manager.logs_updated.emit(server_id)
+        # The error is already stored in ProcessManager logs, which emits logs_updated itself
+
+    def closeEvent(self, event):
+        """Stop all running servers in parallel before closing the window"""
+        if self._shutdown_complete:
+            super().closeEvent(event)
+            return
+        if self._session_statuses is None:
+            # The statuses to remember are those from before the servers are stopped for exit
+            manager = self.process_manager
+            self._session_statuses = {
+                s.id: "error" if s.status == "error" else manager.get_status(s.id) for s in self.servers
+            }
+
+        detached = [sid for sid in self.process_manager.processes if self.process_manager.is_detached(sid)]
+        to_stop = [sid for sid in self.process_manager.processes if sid not in detached]
+        if detached:
+            print(f"[DEBUG] Leaving persistent servers running: {detached}")
+        if not to_stop:
+            self._flush_state()
+            self._shutdown_complete = True
+            super().closeEvent(event)
+            return
+
+        event.ignore()
+        if self.shutdown_coordinator is not None and self.shutdown_coordinator.is_active():
+            return
+
+        print(f"[DEBUG] Stopping {len(to_stop)} running servers before exit")
+        self.status_timer.stop()
+        self._shutdown_progress = QProgressDialog(
+            f"Stopping {len(to_stop)} running server(s)...", None, 0, len(to_stop), self
+        )
+        self._shutdown_progress.setWindowTitle("Shutting Down")
+        self._shutdown_progress.setWindowModality(Qt.WindowModality.ApplicationModal)
+        self._shutdown_progress.setMinimumDuration(0)
+        self._shutdown_progress.setAutoClose(False)
+        self._shutdown_progress.setValue(0)
+
+        from shutdown_coordinator import ShutdownCoordinator
+
+        self.shutdown_coordinator = ShutdownCoordinator(self.process_manager, parent=self)
+        self.shutdown_coordinator.progress.connect(self._on_shutdown_progress)
+        self.shutdown_coordinator.finished.connect(self._on_shutdown_finished)
+        self.shutdown_coordinator.start(to_stop)
+
+    def _on_shutdown_progress(self, stopped, total):
+        if self._shutdown_progress is not None:
+            self._shutdown_progress.setLabelText(f"Stopping running servers... ({stopped}/{total})")
+            self._shutdown_progress.setValue(stopped)
+
+    def _on_shutdown_finished(self, unconfirmed):
+        if unconfirmed:
+            print(f"[ERROR] Could not confirm that these servers stopped: {unconfirmed}")
+        if self._shutdown_progress is not None:
+            self._shutdown_progress.close()
+            self._shutdown_progress = None
+        self._flush_state()
+        self._shutdown_complete = True
+        self.close()
+
+    def _on_activate_requested(self):
+        """Bring the window to the front when a second instance is launched"""
+        self.showNormal()
+        self.raise_()
+        self.activateWindow()
+
+    def _start_metrics_exporter(self):
+        """Serve Prometheus metrics on localhost and/or write them as a node-exporter textfile"""
+        import metrics
+
+        self.metrics_exporter = metrics.MetricsExporter.from_env(
+            lambda: metrics.render(self.process_manager.core, [s.id for s in self.servers], self.instrumentation)
+        )
+        if self.metrics_exporter is None:
+            return
+        if not self.metrics_exporter.start():
+            self.toasts.warning("Metrics endpoint is unavailable")
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.timeout.connect(self.metrics_exporter.refresh)
+        self.metrics_timer.start(metrics.REFRESH_INTERVAL_S * 1000)
+
+    def _flush_state(self):
+        """Flush buffered server output, persist configuration and release the control socket before exit"""
+        if self.control_server is not None:
+            self.control_server.close()
+        if self.metrics_exporter is not None:
+            # Leave a final textfile that shows the servers as stopped
+            self.metrics_exporter.refresh()
+            self.metrics_exporter.close()
+        if self.profiler is not None:
+            self.profiler.stop_all()
+        self.process_manager.flush_output()
+        self._save_servers_to_file()
+        self.process_manager.save_session([s.id for s in self.servers], self._session_statuses)
+        sys.stdout.flush()
 
     def _get_style_sheet(self):
         # Delegated to external module for maintainability
@@ -833,6 +1573,16 @@ class MCPManagerWindow(QMainWindow):
 
 def main():
     """Main entry point for the application"""
+    # Only one manager per config directory; a second launch raises the running window
+    control_path = ipc.socket_path()
+    if ipc.instance_running(control_path):
+        try:
+            with ipc.Client(control_path) as client:
+                client.request("activate")
+        except (ipc.IpcError, OSError) as e:
+            print(f"[ERROR] Activating the running instance: {e}")
+        print("[DEBUG] MCP Manager is already running")
+        sys.exit(0)
     app = QApplication(sys.argv)
     window = MCPManagerWindow()
     window.show()
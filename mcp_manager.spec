@@ -11,40 +11,53 @@ a = Analysis(
         'PyQt6.QtCore',
         'PyQt6.QtGui',
         'PyQt6.QtWidgets',
+        'PyQt6.QtNetwork',
         'PyQt6.sip',
     ],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
+    # Unused Qt modules add tens of megabytes that every launch has to map
     excludes=[
         'tkinter',
         'matplotlib',
         'numpy',
         'scipy',
         'pandas',
+        'PyQt6.QtBluetooth',
+        'PyQt6.QtMultimedia',
+        'PyQt6.QtMultimediaWidgets',
+        'PyQt6.QtPdf',
+        'PyQt6.QtPdfWidgets',
+        'PyQt6.QtQml',
+        'PyQt6.QtQuick',
+        'PyQt6.QtQuickWidgets',
+        'PyQt6.QtSql',
+        'PyQt6.QtTest',
+        'PyQt6.QtWebEngineCore',
+        'PyQt6.QtWebEngineWidgets',
+        'PyQt6.Qt3DCore',
     ],
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=block_cipher,
     noarchive=False,
+    optimize=1,
 )
 
 pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
 
+# onedir: a onefile build unpacks the whole Qt runtime to a temp dir on every launch
 exe = EXE(
     pyz,
     a.scripts,
-    a.binaries,
-    a.zipfiles,
-    a.datas,
     [],
+    exclude_binaries=True,
     name='MCPManager',
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
+    upx=False,
     console=False,
     disable_windowed_traceback=False,
     argv_emulation=False,
@@ -54,8 +67,18 @@ exe = EXE(
     icon='assets\\mcp-manager-icon.ico'
 )
 
-app = BUNDLE(
+coll = COLLECT(
     exe,
+    a.binaries,
+    a.zipfiles,
+    a.datas,
+    strip=False,
+    upx=False,
+    name='MCPManager',
+)
+
+app = BUNDLE(
+    coll,
     name='MCPManager.app',
     icon='assets/mcp-manager-icon.icns',
     bundle_identifier='dev.deskriders.mcpmanager',
@@ -0,0 +1,144 @@
+import time
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt, QTimer
+from PyQt6.QtGui import QAction, QColor
+from PyQt6.QtWidgets import QHBoxLayout, QLabel, QListView, QMenu, QPushButton, QVBoxLayout, QWidget
+
+from log_buffer import MergedLog
+
+UPDATE_DELAY_MS = 100  # coalesces bursts of logs_updated into one merge
+MERGE_BATCH_ENTRIES = 20000  # entries merged per event-loop pass while catching up
+SERVER_COLORS = ("#E6EDF3", "#7EE787", "#79C0FF", "#FFA657", "#D2A8FF", "#FF7B72", "#A5D6FF", "#F2CC60")
+
+
+class MergedLogModel(QAbstractListModel):
+    """Rows of a MergedLog, formatted only when the view asks for them"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.merged = MergedLog()
+
+    def rowCount(self, parent=None):
+        return 0 if parent is not None and parent.isValid() else len(self.merged)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole:
+            server_id, captured, text = self.merged.row(index.row())
+            stamp = time.strftime("%H:%M:%S", time.localtime(captured))
+            return f"{stamp}.{int(captured % 1 * 1000):03d} [{server_id}] {text}"
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return QColor(SERVER_COLORS[self.merged.source(index.row()) % len(SERVER_COLORS)])
+        return None
+
+    def rebuild(self, buffers):
+        self.beginResetModel()
+        self.merged.set_sources(buffers)
+        self.endResetModel()
+
+    def merge_more(self, budget) -> bool:
+        """Merge newly captured entries into the model; returns True while more are waiting"""
+        first = len(self.merged)
+        more = self.merged.update(budget)
+        if len(self.merged) > first:
+            self.beginInsertRows(QModelIndex(), first, len(self.merged) - 1)
+            self.endInsertRows()
+        return more
+
+
+class MergedLogPanel(QWidget):
+    """Logs of several servers interleaved by capture time, each line tagged with its server"""
+
+    def __init__(self, process_manager, parent=None):
+        super().__init__(parent)
+        self.process_manager = process_manager
+        self.server_ids = []  # every configured server, in list order
+        self.selected = None  # server IDs to show; None shows all
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(6)
+
+        controls = QHBoxLayout()
+        self.servers_button = QPushButton("Servers")
+        self.servers_menu = QMenu(self.servers_button)
+        self.servers_menu.triggered.connect(self._on_server_toggled)
+        self.servers_button.setMenu(self.servers_menu)
+        controls.addWidget(self.servers_button)
+        self.count_label = QLabel()
+        controls.addWidget(self.count_label)
+        controls.addStretch()
+        layout.addLayout(controls)
+
+        # Only the visible rows are ever formatted
+        self.model = MergedLogModel(self)
+        self.view = QListView()
+        self.view.setObjectName("LogDisplay")
+        self.view.setUniformItemSizes(True)
+        self.view.setSelectionMode(QListView.SelectionMode.ExtendedSelection)
+        self.view.setModel(self.model)
+        layout.addWidget(self.view)
+
+        self.update_timer = QTimer(self)
+        self.update_timer.setSingleShot(True)
+        self.update_timer.timeout.connect(self._merge)
+        process_manager.logs_updated.connect(self._on_logs_updated)
+
+    def set_servers(self, server_ids):
+        """Offer these servers in the Servers menu, keeping the current selection"""
+        self.server_ids = list(server_ids)
+        if self.selected is not None:
+            self.selected = [sid for sid in self.selected if sid in self.server_ids]
+        self.servers_menu.clear()
+        all_action = self.servers_menu.addAction("All servers")
+        all_action.setCheckable(True)
+        all_action.setChecked(self.selected is None)
+        self.servers_menu.addSeparator()
+        for server_id in self.server_ids:
+            action = self.servers_menu.addAction(server_id)
+            action.setCheckable(True)
+            action.setChecked(self.selected is None or server_id in self.selected)
+            action.setData(server_id)
+        self._schedule(0)
+
+    def _on_server_toggled(self, action: QAction):
+        server_id = action.data()
+        if server_id is None:
+            self.selected = None
+        else:
+            selected = set(self.server_ids if self.selected is None else self.selected)
+            selected.symmetric_difference_update({server_id})
+            self.selected = [sid for sid in self.server_ids if sid in selected]
+        self.set_servers(self.server_ids)
+
+    def _visible_buffers(self):
+        server_ids = self.server_ids if self.selected is None else self.selected
+        logs = self.process_manager.logs
+        return {sid: logs[sid] for sid in server_ids if sid in logs}
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._schedule(0)
+
+    def _on_logs_updated(self, server_id):
+        if self.isVisible() and not self.update_timer.isActive():
+            self._schedule(UPDATE_DELAY_MS)
+
+    def _schedule(self, delay_ms):
+        self.update_timer.start(delay_ms)
+
+    def _merge(self):
+        if not self.isVisible():
+            return
+        buffers = self._visible_buffers()
+        scrollbar = self.view.verticalScrollBar()
+        following = scrollbar.value() >= scrollbar.maximum()
+        if self.model.merged.is_stale(buffers):
+            self.model.rebuild(buffers)
+        more = self.model.merge_more(MERGE_BATCH_ENTRIES)
+        if following:
+            self.view.scrollToBottom()
+        shown = len(buffers)
+        self.count_label.setText(f"{len(self.model.merged):,} lines from {shown} server{'s' if shown != 1 else ''}")
+        if more:
+            # Catch up in batches so the window stays responsive
+            self._schedule(0)
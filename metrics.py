@@ -0,0 +1,236 @@
+"""Prometheus metrics for the managed servers, served over HTTP and written as a textfile.
+
+Both exporters are opt-in. ``MCP_MANAGER_METRICS_PORT`` serves
+``http://127.0.0.1:<port>/metrics`` and ``MCP_MANAGER_METRICS_TEXTFILE`` names a
+``.prom`` file for node-exporter's textfile collector (the daemon also takes
+``--metrics-port`` and ``--metrics-textfile``).
+
+The exposition text is rendered on the host's event loop every
+REFRESH_INTERVAL_S seconds with a single /proc scan for all servers; scrapes
+are answered from that cached text by a background thread, so scraping costs
+the manager nothing. This module is free of Qt and renders from the
+ServerCore that both the GUI and the daemon run; the counters it records live
+in ``instrumentation.ServerStats`` so recording them does not import this module.
+"""
+
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import process_tree
+from instrumentation import BUCKETS_MS
+
+PORT_ENV_VAR = "MCP_MANAGER_METRICS_PORT"
+TEXTFILE_ENV_VAR = "MCP_MANAGER_METRICS_TEXTFILE"
+REFRESH_INTERVAL_S = 2
+BIND_ADDRESS = "127.0.0.1"  # never exposed beyond the local machine
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+PREFIX = "mcp_manager_"
+
+
+def _label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    return f"{value:.6g}"
+
+
+class _Writer:
+    def __init__(self):
+        self.lines = []
+
+    def family(self, name, kind, help_text, samples):
+        """Write one metric family; ``samples`` yields (server_id or None, value)"""
+        self.lines.append(f"# HELP {PREFIX}{name} {help_text}")
+        self.lines.append(f"# TYPE {PREFIX}{name} {kind}")
+        for server_id, value in samples:
+            labels = "" if server_id is None else f'{{server="{_label(server_id)}"}}'
+            self.lines.append(f"{PREFIX}{name}{labels} {_number(value)}")
+
+    def histogram_ms(self, name, help_text, histogram):
+        """Write an instrumentation Histogram (milliseconds) as a Prometheus histogram in seconds"""
+        self.lines.append(f"# HELP {PREFIX}{name} {help_text}")
+        self.lines.append(f"# TYPE {PREFIX}{name} histogram")
+        cumulative = 0
+        for bound, count in zip(BUCKETS_MS, histogram.buckets, strict=False):
+            cumulative += count
+            self.lines.append(f'{PREFIX}{name}_bucket{{le="{_number(bound / 1000)}"}} {cumulative}')
+        self.lines.append(f'{PREFIX}{name}_bucket{{le="+Inf"}} {histogram.count}')
+        self.lines.append(f"{PREFIX}{name}_sum {_number(histogram.total / 1000)}")
+        self.lines.append(f"{PREFIX}{name}_count {histogram.count}")
+
+
+def render(manager, server_ids, instrumentation=None) -> str:
+    """Render the metrics of ``server_ids`` in the Prometheus text exposition format.
+
+    ``manager`` is the server_core.ServerCore running the servers.
+    """
+    now = time.monotonic()
+    stats = manager.stats
+    up = [sid for sid in server_ids if sid in manager.processes]
+    pgids = {sid: manager.process_groups[sid] for sid in up if sid in manager.process_groups}
+    usage = process_tree.group_usage(pgids.values()) if process_tree.has_procfs() else {}
+    resources = {sid: usage[pgid] for sid, pgid in pgids.items() if pgid in usage}
+
+    out = _Writer()
+    out.family("server_up", "gauge", "1 if the server process is running", ((s, s in up) for s in server_ids))
+    out.family(
+        "server_ready",
+        "gauge",
+        "1 if the server passed its readiness check",
+        ((s, manager.is_ready(s)) for s in server_ids),
+    )
+    out.family(
+        "server_restarts_total",
+        "counter",
+        "Launches of the server after the first one since the manager started",
+        ((s, max(0, stats.starts.get(s, 0) - 1)) for s in server_ids),
+    )
+    out.family(
+        "server_uptime_seconds",
+        "gauge",
+        "Seconds since the running server was launched",
+        ((s, now - manager.start_times[s]) for s in up if s in manager.start_times),
+    )
+    out.family(
+        "server_ready_latency_seconds",
+        "gauge",
+        "Seconds from launch until the server passed its readiness check",
+        ((s, manager.ready_times[s]) for s in up if s in manager.ready_times),
+    )
+    out.family(
+        "server_resident_memory_bytes",
+        "gauge",
+        "Resident memory of the server's process group",
+        ((s, rss) for s, (rss, _) in resources.items()),
+    )
+    out.family(
+        "server_cpu_seconds_total",
+        "counter",
+        "User and system CPU time of the live processes in the server's process group",
+        ((s, cpu) for s, (_, cpu) in resources.items()),
+    )
+    out.family(
+        "server_log_bytes_total",
+        "counter",
+        "Bytes of server output ingested",
+        ((s, stats.log_bytes.get(s, 0)) for s in server_ids),
+    )
+    out.family(
+        "server_log_lines_total",
+        "counter",
+        "Lines of server output ingested",
+        ((s, stats.log_lines.get(s, 0)) for s in server_ids),
+    )
+    out.family(
+        "server_log_lines_suppressed_total",
+        "counter",
+        "Output lines left out of the log because the server exceeded its log budget",
+        ((s, stats.suppressed_lines.get(s, 0)) for s in server_ids),
+    )
+    out.family(
+        "server_log_bytes_suppressed_total",
+        "counter",
+        "Output bytes left out of the log because the server exceeded its log budget",
+        ((s, stats.suppressed_bytes.get(s, 0)) for s in server_ids),
+    )
+    out.family("managed_processes", "gauge", "Number of running server processes", [(None, len(up))])
+    if instrumentation is not None:
+        out.histogram_ms("event_loop_lag_seconds", "Lateness of the manager's event loop", instrumentation.lag)
+        out.family(
+            "event_loop_stalls_total",
+            "counter",
+            "Event-loop delays above the stall threshold",
+            [(None, instrumentation.stalls)],
+        )
+    return "\n".join(out.lines) + "\n"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.server.exporter.body
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # noqa: A002
+        pass  # scrapes every few seconds would flood the console
+
+
+class MetricsExporter:
+    """Serve and/or write the text produced by ``collect()``; call ``refresh`` periodically"""
+
+    def __init__(self, collect, port: int | None = None, textfile=None):
+        self.collect = collect
+        self.port = port
+        self.textfile = Path(textfile) if textfile else None
+        self.body = b""
+        self._httpd = None
+
+    @classmethod
+    def from_env(cls, collect, port=None, textfile=None):
+        """Build an exporter from explicit settings or the environment; None when neither is set"""
+        if port is None and os.environ.get(PORT_ENV_VAR):
+            try:
+                port = int(os.environ[PORT_ENV_VAR])
+            except ValueError:
+                print(f"[ERROR] {PORT_ENV_VAR} must be a port number, got '{os.environ[PORT_ENV_VAR]}'")
+        textfile = textfile or os.environ.get(TEXTFILE_ENV_VAR) or None
+        if port is None and textfile is None:
+            return None
+        return cls(collect, port, textfile)
+
+    def start(self) -> bool:
+        """Render once and start the HTTP endpoint; False if the port cannot be bound"""
+        self.refresh()
+        if self.port is None:
+            return True
+        try:
+            self._httpd = ThreadingHTTPServer((BIND_ADDRESS, self.port), _Handler)
+        except OSError as e:
+            print(f"[ERROR] Metrics endpoint on port {self.port}: {e}")
+            return False
+        self._httpd.daemon_threads = True
+        self._httpd.exporter = self
+        threading.Thread(target=self._httpd.serve_forever, name="mcp-metrics-http", daemon=True).start()
+        print(f"[DEBUG] Serving metrics on http://{BIND_ADDRESS}:{self._httpd.server_port}/metrics")
+        return True
+
+    def refresh(self) -> None:
+        try:
+            text = self.collect()
+        except Exception as e:
+            print(f"[ERROR] Collecting metrics: {e}")
+            return
+        # Replacing the reference is atomic, so the HTTP thread never sees a partial body
+        self.body = text.encode()
+        if self.textfile is not None:
+            self._write_textfile(text)
+
+    def _write_textfile(self, text):
+        # node-exporter may read at any moment: write a temporary file and rename it over the target
+        try:
+            self.textfile.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.textfile.with_name(f".{self.textfile.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(text)
+            os.replace(tmp_path, self.textfile)
+        except OSError as e:
+            print(f"[ERROR] Writing metrics textfile: {e}")
+
+    def close(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
@@ -1,11 +1,203 @@
+class ResourceLimits:
+    """Per-server resource limits and scheduling settings. Zero/empty means unlimited/unchanged"""
+
+    def __init__(
+        self,
+        address_space_mb: int = 0,
+        rss_mb: int = 0,
+        open_files: int = 0,
+        cpu_seconds: int = 0,
+        nice: int = 0,
+        cpu_affinity: str = "",
+        cgroup: str = "",
+    ):
+        self.address_space_mb = address_space_mb  # RLIMIT_AS
+        self.rss_mb = rss_mb  # cgroup memory.max, or RSS watchdog without a cgroup
+        self.open_files = open_files  # RLIMIT_NOFILE
+        self.cpu_seconds = cpu_seconds  # RLIMIT_CPU
+        self.nice = nice
+        self.cpu_affinity = cpu_affinity  # CPU list, e.g. "0-3,6"
+        self.cgroup = cgroup  # "", "auto" (delegated cgroup v2 subtree) or an explicit cgroup directory
+
+    def is_empty(self) -> bool:
+        """Return True when no limit or scheduling setting is configured"""
+        return self.to_dict() == ResourceLimits().to_dict()
+
+    def to_dict(self) -> dict:
+        """Serialize limits to dictionary"""
+        return {
+            "address_space_mb": self.address_space_mb,
+            "rss_mb": self.rss_mb,
+            "open_files": self.open_files,
+            "cpu_seconds": self.cpu_seconds,
+            "nice": self.nice,
+            "cpu_affinity": self.cpu_affinity,
+            "cgroup": self.cgroup,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict | None) -> "ResourceLimits":
+        """Create limits from dictionary, tolerating missing keys"""
+        data = data or {}
+        return cls(
+            address_space_mb=int(data.get("address_space_mb", 0) or 0),
+            rss_mb=int(data.get("rss_mb", 0) or 0),
+            open_files=int(data.get("open_files", 0) or 0),
+            cpu_seconds=int(data.get("cpu_seconds", 0) or 0),
+            nice=int(data.get("nice", 0) or 0),
+            cpu_affinity=data.get("cpu_affinity", "") or "",
+            cgroup=data.get("cgroup", "") or "",
+        )
+
+    def copy(self) -> "ResourceLimits":
+        """Create a copy of the limits"""
+        return ResourceLimits.from_dict(self.to_dict())
+
+
+class ReadinessCheck:
+    """How a server signals that it is ready for its dependents"""
+
+    TYPES = ("started", "log", "tcp", "delay")
+
+    def __init__(self, check_type: str = "started", value: str = "", timeout_s: int = 60):
+        self.type = check_type  # started, log (regex on output), tcp (host:port), delay (seconds)
+        self.value = value
+        self.timeout_s = timeout_s
+
+    def to_dict(self) -> dict:
+        """Serialize readiness check to dictionary"""
+        return {"type": self.type, "value": self.value, "timeout_s": self.timeout_s}
+
+    @classmethod
+    def from_dict(cls, data: dict | None) -> "ReadinessCheck":
+        """Create readiness check from dictionary, tolerating missing keys"""
+        data = data or {}
+        return cls(
+            check_type=data.get("type", "started") or "started",
+            value=str(data.get("value", "") or ""),
+            timeout_s=int(data.get("timeout_s", 60) or 60),
+        )
+
+    def copy(self) -> "ReadinessCheck":
+        """Create a copy of the readiness check"""
+        return ReadinessCheck.from_dict(self.to_dict())
+
+
+class StderrPolicy:
+    """Which stderr output marks a server as errored; stdout is the MCP channel, so most servers log to stderr"""
+
+    MODES = ("levels", "regex", "always", "never")
+
+    def __init__(self, mode: str = "levels", pattern: str = ""):
+        self.mode = mode  # levels (ERROR/FATAL/tracebacks), regex (pattern), always, never
+        self.pattern = pattern
+
+    def to_dict(self) -> dict:
+        """Serialize stderr policy to dictionary"""
+        return {"mode": self.mode, "pattern": self.pattern}
+
+    @classmethod
+    def from_dict(cls, data: dict | None) -> "StderrPolicy":
+        """Create stderr policy from dictionary, tolerating missing keys"""
+        data = data or {}
+        mode = data.get("mode", "levels") or "levels"
+        return cls(mode=mode if mode in cls.MODES else "levels", pattern=str(data.get("pattern", "") or ""))
+
+    def copy(self) -> "StderrPolicy":
+        """Create a copy of the stderr policy"""
+        return StderrPolicy.from_dict(self.to_dict())
+
+
+class LogBudget:
+    """Lines and bytes per second a server may add to its log before output is suppressed; 0 means unlimited"""
+
+    # Far above what a healthy server logs, low enough to keep one stuck in an error loop in check
+    DEFAULT_LINES_PER_S = 1000
+    DEFAULT_BYTES_PER_S = 512 * 1024
+
+    def __init__(self, lines_per_s: int = DEFAULT_LINES_PER_S, bytes_per_s: int = DEFAULT_BYTES_PER_S):
+        self.lines_per_s = lines_per_s
+        self.bytes_per_s = bytes_per_s
+
+    def to_dict(self) -> dict:
+        """Serialize log budget to dictionary"""
+        return {"lines_per_s": self.lines_per_s, "bytes_per_s": self.bytes_per_s}
+
+    @classmethod
+    def from_dict(cls, data: dict | None) -> "LogBudget":
+        """Create log budget from dictionary; missing keys get the defaults, 0 disables a limit"""
+        data = data or {}
+        lines = data.get("lines_per_s")
+        size = data.get("bytes_per_s")
+        return cls(
+            lines_per_s=cls.DEFAULT_LINES_PER_S if lines is None else max(0, int(lines)),
+            bytes_per_s=cls.DEFAULT_BYTES_PER_S if size is None else max(0, int(size)),
+        )
+
+    def copy(self) -> "LogBudget":
+        """Create a copy of the log budget"""
+        return LogBudget.from_dict(self.to_dict())
+
+
+class AlertRule:
+    """A log pattern that raises an alert when a server prints a matching line"""
+
+    def __init__(self, name: str = "", pattern: str = "", regex: bool = False, ignore_case: bool = False):
+        self.name = name or pattern
+        self.pattern = pattern  # plain text unless regex is set
+        self.regex = regex
+        self.ignore_case = ignore_case
+
+    def to_dict(self) -> dict:
+        """Serialize alert rule to dictionary"""
+        return {"name": self.name, "pattern": self.pattern, "regex": self.regex, "ignore_case": self.ignore_case}
+
+    @classmethod
+    def from_dict(cls, data: dict | None) -> "AlertRule":
+        """Create alert rule from dictionary, tolerating missing keys"""
+        data = data or {}
+        return cls(
+            name=str(data.get("name", "") or ""),
+            pattern=str(data.get("pattern", "") or ""),
+            regex=bool(data.get("regex", False)),
+            ignore_case=bool(data.get("ignore_case", False)),
+        )
+
+    def copy(self) -> "AlertRule":
+        """Create a copy of the alert rule"""
+        return AlertRule.from_dict(self.to_dict())
+
+
 class ServerConfig:
-    def __init__(self, server_id: str, name: str, command: str, arguments: list, env_vars: dict, working_dir: str = ""):
+    def __init__(
+        self,
+        server_id: str,
+        name: str,
+        command: str,
+        arguments: list,
+        env_vars: dict,
+        working_dir: str = "",
+        resource_limits: ResourceLimits | None = None,
+        persistent: bool = False,
+        depends_on: list | None = None,
+        readiness: ReadinessCheck | None = None,
+        stderr: StderrPolicy | None = None,
+        alert_rules: list | None = None,
+        log_budget: LogBudget | None = None,
+    ):
         self.id = server_id
         self.name = name
         self.command = command
         self.arguments = arguments
         self.env_vars = env_vars
         self.working_dir = working_dir
+        self.resource_limits = resource_limits or ResourceLimits()
+        self.persistent = persistent  # keep running (detached) when the manager exits
+        self.depends_on = depends_on or []  # IDs of servers that must be ready first
+        self.readiness = readiness or ReadinessCheck()
+        self.stderr = stderr or StderrPolicy()
+        self.alert_rules = alert_rules or []  # AlertRule list, checked against every output line
+        self.log_budget = log_budget or LogBudget()
         self.status = "offline"  # offline, starting, online, error
 
     def to_dict(self) -> dict:
@@ -17,6 +209,13 @@ class ServerConfig:
             "arguments": self.arguments,
             "env_vars": self.env_vars,
             "working_dir": self.working_dir,
+            "resource_limits": self.resource_limits.to_dict(),
+            "persistent": self.persistent,
+            "depends_on": self.depends_on,
+            "readiness": self.readiness.to_dict(),
+            "stderr": self.stderr.to_dict(),
+            "alert_rules": [rule.to_dict() for rule in self.alert_rules],
+            "log_budget": self.log_budget.to_dict(),
             "status": self.status,
         }
 
@@ -30,6 +229,13 @@ class ServerConfig:
             arguments=data["arguments"],
             env_vars=data["env_vars"],
             working_dir=data.get("working_dir", ""),
+            resource_limits=ResourceLimits.from_dict(data.get("resource_limits")),
+            persistent=bool(data.get("persistent", False)),
+            depends_on=list(data.get("depends_on", [])),
+            readiness=ReadinessCheck.from_dict(data.get("readiness")),
+            stderr=StderrPolicy.from_dict(data.get("stderr")),
+            alert_rules=[AlertRule.from_dict(rule) for rule in data.get("alert_rules") or []],
+            log_budget=LogBudget.from_dict(data.get("log_budget")),
         )
 
     def copy(self) -> "ServerConfig":
@@ -41,4 +247,11 @@ class ServerConfig:
             arguments=self.arguments.copy(),
             env_vars=self.env_vars.copy(),
             working_dir=self.working_dir,
+            resource_limits=self.resource_limits.copy(),
+            persistent=self.persistent,
+            depends_on=self.depends_on.copy(),
+            readiness=self.readiness.copy(),
+            stderr=self.stderr.copy(),
+            alert_rules=[rule.copy() for rule in self.alert_rules],
+            log_budget=self.log_budget.copy(),
         )
@@ -0,0 +1,121 @@
+"""Recordings of a server's raw stdout/stderr with the timing of every chunk.
+
+A recording is a gzip stream: a ``MCPREC1`` line, a JSON line with the server
+ID and start time, then one record per chunk of output as it was read from the
+server. A record is the delay since the previous chunk in microseconds
+(varint), the stream (0 stdout, 1 stderr), the length (varint) and the bytes.
+The bytes are stored as read, so multi-byte characters split across reads
+replay exactly as they arrived. ``output_replay`` feeds recordings back through
+``ProcessManager``. Free of Qt.
+"""
+
+import gzip
+import json
+import time
+
+MAGIC = b"MCPREC1\n"
+FILE_SUFFIX = ".mcprec"
+STREAMS = ("stdout", "stderr")
+COMPRESS_LEVEL = 1  # recording runs at ingest, like sealing log chunks
+MAX_RECORDING_BYTES = 512 * 1024 * 1024  # of output; the recording stops there
+
+
+class RecordingFormatError(Exception):
+    def __init__(self, path, reason: str):
+        self.message = f"Not an output recording: {path} ({reason})"
+        super().__init__(self.message)
+
+
+def _varint(n: int) -> bytes:
+    out = bytearray()
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+    return bytes(out)
+
+
+def _read_varint(f) -> int | None:
+    n = shift = 0
+    while True:
+        byte = f.read(1)
+        if not byte:
+            return None
+        n |= (byte[0] & 0x7F) << shift
+        if byte[0] < 0x80:
+            return n
+        shift += 7
+
+
+class OutputRecorder:
+    """Append chunks of one server's output to a recording file"""
+
+    def __init__(self, path, server_id: str):
+        self.path = path
+        self.server_id = server_id
+        self.chunks = 0
+        self.bytes = 0
+        self._file = gzip.open(path, "wb", compresslevel=COMPRESS_LEVEL)  # noqa: SIM115 - open until close()
+        self._file.write(MAGIC)
+        header = {"server_id": server_id, "started": time.time()}
+        self._file.write(json.dumps(header).encode() + b"\n")
+        self._last = time.monotonic()
+
+    @property
+    def full(self) -> bool:
+        return self.bytes >= MAX_RECORDING_BYTES
+
+    def record(self, stream: str, data: bytes, now=None) -> None:
+        now = time.monotonic() if now is None else now
+        delay_us = max(0, round((now - self._last) * 1_000_000))
+        self._last = now
+        self._file.write(_varint(delay_us) + bytes((STREAMS.index(stream),)) + _varint(len(data)) + data)
+        self.chunks += 1
+        self.bytes += len(data)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def describe(self) -> str:
+        return f"{self.chunks:,} chunks ({self.bytes / (1024 * 1024):.1f} MB) to {self.path}"
+
+
+class OutputRecording:
+    """A recording opened for reading; iterate it for (seconds since start, stream, bytes)"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = gzip.open(path, "rb")  # noqa: SIM115 - open until close()
+        try:
+            magic = self._file.read(len(MAGIC))
+            header = json.loads(self._file.readline()) if magic == MAGIC else None
+        except (OSError, EOFError, ValueError) as e:
+            self._file.close()
+            raise RecordingFormatError(path, str(e)) from e
+        if not isinstance(header, dict):
+            self._file.close()
+            raise RecordingFormatError(path, "missing header")
+        self.server_id = header.get("server_id") or ""
+        self.started = header.get("started")
+
+    def __iter__(self):
+        elapsed = 0.0
+        f = self._file
+        try:
+            while True:
+                delay_us = _read_varint(f)
+                stream = f.read(1)
+                size = _read_varint(f) if stream else None
+                if size is None:
+                    return
+                data = f.read(size)
+                if len(data) < size:
+                    return
+                elapsed += delay_us / 1_000_000
+                yield elapsed, STREAMS[stream[0] & 1], data
+        except (OSError, EOFError):
+            # A recording cut short (the manager was killed) replays up to its last whole chunk
+            return
+
+    def close(self) -> None:
+        self._file.close()
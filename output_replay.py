@@ -0,0 +1,104 @@
+import time
+
+from PyQt6.QtCore import QObject, Qt, QTimer, pyqtSignal
+
+from output_recording import OutputRecording
+from process_manager import ProcessManager
+
+SLICE_MS = 20  # longest stretch of replaying before the event loop gets control back
+# Replay speeds offered by the GUI; 0 replays as fast as the pipeline takes it
+SPEEDS = (("Real time", 1.0), ("10x", 10.0), ("100x", 100.0), ("Max speed", 0.0))
+
+
+class OutputReplay(QObject):
+    """Feed a recording through ProcessManager's ingest path at real time, faster, or at max speed.
+
+    Chunks are handed to ``ProcessManager.ingest_output`` from timers on the
+    event loop, exactly as output from a running server would be, so log
+    storage, budgets, alert rules and the log views see the same workload. At
+    max speed the loop still gets control back every SLICE_MS.
+    """
+
+    finished = pyqtSignal(str, str)  # server_id, summary
+
+    def __init__(self, process_manager: ProcessManager, path, server_id: str, config=None, speed: float = 1.0):
+        super().__init__(process_manager)
+        self.process_manager = process_manager
+        self.server_id = server_id
+        self.config = config
+        self.speed = speed
+        self.recording = OutputRecording(path)  # raises OSError or RecordingFormatError
+        self.chunks = 0
+        self.bytes = 0
+        self.recorded_s = 0.0
+        self._records = iter(self.recording)
+        self._next = None  # (seconds since start, stream, bytes) waiting for its time
+        self._started = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._step)
+
+    def is_active(self) -> bool:
+        return self._started is not None and self.recording is not None
+
+    def start(self) -> bool:
+        """Begin replaying; False if the server is running"""
+        speed = f"{self.speed:g}x" if self.speed else "max speed"
+        description = f"{self.recording.path} at {speed}"
+        if not self.process_manager.begin_replay(self.server_id, self.config, description):
+            self.recording.close()
+            return False
+        self._started = time.monotonic()
+        self.process_manager.status_changed.connect(self._on_status_changed)
+        self._timer.start(0)
+        return True
+
+    def _on_status_changed(self, server_id, status):
+        if server_id == self.server_id and server_id in self.process_manager.processes:
+            self.stop("the server was started")
+
+    def stop(self, reason: str | None = None) -> None:
+        """End the replay now; ``finished`` is emitted with the summary"""
+        if not self.is_active():
+            return
+        self._timer.stop()
+        self.process_manager.status_changed.disconnect(self._on_status_changed)
+        self.recording.close()
+        self.recording = None
+        summary = self.summary() + (f" ({reason})" if reason else "")
+        self.process_manager.end_replay(self.server_id, summary)
+        self.finished.emit(self.server_id, summary)
+
+    def summary(self) -> str:
+        elapsed = time.monotonic() - self._started if self._started is not None else 0.0
+        return (
+            f"{self.chunks:,} chunks ({self.bytes / (1024 * 1024):.1f} MB) recorded over {self.recorded_s:.1f}s "
+            f"replayed in {elapsed:.1f}s"
+        )
+
+    def _step(self):
+        if self.recording is None:
+            return
+        slice_end = time.monotonic() + SLICE_MS / 1000
+        while True:
+            if self._next is None:
+                self._next = next(self._records, None)
+                if self._next is None:
+                    self.stop()
+                    return
+            at, stream, data = self._next
+            now = time.monotonic()
+            if self.speed:
+                wait = self._started + at / self.speed - now
+                if wait > 0:
+                    self._timer.start(max(1, round(wait * 1000)))
+                    return
+            if now >= slice_end:
+                self._timer.start(0)
+                return
+            self._next = None
+            self.chunks += 1
+            self.bytes += len(data)
+            self.recorded_s = at
+            self.process_manager.ingest_output(self.server_id, stream, data)
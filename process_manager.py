@@ -1,191 +1,235 @@
-import os
-import shlex
-import subprocess
-
-from PyQt6.QtCore import QObject, QProcess, QProcessEnvironment, pyqtSignal
+from PyQt6.QtCore import QObject, QProcess, QProcessEnvironment, QTimer, pyqtSignal
 
+import process_tree
 from models import ServerConfig
+from server_core import STOP_TIMEOUT_S, Launcher, ServerCore
+
+STOP_TIMEOUT_MS = int(STOP_TIMEOUT_S * 1000)
+START_TIMEOUT_MS = 3000
+
+
+class QtProcess:
+    """Launcher handle of a QProcess child"""
+
+    def __init__(self, process: QProcess, on_output, on_exit):
+        self.process = process
+        self.pid = process.processId()
+        self._on_output = on_output
+        # QProcess reads what is left in the pipes before it emits finished
+        process.readyReadStandardOutput.connect(lambda: self._read_stdout())
+        process.readyReadStandardError.connect(lambda: self._read_stderr())
+        process.finished.connect(
+            lambda exit_code, exit_status: on_exit(exit_code, exit_status == QProcess.ExitStatus.CrashExit)
+        )
+
+    def _read_stdout(self):
+        data = bytes(self.process.readAllStandardOutput())
+        if data:
+            self._on_output("stdout", data)
+
+    def _read_stderr(self):
+        data = bytes(self.process.readAllStandardError())
+        if data:
+            self._on_output("stderr", data)
+
+    def write(self, data: bytes) -> bool:
+        return self.process.write(data) == len(data)
+
+    def terminate(self):
+        self.process.terminate()
+
+    def kill(self):
+        self.process.kill()
+
+    def flush(self):
+        self._read_stdout()
+        self._read_stderr()
+
+
+class QtLauncher(Launcher):
+    """Launch servers as QProcess children of the manager"""
+
+    detaches = True
+
+    def spawn(self, server_id, program, args, env, cwd, on_output, on_exit):
+        process = self._create_process(program, args, env, cwd)
+        process.start()
+        # Check if process started successfully
+        if not process.waitForStarted(START_TIMEOUT_MS):
+            raise OSError(process.errorString())
+        return QtProcess(process, on_output, on_exit)
+
+    def spawn_detached(self, server_id, program, args, env, cwd):
+        process = self._create_process(program, args, env, cwd)
+        # Detached children would otherwise inherit the manager's own stdio
+        process.setStandardInputFile(QProcess.nullDevice())
+        process.setStandardOutputFile(QProcess.nullDevice())
+        process.setStandardErrorFile(QProcess.nullDevice())
+        ok, pid = process.startDetached()
+        if not ok:
+            raise OSError(process.errorString())
+        return pid
+
+    def _create_process(self, program, args, env, cwd):
+        """Create a QProcess with the server's environment, session and working directory"""
+        process = QProcess()
+        process.setProgram(program)
+        process.setArguments(args)
+        environment = QProcessEnvironment.systemEnvironment()
+        for key, value in env.items():
+            environment.insert(key, value)
+        process.setProcessEnvironment(environment)
+        # Give each server its own session/process group so stop can reclaim grandchildren
+        if process_tree.supports_process_groups():
+            process.setUnixProcessParameters(QProcess.UnixProcessFlag.CreateNewSession)
+        if cwd:
+            process.setWorkingDirectory(cwd)
+        return process
 
 
 class ProcessManager(QObject):
+    """Qt adapter of ServerCore: launches servers as QProcesses and re-emits the core's events as signals"""
+
     status_changed = pyqtSignal(str, str)  # server_id, new_status
     output_received = pyqtSignal(str, str)  # server_id, output
     error_occurred = pyqtSignal(str, str)  # server_id, error
+    stderr_received = pyqtSignal(str, str)  # server_id, every chunk of stderr output
     logs_updated = pyqtSignal(str)  # server_id
+    limit_hit = pyqtSignal(str, str)  # server_id, reason
+    server_ready = pyqtSignal(str)  # server_id
+    readiness_failed = pyqtSignal(str, str)  # server_id, reason
+    alert_raised = pyqtSignal(str, str, str)  # server_id, alert rule name, matching line
 
-    def __init__(self):
+    def __init__(self, state_dir=None):
         super().__init__()
-        self.processes = {}  # server_id: QProcess
-        self.configs = {}  # server_id: ServerConfig
-        self.logs = {}  # server_id: list of log entries
+        self.core = ServerCore(
+            state_dir=state_dir,
+            launcher=QtLauncher(),
+            call_later=lambda seconds, callback: QTimer.singleShot(int(seconds * 1000), callback),
+        )
+        self.core.subscribe(self._on_core_event)
+
+    def _on_core_event(self, event):
+        server_id = event["server"]
+        kind = event["type"]
+        if kind == "log":
+            self.logs_updated.emit(server_id)
+        elif kind == "output":
+            signal = self.stderr_received if event["stream"] == "stderr" else self.output_received
+            signal.emit(server_id, event["text"])
+        elif kind == "status":
+            self.status_changed.emit(server_id, event["status"])
+        elif kind == "ready":
+            self.server_ready.emit(server_id)
+        elif kind == "ready_failed":
+            self.readiness_failed.emit(server_id, event["reason"])
+        elif kind == "limit_hit":
+            self.limit_hit.emit(server_id, event["reason"])
+        elif kind == "alert":
+            self.alert_raised.emit(server_id, event["rule"], event["line"])
+        elif kind == "error":
+            self.error_occurred.emit(server_id, event["message"])
+
+    # State owned by the core, read by the window and its panels
+
+    @property
+    def processes(self):
+        return self.core.processes
+
+    @property
+    def logs(self):
+        return self.core.logs
+
+    @property
+    def history(self):
+        return self.core.history
+
+    @property
+    def limit_hits(self):
+        return self.core.limit_hits
+
+    @property
+    def start_times(self):
+        return self.core.start_times
+
+    @property
+    def recorders(self):
+        return self.core.recorders
+
+    @property
+    def events(self):
+        return self.core.events
+
+    @property
+    def state_dir(self):
+        return self.core.state_dir
+
+    # Operations
 
-    # ruff: noqa: C901
     def start_server(self, config: ServerConfig):
         """Start a server process using its configuration"""
-        server_id = config.id
-
-        if server_id in self.processes:
-            self.error_occurred.emit(server_id, "Server already running")
-            return False
-
-        # Initialize logs for this server
-        self.logs[server_id] = []
-        self.logs[server_id].append(f"Starting server '{server_id}'...")
-        self.logs[server_id].append(f"Command: {config.command} {" ".join(config.arguments)}")
-        if config.working_dir:
-            self.logs[server_id].append(f"Working directory: {config.working_dir}")
-        if config.env_vars:
-            self.logs[server_id].append(f"Environment variables: {config.env_vars}")
-
-        # Build shell-wrapped command so user shell environment is available
-        if os.name == "nt":
-            shell = os.environ.get("COMSPEC", "cmd.exe")
-            # Properly quote the command line for cmd.exe
-            full_cmd = subprocess.list2cmdline([config.command, *list(config.arguments)])
-            shell_args = ["/C", full_cmd]
-        else:
-            shell = os.environ.get("SHELL", "/bin/bash") or "/bin/bash"
-            # Safely quote for POSIX shells
-            try:
-                full_cmd = shlex.join([config.command, *list(config.arguments)])
-            except AttributeError:
-                # Fallback if shlex.join is unavailable
-                full_cmd = " ".join(shlex.quote(x) for x in [config.command, *list(config.arguments)])
-            # Use a login shell to load user profiles, and execute the command
-            shell_args = ["-lc", full_cmd]
-
-        self.logs[server_id].append(f"Shell: {shell}")
-        self.logs[server_id].append(f"Shell command: {shell} {" ".join(shell_args)}")
-        self.logs[server_id].append("--- Server Output ---")
-        self.logs_updated.emit(server_id)
-
-        # Create and configure process
-        process = QProcess()
-        process.setProgram(shell)
-        process.setArguments(shell_args)
-
-        # Set environment variables
-        env = QProcessEnvironment.systemEnvironment()
-        for key, value in config.env_vars.items():
-            env.insert(key, value)
-        process.setProcessEnvironment(env)
-
-        # Set working directory if specified
-        if config.working_dir:
-            process.setWorkingDirectory(config.working_dir)
-
-        # Connect signals
-        process.readyReadStandardOutput.connect(lambda: self._handle_stdout(server_id, process))
-        process.readyReadStandardError.connect(lambda: self._handle_stderr(server_id, process))
-        process.stateChanged.connect(lambda state: self._handle_state_change(server_id, state))
-        process.finished.connect(
-            lambda exit_code, exit_status: self._handle_finished(server_id, exit_code, exit_status)
-        )
+        return self.core.start_server(config)
 
-        # Start process
-        try:
-            process.start()
+    def stop_server(self, server_id):
+        """Stop a running server; SIGKILL follows after STOP_TIMEOUT_MS without blocking the UI"""
+        return self.core.stop_server(server_id)
 
-            # Check if process started successfully
-            if not process.waitForStarted(3000):  # Wait up to 3 seconds
-                error_msg = f"Failed to start process: {process.errorString()}"
-                self.logs[server_id].append(f"ERROR: {error_msg}")
-                self.logs_updated.emit(server_id)
-                self.error_occurred.emit(server_id, error_msg)
-                return False
+    def begin_stop(self, server_id):
+        return self.core.begin_stop(server_id)
 
-            self.processes[server_id] = process
-            self.configs[server_id] = config
+    def force_stop(self, server_id, pids=()):
+        self.core.force_stop(server_id, pids)
 
-            # Add startup log entry
-            if server_id in self.logs:
-                self.logs[server_id].append("Process started successfully")
-                self.logs_updated.emit(server_id)
+    def is_stopped(self, server_id, pids=()):
+        return self.core.is_stopped(server_id, pids)
 
-            self.status_changed.emit(server_id, "starting")
-            return True
+    def is_ready(self, server_id):
+        return self.core.is_ready(server_id)
 
-        except Exception as e:
-            error_msg = f"Exception starting process: {e!s}"
-            self.logs[server_id].append(f"ERROR: {error_msg}")
-            self.logs_updated.emit(server_id)
-            self.error_occurred.emit(server_id, error_msg)
-            return False
+    def is_detached(self, server_id):
+        return self.core.is_detached(server_id)
+
+    def get_status(self, server_id):
+        return self.core.get_status(server_id)
 
     def get_logs(self, server_id):
-        """Get logs for a server"""
-        return "\n".join(self.logs.get(server_id, []))
+        return self.core.get_logs(server_id)
 
     def clear_logs(self, server_id):
-        """Clear logs for a server"""
-        if server_id in self.logs:
-            self.logs[server_id] = []
-            self.logs_updated.emit(server_id)
+        self.core.clear_logs(server_id)
 
-    def stop_server(self, server_id):
-        """Stop a running server process"""
-        if server_id not in self.processes:
-            return False
-
-        process = self.processes[server_id]
-        if process.state() == QProcess.ProcessState.Running:
-            # Try graceful termination first
-            process.terminate()
-            if not process.waitForFinished(5000):  # 5s timeout
-                process.kill()
-        return True
+    def append_log(self, server_id, message):
+        self.core.append_log(server_id, message)
 
-    def get_status(self, server_id):
-        """Get current status of a server"""
-        if server_id not in self.processes:
-            return "offline"
-
-        process = self.processes[server_id]
-        state = process.state()
-
-        if state == QProcess.ProcessState.Running:
-            return "online"
-        elif state == QProcess.ProcessState.Starting:
-            return "starting"
-        else:
-            return "offline"
-
-    def _handle_stdout(self, server_id, process):
-        """Handle standard output from process"""
-        output = bytes(process.readAllStandardOutput()).decode("utf-8")
-        self.output_received.emit(server_id, output)
-        if server_id in self.logs:
-            self.logs[server_id].append(output)
-            self.logs_updated.emit(server_id)
+    def write_stdin(self, server_id, data: bytes) -> bool:
+        return self.core.write_stdin(server_id, data)
 
-    def _handle_stderr(self, server_id, process):
-        """Handle error output from process"""
-        error = bytes(process.readAllStandardError()).decode("utf-8")
-        self.error_occurred.emit(server_id, error)
-        self.status_changed.emit(server_id, "error")
-        if server_id in self.logs:
-            self.logs[server_id].append(f"ERROR: {error}")
-            self.logs_updated.emit(server_id)
+    def reattach_servers(self, configs):
+        return self.core.reattach_servers(configs)
+
+    def find_orphans(self):
+        return self.core.find_orphans()
+
+    def flush_output(self):
+        self.core.flush_output()
+
+    def restore_session(self):
+        self.core.restore_session()
+
+    def save_session(self, server_ids, statuses=None):
+        self.core.save_session(server_ids, statuses)
+
+    def start_recording(self, server_id, path):
+        self.core.start_recording(server_id, path)
+
+    def stop_recording(self, server_id):
+        return self.core.stop_recording(server_id)
+
+    def ingest_output(self, server_id, stream, data: bytes):
+        self.core.ingest_output(server_id, stream, data)
+
+    def begin_replay(self, server_id, config, description):
+        return self.core.begin_replay(server_id, config, description)
 
-    def _handle_state_change(self, server_id, state):
-        """Handle process state changes"""
-        if state == QProcess.ProcessState.Running:
-            self.status_changed.emit(server_id, "online")
-            if server_id in self.logs:
-                self.logs[server_id].append("Server is now running")
-                self.logs_updated.emit(server_id)
-        elif state == QProcess.ProcessState.NotRunning:
-            self.status_changed.emit(server_id, "offline")
-            if server_id in self.logs:
-                self.logs[server_id].append("Server stopped")
-                self.logs_updated.emit(server_id)
-
-    def _handle_finished(self, server_id, exit_code, exit_status):
-        """Clean up when process finishes"""
-        if server_id in self.processes:
-            self.processes.pop(server_id)
-            self.configs.pop(server_id)
-            self.status_changed.emit(server_id, "offline")
-            if server_id in self.logs:
-                self.logs[server_id].append(f"Process exited with code {exit_code}")
-                self.logs_updated.emit(server_id)
+    def end_replay(self, server_id, summary):
+        self.core.end_replay(server_id, summary)
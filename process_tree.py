@@ -0,0 +1,199 @@
+"""Helpers for tracking and reclaiming whole server process trees on Linux.
+
+Every server is launched as the leader of its own session/process group, so the
+real server (``npx`` -> ``node``, ``uvx`` -> ``python``, ...) lives in the same
+group as the ``$SHELL -lc`` wrapper. Stopping a server signals the group, then
+walks ``/proc`` to make sure no descendant survived.
+"""
+
+import os
+from pathlib import Path
+from typing import NamedTuple
+
+PROC_ROOT = Path("/proc")
+
+# Marker placed in every child's environment so leftovers can be found later
+SERVER_ID_ENV = "MCP_MANAGER_SERVER_ID"
+
+
+class ProcStat(NamedTuple):
+    pid: int
+    state: str
+    ppid: int
+    pgrp: int
+    session: int
+    utime: int  # clock ticks
+    stime: int  # clock ticks
+    starttime: int  # clock ticks since boot
+    rss_pages: int
+
+
+def has_procfs() -> bool:
+    """Return True when /proc is available for process inspection"""
+    return (PROC_ROOT / "self" / "stat").exists()
+
+
+def supports_process_groups() -> bool:
+    """Return True when servers can be placed in their own process group"""
+    return os.name == "posix"
+
+
+def read_stat(pid: int) -> ProcStat | None:
+    """Parse /proc/<pid>/stat, returning None if the process is gone"""
+    try:
+        raw = (PROC_ROOT / str(pid) / "stat").read_text()
+    except (FileNotFoundError, ProcessLookupError, PermissionError, OSError):
+        return None
+    # The command name may contain spaces and parentheses; fields start after the last ')'
+    fields = raw[raw.rfind(")") + 2 :].split()
+    try:
+        return ProcStat(
+            pid=pid,
+            state=fields[0],
+            ppid=int(fields[1]),
+            pgrp=int(fields[2]),
+            session=int(fields[3]),
+            utime=int(fields[11]),
+            stime=int(fields[12]),
+            starttime=int(fields[19]),
+            rss_pages=int(fields[21]),
+        )
+    except (IndexError, ValueError):
+        return None
+
+
+def iter_processes():
+    """Yield a ProcStat for every process visible in /proc"""
+    try:
+        entries = os.listdir(PROC_ROOT)
+    except OSError:
+        return
+    for name in entries:
+        if name.isdigit():
+            stat = read_stat(int(name))
+            if stat is not None:
+                yield stat
+
+
+def is_alive(pid: int) -> bool:
+    """Return True if the process exists and is not a zombie"""
+    if has_procfs():
+        stat = read_stat(pid)
+        return stat is not None and stat.state not in ("Z", "X")
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def descendants(pid: int, processes: list[ProcStat] | None = None) -> list[int]:
+    """Return all descendant PIDs of ``pid`` (children, grandchildren, ...)"""
+    procs = processes if processes is not None else list(iter_processes())
+    children: dict[int, list[int]] = {}
+    for p in procs:
+        children.setdefault(p.ppid, []).append(p.pid)
+    found = []
+    stack = list(children.get(pid, []))
+    while stack:
+        child = stack.pop()
+        found.append(child)
+        stack.extend(children.get(child, []))
+    return found
+
+
+def tree_pids(pid: int, pgid: int | None = None) -> set[int]:
+    """Return the root PID, its descendants and every member of its process group/session.
+
+    Descendants that moved themselves into a new session are still caught through
+    the parent links, and group members already reparented to init are caught
+    through the group id.
+    """
+    procs = list(iter_processes())
+    group = pgid if pgid is not None else pid
+    pids = {pid, *descendants(pid, procs)}
+    pids.update(p.pid for p in procs if p.pgrp == group or p.session == group)
+    pids.discard(os.getpid())
+    return pids
+
+
+def signal_group(pgid: int, sig: int) -> bool:
+    """Send ``sig`` to a whole process group. Returns False if the group is gone"""
+    try:
+        os.killpg(pgid, sig)
+    except (ProcessLookupError, PermissionError):
+        return False
+    return True
+
+
+def signal_pids(pids, sig: int) -> None:
+    """Send ``sig`` to each PID, ignoring processes that already exited"""
+    for pid in pids:
+        try:
+            os.kill(pid, sig)
+        except (ProcessLookupError, PermissionError):
+            continue
+
+
+def group_rss_bytes(pgid: int) -> int:
+    """Return the summed resident set size of every process in a group/session"""
+    page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+    return sum(
+        p.rss_pages * page_size for p in iter_processes() if (p.pgrp == pgid or p.session == pgid) and p.state != "Z"
+    )
+
+
+def group_usage(pgids) -> dict[int, tuple[int, float]]:
+    """Return {pgid: (RSS bytes, CPU seconds)} summed over each group/session from one /proc scan"""
+    page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+    ticks = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+    wanted = set(pgids)
+    usage = dict.fromkeys(wanted, (0, 0.0))
+    if not wanted:
+        return usage
+    for p in iter_processes():
+        if p.state == "Z":
+            continue
+        group = p.pgrp if p.pgrp in wanted else p.session if p.session in wanted else None
+        if group is not None:
+            rss, cpu = usage[group]
+            usage[group] = (rss + p.rss_pages * page_size, cpu + (p.utime + p.stime) / ticks)
+    return usage
+
+
+def read_environ_value(pid: int, key: str) -> str | None:
+    """Return the value of ``key`` in another process's environment, if readable"""
+    try:
+        raw = (PROC_ROOT / str(pid) / "environ").read_bytes()
+    except (FileNotFoundError, ProcessLookupError, PermissionError, OSError):
+        return None
+    prefix = key.encode() + b"="
+    for entry in raw.split(b"\0"):
+        if entry.startswith(prefix):
+            return entry[len(prefix) :].decode("utf-8", errors="replace")
+    return None
+
+
+def find_orphans(exclude_pids=()) -> dict[str, list[int]]:
+    """Find processes left behind by earlier manager runs.
+
+    Returns a mapping of server ID to the leader PIDs of the process groups still
+    carrying that server's environment marker.
+    """
+    if not has_procfs():
+        return {}
+    excluded = set(exclude_pids)
+    excluded.add(os.getpid())
+    orphans: dict[str, set[int]] = {}
+    for stat in iter_processes():
+        if stat.pid in excluded or stat.ppid in excluded or stat.state == "Z":
+            continue
+        server_id = read_environ_value(stat.pid, SERVER_ID_ENV)
+        if server_id is None:
+            continue
+        # Report the group leader when it is still around, otherwise the process itself
+        leader = stat.pgrp if stat.pgrp > 0 and is_alive(stat.pgrp) else stat.pid
+        orphans.setdefault(server_id, set()).add(leader)
+    return {server_id: sorted(pids) for server_id, pids in orphans.items()}
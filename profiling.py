@@ -0,0 +1,296 @@
+"""On-demand profiling of a running manager: cProfile, tracemalloc and a stack sampler.
+
+Profiles are started from the Diagnostics tab, the ``mcp-manager profile``
+command or the ``MCP_MANAGER_PROFILE`` environment variable, and write their
+artifacts to the config directory next to ``mcp_servers.json``:
+
+- ``profile-cpu-<time>.pstats`` and ``.txt``: cProfile of the main thread
+- ``profile-memory-<time>.txt`` (and ``-diff.txt`` against the previous
+  snapshot): tracemalloc top allocations
+- ``profile-stacks-<time>.collapsed``: sampled stacks of every thread in the
+  collapsed format read by flamegraph.pl and speedscope
+
+This module is free of Qt; the host passes ``call_later(seconds, callback)`` so
+timed profiles stop on its own event loop.
+"""
+
+import cProfile
+import io
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+ENV_VAR = "MCP_MANAGER_PROFILE"  # e.g. "cpu:30,sample:60,memory"
+ACTIONS = ("cpu-start", "cpu-stop", "memory-snapshot", "memory-stop", "sample-start", "sample-stop", "status")
+ARTIFACT_PREFIX = "profile-"
+DEFAULT_SAMPLE_INTERVAL_MS = 10
+REPORT_LINES = 50
+TRACEMALLOC_FRAMES = 10
+
+
+class ProfilingError(Exception):
+    """Exception raised for invalid or conflicting profiling requests."""
+
+    def __init__(self, message: str = "Invalid profiling request") -> None:
+        self.message = message
+        super().__init__(self.message)
+
+
+class UnknownActionError(ProfilingError):
+    """Exception raised for a profiling action that does not exist."""
+
+    def __init__(self, action) -> None:
+        super().__init__(f"Unknown profiling action '{action}'; expected one of {', '.join(ACTIONS)}")
+
+
+class InvalidDurationError(ProfilingError):
+    """Exception raised when a profile duration is not a positive number."""
+
+    def __init__(self) -> None:
+        super().__init__("'seconds' must be a positive number")
+
+
+class ProfileRunningError(ProfilingError):
+    """Exception raised when a profile of the same kind is already running."""
+
+    def __init__(self, kind: str) -> None:
+        super().__init__(f"A {kind} profile is already running")
+
+
+class ProfileNotRunningError(ProfilingError):
+    """Exception raised when stopping a profile that is not running."""
+
+    def __init__(self, kind: str) -> None:
+        super().__init__(f"No {kind} profile is running")
+
+
+class ProfileFailedError(ProfilingError):
+    """Exception raised when a profiling action fails, e.g. writing its artifacts."""
+
+    def __init__(self, action: str, error: Exception) -> None:
+        super().__init__(f"Profiling action '{action}' failed: {error}")
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Sample the stacks of all other threads from a background thread"""
+
+    def __init__(self, path: Path, interval_ms: float = DEFAULT_SAMPLE_INTERVAL_MS, duration_s: float | None = None):
+        self.path = path
+        self.interval_s = max(interval_ms, 1) / 1000
+        self.duration_s = duration_s
+        self.counts = Counter()  # collapsed stack: samples
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="mcp-stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def is_running(self) -> bool:
+        return self._thread.is_alive()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _sample(self, own_ident):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            stack.append(f"thread {names.get(ident, ident)}")
+            self.counts[";".join(reversed(stack))] += 1
+        self.samples += 1
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        deadline = time.monotonic() + self.duration_s if self.duration_s else None
+        while not self._stop.wait(self.interval_s):
+            self._sample(own_ident)
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+        try:
+            with open(self.path, "w") as f:
+                for stack, count in self.counts.most_common():
+                    f.write(f"{stack} {count}\n")
+            print(f"[DEBUG] Wrote {self.samples} stack samples to {self.path}")
+        except OSError as e:
+            print(f"[ERROR] Writing stack samples: {e}")
+
+
+class Profiler:
+    """Start and stop profiles of this process and write their artifacts to ``output_dir``"""
+
+    def __init__(self, output_dir, call_later=None):
+        self.output_dir = Path(output_dir)
+        self.call_later = call_later  # call_later(seconds, callback) on the host's event loop
+        self._cpu = None  # (cProfile.Profile, artifact base path)
+        self._cpu_run = 0  # increments per CPU profile so a stale timer cannot stop a newer one
+        self._sampler = None
+        self._previous_snapshot = None
+
+    def _artifact(self, kind: str) -> Path:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        now = time.time()
+        stamp = f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}-{int(now * 1000) % 1000:03d}"
+        return self.output_dir / f"{ARTIFACT_PREFIX}{kind}-{stamp}"
+
+    def start_cpu(self, seconds: float | None = None) -> Path:
+        """Start profiling the main thread; returns the artifact path without suffix"""
+        if self._cpu is not None:
+            raise ProfileRunningError("CPU")
+        profile = cProfile.Profile()
+        base = self._artifact("cpu")
+        profile.enable()
+        self._cpu = (profile, base)
+        self._cpu_run += 1
+        if seconds and self.call_later is not None:
+            run = self._cpu_run
+            self.call_later(
+                seconds, lambda: self._cpu_run == run and self._cpu is not None and self._stop_cpu_quietly()
+            )
+        print(f"[DEBUG] CPU profile started{f' for {seconds}s' if seconds else ''}")
+        return base
+
+    def stop_cpu(self) -> list[Path]:
+        if self._cpu is None:
+            raise ProfileNotRunningError("CPU")
+        profile, base = self._cpu
+        self._cpu = None
+        profile.disable()
+        stats_path = base.with_suffix(".pstats")
+        report_path = base.with_suffix(".txt")
+        profile.dump_stats(stats_path)
+        import pstats  # only needed for the report; costs tens of milliseconds to import
+
+        report = io.StringIO()
+        pstats.Stats(profile, stream=report).sort_stats("cumulative").print_stats(REPORT_LINES)
+        report_path.write_text(report.getvalue())
+        print(f"[DEBUG] CPU profile written to {stats_path}")
+        return [stats_path, report_path]
+
+    def _stop_cpu_quietly(self) -> None:
+        """Stop the CPU profile from a timer or on exit, where nobody is there to catch an error"""
+        try:
+            self.stop_cpu()
+        except OSError as e:
+            print(f"[ERROR] Writing CPU profile: {e}")
+
+    def memory_snapshot(self) -> list[Path]:
+        """Take a tracemalloc snapshot, starting tracing on first use, and diff it with the previous one"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._previous_snapshot = None
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        base = self._artifact("memory")
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [f"Traced memory: {current / 1024:.0f} kB (peak {peak / 1024:.0f} kB)", ""]
+        lines += [str(stat) for stat in snapshot.statistics("lineno")[:REPORT_LINES]]
+        paths = [base.with_suffix(".txt")]
+        paths[0].write_text("\n".join(lines) + "\n")
+        if self._previous_snapshot is not None:
+            diff = snapshot.compare_to(self._previous_snapshot, "lineno")[:REPORT_LINES]
+            diff_path = base.parent / f"{base.name}-diff.txt"
+            diff_path.write_text("\n".join(str(stat) for stat in diff) + "\n")
+            paths.append(diff_path)
+        self._previous_snapshot = snapshot
+        print(f"[DEBUG] Memory snapshot written to {paths[0]}")
+        return paths
+
+    def stop_memory(self) -> None:
+        if not tracemalloc.is_tracing():
+            raise ProfileNotRunningError("memory")
+        tracemalloc.stop()
+        self._previous_snapshot = None
+
+    def start_sampling(self, seconds: float | None = None, interval_ms: float | None = None) -> Path:
+        """Start the stack sampler; returns the path of the collapsed stacks file"""
+        if self._sampler is not None and self._sampler.is_running():
+            raise ProfileRunningError("sampling")
+        path = self._artifact("stacks").with_suffix(".collapsed")
+        self._sampler = StackSampler(path, interval_ms or DEFAULT_SAMPLE_INTERVAL_MS, seconds)
+        self._sampler.start()
+        print(f"[DEBUG] Stack sampling started{f' for {seconds}s' if seconds else ''}")
+        return path
+
+    def stop_sampling(self) -> list[Path]:
+        if self._sampler is None or not self._sampler.is_running():
+            raise ProfileNotRunningError("sampling")
+        self._sampler.stop()
+        return [self._sampler.path]
+
+    def status(self) -> dict:
+        return {
+            "cpu": self._cpu is not None,
+            "memory": tracemalloc.is_tracing(),
+            "sampling": self._sampler is not None and self._sampler.is_running(),
+            "output_dir": str(self.output_dir),
+        }
+
+    def run(self, action: str, seconds: float | None = None, interval_ms: float | None = None) -> dict:
+        """Run a profiling action by name and describe what happened"""
+        if action not in ACTIONS:
+            raise UnknownActionError(action)
+        if seconds is not None and (not isinstance(seconds, int | float) or seconds <= 0):
+            raise InvalidDurationError
+        try:
+            artifacts = self._run_action(action, seconds, interval_ms)
+        except (OSError, ValueError) as e:
+            # An unwritable output directory, or cProfile refusing to run beside another profiler
+            raise ProfileFailedError(action, e) from e
+        return {"action": action, "artifacts": [str(path) for path in artifacts], **self.status()}
+
+    def _run_action(self, action, seconds, interval_ms) -> list[Path]:
+        artifacts = []
+        if action == "cpu-start":
+            artifacts = [self.start_cpu(seconds).with_suffix(".pstats")]
+        elif action == "cpu-stop":
+            artifacts = self.stop_cpu()
+        elif action == "memory-snapshot":
+            artifacts = self.memory_snapshot()
+        elif action == "memory-stop":
+            self.stop_memory()
+        elif action == "sample-start":
+            artifacts = [self.start_sampling(seconds, interval_ms)]
+        elif action == "sample-stop":
+            artifacts = self.stop_sampling()
+        return artifacts
+
+    def start_from_env(self, value: str | None = None) -> None:
+        """Start the profiles listed in ENV_VAR, e.g. ``cpu:30,sample:60,memory``"""
+        value = os.environ.get(ENV_VAR, "") if value is None else value
+        for item in filter(None, (part.strip() for part in value.split(","))):
+            kind, _, seconds = item.partition(":")
+            action = {"cpu": "cpu-start", "sample": "sample-start", "memory": "memory-snapshot"}.get(kind)
+            if action is None:
+                print(f"[ERROR] {ENV_VAR}: unknown profile '{kind}' (expected cpu, sample or memory)")
+                continue
+            try:
+                self.run(action, float(seconds) if seconds else None)
+            except ValueError:
+                print(f"[ERROR] {ENV_VAR}: invalid duration in '{item}'")
+            except ProfilingError as e:
+                print(f"[ERROR] {ENV_VAR}: {e.message}")
+
+    def stop_all(self) -> None:
+        """Stop running profiles and write their artifacts, e.g. on exit"""
+        if self._cpu is not None:
+            self._stop_cpu_quietly()
+        if self._sampler is not None and self._sampler.is_running():
+            self._sampler.stop()
@@ -0,0 +1,250 @@
+"""Apply per-server resource limits, CPU priority and cgroup placement, and detect limit hits.
+
+Limits enforced with ``setrlimit`` must be applied inside the child before the
+server is exec'd. Every launch does that with ``ulimit`` in the shell wrapper
+(the shell calls ``setrlimit`` on itself before ``exec``). Nice level and CPU
+affinity are applied to the new session leader right after it starts, so the
+server inherits them.
+"""
+
+import contextlib
+import os
+import re
+import signal
+from pathlib import Path
+
+from models import ResourceLimits
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+CGROUP_DIR_NAME = "mcp-manager"
+
+# Output hints that a server died on one of its own limits
+_LIMIT_HINTS = {
+    "open_files": re.compile(r"EMFILE|Too many open files", re.IGNORECASE),
+    "address_space_mb": re.compile(
+        r"ENOMEM|Cannot allocate memory|out of memory|MemoryError|heap out of memory", re.IGNORECASE
+    ),
+}
+
+
+class InvalidCpuListError(ValueError):
+    """Exception raised when a CPU affinity list cannot be parsed."""
+
+    def __init__(self, spec: str) -> None:
+        self.message = f"Invalid CPU list: {spec}"
+        super().__init__(self.message)
+
+
+def parse_cpu_list(spec: str) -> set[int]:
+    """Parse a CPU list such as ``"0-3,6"`` into a set of CPU numbers"""
+    cpus: set[int] = set()
+    for part in spec.replace(" ", "").split(","):
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            lo, hi = int(start), int(end)
+            if hi < lo:
+                raise InvalidCpuListError(spec)
+            cpus.update(range(lo, hi + 1))
+        else:
+            cpus.add(int(part))
+    return cpus
+
+
+def validate(limits: ResourceLimits) -> list[str]:
+    """Return a list of validation errors for the given limits"""
+    errors = []
+    for field in ("address_space_mb", "rss_mb", "open_files", "cpu_seconds"):
+        if getattr(limits, field) < 0:
+            errors.append(f"{field.replace('_', ' ').capitalize()} must not be negative")
+    if not -20 <= limits.nice <= 19:
+        errors.append("Nice level must be between -20 and 19")
+    if limits.cpu_affinity:
+        try:
+            parse_cpu_list(limits.cpu_affinity)
+        except ValueError:
+            errors.append(f"Invalid CPU affinity list: {limits.cpu_affinity}")
+    return errors
+
+
+def _rlimits(limits: ResourceLimits) -> list[tuple[str, int, str]]:
+    """Return (resource name, value, ulimit flag) for each configured rlimit"""
+    result = []
+    if limits.address_space_mb:
+        result.append(("RLIMIT_AS", limits.address_space_mb * 1024 * 1024, "-v"))
+    if limits.open_files:
+        result.append(("RLIMIT_NOFILE", limits.open_files, "-n"))
+    if limits.cpu_seconds:
+        result.append(("RLIMIT_CPU", limits.cpu_seconds, "-t"))
+    return result
+
+
+def wrap_shell_command(command: str, limits: ResourceLimits, exec_command: bool = True) -> str:
+    """Prefix a POSIX shell command line with ``ulimit`` calls and (by default) exec the server"""
+    prelude = []
+    for name, value, flag in _rlimits(limits):
+        # ulimit -v takes KiB; the others take the raw count/seconds
+        prelude.append(f"ulimit {flag} {value // 1024 if name == 'RLIMIT_AS' else value}")
+    if not prelude:
+        return command
+    return " && ".join([*prelude, f"exec {command}" if exec_command else command])
+
+
+def apply_to_process(pid: int, limits: ResourceLimits) -> list[str]:
+    """Apply nice level and CPU affinity to a running process. Returns warnings for the log"""
+    warnings = []
+    if limits.nice:
+        try:
+            os.setpriority(os.PRIO_PROCESS, pid, limits.nice)
+        except (PermissionError, ProcessLookupError, OSError) as e:
+            warnings.append(f"Could not set nice level {limits.nice}: {e!s}")
+    if limits.cpu_affinity:
+        if not hasattr(os, "sched_setaffinity"):
+            warnings.append("CPU affinity is not supported on this platform")
+        else:
+            try:
+                os.sched_setaffinity(pid, parse_cpu_list(limits.cpu_affinity))
+            except (ValueError, PermissionError, ProcessLookupError, OSError) as e:
+                warnings.append(f"Could not set CPU affinity '{limits.cpu_affinity}': {e!s}")
+    return warnings
+
+
+def describe(limits: ResourceLimits) -> str:
+    """Return a short human readable summary of the configured limits"""
+    parts = []
+    if limits.address_space_mb:
+        parts.append(f"address space {limits.address_space_mb} MB")
+    if limits.rss_mb:
+        parts.append(f"RSS {limits.rss_mb} MB")
+    if limits.open_files:
+        parts.append(f"open files {limits.open_files}")
+    if limits.cpu_seconds:
+        parts.append(f"CPU time {limits.cpu_seconds}s")
+    if limits.nice:
+        parts.append(f"nice {limits.nice}")
+    if limits.cpu_affinity:
+        parts.append(f"CPUs {limits.cpu_affinity}")
+    if limits.cgroup:
+        parts.append(f"cgroup {limits.cgroup}")
+    return ", ".join(parts)
+
+
+# ---------- cgroup v2 ----------
+
+
+def _own_cgroup() -> Path | None:
+    """Return this process's cgroup v2 directory, or None without a unified hierarchy"""
+    if not (CGROUP_ROOT / "cgroup.controllers").exists():
+        return None
+    try:
+        for line in Path("/proc/self/cgroup").read_text().splitlines():
+            if line.startswith("0::"):
+                return CGROUP_ROOT / line[3:].lstrip("/")
+    except OSError:
+        return None
+    return None
+
+
+def delegated_cgroup_base() -> Path | None:
+    """Find a writable cgroup v2 directory next to our own one (e.g. under a systemd user slice)"""
+    own = _own_cgroup()
+    if own is None or own == CGROUP_ROOT:
+        return None
+    parent = own.parent
+    if os.access(parent, os.W_OK) and os.access(parent / "cgroup.procs", os.W_OK):
+        return parent / CGROUP_DIR_NAME
+    return None
+
+
+def _sanitize(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", name) or "server"
+
+
+def place_in_cgroup(server_id: str, pid: int, limits: ResourceLimits) -> tuple[Path | None, str]:
+    """Move ``pid`` into a per-server cgroup and apply memory.max.
+
+    Returns ``(cgroup_path, message)``; ``cgroup_path`` is None when placement was
+    not possible, in which case ``message`` explains why.
+    """
+    if limits.cgroup == "auto":
+        base = delegated_cgroup_base()
+        if base is None:
+            return None, "no delegated cgroup v2 subtree available"
+    else:
+        base = Path(limits.cgroup)
+    path = base / _sanitize(server_id)
+    try:
+        path.mkdir(parents=True, exist_ok=True)
+        if limits.rss_mb:
+            # Controllers must be enabled on the parent before memory.max exists
+            with contextlib.suppress(OSError):
+                (path.parent / "cgroup.subtree_control").write_text("+memory")
+            (path / "memory.max").write_text(str(limits.rss_mb * 1024 * 1024))
+        (path / "cgroup.procs").write_text(str(pid))
+    except OSError as e:
+        return None, f"cgroup placement in {path} failed: {e!s}"
+    return path, f"placed in cgroup {path}"
+
+
+def read_oom_kills(cgroup_path: Path | None) -> int:
+    """Return the oom_kill counter from a cgroup's memory.events (0 if unavailable)"""
+    if cgroup_path is None:
+        return 0
+    try:
+        for line in (cgroup_path / "memory.events").read_text().splitlines():
+            key, _, value = line.partition(" ")
+            if key == "oom_kill":
+                return int(value)
+    except (OSError, ValueError):
+        return 0
+    return 0
+
+
+def remove_cgroup(cgroup_path: Path | None) -> None:
+    """Remove an empty per-server cgroup"""
+    if cgroup_path is None:
+        return
+    with contextlib.suppress(OSError):
+        cgroup_path.rmdir()
+
+
+# ---------- limit hit detection ----------
+
+
+def detect_exit_limit_hit(
+    limits: ResourceLimits,
+    exit_code: int,
+    crashed: bool,
+    oom_kills_before: int = 0,
+    cgroup_path: Path | None = None,
+    stop_requested: bool = False,
+) -> str | None:
+    """Return a reason if the exit looks like a resource limit was hit, otherwise None.
+
+    ``stop_requested`` is set when the manager itself stopped the server: a
+    SIGKILL is then its own stop escalation, not the hard CPU limit.
+    """
+    if crashed and exit_code == signal.SIGXCPU:
+        return f"CPU time limit of {limits.cpu_seconds}s exceeded (SIGXCPU)"
+    if cgroup_path is not None and read_oom_kills(cgroup_path) > oom_kills_before:
+        return f"memory limit of {limits.rss_mb} MB exceeded (killed by the cgroup OOM killer)"
+    if crashed and exit_code == signal.SIGKILL and limits.cpu_seconds and not stop_requested:
+        return f"CPU time limit of {limits.cpu_seconds}s reached (SIGKILL at hard limit)"
+    return None
+
+
+def scan_output_for_limit_hit(limits: ResourceLimits, text: str) -> str | None:
+    """Return a reason if server output suggests a configured limit was hit"""
+    if limits.open_files and _LIMIT_HINTS["open_files"].search(text):
+        return f"open file limit of {limits.open_files} reached"
+    if limits.address_space_mb and _LIMIT_HINTS["address_space_mb"].search(text):
+        return f"address space limit of {limits.address_space_mb} MB reached"
+    return None
+
+
+def rss_over_limit(limits: ResourceLimits, rss_bytes: int) -> str | None:
+    """Return a reason if the measured RSS exceeds the configured limit"""
+    if limits.rss_mb and rss_bytes > limits.rss_mb * 1024 * 1024:
+        return f"RSS limit of {limits.rss_mb} MB exceeded ({rss_bytes // (1024 * 1024)} MB)"
+    return None
@@ -0,0 +1,223 @@
+"""JSON-RPC over a running server's stdio, for the Console tab.
+
+``RpcSession`` writes newline-delimited JSON-RPC 2.0 requests to a server's
+stdin and matches the responses on its stdout to them by ID. Any number of
+requests can be in flight at once, and each response carries its latency.
+``LoadRun`` repeats one request N times with at most C of them in flight. It
+sends the next request as each response arrives, which makes it a small load
+tester for a single server. Free of Qt.
+"""
+
+import json
+import time
+
+from instrumentation import Histogram
+
+REQUEST_TIMEOUT_S = 30.0
+PROTOCOL_VERSION = "2024-11-05"
+# Parameters offered for the common methods; "initialize" is followed by the initialized notification
+TEMPLATES = {
+    "initialize": {
+        "protocolVersion": PROTOCOL_VERSION,
+        "capabilities": {},
+        "clientInfo": {"name": "mcp-manager-console", "version": "1.0"},
+    },
+    "ping": {},
+    "tools/list": {},
+    "tools/call": {"name": "", "arguments": {}},
+    "resources/list": {},
+    "resources/read": {"uri": ""},
+    "prompts/list": {},
+}
+INITIALIZED_NOTIFICATION = "notifications/initialized"
+
+
+class RpcResponse:
+    """The outcome of one request: a result, an error object, or a timeout"""
+
+    __slots__ = ("error", "id", "latency_ms", "method", "result")
+
+    def __init__(self, request_id, method, latency_ms, result=None, error=None):
+        self.id = request_id
+        self.method = method
+        self.latency_ms = latency_ms
+        self.result = result
+        self.error = error  # JSON-RPC error object, or {"message": ...} for a timeout or a stopped server
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class RpcSession:
+    """Requests written to one server's stdin, matched to the responses on its stdout by ID"""
+
+    def __init__(self, write):
+        self._write = write  # write(bytes) -> bool
+        self._next_id = 1
+        self._partial = ""  # stdout after the last newline
+        self.pending = {}  # request id: (method, time.monotonic() when sent)
+        self.latency = Histogram()
+        self.sent = 0
+        self.ok = 0
+        self.errors = 0
+        self.unanswered = 0
+
+    def request(self, method: str, params=None, now=None) -> int | None:
+        """Send a request and return its ID; None if the server's stdin could not be written"""
+        request_id = self._next_id
+        message = {"jsonrpc": "2.0", "id": request_id, "method": method}
+        if params is not None:
+            message["params"] = params
+        if not self._write((json.dumps(message) + "\n").encode()):
+            return None
+        self._next_id += 1
+        self.sent += 1
+        self.pending[request_id] = (method, time.monotonic() if now is None else now)
+        return request_id
+
+    def notify(self, method: str, params=None) -> bool:
+        message = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        return self._write((json.dumps(message) + "\n").encode())
+
+    def feed(self, text: str, now=None) -> list[RpcResponse]:
+        """Return the responses to pending requests found in a chunk of stdout"""
+        if not self.pending:
+            self._partial = ""
+            return []
+        now = time.monotonic() if now is None else now
+        lines = (self._partial + text).split("\n")
+        self._partial = lines.pop()
+        responses = []
+        for line in lines:
+            line = line.strip()
+            if not line.startswith("{"):
+                continue
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+            # Requests from the server (sampling, roots) carry a method and their own IDs
+            if not isinstance(message, dict) or "method" in message:
+                continue
+            request_id = message.get("id")
+            if isinstance(request_id, bool) or request_id not in self.pending:
+                continue
+            method, sent = self.pending.pop(request_id)
+            response = RpcResponse(request_id, method, (now - sent) * 1000, message.get("result"), message.get("error"))
+            self._count(response)
+            responses.append(response)
+        return responses
+
+    def expire(self, now=None, reason=None) -> list[RpcResponse]:
+        """Fail requests older than REQUEST_TIMEOUT_S, or every pending one with ``reason``"""
+        now = time.monotonic() if now is None else now
+        responses = []
+        for request_id, (method, sent) in list(self.pending.items()):
+            if reason is None and now - sent < REQUEST_TIMEOUT_S:
+                continue
+            del self.pending[request_id]
+            message = reason or f"no response after {REQUEST_TIMEOUT_S:.0f}s"
+            response = RpcResponse(request_id, method, (now - sent) * 1000, error={"message": message})
+            self.unanswered += 1
+            responses.append(response)
+        return responses
+
+    def _count(self, response):
+        self.latency.observe(response.latency_ms)
+        if response.ok:
+            self.ok += 1
+        else:
+            self.errors += 1
+
+    def summary(self) -> str:
+        latency = self.latency
+        text = f"{self.sent} sent, {len(self.pending)} in flight, {self.ok} ok, {self.errors} errors"
+        if self.unanswered:
+            text += f", {self.unanswered} unanswered"
+        if latency.count:
+            text += (
+                f"; latency p50 {latency.percentile(50):.1f} ms, p90 {latency.percentile(90):.1f} ms, "
+                f"p99 {latency.percentile(99):.1f} ms, max {latency.max:.1f} ms"
+            )
+        return text
+
+
+def _percentile(ordered, pct):
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+class LoadRun:
+    """One request repeated ``total`` times with at most ``concurrency`` in flight"""
+
+    def __init__(self, session: RpcSession, method: str, params, total: int, concurrency: int):
+        self.session = session
+        self.method = method
+        self.params = params
+        self.total = total
+        self.concurrency = max(1, concurrency)
+        self.in_flight = set()  # request IDs of this run
+        self.latencies = []  # of every completed request, for exact percentiles
+        self.sent = 0
+        self.ok = 0
+        self.failed = 0
+        self.stopped = None  # why the run ended early
+        self.started = time.monotonic()
+        self.ended = None
+
+    @property
+    def finished(self) -> bool:
+        return self.ended is not None
+
+    def pump(self) -> None:
+        """Send requests until ``concurrency`` are in flight or all have been sent"""
+        while self.stopped is None and self.sent < self.total and len(self.in_flight) < self.concurrency:
+            request_id = self.session.request(self.method, self.params)
+            if request_id is None:
+                self.stop("could not write to the server's stdin")
+                break
+            self.in_flight.add(request_id)
+            self.sent += 1
+        self._check_finished()
+
+    def stop(self, reason: str = "stopped") -> None:
+        """Send nothing more; the run ends when the requests in flight are answered"""
+        if self.stopped is None:
+            self.stopped = reason
+        self._check_finished()
+
+    def record(self, response: RpcResponse) -> bool:
+        """Count a response if it belongs to this run and keep the pipeline full"""
+        if response.id not in self.in_flight:
+            return False
+        self.in_flight.discard(response.id)
+        self.latencies.append(response.latency_ms)
+        if response.ok:
+            self.ok += 1
+        else:
+            self.failed += 1
+        self.pump()
+        return True
+
+    def _check_finished(self):
+        if self.ended is None and not self.in_flight and (self.sent >= self.total or self.stopped is not None):
+            self.ended = time.monotonic()
+
+    def summary(self) -> str:
+        elapsed = (self.ended or time.monotonic()) - self.started
+        done = self.ok + self.failed
+        text = (
+            f"{self.method} x{self.total} at concurrency {self.concurrency}: {done} done, {self.ok} ok, "
+            f"{self.failed} failed in {elapsed:.2f}s ({done / elapsed if elapsed > 0 else 0:.0f} req/s)"
+        )
+        if self.latencies:
+            ordered = sorted(self.latencies)
+            text += (
+                f"; latency p50 {_percentile(ordered, 50):.1f} ms, p90 {_percentile(ordered, 90):.1f} ms, "
+                f"p99 {_percentile(ordered, 99):.1f} ms, max {ordered[-1]:.1f} ms"
+            )
+        if self.stopped is not None:
+            text += f" ({self.stopped})"
+        return text
@@ -0,0 +1,267 @@
+import json
+
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import (
+    QComboBox,
+    QHBoxLayout,
+    QLabel,
+    QPlainTextEdit,
+    QPushButton,
+    QSpinBox,
+    QVBoxLayout,
+    QWidget,
+)
+
+from process_manager import ProcessManager
+from rpc_console import INITIALIZED_NOTIFICATION, TEMPLATES, LoadRun, RpcSession
+
+POLL_INTERVAL_MS = 250  # timeouts, and the stats while the tab is visible
+MAX_TRANSCRIPT_LINES = 2000
+MAX_SHOWN_CHARS = 2000  # of a request or response in the transcript
+MAX_REPEAT = 100000
+MAX_CONCURRENCY = 1000
+
+
+def _shorten(text):
+    return text if len(text) <= MAX_SHOWN_CHARS else text[:MAX_SHOWN_CHARS] + "..."
+
+
+class RpcConsolePanel(QWidget):
+    """JSON-RPC console for the selected server, with pipelined repeats as a micro load test"""
+
+    def __init__(self, process_manager: ProcessManager, parent=None):
+        super().__init__(parent)
+        self.process_manager = process_manager
+        self.server_id = None
+        self.sessions = {}  # server_id: RpcSession, kept while the server runs
+        self.runs = {}  # server_id: LoadRun in progress
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(6)
+
+        request_row = QHBoxLayout()
+        self.server_label = QLabel()
+        request_row.addWidget(self.server_label)
+        self.method_input = QComboBox()
+        self.method_input.setEditable(True)
+        self.method_input.addItems(TEMPLATES)
+        self.method_input.setCurrentText("ping")
+        self.method_input.textActivated.connect(self._on_method_chosen)
+        request_row.addWidget(self.method_input, 1)
+        self.send_button = QPushButton("Send")
+        self.send_button.clicked.connect(self._on_send)
+        request_row.addWidget(self.send_button)
+        layout.addLayout(request_row)
+
+        self.params_input = QPlainTextEdit()
+        self.params_input.setPlaceholderText('Params as JSON, e.g. {"name": "search", "arguments": {}}')
+        self.params_input.setFixedHeight(90)
+        layout.addWidget(self.params_input)
+
+        load_row = QHBoxLayout()
+        load_row.addWidget(QLabel("Repeat"))
+        self.repeat_input = QSpinBox()
+        self.repeat_input.setRange(1, MAX_REPEAT)
+        self.repeat_input.setValue(100)
+        load_row.addWidget(self.repeat_input)
+        load_row.addWidget(QLabel("Concurrency"))
+        self.concurrency_input = QSpinBox()
+        self.concurrency_input.setRange(1, MAX_CONCURRENCY)
+        self.concurrency_input.setValue(8)
+        load_row.addWidget(self.concurrency_input)
+        self.run_button = QPushButton("Run")
+        self.run_button.clicked.connect(self._on_run)
+        load_row.addWidget(self.run_button)
+        load_row.addStretch()
+        clear_button = QPushButton("Clear")
+        clear_button.clicked.connect(self._on_clear)
+        load_row.addWidget(clear_button)
+        layout.addLayout(load_row)
+
+        self.stats_label = QLabel()
+        self.stats_label.setWordWrap(True)
+        layout.addWidget(self.stats_label)
+
+        self.transcript = QPlainTextEdit()
+        self.transcript.setReadOnly(True)
+        self.transcript.setObjectName("LogDisplay")
+        self.transcript.setMaximumBlockCount(MAX_TRANSCRIPT_LINES)
+        layout.addWidget(self.transcript)
+
+        self.transcripts = {}  # server_id: transcript text of servers not shown
+        process_manager.output_received.connect(self._on_output)
+        process_manager.status_changed.connect(self._on_status_changed)
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self._poll)
+        self.poll_timer.start(POLL_INTERVAL_MS)
+        self._on_method_chosen("ping")
+        self.set_server(None)
+
+    def set_server(self, server_id):
+        """Show the console of another server; each keeps its own requests and transcript"""
+        if server_id == self.server_id and server_id is not None:
+            self._update_controls()
+            return
+        if self.server_id is not None:
+            self.transcripts[self.server_id] = self.transcript.toPlainText()
+        self.server_id = server_id
+        self.transcript.setPlainText(self.transcripts.pop(server_id, "") if server_id else "")
+        self.server_label.setText(server_id or "No server selected")
+        self._update_controls()
+        self._update_stats()
+
+    def _update_controls(self):
+        running = self.server_id in self.process_manager.processes
+        busy = self.server_id in self.runs
+        self.send_button.setEnabled(running)
+        self.run_button.setEnabled(running)
+        self.run_button.setText("Stop" if busy else "Run")
+        if busy:
+            self.run_button.setEnabled(True)
+        if self.server_id and not running:
+            self.stats_label.setText("Start the server to send requests to it")
+
+    def _session(self, server_id):
+        session = self.sessions.get(server_id)
+        if session is None:
+            session = self.sessions[server_id] = RpcSession(
+                lambda data: self.process_manager.write_stdin(server_id, data)
+            )
+        return session
+
+    def _on_method_chosen(self, method):
+        params = TEMPLATES.get(method)
+        if params is not None:
+            self.params_input.setPlainText(json.dumps(params, indent=2) if params else "")
+
+    def _read_request(self):
+        """Return (method, params) from the inputs, or None after reporting invalid params"""
+        method = self.method_input.currentText().strip()
+        if not method:
+            return None
+        text = self.params_input.toPlainText().strip()
+        if not text:
+            return method, None
+        try:
+            return method, json.loads(text)
+        except ValueError as e:
+            self._append(f"Invalid params: {e}")
+            return None
+
+    def _on_send(self):
+        request = self._read_request()
+        if self.server_id is None or request is None:
+            return
+        method, params = request
+        session = self._session(self.server_id)
+        request_id = session.request(method, params)
+        if request_id is None:
+            self._append(f"Could not write to the stdin of '{self.server_id}'")
+            return
+        shown = json.dumps(params) if params is not None else ""
+        self._append(_shorten(f"-> #{request_id} {method} {shown}"))
+        if method == "initialize":
+            session.notify(INITIALIZED_NOTIFICATION)
+        self._update_stats()
+
+    def _on_run(self):
+        server_id = self.server_id
+        if server_id is None:
+            return
+        run = self.runs.get(server_id)
+        if run is not None:
+            run.stop()
+            self._finish_run_if_done(server_id)
+            return
+        request = self._read_request()
+        if request is None:
+            return
+        method, params = request
+        run = LoadRun(
+            self._session(server_id), method, params, self.repeat_input.value(), self.concurrency_input.value()
+        )
+        self.runs[server_id] = run
+        self._append(f"Running {method} x{run.total} at concurrency {run.concurrency}...")
+        run.pump()
+        self._finish_run_if_done(server_id)
+        self._update_controls()
+
+    def _on_clear(self):
+        self.transcript.clear()
+        if self.server_id is not None and self.server_id not in self.runs:
+            self.sessions.pop(self.server_id, None)
+        self._update_stats()
+
+    def _on_output(self, server_id, output):
+        session = self.sessions.get(server_id)
+        if session is None:
+            return
+        self._handle_responses(server_id, session.feed(output))
+
+    def _handle_responses(self, server_id, responses):
+        run = self.runs.get(server_id)
+        for response in responses:
+            # A load run only reports its summary
+            if run is not None and run.record(response):
+                continue
+            if response.ok:
+                body = json.dumps(response.result)
+            else:
+                error = response.error
+                code = f" {error['code']}" if isinstance(error, dict) and "code" in error else ""
+                message = error.get("message") if isinstance(error, dict) else error
+                body = f"error{code}: {message}"
+            self._append(
+                _shorten(f"<- #{response.id} {response.method} {response.latency_ms:.1f} ms {body}"), server_id
+            )
+        if run is not None:
+            self._finish_run_if_done(server_id)
+
+    def _finish_run_if_done(self, server_id):
+        run = self.runs.get(server_id)
+        if run is None or not run.finished:
+            return
+        del self.runs[server_id]
+        self._append(run.summary(), server_id)
+        self._update_controls()
+        self._update_stats()
+
+    def _on_status_changed(self, server_id, status):
+        if status == "offline" and server_id not in self.process_manager.processes:
+            session = self.sessions.get(server_id)
+            if session is not None:
+                run = self.runs.get(server_id)
+                if run is not None:
+                    run.stop("server stopped")
+                self._handle_responses(server_id, session.expire(reason="server stopped"))
+        if server_id == self.server_id:
+            self._update_controls()
+
+    def _poll(self):
+        for server_id, session in list(self.sessions.items()):
+            if session.pending:
+                self._handle_responses(server_id, session.expire())
+        if self.isVisible():
+            self._update_stats()
+
+    def _update_stats(self):
+        session = self.sessions.get(self.server_id) if self.server_id else None
+        if self.server_id and self.server_id not in self.process_manager.processes and session is None:
+            return
+        run = self.runs.get(self.server_id) if self.server_id else None
+        if run is not None:
+            self.stats_label.setText(run.summary())
+        elif session is not None:
+            self.stats_label.setText(session.summary())
+        else:
+            self.stats_label.setText("")
+
+    def _append(self, line, server_id=None):
+        if server_id is None or server_id == self.server_id:
+            self.transcript.appendPlainText(line)
+            return
+        # Kept for when the server is selected again
+        lines = self.transcripts.get(server_id, "").split("\n") if server_id in self.transcripts else []
+        lines.append(line)
+        self.transcripts[server_id] = "\n".join(lines[-MAX_TRANSCRIPT_LINES:])
@@ -0,0 +1,1117 @@
+"""Qt-free server lifecycle and log core shared by the GUI and the headless daemon.
+
+``ServerCore`` launches servers, ingests their output into per-server LogBuffers
+and owns everything that happens to a running server: readiness checks,
+resource limits, log budgets, stderr classification, alert rules, the state
+and event journals, output recording, the previous session's history and
+dependency-ordered startup. The host supplies a Launcher that spawns processes
+on its event loop and a ``call_later(seconds, callback)`` timer. The GUI's
+ProcessManager turns the core's events into Qt signals and the daemon serves
+them over its control socket. Nothing in this module may import PyQt6.
+"""
+
+import contextlib
+import os
+import re
+import shlex
+import signal
+import time
+from pathlib import Path
+
+import dependency_graph
+import log_history
+import process_tree
+import resource_limits
+import server_launch
+import state_journal
+from alert_rules import AlertMonitor, alert_rules_path
+from event_journal import EventJournal, journal_path
+from instrumentation import ServerStats
+from log_budget import LogThrottle
+from log_buffer import LogBuffer
+from log_levels import StderrClassifier
+from models import ServerConfig
+from output_recording import OutputRecorder
+
+STOP_TIMEOUT_S = 5.0
+KILL_GRACE_S = 1.0
+RESOURCE_CHECK_INTERVAL_S = 2.0
+ATTACHED_POLL_INTERVAL_S = 0.25
+READINESS_POLL_INTERVAL_S = 0.2
+RECOVERED_LOG_BYTES = 256 * 1024  # tail of each on-disk log loaded when reattaching
+MAX_RUNTIME_LOG_BYTES = 16 * 1024 * 1024  # on-disk logs are truncated once fully read past this size
+ERROR_SIGNAL_INTERVAL_S = 1.0  # at most one error/status event per server per interval
+LOG_COMPACT_INTERVAL_S = 30.0
+LOG_IDLE_AFTER_S = 120.0  # a running server quiet this long has its open log chunk compressed
+LOG_SUMMARY_CHECK_S = 1.0  # how often pending "suppressed N lines" summaries are checked
+
+
+class Launcher:
+    """Spawns server processes for a ServerCore on the host's event loop.
+
+    ``spawn`` returns a handle with ``pid``, ``write(data) -> bool``,
+    ``terminate()``, ``kill()`` and ``flush()`` (deliver output still buffered).
+    """
+
+    detaches = False  # True if spawn_detached can start servers that outlive the host
+
+    def spawn(self, server_id, program, args, env, cwd, on_output, on_exit):
+        """Start ``program`` in its own session and return its handle.
+
+        ``env`` holds the variables to set on top of the host's environment.
+        ``on_output(stream, data)`` receives raw stdout/stderr bytes and
+        ``on_exit(exit_code, crashed)`` is called once, after the output was
+        delivered. Raises OSError if the process could not be started.
+        """
+        raise NotImplementedError
+
+    def spawn_detached(self, server_id, program, args, env, cwd) -> int:
+        """Start a process that is not a child of the host and return its PID; raises OSError"""
+        raise NotImplementedError
+
+
+class AttachedProcess:
+    """Handle of a server that is not a direct child of this manager.
+
+    Persistent servers are started detached and servers found in the state
+    journal are reattached after a restart; both are tracked by PID and
+    ``/proc`` start time, with output tailed from their runtime log files.
+    """
+
+    def __init__(self, pid: int, start_time: int, files: state_journal.RuntimeFiles | None):
+        self.pid = pid
+        self.start_time = start_time
+        self.files = files
+        self.offsets = {"stdout": 0, "stderr": 0}
+
+    def is_alive(self):
+        stat = process_tree.read_stat(self.pid)
+        return stat is not None and stat.state not in ("Z", "X") and stat.starttime == self.start_time
+
+    def terminate(self):
+        process_tree.signal_pids([self.pid], signal.SIGTERM)
+
+    def kill(self):
+        process_tree.signal_pids([self.pid], signal.SIGKILL)
+
+    def write(self, data: bytes) -> bool:
+        """Write to the server's stdin FIFO without blocking"""
+        if self.files is None:
+            return False
+        try:
+            fd = os.open(self.files.stdin, os.O_WRONLY | os.O_NONBLOCK)
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+        except OSError:
+            return False
+        return True
+
+    def read_new_output(self, stream):
+        """Return bytes appended to the stdout/stderr log since the last read"""
+        if self.files is None:
+            return b""
+        path = self.files.stdout if stream == "stdout" else self.files.stderr
+        try:
+            with open(path, "rb") as f:
+                f.seek(self.offsets[stream])
+                data = f.read()
+        except OSError:
+            return b""
+        self.offsets[stream] += len(data)
+        if self.offsets[stream] > MAX_RUNTIME_LOG_BYTES:
+            # The child appends (O_APPEND), so truncating makes its next write land at offset 0.
+            # A write racing with the truncate can be lost; that is the price of a bounded file.
+            try:
+                os.truncate(path, 0)
+                self.offsets[stream] = 0
+            except OSError:
+                pass
+        return data
+
+
+class StartupRun:
+    """One dependency-ordered startup, as parallel as the graph allows.
+
+    Servers are grouped into topological waves for reporting, but a server is
+    launched as soon as all of its own prerequisites are ready rather than when
+    the whole previous wave is. A server that fails to start or to become ready
+    blocks everything that depends on it.
+    """
+
+    def __init__(self, core, configs, graph, waves, on_finished=None):
+        self.core = core
+        self.configs = {c.id: c for c in configs}
+        self.graph = graph
+        self.waves = waves
+        self.on_finished = on_finished  # on_finished(report), see dependency_graph.format_report
+        self.waiting = set()  # not yet launched
+        self.starting = set()  # launched, waiting for readiness
+        self.ready = set()
+        self.failed = {}  # server_id: reason
+        self.started_at = {}  # server_id: monotonic launch time (None if already running)
+        self.ready_at = {}  # server_id: monotonic ready time
+        self.t0 = time.monotonic()
+        self.active = True
+
+    def begin(self):
+        for wave in self.waves:
+            for server_id in wave:
+                if self.core.is_ready(server_id):
+                    self.ready.add(server_id)
+                    self.ready_at[server_id] = self.t0
+                    self.started_at[server_id] = None
+                elif server_id in self.core.processes and server_id in self.core.pending_readiness:
+                    # Already launched by someone else; wait for its readiness
+                    self.starting.add(server_id)
+                    self.started_at[server_id] = None
+                elif server_id in self.core.processes:
+                    self.failed[server_id] = "did not become ready"
+                else:
+                    self.waiting.add(server_id)
+        self._advance()
+
+    def _advance(self):
+        """Launch every waiting server whose prerequisites are all ready"""
+        progress = True
+        while progress:
+            progress = False
+            for server_id in sorted(self.waiting):
+                if server_id not in self.waiting:
+                    continue  # launched by a nested call (readiness can be reported synchronously)
+                deps = self.graph.get(server_id, [])
+                blocked = [d for d in deps if d in self.failed]
+                if blocked:
+                    self.waiting.discard(server_id)
+                    self.failed[server_id] = f"dependency '{blocked[0]}' failed"
+                    progress = True
+                elif all(d in self.ready for d in deps):
+                    self.waiting.discard(server_id)
+                    self._launch(server_id)
+                    progress = True
+        if self.active and not self.waiting and not self.starting:
+            self._finish()
+
+    def _launch(self, server_id):
+        print(f"[DEBUG] Startup scheduler launching '{server_id}'")
+        self.started_at[server_id] = time.monotonic()
+        self.starting.add(server_id)
+        if not self.core.start_server(self.configs[server_id]) and server_id in self.starting:
+            self.starting.discard(server_id)
+            self.failed[server_id] = "failed to start"
+
+    def server_ready(self, server_id):
+        if not self.active or server_id not in self.starting:
+            return
+        self.starting.discard(server_id)
+        self.ready.add(server_id)
+        self.ready_at[server_id] = time.monotonic()
+        self._advance()
+
+    def readiness_failed(self, server_id, reason):
+        if not self.active or server_id not in self.starting:
+            return
+        self.starting.discard(server_id)
+        self.failed[server_id] = reason
+        self._advance()
+
+    def _finish(self):
+        self.active = False
+        self.core.startup_runs.remove(self)
+        if self.on_finished is not None:
+            self.on_finished(self.build_report())
+
+    def build_report(self) -> dict:
+        """Summarize per-wave timing and the critical path of the startup"""
+        ready_s = {}  # start-to-ready duration of each server launched by this run
+        for server_id, ready_at in self.ready_at.items():
+            started = self.started_at.get(server_id)
+            ready_s[server_id] = ready_at - started if started is not None else 0.0
+        waves = []
+        for wave in self.waves:
+            launched = [self.started_at[s] for s in wave if self.started_at.get(s) is not None]
+            finished = [self.ready_at[s] for s in wave if s in self.ready_at]
+            complete = all(s in self.ready for s in wave)
+            duration = max(finished) - min(launched) if complete and launched else (0.0 if complete else None)
+            waves.append({"servers": list(wave), "duration_s": duration})
+        path, path_s = dependency_graph.critical_path(self.graph, ready_s)
+        return {
+            "total_s": time.monotonic() - self.t0,
+            "waves": waves,
+            "critical_path": path,
+            "critical_path_s": path_s,
+            "ready_s": ready_s,
+            "failed": dict(self.failed),
+        }
+
+
+class ServerCore:
+    """Server lifecycle and log core driven by a host event loop.
+
+    Events are dicts with ``type`` and ``server`` keys passed to every subscriber:
+    ``status`` (``status``), ``log`` (``text`` appended to the server's log,
+    empty when the log was cleared), ``output`` (``stream``, ``text`` of every
+    chunk of output, logged or not), ``ready``, ``ready_failed`` (``reason``),
+    ``limit_hit`` (``reason``), ``alert`` (``rule``, ``line``) and ``error``
+    (``message``).
+    """
+
+    def __init__(self, configs=(), state_dir=None, launcher: Launcher | None = None, call_later=None):
+        self.configs = {c.id: c for c in configs}  # server_id: ServerConfig of every known server
+        self.launcher = launcher
+        self.call_later = call_later  # call_later(seconds, callback) on the host's event loop
+        self.processes = {}  # server_id: launcher handle or AttachedProcess
+        self.run_configs = {}  # server_id: ServerConfig the running process was launched with
+        self.statuses = {}  # server_id: offline, starting, online, error
+        self.logs = {}  # server_id: LogBuffer of log entries
+        self.history = {}  # server_id: log_history.LogHistory of the previous session
+        self.process_groups = {}  # server_id: process group id (POSIX only)
+        self.cgroups = {}  # server_id: (cgroup path, oom_kill count at start)
+        self.limit_hits = {}  # server_id: reason of the last resource limit hit
+        self.stderr_classifiers = {}  # server_id: StderrClassifier of the running process
+        self._last_error_signal = {}  # server_id: time.monotonic() of the last error escalation
+        self.log_throttles = {}  # server_id: LogThrottle enforcing the running process's log budget
+        self.recorders = {}  # server_id: OutputRecorder of its raw output
+        self._listeners = []
+        self._timers = set()  # names of the periodic checks currently scheduled
+
+        # State journal and runtime files live next to the config file; without a
+        # state directory servers are never detached and nothing is reattached
+        self.state_dir = Path(state_dir) if state_dir else None
+        self.journal = None
+        if self.state_dir is not None:
+            self.journal = state_journal.StateJournal(self.state_dir / state_journal.STATE_FILE_NAME)
+            self.journal.load()
+        # Lifecycle events (starts, exits, crashes, ...) are journaled next to the state journal
+        self.events = EventJournal(journal_path(self.state_dir)) if self.state_dir else None
+        self._stop_requested = set()  # server IDs whose exit was asked for
+        # Alert rules from the server configs and alert_rules.json, matched against all output
+        self.alerts = AlertMonitor(alert_rules_path(self.state_dir) if self.state_dir else None)
+
+        # Readiness tracking for dependency-ordered startup
+        self.start_times = {}  # server_id: time.monotonic() at start
+        self.ready_times = {}  # server_id: seconds from start until ready
+        self.pending_readiness = {}  # server_id: ReadinessProbe
+        self.startup_runs = []  # StartupRun objects still in progress
+
+        # Optional instrumentation.Instrumentation that counts ingested bytes per server
+        self.instrumentation = None
+        self.stats = ServerStats()  # starts and ingested output, exported by metrics.py
+
+    # Events
+
+    def subscribe(self, callback):
+        """Register ``callback(event)`` for the core's events"""
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        with contextlib.suppress(ValueError):
+            self._listeners.remove(callback)
+
+    def _emit(self, event_type, server_id, **fields):
+        event = {"type": event_type, "server": server_id, **fields}
+        for callback in list(self._listeners):
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"[ERROR] Event listener failed: {e}")
+
+    def _set_status(self, server_id, status):
+        if self.statuses.get(server_id) != status:
+            self.statuses[server_id] = status
+            self._emit("status", server_id, status=status)
+
+    def _emit_error(self, server_id, message):
+        self._emit("error", server_id, message=message)
+
+    def _schedule(self, name, interval_s, poll):
+        """Run ``poll`` every ``interval_s`` seconds on the host's loop until it returns False"""
+        if name in self._timers or self.call_later is None:
+            return
+        self._timers.add(name)
+
+        def tick():
+            if poll():
+                self.call_later(interval_s, tick)
+            else:
+                self._timers.discard(name)
+
+        self.call_later(interval_s, tick)
+
+    # Lifecycle
+
+    # ruff: noqa: C901
+    def start_server(self, config: ServerConfig) -> bool:
+        """Start a server process using its configuration; readiness is reported through events"""
+        server_id = config.id
+
+        if server_id in self.processes:
+            self._emit_error(server_id, "Server already running")
+            return False
+
+        lines = [f"Starting server '{server_id}'...", f"Command: {config.command} {' '.join(config.arguments)}"]
+        if config.working_dir:
+            lines.append(f"Working directory: {config.working_dir}")
+        if config.env_vars:
+            lines.append(f"Environment variables: {config.env_vars}")
+        limits = config.resource_limits
+        if not limits.is_empty():
+            lines.append(f"Resource limits: {resource_limits.describe(limits)}")
+        self.limit_hits.pop(server_id, None)
+        self.stderr_classifiers.pop(server_id, None)
+        self._last_error_signal.pop(server_id, None)
+        self.log_throttles.pop(server_id, None)
+        self.alerts.reset(server_id)
+        if config.persistent and not self._is_persistent(config):
+            lines.append("WARNING: persistent mode is not supported here; the server stops with the manager")
+
+        # Build shell-wrapped command so user shell environment is available
+        shell = server_launch.login_shell()
+        full_cmd = server_launch.quote_command(config)
+        if os.name != "nt":
+            if self._is_persistent(config):
+                return self._start_persistent(config, lines, shell, full_cmd)
+            # rlimits are set by the shell itself (ulimit) right before it execs the server
+            full_cmd = resource_limits.wrap_shell_command(full_cmd, limits)
+        # Use a login shell to load user profiles, and execute the command
+        shell_args = server_launch.shell_arguments(full_cmd)
+        lines.append(f"Shell: {shell}")
+        lines.append(f"Shell command: {shell} {' '.join(shell_args)}")
+        lines.append("--- Server Output ---")
+        self._new_log(server_id, lines)
+
+        handle = None
+
+        def on_exit(exit_code, crashed):
+            self._handle_exit(server_id, handle, exit_code, crashed)
+
+        try:
+            handle = self.launcher.spawn(
+                server_id,
+                shell,
+                shell_args,
+                self._environment(config),
+                config.working_dir or None,
+                lambda stream, data: self.ingest_output(server_id, stream, data),
+                on_exit,
+            )
+        except OSError as e:
+            self._start_failed(server_id, f"Failed to start process: {e!s}")
+            return False
+
+        self.processes[server_id] = handle
+        self.run_configs[server_id] = config
+        if process_tree.supports_process_groups():
+            # The shell is the session leader, so its PID is also the group ID
+            self.process_groups[server_id] = handle.pid
+            self._apply_process_limits(server_id, handle.pid, limits)
+            self._journal_started(server_id, handle.pid, config, persistent=False)
+        self.append_log(server_id, "Process started successfully")
+        self._set_status(server_id, "starting")
+        self._begin_readiness(config)
+        return True
+
+    def _environment(self, config):
+        env = dict(config.env_vars)
+        # Tag the whole tree so leftovers can be recognised after a crash or restart
+        env[process_tree.SERVER_ID_ENV] = config.id
+        return env
+
+    def _start_failed(self, server_id, message):
+        self.append_log(server_id, f"ERROR: {message}")
+        self._record_event(server_id, "start_failed", cause=message)
+        self._set_status(server_id, "error")
+        self._emit_error(server_id, message)
+
+    def _is_persistent(self, config):
+        return (
+            config.persistent
+            and self.journal is not None
+            and self.launcher is not None
+            and self.launcher.detaches
+            and process_tree.has_procfs()
+        )
+
+    def _start_persistent(self, config, lines, shell, full_cmd):
+        """Start a server detached from the manager so it survives a manager restart"""
+        server_id = config.id
+        files = state_journal.runtime_files(self.state_dir, server_id)
+        try:
+            state_journal.prepare_runtime_files(files)
+        except OSError as e:
+            self._new_log(server_id, lines)
+            self._start_failed(server_id, f"Failed to prepare runtime files: {e!s}")
+            return False
+
+        # stdin is a FIFO opened read/write by the child so it never sees EOF while detached;
+        # the shell stays as the group leader to record the exit status for the next manager
+        redirected = (
+            f"{full_cmd} <>{shlex.quote(str(files.stdin))}"
+            f" >>{shlex.quote(str(files.stdout))} 2>>{shlex.quote(str(files.stderr))}"
+        )
+        script = resource_limits.wrap_shell_command(redirected, config.resource_limits, exec_command=False)
+        script += f"; echo $? >{shlex.quote(str(files.exit_status))}"
+        shell_args = server_launch.shell_arguments(script)
+        lines.append(f"Shell: {shell}")
+        lines.append(f"Shell command: {shell} {' '.join(shell_args)}")
+        lines.append(f"Persistent: output redirected to {files.directory}")
+        lines.append("--- Server Output ---")
+        self._new_log(server_id, lines)
+
+        try:
+            pid = self.launcher.spawn_detached(
+                server_id, shell, shell_args, self._environment(config), config.working_dir or None
+            )
+        except OSError as e:
+            self._start_failed(server_id, f"Failed to start process: {e!s}")
+            return False
+        stat = process_tree.read_stat(pid)
+        if stat is None:
+            self._start_failed(server_id, f"Failed to start process: PID {pid} exited immediately")
+            return False
+
+        self._attach(config, AttachedProcess(pid, stat.starttime, files), stat.pgrp)
+        self._apply_process_limits(server_id, pid, config.resource_limits)
+        self._journal_started(server_id, pid, config, persistent=True)
+        self.append_log(server_id, "Process started successfully")
+        self._set_status(server_id, "starting")
+        self._begin_readiness(config)
+        return True
+
+    def _attach(self, config, attached, pgid):
+        """Track an AttachedProcess like a child process"""
+        self.processes[config.id] = attached
+        self.run_configs[config.id] = config
+        self.process_groups[config.id] = pgid
+        self._schedule("attached", ATTACHED_POLL_INTERVAL_S, self._poll_attached)
+
+    def _journal_started(self, server_id, pid, config, persistent):
+        if self.journal is None:
+            return
+        entry = state_journal.make_entry(pid, config, persistent)
+        if entry is not None:
+            if persistent:
+                entry["runtime_dir"] = str(state_journal.runtime_files(self.state_dir, server_id).directory)
+            self.journal.record(server_id, entry)
+
+    def reattach_servers(self, configs):
+        """Reattach to servers from the state journal that survived a manager restart.
+
+        Returns the list of server IDs that were reattached. Journal entries whose
+        process is gone, or whose server no longer exists, are dropped.
+        """
+        if self.journal is None or not process_tree.has_procfs():
+            return []
+        by_id = {c.id: c for c in configs}
+        reattached = []
+        for server_id, entry in list(self.journal.load().items()):
+            config = by_id.get(server_id)
+            if config is None or server_id in self.processes or not state_journal.validate_entry(server_id, entry):
+                self.journal.remove(server_id)
+                continue
+            files = state_journal.runtime_files(self.state_dir, server_id) if entry.get("persistent") else None
+            attached = AttachedProcess(int(entry["pid"]), int(entry["start_time"]), files)
+            # Output the previous session already logged is in its history; recover only what came after
+            history = self.history.get(server_id)
+            offsets = history.offsets if history is not None else {}
+            logs = LogBuffer([f"Reattached to running server '{server_id}' (PID {attached.pid})"])
+            if entry.get("config_hash") != state_journal.config_hash(config):
+                logs.append("WARNING: configuration changed since launch; restart to apply it")
+            if files is None:
+                logs.append("Output from before the restart is not available for this server")
+            else:
+                logs.append("--- Recovered Output ---")
+                for stream in ("stdout", "stderr"):
+                    path = files.stdout if stream == "stdout" else files.stderr
+                    data, size = state_journal.read_tail(path, RECOVERED_LOG_BYTES, offsets.get(stream, 0))
+                    attached.offsets[stream] = size
+                    if data:
+                        text = data.decode("utf-8", errors="replace")
+                        logs.append(text if stream == "stdout" else f"ERROR: {text}")
+                        if stream == "stderr":
+                            logs.index_json(text)
+                logs.append("--- Server Output ---")
+            self._set_log(server_id, logs)
+            self._attach(config, attached, int(entry.get("pgid") or attached.pid))
+            self._record_event(server_id, "reattach")
+            # A server that survived a restart has long passed its readiness check
+            self.ready_times[server_id] = 0.0
+            self._set_status(server_id, "online")
+            reattached.append(server_id)
+        return reattached
+
+    def _poll_attached(self):
+        """Tail output of attached servers and detect their exit; False once none is left"""
+        attached_ids = [sid for sid, p in self.processes.items() if isinstance(p, AttachedProcess)]
+        for server_id in attached_ids:
+            process = self.processes[server_id]
+            stdout = process.read_new_output("stdout")
+            if stdout:
+                self._ingest_stdout(server_id, stdout)
+            stderr = process.read_new_output("stderr")
+            if stderr:
+                self._ingest_stderr(server_id, stderr)
+            if not process.is_alive():
+                exit_code = state_journal.read_exit_status(process.files) if process.files else None
+                if exit_code is not None and exit_code > 128:
+                    # The shell reports death by signal N as 128 + N
+                    self._handle_exit(server_id, process, exit_code - 128, True)
+                else:
+                    self._handle_exit(server_id, process, exit_code, False)
+        return bool(attached_ids)
+
+    def _begin_readiness(self, config):
+        """Start tracking the server's readiness condition"""
+        server_id = config.id
+        self.start_times[server_id] = time.monotonic()
+        self.stats.record_start(server_id)
+        self._record_event(server_id, "start")
+        self.ready_times.pop(server_id, None)
+        try:
+            probe = server_launch.ReadinessProbe(config.readiness, self.start_times[server_id])
+        except re.error as e:
+            self._fail_readiness(server_id, f"invalid readiness pattern: {e!s}")
+            return
+        if probe.immediate:
+            self._mark_ready(server_id)
+            return
+        self.pending_readiness[server_id] = probe
+        self._schedule("readiness", READINESS_POLL_INTERVAL_S, self._poll_readiness)
+
+    def _poll_readiness(self):
+        """Evaluate time-based and TCP readiness checks and enforce readiness timeouts"""
+        for server_id, probe in list(self.pending_readiness.items()):
+            result = probe.poll()
+            if result == "ready":
+                self._mark_ready(server_id)
+            elif result == "timeout":
+                self._fail_readiness(server_id, probe.timeout_reason())
+        return bool(self.pending_readiness)
+
+    def _check_log_readiness(self, server_id, text):
+        probe = self.pending_readiness.get(server_id)
+        if probe is not None and probe.feed(text):
+            self._mark_ready(server_id)
+
+    def _mark_ready(self, server_id):
+        self.pending_readiness.pop(server_id, None)
+        elapsed = time.monotonic() - self.start_times.get(server_id, time.monotonic())
+        self.ready_times[server_id] = elapsed
+        self._record_event(server_id, "ready", duration_s=elapsed)
+        self.append_log(server_id, f"Server is ready ({elapsed:.2f}s after start)")
+        if server_id not in self.limit_hits:
+            self._set_status(server_id, "online")
+        self._emit("ready", server_id)
+        for run in list(self.startup_runs):
+            run.server_ready(server_id)
+
+    def _fail_readiness(self, server_id, reason):
+        self.pending_readiness.pop(server_id, None)
+        self._record_event(server_id, "ready_failed", cause=reason)
+        self.append_log(server_id, f"WARNING: readiness check failed: {reason}")
+        self._set_status(server_id, "error")
+        self._emit("ready_failed", server_id, reason=reason)
+        for run in list(self.startup_runs):
+            run.readiness_failed(server_id, reason)
+
+    def is_ready(self, server_id):
+        """Return True if the server is running and has passed its readiness check"""
+        return server_id in self.processes and server_id in self.ready_times
+
+    def is_running(self, server_id):
+        return server_id in self.processes
+
+    def write_stdin(self, server_id, data: bytes) -> bool:
+        """Write raw bytes to a running server's stdin"""
+        process = self.processes.get(server_id)
+        return process is not None and process.write(data)
+
+    def _apply_process_limits(self, server_id, pid, limits):
+        """Apply nice level, CPU affinity and cgroup placement to a freshly started server"""
+        for warning in resource_limits.apply_to_process(pid, limits):
+            self.append_log(server_id, f"WARNING: {warning}")
+        if limits.cgroup:
+            path, message = resource_limits.place_in_cgroup(server_id, pid, limits)
+            self.append_log(server_id, f"Cgroup: {message}")
+            if path is not None:
+                self.cgroups[server_id] = (path, resource_limits.read_oom_kills(path))
+        if limits.rss_mb and server_id not in self.cgroups:
+            self._schedule("resources", RESOURCE_CHECK_INTERVAL_S, self._check_resource_usage)
+
+    def _check_resource_usage(self):
+        """Enforce RSS limits for servers that are not inside a memory-limited cgroup"""
+        watched = False
+        for server_id, config in list(self.run_configs.items()):
+            limits = config.resource_limits
+            pgid = self.process_groups.get(server_id)
+            if not limits.rss_mb or server_id in self.cgroups or pgid is None or server_id in self.limit_hits:
+                continue
+            watched = True
+            reason = resource_limits.rss_over_limit(limits, process_tree.group_rss_bytes(pgid))
+            if reason:
+                self._record_limit_hit(server_id, reason)
+                # Let the normal exit handling pick up the exit
+                process_tree.signal_group(pgid, signal.SIGTERM)
+        return watched
+
+    def _record_limit_hit(self, server_id, reason):
+        """Surface a resource limit hit in the server's log and status"""
+        self.limit_hits[server_id] = reason
+        self._record_event(server_id, "limit_hit", cause=reason)
+        self.append_log(server_id, f"RESOURCE LIMIT HIT: {reason}")
+        self._set_status(server_id, "error")
+        self._emit("limit_hit", server_id, reason=reason)
+
+    def start_servers(self, server_ids=None, on_finished=None, configs=None) -> StartupRun:
+        """Start ``server_ids`` (default: every server) and their prerequisites in dependency order.
+
+        ``configs`` defaults to every known server. ``on_finished(report)`` is
+        called with the report understood by ``dependency_graph.format_report``.
+        Raises DependencyCycleError or UnknownDependencyError before anything is
+        started if the graph is invalid.
+        """
+        configs = list(self.configs.values() if configs is None else configs)
+        graph = dependency_graph.build_graph(configs)
+        waves = dependency_graph.plan_waves(graph, server_ids)
+        run = StartupRun(self, configs, graph, waves, on_finished)
+        self.startup_runs.append(run)
+        run.begin()
+        return run
+
+    # Stopping
+
+    def stop_server(self, server_id, timeout=STOP_TIMEOUT_S):
+        """Stop a server's whole process tree: SIGTERM now, SIGKILL for what is left after ``timeout``"""
+        process = self.processes.get(server_id)
+        if process is None:
+            return False
+        self.append_log(server_id, "Stopping server...")
+        pids = self.begin_stop(server_id)
+        if self.call_later is not None:
+            self.call_later(timeout, lambda: self._escalate_stop(server_id, process, pids))
+        return True
+
+    def _escalate_stop(self, server_id, process, pids):
+        stragglers = {pid for pid in pids if process_tree.is_alive(pid)}
+        if self.processes.get(server_id) is process:
+            self.force_stop(server_id, stragglers)
+        elif stragglers:
+            # The server itself exited (or was restarted); only its leftovers are killed
+            process_tree.signal_pids(stragglers, signal.SIGKILL)
+        else:
+            return
+        self.call_later(KILL_GRACE_S, lambda: self._report_survivors(server_id, stragglers))
+
+    def _report_survivors(self, server_id, pids):
+        survivors = sorted(pid for pid in pids if process_tree.is_alive(pid))
+        if survivors:
+            pid_list = ", ".join(str(pid) for pid in survivors)
+            self.append_log(server_id, f"WARNING: processes still running after SIGKILL: {pid_list}")
+
+    def stop_all(self, timeout=STOP_TIMEOUT_S):
+        """Stop every running server in parallel against one deadline; returns their IDs"""
+        server_ids = list(self.processes)
+        for server_id in server_ids:
+            self.stop_server(server_id, timeout)
+        return server_ids
+
+    def begin_stop(self, server_id):
+        """Send SIGTERM to a server's whole process group without waiting.
+
+        Returns the PIDs (group members and descendants) that have to exit before
+        the server counts as stopped.
+        """
+        process = self.processes.get(server_id)
+        if process is None:
+            return set()
+        self._note_stop_requested(server_id)
+        pgid = self.process_groups.get(server_id)
+        if pgid is None:
+            process.terminate()
+            return set()
+        # Snapshot the tree before signalling; reparented grandchildren are otherwise hard to find
+        pids = process_tree.tree_pids(pgid, pgid) if process_tree.has_procfs() else {pgid}
+        process_tree.signal_group(pgid, signal.SIGTERM)
+        process_tree.signal_pids(pids, signal.SIGTERM)
+        return pids
+
+    def force_stop(self, server_id, pids=()):
+        """SIGKILL whatever is left of a server after its graceful stop deadline passed"""
+        if server_id in self.processes:
+            self._note_stop_requested(server_id)
+        pgid = self.process_groups.get(server_id)
+        if pgid is not None:
+            self.append_log(server_id, f"Escalating to SIGKILL for process group {pgid}")
+            process_tree.signal_group(pgid, signal.SIGKILL)
+        process_tree.signal_pids([pid for pid in pids if process_tree.is_alive(pid)], signal.SIGKILL)
+        process = self.processes.get(server_id)
+        if process is not None:
+            process.kill()
+
+    def is_stopped(self, server_id, pids=()):
+        """Return True once the server is no longer tracked and none of ``pids`` is alive"""
+        return server_id not in self.processes and not any(process_tree.is_alive(pid) for pid in pids)
+
+    def is_detached(self, server_id):
+        """Return True for persistent servers that keep running when the manager exits"""
+        process = self.processes.get(server_id)
+        return isinstance(process, AttachedProcess) and process.files is not None
+
+    def flush_output(self):
+        """Ingest any output still buffered for tracked servers"""
+        for server_id, process in list(self.processes.items()):
+            if isinstance(process, AttachedProcess):
+                for stream, ingest in (("stdout", self._ingest_stdout), ("stderr", self._ingest_stderr)):
+                    data = process.read_new_output(stream)
+                    if data:
+                        ingest(server_id, data)
+            else:
+                process.flush()
+
+    def find_orphans(self):
+        """Return {server_id: [pgid, ...]} for server processes left behind by earlier runs"""
+        managed = set(self.process_groups.values())
+        orphans = {}
+        for server_id, pids in process_tree.find_orphans(exclude_pids=managed).items():
+            # A leftover group from an earlier run stays visible while the server runs again
+            pids = [pid for pid in pids if pid not in managed]
+            if pids:
+                orphans[server_id] = pids
+        return orphans
+
+    # Logs and session
+
+    def _new_log(self, server_id, lines):
+        """Replace a server's log with a fresh one holding ``lines``"""
+        self._set_log(server_id, LogBuffer(lines))
+
+    def _set_log(self, server_id, logs):
+        self.logs[server_id] = logs
+        self._emit("log", server_id, text="\n".join(logs))
+        # Logs of stopped servers move to lzma, idle servers' open chunks are compressed
+        self._schedule("compaction", LOG_COMPACT_INTERVAL_S, self._compact_logs)
+
+    def append_log(self, server_id, message):
+        """Append a manager-generated line to a server's log"""
+        logs = self.logs.get(server_id)
+        if logs is None:
+            self._new_log(server_id, [message])
+            return
+        logs.append(message)
+        self._emit("log", server_id, text=message)
+
+    def get_logs(self, server_id):
+        """Get logs for a server"""
+        logs = self.logs.get(server_id)
+        if logs is None:
+            return ""
+        return logs.text()
+
+    def log_lines(self, server_id, lines=None) -> list[str]:
+        """Return the last ``lines`` log lines of a server (all when None); entries may hold several lines"""
+        entries = self.logs.get(server_id, ())
+        if not lines:
+            return [line for entry in entries for line in entry.splitlines()]
+        tail = []
+        for index in range(len(entries) - 1, -1, -1):
+            tail.extend(reversed(entries[index].splitlines()))
+            if len(tail) >= lines:
+                break
+        return tail[:lines][::-1]
+
+    def _compact_logs(self):
+        now = time.monotonic()
+        for server_id, logs in self.logs.items():
+            if server_id not in self.processes:
+                logs.freeze()
+            elif logs.times and now - logs.times[-1] > LOG_IDLE_AFTER_S:
+                logs.seal()
+        return bool(self.logs)
+
+    def clear_logs(self, server_id):
+        """Clear logs for a server, including those kept from the previous session"""
+        had_history = self.history.pop(server_id, None) is not None
+        if server_id in self.logs:
+            self.logs[server_id] = LogBuffer()
+        if had_history or server_id in self.logs:
+            self._emit("log", server_id, text="")
+
+    def restore_session(self):
+        """Load the previous session's statuses; its logs are read when first shown"""
+        if self.state_dir is not None:
+            self.history = log_history.load_session(self.state_dir)
+
+    def save_session(self, server_ids, statuses=None):
+        """Keep the tail of each server's log and its last status for the next launch"""
+        if self.state_dir is None:
+            return
+        statuses = statuses or {}
+        ended = time.time()
+        snapshots = {}
+        entries = {}
+        for server_id in server_ids:
+            logs = self.logs.get(server_id)
+            if not logs:
+                continue
+            snapshots[server_id] = logs.snapshot()
+            entry = {
+                "status": statuses.get(server_id) or self.get_status(server_id),
+                "detail": self.limit_hits.get(server_id),
+                "ended": ended,
+            }
+            process = self.processes.get(server_id)
+            if isinstance(process, AttachedProcess) and process.files is not None:
+                entry["offsets"] = dict(process.offsets)
+            entries[server_id] = entry
+        log_history.save_session(self.state_dir, server_ids, snapshots, entries, self.history)
+
+    def get_status(self, server_id):
+        """Get current status of a server"""
+        return self.statuses.get(server_id, "offline")
+
+    def describe(self, server_id) -> dict:
+        """Return a JSON-serializable status summary of a server"""
+        process = self.processes.get(server_id)
+        config = self.run_configs.get(server_id) or self.configs.get(server_id)
+        started = self.start_times.get(server_id)
+        return {
+            "id": server_id,
+            "name": config.name if config is not None else server_id,
+            "status": self.get_status(server_id),
+            "pid": process.pid if process is not None else None,
+            "ready": self.is_ready(server_id),
+            "uptime_s": round(time.monotonic() - started, 1) if process is not None and started else None,
+            "limit_hit": self.limit_hits.get(server_id),
+            "suppressed_lines": self.stats.suppressed_lines.get(server_id, 0),
+        }
+
+    def _record_event(self, server_id, event_type, **details):
+        if self.events is not None:
+            self.events.record(server_id, event_type, **details)
+
+    def _note_stop_requested(self, server_id):
+        if server_id not in self._stop_requested:
+            self._stop_requested.add(server_id)
+            self._record_event(server_id, "stop")
+
+    def _record_exit(self, server_id, exit_code, crashed, uptime):
+        """Journal an exit as expected ("exit") or unexpected ("crash")"""
+        requested = server_id in self._stop_requested
+        self._stop_requested.discard(server_id)
+        if server_id in self.limit_hits:
+            event_type, cause = "crash", self.limit_hits[server_id]
+        elif requested:
+            event_type, cause = "exit", "stop requested"
+        elif crashed or exit_code:
+            event_type, cause = "crash", "killed" if crashed else f"exit code {exit_code}"
+        else:
+            event_type, cause = "exit", None if exit_code is not None else "exit code unavailable"
+        self._record_event(server_id, event_type, exit_code=exit_code, duration_s=uptime, cause=cause)
+
+    # Output
+
+    def _ingest_stdout(self, server_id, data: bytes):
+        """Store and announce a chunk of standard output"""
+        if server_id in self.recorders:
+            self._record_output(server_id, "stdout", data)
+        lines = data.count(b"\n")
+        self.stats.record_output(server_id, len(data), lines)
+        if self.instrumentation is not None:
+            self.instrumentation.add_bytes(server_id, len(data))
+        output = data.decode("utf-8", errors="replace")
+        self._emit("output", server_id, stream="stdout", text=output)
+        if self._admit_to_log(server_id, output, lines, len(data)) and server_id in self.logs:
+            self.logs[server_id].append(output)
+            self._emit("log", server_id, text=output)
+        # Alert rules, like readiness, see output the log budget left out
+        self._check_alerts(server_id, output)
+        self._check_log_readiness(server_id, output)
+
+    def _ingest_stderr(self, server_id, data: bytes):
+        """Store and announce a chunk of error output"""
+        if server_id in self.recorders:
+            self._record_output(server_id, "stderr", data)
+        lines = data.count(b"\n")
+        self.stats.record_output(server_id, len(data), lines)
+        if self.instrumentation is not None:
+            self.instrumentation.add_bytes(server_id, len(data))
+        error = data.decode("utf-8", errors="replace")
+        self._emit("output", server_id, stream="stderr", text=error)
+        logs = self.logs.get(server_id)
+        if not self._admit_to_log(server_id, error, lines, len(data)):
+            if logs is not None and logs.structured is not None:
+                logs.structured.drop_partial()
+        elif logs is not None:
+            logs.append(f"ERROR: {error}")
+            logs.index_json(error)
+            self._emit("log", server_id, text=f"ERROR: {error}")
+        self._check_alerts(server_id, error)
+        # Error status and limit hits are still detected in suppressed output
+        if self._stderr_classifier(server_id).is_error(error):
+            self._escalate_error(server_id, error)
+        self._check_log_readiness(server_id, error)
+        config = self.run_configs.get(server_id)
+        if config is not None and server_id not in self.limit_hits:
+            reason = resource_limits.scan_output_for_limit_hit(config.resource_limits, error)
+            if reason:
+                self._record_limit_hit(server_id, reason)
+
+    def ingest_output(self, server_id, stream, data: bytes):
+        """Process a chunk of output as if the server had written it; also used to replay recordings"""
+        if stream == "stderr":
+            self._ingest_stderr(server_id, data)
+        else:
+            self._ingest_stdout(server_id, data)
+
+    def begin_replay(self, server_id, config, description):
+        """Start a fresh log for output replayed into a server that is not running"""
+        if server_id in self.processes:
+            return False
+        logs = LogBuffer([f"--- Replay of {description} ---"])
+        self.limit_hits.pop(server_id, None)
+        self._last_error_signal.pop(server_id, None)
+        # The server's own log budget, error detection and alert rules apply to the replay
+        self.log_throttles[server_id] = LogThrottle(config.log_budget if config else None)
+        self.stderr_classifiers[server_id] = StderrClassifier(config.stderr if config else None)
+        self.alerts.reset(server_id)
+        matcher, _ = self.alerts.matcher(server_id, config)
+        for error in matcher.errors:
+            logs.append(f"WARNING: {error}")
+        self._set_log(server_id, logs)
+        return True
+
+    def end_replay(self, server_id, summary):
+        throttle = self.log_throttles.get(server_id)
+        if throttle is not None:
+            self._write_log_summary(server_id, throttle, force=True)
+        self.append_log(server_id, f"--- End of replay: {summary} ---")
+
+    def start_recording(self, server_id, path):
+        """Record the server's raw output with its timing; raises OSError if the file cannot be created"""
+        self.stop_recording(server_id)
+        recorder = self.recorders[server_id] = OutputRecorder(path, server_id)
+        self.append_log(server_id, f"Recording output to {recorder.path}")
+
+    def stop_recording(self, server_id):
+        """Finish the server's recording, if any, and return its recorder"""
+        recorder = self.recorders.pop(server_id, None)
+        if recorder is None:
+            return None
+        try:
+            recorder.close()
+        except OSError as e:
+            print(f"[ERROR] Closing output recording: {e}")
+        self.append_log(server_id, f"Recorded {recorder.describe()}")
+        return recorder
+
+    def _record_output(self, server_id, stream, data):
+        recorder = self.recorders[server_id]
+        try:
+            recorder.record(stream, data)
+        except OSError as e:
+            self.append_log(server_id, f"ERROR: recording stopped: {e}")
+            self.stop_recording(server_id)
+            return
+        if recorder.full:
+            self.append_log(server_id, "WARNING: recording stopped at its size limit")
+            self.stop_recording(server_id)
+
+    def _admit_to_log(self, server_id, text, lines, size):
+        """Check a chunk against the server's log budget; suppressed chunks are only counted"""
+        throttle = self.log_throttles.get(server_id)
+        if throttle is None:
+            config = self.run_configs.get(server_id)
+            throttle = self.log_throttles[server_id] = LogThrottle(config.log_budget if config else None)
+        if throttle.admit(text, lines, size):
+            # Output resumed: say what was left out before it
+            self._write_log_summary(server_id, throttle, force=True)
+            return True
+        self.stats.record_suppressed(server_id, lines, size)
+        self._write_log_summary(server_id, throttle)
+        self._schedule("log_summaries", LOG_SUMMARY_CHECK_S, self._flush_log_summaries)
+        return False
+
+    def _write_log_summary(self, server_id, throttle, force=False):
+        message = throttle.summary(force=force)
+        if message is not None:
+            self.append_log(server_id, f"WARNING: {message}")
+
+    def _flush_log_summaries(self):
+        for server_id, throttle in self.log_throttles.items():
+            self._write_log_summary(server_id, throttle, force=server_id not in self.processes)
+        return any(throttle.pending for throttle in self.log_throttles.values())
+
+    def _check_alerts(self, server_id, text):
+        """Match output against the server's alert rules and raise the alerts that are due"""
+        matcher, built = self.alerts.matcher(server_id, self.run_configs.get(server_id))
+        if built:
+            for error in matcher.errors:
+                self.append_log(server_id, f"WARNING: {error}")
+        for rule, line, count in self.alerts.check(server_id, matcher, text):
+            lines = f" ({count} lines)" if count > 1 else ""
+            self.append_log(server_id, f"ALERT {rule.name}: {line}{lines}")
+            self._record_event(server_id, "alert", cause=f"{rule.name}: {line}")
+            self._emit("alert", server_id, rule=rule.name, line=line)
+
+    def _stderr_classifier(self, server_id):
+        """Return the server's classifier, compiling its stderr policy once per run"""
+        classifier = self.stderr_classifiers.get(server_id)
+        if classifier is None:
+            config = self.run_configs.get(server_id)
+            classifier = StderrClassifier(config.stderr if config else None)
+            self.stderr_classifiers[server_id] = classifier
+            if classifier.warning:
+                self.append_log(server_id, f"WARNING: {classifier.warning}")
+        return classifier
+
+    def _escalate_error(self, server_id, error):
+        """Report error output, rate-limited so a failing chatty server cannot flood the host"""
+        now = time.monotonic()
+        if now - self._last_error_signal.get(server_id, float("-inf")) < ERROR_SIGNAL_INTERVAL_S:
+            return
+        self._last_error_signal[server_id] = now
+        self._emit_error(server_id, error)
+        if server_id in self.processes:
+            self._set_status(server_id, "error")
+
+    def _handle_exit(self, server_id, process, exit_code, crashed):
+        """Clean up when a server process finished"""
+        if self.processes.get(server_id) is not process:
+            return
+        del self.processes[server_id]
+        config = self.run_configs.pop(server_id)
+        self.process_groups.pop(server_id, None)
+        cgroup_path, oom_kills_before = self.cgroups.pop(server_id, (None, 0))
+        if self.journal is not None:
+            self.journal.remove(server_id)
+        self.ready_times.pop(server_id, None)
+        started = self.start_times.get(server_id)
+        uptime = time.monotonic() - started if started is not None else None
+        if server_id in self.pending_readiness:
+            self._fail_readiness(server_id, "process exited before becoming ready")
+        self._set_status(server_id, "offline")
+        throttle = self.log_throttles.get(server_id)
+        if throttle is not None:
+            self._write_log_summary(server_id, throttle, force=True)
+        self.stop_recording(server_id)
+        if exit_code is None:
+            self.append_log(server_id, "Process exited (exit code unavailable)")
+        else:
+            self.append_log(server_id, f"Process exited with code {exit_code}")
+        if server_id in self.limit_hits:
+            self._set_status(server_id, "error")
+        elif exit_code is not None:
+            reason = resource_limits.detect_exit_limit_hit(
+                config.resource_limits,
+                exit_code,
+                crashed,
+                oom_kills_before,
+                cgroup_path,
+                stop_requested=server_id in self._stop_requested,
+            )
+            if reason:
+                self._record_limit_hit(server_id, reason)
+        # An unavailable exit code (a reattached server whose wrapper was killed) is a plain stop
+        resource_limits.remove_cgroup(cgroup_path)
+        self._record_exit(server_id, exit_code, crashed, uptime)
@@ -1,20 +1,329 @@
+import re
+
+from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import (
     QAbstractItemView,
+    QCheckBox,
+    QComboBox,
     QDialog,
     QFileDialog,
     QFormLayout,
+    QGroupBox,
     QHBoxLayout,
     QHeaderView,
     QLabel,
     QLineEdit,
     QMessageBox,
     QPushButton,
+    QSpinBox,
     QTableWidget,
     QTableWidgetItem,
     QVBoxLayout,
 )
 
-from models import ServerConfig
+import resource_limits
+from alert_rules import rule_source
+from models import AlertRule, LogBudget, ReadinessCheck, ResourceLimits, ServerConfig, StderrPolicy
+
+
+class ResourceLimitsEditor(QGroupBox):
+    """Form for a server's resource limits, shared by the editor dialog and panel"""
+
+    def __init__(self, parent=None):
+        super().__init__("Resource Limits", parent)
+        form = QFormLayout(self)
+        form.setFieldGrowthPolicy(QFormLayout.FieldGrowthPolicy.ExpandingFieldsGrow)
+
+        self.address_space_input = self._spin_box(0, 1024 * 1024, " MB")
+        form.addRow("Address space:", self.address_space_input)
+        self.rss_input = self._spin_box(0, 1024 * 1024, " MB")
+        form.addRow("RSS:", self.rss_input)
+        self.open_files_input = self._spin_box(0, 1024 * 1024, "")
+        form.addRow("Open files:", self.open_files_input)
+        self.cpu_seconds_input = self._spin_box(0, 365 * 24 * 3600, " s")
+        form.addRow("CPU time:", self.cpu_seconds_input)
+
+        self.nice_input = QSpinBox()
+        self.nice_input.setRange(-20, 19)
+        form.addRow("Nice level:", self.nice_input)
+
+        self.affinity_input = QLineEdit()
+        self.affinity_input.setPlaceholderText("All CPUs (e.g. 0-3,6)")
+        form.addRow("CPU affinity:", self.affinity_input)
+
+        self.cgroup_input = QComboBox()
+        self.cgroup_input.setEditable(True)
+        self.cgroup_input.addItems(["", "auto"])
+        self.cgroup_input.setToolTip("Empty: no cgroup, auto: delegated cgroup v2 subtree, or a cgroup directory")
+        form.addRow("Cgroup:", self.cgroup_input)
+
+    @staticmethod
+    def _spin_box(minimum, maximum, suffix):
+        box = QSpinBox()
+        box.setRange(minimum, maximum)
+        box.setSpecialValueText("Unlimited")
+        box.setSuffix(suffix)
+        return box
+
+    def load_limits(self, limits: ResourceLimits | None):
+        limits = limits or ResourceLimits()
+        self.address_space_input.setValue(limits.address_space_mb)
+        self.rss_input.setValue(limits.rss_mb)
+        self.open_files_input.setValue(limits.open_files)
+        self.cpu_seconds_input.setValue(limits.cpu_seconds)
+        self.nice_input.setValue(limits.nice)
+        self.affinity_input.setText(limits.cpu_affinity)
+        self.cgroup_input.setCurrentText(limits.cgroup)
+
+    def get_limits(self) -> ResourceLimits:
+        return ResourceLimits(
+            address_space_mb=self.address_space_input.value(),
+            rss_mb=self.rss_input.value(),
+            open_files=self.open_files_input.value(),
+            cpu_seconds=self.cpu_seconds_input.value(),
+            nice=self.nice_input.value(),
+            cpu_affinity=self.affinity_input.text().strip(),
+            cgroup=self.cgroup_input.currentText().strip(),
+        )
+
+    def validate(self):
+        return resource_limits.validate(self.get_limits())
+
+
+READINESS_VALUE_HINTS = {
+    "started": "",
+    "log": "Regular expression matched against output",
+    "tcp": "host:port accepting connections",
+    "delay": "Seconds after start",
+}
+
+
+class StartupSettingsEditor(QGroupBox):
+    """Form for a server's dependencies and readiness condition"""
+
+    def __init__(self, parent=None):
+        super().__init__("Startup Order", parent)
+        form = QFormLayout(self)
+        form.setFieldGrowthPolicy(QFormLayout.FieldGrowthPolicy.ExpandingFieldsGrow)
+
+        self.depends_on_input = QLineEdit()
+        self.depends_on_input.setPlaceholderText("Server IDs, comma separated")
+        form.addRow("Depends on:", self.depends_on_input)
+
+        self.readiness_type_input = QComboBox()
+        self.readiness_type_input.addItems(ReadinessCheck.TYPES)
+        self.readiness_type_input.currentTextChanged.connect(self._on_type_changed)
+        form.addRow("Ready when:", self.readiness_type_input)
+
+        self.readiness_value_input = QLineEdit()
+        form.addRow("Readiness value:", self.readiness_value_input)
+
+        self.readiness_timeout_input = QSpinBox()
+        self.readiness_timeout_input.setRange(1, 3600)
+        self.readiness_timeout_input.setSuffix(" s")
+        form.addRow("Readiness timeout:", self.readiness_timeout_input)
+        self._on_type_changed(self.readiness_type_input.currentText())
+
+    def _on_type_changed(self, check_type):
+        self.readiness_value_input.setPlaceholderText(READINESS_VALUE_HINTS.get(check_type, ""))
+        self.readiness_value_input.setEnabled(check_type != "started")
+        self.readiness_timeout_input.setEnabled(check_type != "started")
+
+    def load_settings(self, config: ServerConfig | None):
+        depends_on = config.depends_on if config else []
+        readiness = config.readiness if config else ReadinessCheck()
+        self.depends_on_input.setText(", ".join(depends_on))
+        self.readiness_type_input.setCurrentText(readiness.type)
+        self.readiness_value_input.setText(readiness.value)
+        self.readiness_timeout_input.setValue(readiness.timeout_s)
+
+    def get_depends_on(self) -> list:
+        items = [part.strip() for part in self.depends_on_input.text().split(",")]
+        return list(dict.fromkeys(item for item in items if item))
+
+    def get_readiness(self) -> ReadinessCheck:
+        return ReadinessCheck(
+            check_type=self.readiness_type_input.currentText(),
+            value=self.readiness_value_input.text().strip(),
+            timeout_s=self.readiness_timeout_input.value(),
+        )
+
+    def validate(self, server_id=""):
+        errors = []
+        if server_id and server_id in self.get_depends_on():
+            errors.append("A server cannot depend on itself")
+        check = self.get_readiness()
+        if check.type == "log":
+            try:
+                re.compile(check.value)
+            except re.error as e:
+                errors.append(f"Invalid readiness pattern: {e}")
+        elif check.type == "tcp":
+            port = check.value.rpartition(":")[2]
+            if not port.isdigit():
+                errors.append("TCP readiness value must be host:port")
+        elif check.type == "delay":
+            try:
+                float(check.value)
+            except ValueError:
+                errors.append("Delay readiness value must be a number of seconds")
+        return errors
+
+
+STDERR_MODE_LABELS = {
+    "levels": "Error-level lines (ERROR, FATAL, tracebacks)",
+    "regex": "Lines matching a pattern",
+    "always": "Any stderr output",
+    "never": "Never",
+}
+
+
+class StderrPolicyEditor(QGroupBox):
+    """Form for which stderr output marks a server as errored"""
+
+    def __init__(self, parent=None):
+        super().__init__("Error Detection", parent)
+        form = QFormLayout(self)
+        form.setFieldGrowthPolicy(QFormLayout.FieldGrowthPolicy.ExpandingFieldsGrow)
+
+        self.mode_input = QComboBox()
+        for mode in StderrPolicy.MODES:
+            self.mode_input.addItem(STDERR_MODE_LABELS[mode], mode)
+        self.mode_input.currentIndexChanged.connect(self._on_mode_changed)
+        form.addRow("Stderr is an error:", self.mode_input)
+
+        self.pattern_input = QLineEdit()
+        self.pattern_input.setPlaceholderText(r"Regular expression, e.g. \b(ERROR|panic)\b")
+        form.addRow("Error pattern:", self.pattern_input)
+        self._on_mode_changed()
+
+    def _on_mode_changed(self):
+        self.pattern_input.setEnabled(self.mode_input.currentData() == "regex")
+
+    def load_policy(self, policy: StderrPolicy | None):
+        policy = policy or StderrPolicy()
+        self.mode_input.setCurrentIndex(max(0, self.mode_input.findData(policy.mode)))
+        self.pattern_input.setText(policy.pattern)
+
+    def get_policy(self) -> StderrPolicy:
+        return StderrPolicy(mode=self.mode_input.currentData(), pattern=self.pattern_input.text().strip())
+
+    def validate(self):
+        policy = self.get_policy()
+        if policy.mode != "regex":
+            return []
+        if not policy.pattern:
+            return ["An error pattern is required when matching stderr lines"]
+        try:
+            re.compile(policy.pattern)
+        except re.error as e:
+            return [f"Invalid error pattern: {e}"]
+        return []
+
+
+class LogBudgetEditor(QGroupBox):
+    """Form for how much output per second a server may add to its log"""
+
+    def __init__(self, parent=None):
+        super().__init__("Log Budget", parent)
+        form = QFormLayout(self)
+        form.setFieldGrowthPolicy(QFormLayout.FieldGrowthPolicy.ExpandingFieldsGrow)
+        self._bytes_per_s = 0  # as loaded, kept when the KB/s field is not changed
+
+        self.lines_input = ResourceLimitsEditor._spin_box(0, 10_000_000, " lines/s")
+        form.addRow("Lines:", self.lines_input)
+        self.kilobytes_input = ResourceLimitsEditor._spin_box(0, 10 * 1024 * 1024, " KB/s")
+        form.addRow("Volume:", self.kilobytes_input)
+        hint = QLabel("Output over budget is left out of the log and summarized")
+        hint.setWordWrap(True)
+        form.addRow("", hint)
+
+    def load_budget(self, budget: LogBudget | None):
+        budget = budget or LogBudget()
+        self._bytes_per_s = budget.bytes_per_s
+        self.lines_input.setValue(budget.lines_per_s)
+        self.kilobytes_input.setValue(budget.bytes_per_s // 1024)
+
+    def get_budget(self) -> LogBudget:
+        kilobytes = self.kilobytes_input.value()
+        size = self._bytes_per_s if kilobytes == self._bytes_per_s // 1024 else kilobytes * 1024
+        return LogBudget(lines_per_s=self.lines_input.value(), bytes_per_s=size)
+
+
+class AlertRulesEditor(QGroupBox):
+    """Table of log patterns that raise an alert when the server prints a matching line"""
+
+    COLUMNS = ("Name", "Pattern", "Regex", "Ignore case")
+
+    def __init__(self, parent=None):
+        super().__init__("Alert Rules", parent)
+        layout = QVBoxLayout(self)
+        self.table = QTableWidget()
+        self.table.setColumnCount(len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        layout.addWidget(self.table)
+
+        buttons = QHBoxLayout()
+        add_button = QPushButton("Add Rule")
+        add_button.clicked.connect(lambda: self._add_row(AlertRule()))
+        remove_button = QPushButton("Remove Selected")
+        remove_button.clicked.connect(self._remove_selected_rows)
+        buttons.addWidget(add_button)
+        buttons.addWidget(remove_button)
+        buttons.addStretch()
+        layout.addLayout(buttons)
+        hint = QLabel("Patterns are plain text unless Regex is ticked, e.g. OOM, ECONNREFUSED or rate limit")
+        hint.setWordWrap(True)
+        layout.addWidget(hint)
+
+    def _add_row(self, rule: AlertRule):
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        self.table.setItem(row, 0, QTableWidgetItem(rule.name if rule.name != rule.pattern else ""))
+        self.table.setItem(row, 1, QTableWidgetItem(rule.pattern))
+        for column, checked in ((2, rule.regex), (3, rule.ignore_case)):
+            item = QTableWidgetItem()
+            item.setFlags(Qt.ItemFlag.ItemIsUserCheckable | Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable)
+            item.setCheckState(Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked)
+            self.table.setItem(row, column, item)
+
+    def _remove_selected_rows(self):
+        for index in sorted(self.table.selectionModel().selectedRows(), reverse=True):
+            self.table.removeRow(index.row())
+
+    def load_rules(self, rules):
+        self.table.setRowCount(0)
+        for rule in rules or []:
+            self._add_row(rule)
+
+    def get_rules(self) -> list:
+        rules = []
+        for row in range(self.table.rowCount()):
+            pattern_item = self.table.item(row, 1)
+            pattern = pattern_item.text().strip() if pattern_item else ""
+            if not pattern:
+                continue
+            name_item = self.table.item(row, 0)
+            rules.append(
+                AlertRule(
+                    name=name_item.text().strip() if name_item else "",
+                    pattern=pattern,
+                    regex=self.table.item(row, 2).checkState() == Qt.CheckState.Checked,
+                    ignore_case=self.table.item(row, 3).checkState() == Qt.CheckState.Checked,
+                )
+            )
+        return rules
+
+    def validate(self):
+        errors = []
+        for rule in self.get_rules():
+            try:
+                re.compile(rule_source(rule))
+            except re.error as e:
+                errors.append(f"Invalid alert pattern '{rule.pattern}': {e}")
+        return errors
 
 
 class ServerEditorDialog(QDialog):
@@ -56,6 +365,10 @@ class ServerEditorDialog(QDialog):
         dir_layout.addWidget(dir_button)
         form_layout.addRow("Working Directory:", dir_layout)
 
+        self.persistent_input = QCheckBox("Keep running when MCP Manager exits")
+        self.persistent_input.setChecked(self.config.persistent)
+        form_layout.addRow("", self.persistent_input)
+
         layout.addLayout(form_layout)
 
         # Arguments table
@@ -99,6 +412,31 @@ class ServerEditorDialog(QDialog):
         layout.addWidget(self.env_table)
         layout.addLayout(env_btn_layout)
 
+        # Resource limits
+        self.limits_editor = ResourceLimitsEditor()
+        self.limits_editor.load_limits(self.config.resource_limits)
+        layout.addWidget(self.limits_editor)
+
+        # Dependencies and readiness
+        self.startup_editor = StartupSettingsEditor()
+        self.startup_editor.load_settings(self.config)
+        layout.addWidget(self.startup_editor)
+
+        # Which stderr output counts as an error
+        self.stderr_editor = StderrPolicyEditor()
+        self.stderr_editor.load_policy(self.config.stderr)
+        layout.addWidget(self.stderr_editor)
+
+        # Log patterns that raise alerts
+        self.alerts_editor = AlertRulesEditor()
+        self.alerts_editor.load_rules(self.config.alert_rules)
+        layout.addWidget(self.alerts_editor)
+
+        # Output rate admitted to the log
+        self.log_budget_editor = LogBudgetEditor()
+        self.log_budget_editor.load_budget(self.config.log_budget)
+        layout.addWidget(self.log_budget_editor)
+
         # Dialog buttons
         btn_layout = QHBoxLayout()
         save_btn = QPushButton("Save")
@@ -139,15 +477,21 @@ class ServerEditorDialog(QDialog):
 
     def get_config(self):
         """Return the updated configuration"""
-        # Create new config from inputs
-        config = ServerConfig(
-            server_id=self.id_input.text().strip(),
-            name=self.name_input.text().strip(),
-            command=self.command_input.text().strip(),
-            arguments=self._get_table_items(self.args_table),
-            env_vars=self._get_env_vars(),
-            working_dir=self.dir_input.text().strip(),
-        )
+        # Start from a copy so settings without an editor field are preserved
+        config = self.config.copy()
+        config.id = self.id_input.text().strip()
+        config.name = self.name_input.text().strip()
+        config.command = self.command_input.text().strip()
+        config.arguments = self._get_table_items(self.args_table)
+        config.env_vars = self._get_env_vars()
+        config.working_dir = self.dir_input.text().strip()
+        config.persistent = self.persistent_input.isChecked()
+        config.resource_limits = self.limits_editor.get_limits()
+        config.depends_on = self.startup_editor.get_depends_on()
+        config.readiness = self.startup_editor.get_readiness()
+        config.stderr = self.stderr_editor.get_policy()
+        config.alert_rules = self.alerts_editor.get_rules()
+        config.log_budget = self.log_budget_editor.get_budget()
         return config
 
     def _get_table_items(self, table):
@@ -176,6 +520,10 @@ class ServerEditorDialog(QDialog):
             errors.append("Server ID is required")
         if not self.command_input.text().strip():
             errors.append("Command is required")
+        errors.extend(self.limits_editor.validate())
+        errors.extend(self.startup_editor.validate(self.id_input.text().strip()))
+        errors.extend(self.stderr_editor.validate())
+        errors.extend(self.alerts_editor.validate())
         return errors
 
     def accept(self):
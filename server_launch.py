@@ -0,0 +1,85 @@
+"""Launch-command and readiness helpers used by ServerCore.
+
+Kept free of Qt and asyncio so importing it costs the GUI next to nothing at
+startup.
+"""
+
+import os
+import re
+import shlex
+import socket
+import subprocess
+import time
+
+from models import ReadinessCheck, ServerConfig
+
+
+def login_shell() -> str:
+    """Return the shell used to launch servers so user profiles are loaded"""
+    if os.name == "nt":
+        return os.environ.get("COMSPEC", "cmd.exe")
+    return os.environ.get("SHELL", "/bin/bash") or "/bin/bash"
+
+
+def quote_command(config: ServerConfig) -> str:
+    """Quote a server's command and arguments for the platform shell"""
+    argv = [config.command, *list(config.arguments)]
+    if os.name == "nt":
+        return subprocess.list2cmdline(argv)
+    return shlex.join(argv)
+
+
+def shell_arguments(command: str) -> list[str]:
+    """Return the arguments that make the login shell run ``command``"""
+    if os.name == "nt":
+        return ["/C", command]
+    return ["-lc", command]
+
+
+class ReadinessProbe:
+    """Evaluate a server's ReadinessCheck from its output, a TCP port or elapsed time"""
+
+    def __init__(self, check: ReadinessCheck, started_at: float | None = None):
+        self.check = check
+        self.started_at = time.monotonic() if started_at is None else started_at
+        self.deadline = self.started_at + check.timeout_s
+        # Raises re.error for an invalid pattern
+        self.pattern = re.compile(check.value) if check.type == "log" else None
+
+    @property
+    def immediate(self) -> bool:
+        """True when the server is ready as soon as the process started"""
+        return self.check.type not in ("log", "tcp", "delay")
+
+    def feed(self, text: str) -> bool:
+        """Return True if output ``text`` satisfies a log readiness check"""
+        return self.pattern is not None and self.pattern.search(text) is not None
+
+    def poll(self, now: float | None = None) -> str | None:
+        """Return "ready", "timeout" or None (keep waiting) for time and TCP based checks"""
+        now = time.monotonic() if now is None else now
+        if self.check.type == "delay":
+            try:
+                delay = float(self.check.value or 0)
+            except ValueError:
+                delay = 0.0
+            if now - self.started_at >= delay:
+                return "ready"
+        elif self.check.type == "tcp" and tcp_accepting(self.check.value):
+            return "ready"
+        if now >= self.deadline:
+            return "timeout"
+        return None
+
+    def timeout_reason(self) -> str:
+        return f"not ready after {self.check.timeout_s}s ({self.check.type} check)"
+
+
+def tcp_accepting(address: str) -> bool:
+    """Return True if something accepts TCP connections at ``host:port``"""
+    host, _, port = address.rpartition(":")
+    try:
+        with socket.create_connection((host or "127.0.0.1", int(port)), timeout=0.05):
+            return True
+    except (OSError, ValueError):
+        return False
@@ -0,0 +1,68 @@
+import time
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from process_manager import STOP_TIMEOUT_MS, ProcessManager
+
+POLL_INTERVAL_MS = 50
+KILL_GRACE_MS = 1000
+
+
+class ShutdownCoordinator(QObject):
+    """Stop many servers in parallel against a single global deadline.
+
+    Every server gets SIGTERM at once; the event loop keeps running while we wait,
+    so QProcess can reap children and the UI can show progress. Servers still
+    running at the deadline are escalated to SIGKILL together, which makes
+    quitting with fifty servers take about one timeout rather than fifty.
+    """
+
+    progress = pyqtSignal(int, int)  # stopped, total
+    finished = pyqtSignal(list)  # server IDs that could not be confirmed stopped
+
+    def __init__(self, process_manager: ProcessManager, timeout_ms: int = STOP_TIMEOUT_MS, parent=None):
+        super().__init__(parent)
+        self.process_manager = process_manager
+        self.timeout_ms = timeout_ms
+        self._pending = {}  # server_id: PIDs that must exit
+        self._total = 0
+        self._deadline = 0.0
+        self._killed = False
+        self._timer = QTimer(self)
+        self._timer.setInterval(POLL_INTERVAL_MS)
+        self._timer.timeout.connect(self._poll)
+
+    def is_active(self):
+        return self._timer.isActive()
+
+    def start(self, server_ids):
+        """Send SIGTERM to every server and start waiting for them"""
+        self._pending = {server_id: self.process_manager.begin_stop(server_id) for server_id in server_ids}
+        self._total = len(self._pending)
+        self._deadline = time.monotonic() + self.timeout_ms / 1000
+        self._killed = False
+        self.progress.emit(0, self._total)
+        self._timer.start()
+
+    def _poll(self):
+        for server_id, pids in list(self._pending.items()):
+            if self.process_manager.is_stopped(server_id, pids):
+                del self._pending[server_id]
+        self.progress.emit(self._total - len(self._pending), self._total)
+
+        if not self._pending:
+            self._finish()
+            return
+        now = time.monotonic()
+        if not self._killed and now >= self._deadline:
+            # Escalate all stragglers together, then allow a short grace period for reaping
+            for server_id, pids in self._pending.items():
+                self.process_manager.force_stop(server_id, pids)
+            self._killed = True
+            self._deadline = now + KILL_GRACE_MS / 1000
+        elif self._killed and now >= self._deadline:
+            self._finish()
+
+    def _finish(self):
+        self._timer.stop()
+        self.finished.emit(sorted(self._pending))
@@ -0,0 +1,35 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+
+import dependency_graph
+from process_manager import ProcessManager
+
+
+class StartupScheduler(QObject):
+    """Start servers in dependency order through ServerCore, reporting the result as a signal.
+
+    The scheduling itself is ``server_core.StartupRun``, shared with the daemon:
+    a server is launched as soon as all of its own prerequisites are ready, and
+    one that fails to start or to become ready blocks everything that depends on it.
+    """
+
+    finished = pyqtSignal(dict)  # startup report, see dependency_graph.format_report
+
+    def __init__(self, process_manager: ProcessManager, parent=None):
+        super().__init__(parent)
+        self.process_manager = process_manager
+        self._run = None  # server_core.StartupRun of the last startup
+
+    def is_active(self):
+        return self._run is not None and self._run.active
+
+    def start(self, configs, targets=None):
+        """Start ``targets`` (default: every server) and all their prerequisites.
+
+        Raises DependencyCycleError or UnknownDependencyError before anything is
+        started if the graph is invalid.
+        """
+        self._run = self.process_manager.core.start_servers(targets, self._finish, configs)
+
+    def _finish(self, report):
+        print(f"[DEBUG] Startup finished:\n{dependency_graph.format_report(report)}")
+        self.finished.emit(report)
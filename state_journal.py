@@ -0,0 +1,153 @@
+"""Runtime state journal used to reattach to running servers after a manager restart.
+
+For every running server the journal records its PID, ``/proc`` start time,
+process group and a hash of the launch configuration. It is written next to
+``mcp_servers.json``. On startup each entry is revalidated (the PID must still
+exist with the same start time) before the manager reattaches to it.
+
+Persistent servers are launched detached with stdio redirected to files under
+``runtime/<server id>/``: stdin is a FIFO the child opens read/write (so it never
+sees EOF when the manager goes away) and stdout/stderr are append-only log files
+the manager tails, which is also how output is recovered after a restart.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import NamedTuple
+
+import process_tree
+
+STATE_FILE_NAME = "server_state.json"
+RUNTIME_DIR_NAME = "runtime"
+
+
+class RuntimeFiles(NamedTuple):
+    directory: Path
+    stdin: Path  # FIFO
+    stdout: Path
+    stderr: Path
+    exit_status: Path
+
+
+def config_hash(config) -> str:
+    """Return a stable hash of the settings that affect how a server is launched"""
+    data = config.to_dict()
+    # Fields that only matter to the manager, not to the launched process
+    for key in ("status", "name", "depends_on", "readiness", "stderr", "alert_rules", "log_budget"):
+        data.pop(key, None)
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def runtime_files(state_dir: Path, server_id: str) -> RuntimeFiles:
+    """Return the runtime file locations for a server"""
+    safe_id = re.sub(r"[^A-Za-z0-9_.-]", "_", server_id) or "server"
+    directory = Path(state_dir) / RUNTIME_DIR_NAME / safe_id
+    return RuntimeFiles(
+        directory=directory,
+        stdin=directory / "stdin",
+        stdout=directory / "stdout.log",
+        stderr=directory / "stderr.log",
+        exit_status=directory / "exit_status",
+    )
+
+
+def prepare_runtime_files(files: RuntimeFiles) -> None:
+    """Create the stdin FIFO and empty log files for a fresh launch"""
+    files.directory.mkdir(parents=True, exist_ok=True)
+    if not files.stdin.exists():
+        os.mkfifo(files.stdin, 0o600)
+    for path in (files.stdout, files.stderr):
+        path.write_bytes(b"")
+    with contextlib.suppress(FileNotFoundError):
+        files.exit_status.unlink()
+
+
+def read_exit_status(files: RuntimeFiles) -> int | None:
+    """Return the exit status written by the shell wrapper, or None if it was not written"""
+    try:
+        return int(files.exit_status.read_text().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def read_tail(path: Path, max_bytes: int, start: int = 0) -> tuple[bytes, int]:
+    """Return the last ``max_bytes`` of a file from ``start`` on and the file's current size"""
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            if start > size:
+                start = 0  # truncated since that offset was recorded
+            f.seek(max(start, size - max_bytes))
+            return f.read(), size
+    except OSError:
+        return b"", 0
+
+
+class StateJournal:
+    """JSON journal of running servers, rewritten atomically on every change"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries: dict[str, dict] = {}
+
+    def load(self) -> dict[str, dict]:
+        """Read the journal from disk; a missing or corrupt file yields an empty journal"""
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            self.entries = data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            self.entries = {}
+        return self.entries
+
+    def record(self, server_id: str, entry: dict) -> None:
+        self.entries[server_id] = entry
+        self._write()
+
+    def remove(self, server_id: str) -> None:
+        if self.entries.pop(server_id, None) is not None:
+            self._write()
+
+    def _write(self) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(self.entries, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[ERROR] Writing state journal: {e}")
+
+
+def make_entry(pid: int, config, persistent: bool) -> dict | None:
+    """Build a journal entry for a just-started server; None if /proc is unavailable"""
+    stat = process_tree.read_stat(pid)
+    if stat is None:
+        return None
+    return {
+        "pid": pid,
+        "pgid": stat.pgrp,
+        "start_time": stat.starttime,
+        "config_hash": config_hash(config),
+        "persistent": persistent,
+    }
+
+
+def validate_entry(server_id: str, entry: dict) -> bool:
+    """Return True if the journaled process is still the same live process"""
+    try:
+        pid = int(entry["pid"])
+        start_time = int(entry["start_time"])
+    except (KeyError, TypeError, ValueError):
+        return False
+    stat = process_tree.read_stat(pid)
+    if stat is None or stat.state in ("Z", "X") or stat.starttime != start_time:
+        return False
+    # Guard against PID reuse by a process that happens to share the start time
+    marker = process_tree.read_environ_value(pid, process_tree.SERVER_ID_ENV)
+    return marker is None or marker == server_id
@@ -0,0 +1,207 @@
+"""Columnar store of JSON log lines with per-field value indexes.
+
+Many MCP servers write JSON lines (pino, structlog, zap, ...) to stderr. At
+ingest every line that looks like a JSON object is parsed and its common fields
+are appended to columns: a timestamp, small integer codes for ``level`` and
+``logger``, and the message. Each code keeps a posting list of the records that
+carry it, so filtering by level or logger is a lookup plus a sorted-list
+union or intersection, and time ranges are a binary search while the timestamps arrive in
+order. The raw text stays in the server's LogBuffer; records point back at it by
+entry and line. Free of Qt.
+"""
+
+import json
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from itertools import chain
+
+LEVEL_FIELDS = ("level", "lvl", "severity", "levelname", "log.level")
+LOGGER_FIELDS = ("logger", "name", "logger_name", "component", "module")
+MESSAGE_FIELDS = ("msg", "message", "event")
+TIME_FIELDS = ("time", "ts", "timestamp", "@timestamp")
+INDEXED_FIELDS = ("level", "logger")
+MAX_PARTIAL_CHARS = 65536  # longer unterminated lines are not parsed
+MAX_VALUES = 65535  # distinct values indexed per field; later new values are stored as missing
+# Normalized levels from least to most severe
+LEVELS = ("trace", "debug", "info", "warning", "error", "fatal")
+LEVEL_ALIASES = {"warn": "warning", "err": "error", "critical": "fatal", "crit": "fatal", "panic": "fatal"}
+# pino/bunyan numeric levels
+NUMERIC_LEVELS = {10: "trace", 20: "debug", 30: "info", 40: "warning", 50: "error", 60: "fatal"}
+
+
+def _first(record, fields):
+    for field in fields:
+        value = record.get(field)
+        if value is not None:
+            return value
+    return None
+
+
+def normalize_level(value) -> str | None:
+    if value is None:
+        return None
+    if isinstance(value, int | float):
+        return NUMERIC_LEVELS.get(int(value), str(value))
+    level = str(value).lower()
+    return LEVEL_ALIASES.get(level, level)
+
+
+def parse_time(value) -> float | None:
+    """Return epoch seconds for a numeric (s, ms, us or ns) or ISO 8601 timestamp"""
+    if isinstance(value, int | float) and not isinstance(value, bool):
+        for scale in (1e18, 1e15, 1e12):
+            if value > scale / 10:
+                return value / (scale / 1e9)
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+def parse_json_line(line: str) -> dict | None:
+    """Return the common fields of a JSON log line, or None if it is not a JSON object"""
+    line = line.strip()
+    if not line.startswith("{"):
+        return None
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(record, dict):
+        return None
+    logger = _first(record, LOGGER_FIELDS)
+    message = _first(record, MESSAGE_FIELDS)
+    return {
+        "level": normalize_level(_first(record, LEVEL_FIELDS)),
+        "logger": None if logger is None else str(logger),
+        "msg": "" if message is None else str(message),
+        "time": parse_time(_first(record, TIME_FIELDS)),
+    }
+
+
+def _intersect(a, b):
+    """Intersect two ascending sequences of record IDs"""
+    if len(a) > len(b):
+        a, b = b, a
+    result = []
+    n = len(b)
+    for record_id in a:
+        i = bisect_left(b, record_id)
+        if i < n and b[i] == record_id:
+            result.append(record_id)
+    return result
+
+
+class StructuredLog:
+    """Parsed JSON log lines of one server, stored by column"""
+
+    def __init__(self):
+        self.entries = array("I")  # record: entry index in the LogBuffer
+        self.lines = array("I")  # record: line number within that entry
+        self.times = array("d")  # record: epoch seconds (the capture time when the line has none)
+        self.messages = []
+        self._codes = {field: array("H") for field in INDEXED_FIELDS}  # record: value code, 0 = missing
+        self._values = {field: [None] for field in INDEXED_FIELDS}  # code: value
+        self._lookup = {field: {} for field in INDEXED_FIELDS}  # value: code
+        self._postings = {field: [array("I")] for field in INDEXED_FIELDS}  # code: ascending record IDs
+        self._times_sorted = True
+        self._partial = ""  # unterminated last line of the previous chunk
+        self._joined = {}  # record: full text of a line that spanned two chunks
+
+    def __len__(self):
+        return len(self.times)
+
+    def ingest(self, entry: int, text: str, captured: float) -> int:
+        """Parse the JSON lines of a chunk stored as ``entry``; returns the number of records added"""
+        lines = text.split("\n")
+        joined = bool(self._partial)
+        lines[0] = self._partial + lines[0]
+        # A chunk may end mid-line; the rest of that line arrives with the next chunk
+        self._partial = lines.pop()
+        if len(self._partial) > MAX_PARTIAL_CHARS:
+            self._partial = ""
+        added = 0
+        for number, line in enumerate(lines):
+            if "{" not in line:
+                continue
+            fields = parse_json_line(line)
+            if fields is None:
+                continue
+            if number == 0 and joined:
+                self._joined[len(self)] = line
+            self._append(entry, number, fields, captured)
+            added += 1
+        return added
+
+    def drop_partial(self) -> None:
+        """Forget the unterminated last line; the chunk that would have completed it was not logged"""
+        self._partial = ""
+
+    def _append(self, entry, line, fields, captured):
+        record_id = len(self)
+        timestamp = fields["time"] if fields["time"] is not None else captured
+        if self.times and timestamp < self.times[-1]:
+            self._times_sorted = False
+        self.entries.append(entry)
+        self.lines.append(line)
+        self.times.append(timestamp)
+        self.messages.append(fields["msg"])
+        for field in INDEXED_FIELDS:
+            value = fields[field]
+            code = 0
+            if value is not None:
+                code = self._lookup[field].get(value)
+                if code is None and len(self._values[field]) > MAX_VALUES:
+                    code = 0
+                elif code is None:
+                    code = self._lookup[field][value] = len(self._values[field])
+                    self._values[field].append(value)
+                    self._postings[field].append(array("I"))
+            self._codes[field].append(code)
+            self._postings[field][code].append(record_id)
+
+    def values(self, field: str) -> list[str]:
+        """Return the distinct values seen for an indexed field"""
+        return self._values[field][1:]
+
+    def value(self, field: str, record_id: int) -> str | None:
+        return self._values[field][self._codes[field][record_id]]
+
+    def joined_line(self, record_id: int) -> str | None:
+        """Return the full text of a record whose line was split across two chunks"""
+        return self._joined.get(record_id)
+
+    def _ids_for(self, field, wanted):
+        wanted = {wanted} if isinstance(wanted, str) else set(wanted)
+        postings = [self._postings[field][code] for value, code in self._lookup[field].items() if value in wanted]
+        if len(postings) == 1:
+            return postings[0]
+        # Timsort merges the already sorted runs in C
+        return array("I", sorted(chain.from_iterable(postings)))
+
+    def query(self, levels=None, loggers=None, since=None, until=None) -> list[int]:
+        """Return the IDs of matching records in order; ``levels``/``loggers`` take one value or several"""
+        candidates = None
+        for field, wanted in (("level", levels), ("logger", loggers)):
+            if wanted is not None:
+                ids = self._ids_for(field, wanted)
+                candidates = ids if candidates is None else _intersect(candidates, ids)
+        if since is None and until is None:
+            return list(range(len(self))) if candidates is None else list(candidates)
+        if not self._times_sorted:
+            pool = range(len(self)) if candidates is None else candidates
+            return [
+                record_id
+                for record_id in pool
+                if (since is None or self.times[record_id] >= since)
+                and (until is None or self.times[record_id] <= until)
+            ]
+        lo = 0 if since is None else bisect_left(self.times, since)
+        hi = len(self) if until is None else bisect_right(self.times, until)
+        if candidates is None:
+            return list(range(lo, hi))
+        return list(candidates[bisect_left(candidates, lo) : bisect_left(candidates, hi)])
@@ -0,0 +1,122 @@
+import re
+
+import pytest
+
+import alert_rules
+from alert_rules import AlertMatcher, AlertMonitor
+from models import AlertRule, ServerConfig
+
+
+def hits(matcher, text):
+    return {rule.name: (line, count) for rule, line, count in matcher.scan(text)}
+
+
+def test_overlapping_literals_all_fire():
+    matcher = AlertMatcher([
+        AlertRule("rate", "rate limit"),
+        AlertRule("limit", "limit"),
+        AlertRule("exceeded", "limit exceeded"),
+    ])
+    text = "ok\nrate limit exceeded\nlimit\n"
+    assert hits(matcher, text) == {
+        "rate": ("rate limit exceeded", 1),
+        "limit": ("rate limit exceeded", 2),
+        "exceeded": ("rate limit exceeded", 1),
+    }
+
+
+def test_matches_on_one_line_count_once():
+    matcher = AlertMatcher([AlertRule("oom", "OOM")])
+    assert hits(matcher, "OOM OOM\r\nfine\nOOM\n") == {"oom": ("OOM OOM", 2)}
+
+
+def test_ignore_case_reports_the_original_line():
+    # "İ" lowercases to two characters, shifting every later position
+    matcher = AlertMatcher([AlertRule("refused", "econnrefused", ignore_case=True)])
+    assert hits(matcher, "İİİ\nfine\nError: ECONNREFUSED\n") == {"refused": ("Error: ECONNREFUSED", 1)}
+    assert hits(AlertMatcher([AlertRule("oom", "oom")]), "OOM\n") == {}
+
+
+def test_regex_rules_are_attributed_per_line():
+    matcher = AlertMatcher([
+        AlertRule("status", r"status=5\d\d", regex=True),
+        AlertRule("slow", r"took \d{4,}ms", regex=True),
+        AlertRule("repeat", r"(\w+) \1", regex=True),
+    ])
+    text = "status=503 took 20ms\nstatus=200 took 1500ms\nagain again\n"
+    assert hits(matcher, text) == {
+        "status": ("status=503 took 20ms", 1),
+        "slow": ("status=200 took 1500ms", 1),
+        "repeat": ("again again", 1),
+    }
+
+
+@pytest.mark.parametrize(
+    ("source", "expected"),
+    [
+        (r"(GET|POST) /api/(?P<route>\w+)", r"(?:GET|POST) /api/(?:\w+)"),
+        (r"[(]\(x\)[^]()](?=y)(?i:z)", r"[(]\(x\)[^]()](?=y)(?i:z)"),
+        (r"(\w+) \1", None),
+        (r"(?P<word>\w+) (?P=word)", None),
+        (r"(<)?\w+(?(1)>)", None),
+        (r"[\1]\0(a)", r"[\1]\0(?:a)"),
+    ],
+)
+def test_without_groups(source, expected):
+    assert alert_rules.without_groups(source) == expected
+
+
+def test_only_backreferences_need_their_own_scan():
+    matcher = AlertMatcher([
+        AlertRule("method", r"(GET|POST) /admin", regex=True),
+        AlertRule("named", r"user=(?P<user>root)", regex=True),
+        AlertRule("repeat", r"(\w+) \1", regex=True),
+    ])
+    assert [rule.name for rule, _ in matcher._standalone] == ["repeat"]
+    assert matcher._regex.groups == 0
+    assert set(hits(matcher, "POST /admin user=root\n")) == {"method", "named"}
+
+
+def test_invalid_regex_is_skipped_with_an_error():
+    matcher = AlertMatcher([AlertRule("broken", "(", regex=True), AlertRule("", "")])
+    assert not matcher
+    assert len(matcher.errors) == 1
+    assert matcher.errors[0].startswith("alert rule 'broken' ignored")
+
+
+def test_long_lines_are_truncated():
+    line, _ = hits(AlertMatcher([AlertRule("x", "x")]), "x" * 1000)["x"]
+    assert len(line) == alert_rules.MAX_ALERT_LINE_CHARS
+
+
+@pytest.mark.parametrize("words", [["a", "ab", "abc", "b"], ["OOM", "OOMKilled", "E.G.", "x|y"]])
+def test_trie_regex_prefers_the_longest_word(words):
+    pattern = re.compile(alert_rules.trie_regex(words))
+    for word in words:
+        assert pattern.fullmatch(word)
+        assert pattern.match(word + "!").group() == word
+
+
+def test_monitor_rate_limits_and_counts_suppressed_matches(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(alert_rules.time, "monotonic", lambda: now[0])
+    monitor = AlertMonitor()
+    config = ServerConfig("s", "s", "server", [], {}, alert_rules=[AlertRule("oom", "OOM")])
+    matcher, built = monitor.matcher("s", config)
+    assert built
+    assert monitor.matcher("s", config) == (matcher, False)
+    assert [count for _, _, count in monitor.check("s", matcher, "OOM\n")] == [1]
+    assert monitor.check("s", matcher, "OOM\nOOM again\n") == []
+    now[0] += alert_rules.ALERT_INTERVAL_S
+    assert [count for _, _, count in monitor.check("s", matcher, "OOM\n")] == [3]
+    monitor.reset("s")
+    assert monitor.matcher("s", config)[1]
+
+
+def test_global_rules_apply_to_every_server(tmp_path):
+    path = alert_rules.alert_rules_path(tmp_path)
+    path.write_text('[{"name": "panic", "pattern": "panic"}, "junk"]')
+    monitor = AlertMonitor(path)
+    matcher, _ = monitor.matcher("s", ServerConfig("s", "s", "server", [], {}))
+    assert [rule.name for rule, _, _ in monitor.check("s", matcher, "kernel panic\n")] == ["panic"]
+    assert alert_rules.load_global_rules(tmp_path / "missing.json") == []
@@ -0,0 +1,51 @@
+import pytest
+
+import dependency_graph
+from models import ServerConfig
+
+
+def config(server_id, *depends_on):
+    return ServerConfig(server_id, server_id, "true", [], {}, depends_on=list(depends_on))
+
+
+def test_build_graph_drops_duplicate_dependencies():
+    graph = dependency_graph.build_graph([config("a"), config("b", "a", "a")])
+    assert graph == {"a": [], "b": ["a"]}
+
+
+def test_plan_waves_groups_by_depth():
+    graph = {"db": [], "cache": [], "api": ["db", "cache"], "web": ["api"], "worker": ["db"]}
+    assert dependency_graph.plan_waves(graph) == [["cache", "db"], ["api", "worker"], ["web"]]
+
+
+def test_plan_waves_for_targets_includes_their_prerequisites():
+    graph = {"db": [], "api": ["db"], "web": ["api"], "other": []}
+    assert dependency_graph.plan_waves(graph, ["api"]) == [["db"], ["api"]]
+
+
+def test_plan_waves_rejects_unknown_targets():
+    with pytest.raises(dependency_graph.UnknownServerError) as excinfo:
+        dependency_graph.plan_waves({"db": []}, ["web", "db", "api"])
+    assert excinfo.value.message == "Unknown server(s): api, web"
+
+
+def test_cycle_is_rejected():
+    graph = {"a": ["c"], "b": ["a"], "c": ["b"]}
+    with pytest.raises(dependency_graph.DependencyCycleError) as excinfo:
+        dependency_graph.plan_waves(graph)
+    cycle = excinfo.value.cycle
+    assert cycle[0] == cycle[-1]
+    assert set(cycle) == {"a", "b", "c"}
+
+
+def test_unknown_dependency_is_rejected():
+    with pytest.raises(dependency_graph.UnknownDependencyError) as excinfo:
+        dependency_graph.validate({"api": ["db"]})
+    assert excinfo.value.message == "Server 'api' depends on unknown server 'db'"
+
+
+def test_critical_path_follows_the_slowest_chain():
+    graph = {"db": [], "cache": [], "api": ["db", "cache"], "web": ["api"]}
+    durations = {"db": 2.0, "cache": 0.5, "api": 1.0, "web": 0.25}
+    assert dependency_graph.critical_path(graph, durations) == (["db", "api", "web"], 3.25)
+    assert dependency_graph.critical_path(graph, {}) == ([], 0.0)
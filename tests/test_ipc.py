@@ -0,0 +1,105 @@
+import socket
+import struct
+
+import pytest
+
+import ipc
+
+
+def test_frames_round_trip_across_arbitrary_splits():
+    data = ipc.encode_frame({"op": "ping"}) + ipc.encode_frame({"op": "logs", "servers": ["é中"]})
+    decoder = ipc.FrameDecoder()
+    messages = []
+    for i in range(len(data)):
+        messages += decoder.feed(data[i : i + 1])
+    assert messages == [{"op": "ping"}, {"op": "logs", "servers": ["é中"]}]
+
+
+def test_oversized_frame_is_rejected():
+    with pytest.raises(ipc.FrameTooLargeError):
+        ipc.FrameDecoder().feed(struct.pack(">I", ipc.MAX_FRAME_BYTES + 1))
+
+
+def test_malformed_frame_is_rejected():
+    with pytest.raises(ipc.MalformedFrameError):
+        ipc.FrameDecoder().feed(struct.pack(">I", 3) + b"{x}")
+
+
+@pytest.mark.parametrize(
+    ("request_", "valid"),
+    [
+        ({"op": "status", "servers": None}, True),
+        ({"op": "stop", "servers": ["a", "b"]}, True),
+        ({"op": "format-disk"}, False),
+        ({"op": "stop", "servers": "a"}, False),
+        ([], False),
+    ],
+)
+def test_validate_request(request_, valid):
+    assert (ipc.validate_request(request_) is None) == valid
+
+
+def test_resolve_servers():
+    assert ipc.resolve_servers({"servers": None}, ["a", "b"]) == (["a", "b"], None)
+    assert ipc.resolve_servers({"servers": ["b", "b"]}, ["a", "b"]) == (["b"], None)
+    assert ipc.resolve_servers({"servers": ["c"]}, ["a", "b"]) == ([], "Unknown server(s): c")
+
+
+@pytest.fixture
+def listener(tmp_path):
+    """A socket that accepts connections but never answers"""
+    path = tmp_path / ipc.SOCKET_NAME
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(str(path))
+    sock.listen()
+    yield path, sock
+    sock.close()
+
+
+def test_missing_socket_means_no_manager(tmp_path):
+    with pytest.raises(ipc.ManagerNotRunningError):
+        ipc.Client(tmp_path / ipc.SOCKET_NAME)
+    assert not ipc.instance_running(tmp_path / ipc.SOCKET_NAME)
+
+
+def test_request_to_a_silent_manager_times_out(listener):
+    path, _ = listener
+    with ipc.Client(path, timeout=0.05) as client, pytest.raises(ipc.ManagerNotRespondingError):
+        client.request("ping")
+    # A busy manager still owns its socket
+    assert ipc.instance_running(path)
+    assert not ipc.claim_socket(path)
+
+
+def test_reply_and_error_reply(listener):
+    path, sock = listener
+    with ipc.Client(path) as client:
+        conn, _ = sock.accept()
+        with conn:
+            conn.sendall(ipc.encode_frame(ipc.reply({"stopped": ["a"]})))
+            conn.sendall(ipc.encode_frame(ipc.error_reply("Unknown server(s): b")))
+            assert client.request("stop", ["a"]) == {"stopped": ["a"]}
+            with pytest.raises(ipc.IpcError, match="Unknown server"):
+                client.request("stop", ["b"])
+        with pytest.raises(ipc.ConnectionClosedError):
+            client.receive()
+
+
+@pytest.mark.parametrize("error", [PermissionError(13, "Permission denied"), OSError(22, "Invalid argument")])
+def test_connect_errors_are_ipc_errors(monkeypatch, tmp_path, error):
+    def connect(self, address):
+        raise error
+
+    monkeypatch.setattr(socket.socket, "connect", connect)
+    with pytest.raises(ipc.IpcError) as excinfo:
+        ipc.Client(tmp_path / ipc.SOCKET_NAME)
+    assert error.strerror in excinfo.value.message
+
+
+def test_connect_timeout_is_an_ipc_error(monkeypatch, tmp_path):
+    def connect(self, address):
+        raise TimeoutError
+
+    monkeypatch.setattr(socket.socket, "connect", connect)
+    with pytest.raises(ipc.ManagerNotRespondingError):
+        ipc.Client(tmp_path / ipc.SOCKET_NAME, timeout=0.5)
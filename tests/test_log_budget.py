@@ -0,0 +1,57 @@
+from log_budget import BURST_S, SUMMARY_INTERVAL_S, LogThrottle
+from models import LogBudget
+
+
+def test_default_budget_is_generous_but_limited():
+    throttle = LogThrottle(now=0.0)
+    assert throttle.admit("x\n" * 1000, 1000, 2000, now=0.0)
+    assert throttle.admit("x\n" * 10_000, 10_000, 20_000, now=1.0)
+    assert not throttle.admit("x\n", 1, 2, now=2.0)
+
+
+def test_zero_budget_admits_everything():
+    throttle = LogThrottle(LogBudget(0, 0), now=0.0)
+    assert all(throttle.admit("x\n" * 1000, 1000, 2000, now=0.0) for _ in range(100))
+    assert throttle.summary(force=True) is None
+
+
+def test_line_budget_allows_a_burst_then_suppresses():
+    throttle = LogThrottle(LogBudget(lines_per_s=10), now=0.0)
+    admitted = [throttle.admit("line\n", 1, 5, now=0.0) for _ in range(30)]
+    # The chunk that empties the bucket is still admitted
+    assert admitted.count(True) == 10 * BURST_S + 1
+    assert throttle.suppressed_lines == 30 - 10 * BURST_S - 1
+    assert throttle.pending
+    # One second refills ten lines
+    assert throttle.admit("line\n", 1, 5, now=1.0)
+
+
+def test_one_large_chunk_overdraws_the_bucket():
+    throttle = LogThrottle(LogBudget(bytes_per_s=1000), now=0.0)
+    assert throttle.admit("x", 1, 10_000, now=0.0)
+    assert not throttle.admit("x", 1, 1, now=5.0)
+    assert throttle.admit("x", 1, 1, now=8.0)
+
+
+def test_summary_is_due_after_the_interval():
+    throttle = LogThrottle(LogBudget(lines_per_s=1), now=0.0)
+    throttle.admit("warm\n" * 100, 100, 500, now=0.0)
+    for i in range(3):
+        throttle.admit("Error: retrying\nError: retrying\n", 2, 32, now=0.5 + i)
+    assert throttle.summary(now=1.0) is None
+    summary = throttle.summary(now=0.5 + SUMMARY_INTERVAL_S)
+    assert summary == (
+        "suppressed 6 lines (96 B) in 2.0s over the log budget; last line repeated 6 times: Error: retrying"
+    )
+    assert not throttle.pending
+    assert throttle.summary(force=True) is None
+    assert throttle.suppressed_lines == 6
+
+
+def test_forced_summary_reports_the_last_line():
+    throttle = LogThrottle(LogBudget(bytes_per_s=1024 * 1024), now=0.0)
+    throttle.admit("big", 1, 3 * 1024 * 1024, now=0.0)
+    throttle.admit("first\nlast\n", 2, 2 * 1024 * 1024, now=0.0)
+    assert throttle.summary(now=0.0, force=True) == (
+        "suppressed 2 lines (2.0 MB) in 0.0s over the log budget; last line: last"
+    )
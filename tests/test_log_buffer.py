@@ -0,0 +1,121 @@
+import time
+
+import pytest
+
+import log_buffer
+from log_buffer import LogBuffer, MergedLog
+
+
+def entries(count, size=100):
+    return [f"{i:06d} " + "é中😀x" * (size // 4) for i in range(count)]
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(log_buffer, "CHUNK_CHARS", 1024)
+
+
+def test_entries_survive_sealing(small_chunks):
+    lines = [*entries(200), "multi\nline\n", "surrogate \udcff"]
+    buffer = LogBuffer(lines)
+    assert len(buffer._chunks) > 1
+    assert len(buffer) == len(lines) == len(buffer.times)
+    assert list(buffer) == lines
+    assert [buffer[i] for i in range(len(lines))] == lines
+    assert buffer[-1] == lines[-1]
+    assert buffer[5:8] == lines[5:8]
+    assert buffer.text() == "\n".join(lines)
+    with pytest.raises(IndexError):
+        buffer[len(lines)]
+
+
+def test_short_sealed_chunk_is_reopened(small_chunks):
+    buffer = LogBuffer(["a", "b"])
+    buffer.seal()
+    buffer.append("c")
+    assert len(buffer._chunks) == 0
+    assert list(buffer) == ["a", "b", "c"]
+
+
+def test_freeze_recompresses_in_the_background(small_chunks):
+    lines = entries(100)
+    buffer = LogBuffer(lines)
+    buffer.freeze()
+    deadline = time.monotonic() + 10
+    while any(chunk.payload[0] != "lzma" for chunk in buffer._chunks) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert all(chunk.payload[0] == "lzma" for chunk in buffer._chunks)
+    log_buffer._cache = log_buffer._ChunkCache(log_buffer.CACHE_CHARS)
+    assert list(buffer) == lines
+
+
+def test_line_returns_one_line_of_an_entry():
+    buffer = LogBuffer(["one\r\ntwo\n", "single"])
+    assert buffer.line(0, 0) == "one"
+    assert buffer.line(0, 1) == "two"
+    assert buffer.line(1, 0) == "single"
+
+
+def test_clear_forgets_entries_and_times():
+    buffer = LogBuffer(["a"])
+    buffer.clear()
+    assert len(buffer) == 0
+    assert len(buffer.times) == 0
+    assert buffer.text() == ""
+
+
+def test_stderr_json_lines_are_indexed():
+    buffer = LogBuffer()
+    for chunk in ('{"level": "error", "logger": "db", "msg": "a"}\n{"lev', 'el": "info", "msg": "b"}\n'):
+        buffer.append(chunk)
+        buffer.index_json(chunk)
+    assert len(buffer.structured) == 2
+    assert buffer.structured.joined_line(1) == '{"level": "info", "msg": "b"}'
+
+
+def stamped(lines, times):
+    buffer = LogBuffer(lines)
+    buffer.times[:] = buffer.times.__class__("d", times)
+    return buffer
+
+
+def test_merged_log_orders_rows_by_capture_time():
+    a = stamped(["a1", "a2\na3"], [1.0, 4.0])
+    b = stamped(["b1", "b2"], [2.0, 3.0])
+    merged = MergedLog()
+    merged.set_sources({"a": a, "b": b})
+    assert not merged.update()
+    rows = [merged.row(i) for i in range(len(merged))]
+    assert [(server_id, line) for server_id, _, line in rows] == [
+        ("a", "a1"),
+        ("b", "b1"),
+        ("b", "b2"),
+        ("a", "a2"),
+        ("a", "a3"),
+    ]
+    assert rows[0][1] == 1.0 + log_buffer.WALL_CLOCK_OFFSET
+
+
+def test_merged_log_merges_in_batches_and_only_new_entries():
+    a = stamped([f"a{i}" for i in range(10)], [float(i) for i in range(10)])
+    merged = MergedLog()
+    merged.set_sources({"a": a})
+    assert merged.update(budget=4)
+    assert len(merged) == 4
+    assert not merged.update()
+    assert len(merged) == 10
+    a.append("a10")
+    assert not merged.update()
+    assert merged.row(10)[2] == "a10"
+
+
+def test_merged_log_is_stale_when_a_source_is_replaced_or_cleared():
+    a = LogBuffer(["x"])
+    merged = MergedLog()
+    merged.set_sources({"a": a})
+    merged.update()
+    assert not merged.is_stale({"a": a})
+    assert merged.is_stale({"a": LogBuffer(["x"])})
+    assert merged.is_stale({"a": a, "b": LogBuffer()})
+    a.clear()
+    assert merged.is_stale({"a": a})
@@ -0,0 +1,57 @@
+import gzip
+
+import pytest
+
+import output_recording
+from output_recording import OutputRecorder, OutputRecording, RecordingFormatError
+
+
+def record(path, chunks):
+    recorder = OutputRecorder(path, "srv")
+    for now, stream, data in chunks:
+        recorder.record(stream, data, now=now)
+    recorder.close()
+    return recorder
+
+
+def test_chunks_replay_with_their_timing(tmp_path):
+    path = tmp_path / f"srv{output_recording.FILE_SUFFIX}"
+    # A multi-byte character split across two reads stays split
+    chunks = [
+        (0.0, "stdout", b"caf\xc3"),
+        (0.25, "stdout", b"\xa9\n"),
+        (1.0, "stderr", b"x" * 300),
+        (1.0, "stdout", b""),
+    ]
+    recorder = record(path, chunks)
+    assert recorder.chunks == 4
+    assert recorder.bytes == 306
+    recording = OutputRecording(path)
+    assert recording.server_id == "srv"
+    replayed = list(recording)
+    recording.close()
+    assert [(stream, data) for _, stream, data in replayed] == [(stream, data) for _, stream, data in chunks]
+    assert [t - replayed[0][0] for t, _, _ in replayed] == pytest.approx([0.0, 0.25, 1.0, 1.0])
+
+
+def test_truncated_recording_replays_its_whole_chunks(tmp_path):
+    path = tmp_path / "cut.mcprec"
+    record(path, [(0.0, "stdout", b"one\n"), (0.1, "stdout", b"two\n")])
+    raw = gzip.decompress(path.read_bytes())
+    path.write_bytes(gzip.compress(raw[:-2]))
+    assert [data for _, _, data in OutputRecording(path)] == [b"one\n"]
+
+
+@pytest.mark.parametrize("content", [b"MCPREC1\n[1, 2]\n", b"not a recording\n"])
+def test_other_files_are_rejected(tmp_path, content):
+    path = tmp_path / "other.mcprec"
+    path.write_bytes(gzip.compress(content))
+    with pytest.raises(RecordingFormatError):
+        OutputRecording(path)
+
+
+def test_non_gzip_file_is_rejected(tmp_path):
+    path = tmp_path / "plain.mcprec"
+    path.write_bytes(b"plain text")
+    with pytest.raises(RecordingFormatError):
+        OutputRecording(path)
@@ -0,0 +1,36 @@
+import pytest
+
+import profiling
+from profiling import Profiler
+
+
+def test_actions_write_their_artifacts(tmp_path):
+    profiler = Profiler(tmp_path)
+    profiler.run("cpu-start")
+    result = profiler.run("cpu-stop")
+    assert [path.rsplit(".", 1)[1] for path in result["artifacts"]] == ["pstats", "txt"]
+    assert not result["cpu"]
+
+
+@pytest.mark.parametrize(
+    ("action", "seconds", "error"),
+    [
+        ("format", None, profiling.UnknownActionError),
+        ("cpu-start", -1, profiling.InvalidDurationError),
+        ("cpu-stop", None, profiling.ProfileNotRunningError),
+    ],
+)
+def test_invalid_requests_are_profiling_errors(tmp_path, action, seconds, error):
+    with pytest.raises(error):
+        Profiler(tmp_path).run(action, seconds)
+
+
+def test_unwritable_output_directory_is_a_profiling_error(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    profiler = Profiler(blocker / "profiles")
+    with pytest.raises(profiling.ProfileFailedError) as excinfo:
+        profiler.run("memory-snapshot")
+    assert excinfo.value.message.startswith("Profiling action 'memory-snapshot' failed: ")
+    # Tracing had started before the snapshot failed
+    profiler.stop_memory()
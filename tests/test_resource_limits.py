@@ -0,0 +1,67 @@
+import signal
+
+import pytest
+
+import resource_limits
+from models import ResourceLimits
+
+
+def test_sigxcpu_is_a_cpu_limit_hit():
+    reason = resource_limits.detect_exit_limit_hit(ResourceLimits(cpu_seconds=5), signal.SIGXCPU, crashed=True)
+    assert reason == "CPU time limit of 5s exceeded (SIGXCPU)"
+
+
+def test_sigkill_with_a_cpu_limit_is_the_hard_limit():
+    reason = resource_limits.detect_exit_limit_hit(ResourceLimits(cpu_seconds=5), signal.SIGKILL, crashed=True)
+    assert reason == "CPU time limit of 5s reached (SIGKILL at hard limit)"
+
+
+def test_sigkill_from_the_manager_is_not_a_limit_hit():
+    limits = ResourceLimits(cpu_seconds=5)
+    assert resource_limits.detect_exit_limit_hit(limits, signal.SIGKILL, crashed=True, stop_requested=True) is None
+
+
+def test_sigkill_without_a_cpu_limit_is_not_a_limit_hit():
+    assert resource_limits.detect_exit_limit_hit(ResourceLimits(), signal.SIGKILL, crashed=True) is None
+
+
+def test_clean_exit_is_not_a_limit_hit():
+    assert resource_limits.detect_exit_limit_hit(ResourceLimits(cpu_seconds=5), 0, crashed=False) is None
+
+
+def test_new_cgroup_oom_kill_is_a_memory_limit_hit(tmp_path):
+    (tmp_path / "memory.events").write_text("low 0\nhigh 0\nmax 3\noom 1\noom_kill 2\n")
+    limits = ResourceLimits(rss_mb=64)
+    reason = resource_limits.detect_exit_limit_hit(
+        limits, signal.SIGKILL, True, oom_kills_before=1, cgroup_path=tmp_path
+    )
+    assert reason == "memory limit of 64 MB exceeded (killed by the cgroup OOM killer)"
+    # Also when the manager was stopping the server at the time
+    assert resource_limits.detect_exit_limit_hit(limits, signal.SIGKILL, True, 1, tmp_path, stop_requested=True)
+    assert resource_limits.detect_exit_limit_hit(limits, signal.SIGKILL, True, 2, tmp_path) is None
+
+
+@pytest.mark.parametrize(
+    ("limits", "text", "expected"),
+    [
+        (ResourceLimits(open_files=64), "OSError: [Errno 24] Too many open files", "open file limit of 64 reached"),
+        (ResourceLimits(), "Too many open files", None),
+        (ResourceLimits(address_space_mb=256), "MemoryError", "address space limit of 256 MB reached"),
+        (ResourceLimits(address_space_mb=256), "all good", None),
+    ],
+)
+def test_scan_output_for_limit_hit(limits, text, expected):
+    assert resource_limits.scan_output_for_limit_hit(limits, text) == expected
+
+
+def test_wrap_shell_command_prefixes_ulimits():
+    limits = ResourceLimits(address_space_mb=2, open_files=64, cpu_seconds=10)
+    command = resource_limits.wrap_shell_command("server --flag", limits)
+    assert command == "ulimit -v 2048 && ulimit -n 64 && ulimit -t 10 && exec server --flag"
+    assert resource_limits.wrap_shell_command("server", ResourceLimits()) == "server"
+
+
+def test_parse_cpu_list():
+    assert resource_limits.parse_cpu_list("0-2, 5") == {0, 1, 2, 5}
+    with pytest.raises(resource_limits.InvalidCpuListError):
+        resource_limits.parse_cpu_list("3-1")
@@ -0,0 +1,198 @@
+import signal
+
+import pytest
+
+import log_budget
+import process_tree
+from models import LogBudget, ResourceLimits, ServerConfig
+from server_core import STOP_TIMEOUT_S, Launcher, ServerCore
+
+
+class FakeHandle:
+    def __init__(self, on_output, on_exit):
+        self.pid = 4242
+        self.on_output = on_output
+        self.on_exit = on_exit
+        self.signals = []
+        self.written = b""
+
+    def write(self, data):
+        self.written += data
+        return True
+
+    def terminate(self):
+        self.signals.append(signal.SIGTERM)
+
+    def kill(self):
+        self.signals.append(signal.SIGKILL)
+
+    def flush(self):
+        pass
+
+
+class FakeLauncher(Launcher):
+    def __init__(self):
+        self.handles = {}
+        self.error = None
+
+    def spawn(self, server_id, program, args, env, cwd, on_output, on_exit):
+        if self.error is not None:
+            raise self.error
+        handle = self.handles[server_id] = FakeHandle(on_output, on_exit)
+        return handle
+
+
+@pytest.fixture
+def core(monkeypatch):
+    # Without process groups the core signals only the fake handle, never a real PID
+    monkeypatch.setattr(process_tree, "supports_process_groups", lambda: False)
+    timers = []
+    core = ServerCore(launcher=FakeLauncher(), call_later=lambda seconds, callback: timers.append((seconds, callback)))
+    core.timers = timers
+    core.events_seen = []
+    core.subscribe(core.events_seen.append)
+    return core
+
+
+def config(server_id="s", **kwargs):
+    return ServerConfig(server_id, server_id, "server", ["--flag"], {}, **kwargs)
+
+
+def events_of(core, event_type):
+    return [event for event in core.events_seen if event["type"] == event_type]
+
+
+def run_timers(core, seconds):
+    due = [callback for delay, callback in core.timers if delay == seconds]
+    core.timers[:] = [(delay, callback) for delay, callback in core.timers if delay != seconds]
+    for callback in due:
+        callback()
+
+
+def test_start_runs_the_server_and_marks_it_ready(core):
+    assert core.start_server(config())
+    assert core.is_running("s")
+    assert core.is_ready("s")
+    assert core.get_status("s") == "online"
+    assert events_of(core, "ready") == [{"type": "ready", "server": "s"}]
+    assert "Process started successfully" in core.logs["s"]
+
+
+def test_second_start_is_refused(core):
+    core.start_server(config())
+    assert not core.start_server(config())
+    assert events_of(core, "error")[-1]["message"] == "Server already running"
+
+
+def test_failed_spawn_is_an_error(core):
+    core.launcher.error = OSError("No such file or directory")
+    assert not core.start_server(config())
+    assert core.get_status("s") == "error"
+    assert not core.is_running("s")
+    assert any(entry.startswith("ERROR: Failed to start process") for entry in core.logs["s"])
+
+
+def test_output_is_logged_and_stderr_is_marked(core):
+    core.start_server(config())
+    handle = core.launcher.handles["s"]
+    handle.on_output("stdout", b"hello\n")
+    handle.on_output("stderr", b"warning: disk\n")
+    assert core.logs["s"][-2:] == ["hello\n", "ERROR: warning: disk\n"]
+    assert [event["stream"] for event in events_of(core, "output")] == ["stdout", "stderr"]
+
+
+def test_suppressed_stderr_does_not_leave_half_a_json_line(core, monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(log_budget.time, "monotonic", lambda: now[0])
+    core.start_server(config(log_budget=LogBudget(lines_per_s=1)))
+    handle = core.launcher.handles["s"]
+    handle.on_output("stderr", b"noise\n" * 5 + b'{"level": "error", ')
+    handle.on_output("stderr", b'"msg": "lost"}\n')
+    now[0] += 10
+    handle.on_output("stderr", b'{"level": "info", "msg": "kept"}\n')
+    structured = core.logs["s"].structured
+    assert structured.messages == ["kept"]
+    assert any(entry.startswith("WARNING: suppressed 1 lines (15 B)") for entry in core.logs["s"])
+
+
+def test_stop_does_not_block_and_schedules_the_escalation(core):
+    core.start_server(config())
+    assert core.stop_server("s")
+    assert core.launcher.handles["s"].signals == [signal.SIGTERM]
+    assert [delay for delay, _ in core.timers if delay == STOP_TIMEOUT_S] == [STOP_TIMEOUT_S]
+    assert core.is_running("s")
+
+
+def test_requested_stop_is_a_clean_exit(core):
+    core.start_server(config())
+    core.stop_server("s")
+    core.launcher.handles["s"].on_exit(0, False)
+    assert not core.is_running("s")
+    assert core.get_status("s") == "offline"
+    # The escalation finds nothing left to kill
+    run_timers(core, STOP_TIMEOUT_S)
+    assert core.launcher.handles["s"].signals == [signal.SIGTERM]
+
+
+@pytest.mark.parametrize("stop_first", [True, False])
+def test_unavailable_exit_code_is_not_an_error(core, stop_first):
+    core.start_server(config())
+    if stop_first:
+        core.stop_server("s")
+    core.launcher.handles["s"].on_exit(None, False)
+    assert core.get_status("s") == "offline"
+    assert "Process exited (exit code unavailable)" in core.logs["s"]
+
+
+def test_escalated_sigkill_is_not_a_cpu_limit_hit(core):
+    core.start_server(config(resource_limits=ResourceLimits(cpu_seconds=5)))
+    core.stop_server("s")
+    run_timers(core, STOP_TIMEOUT_S)
+    handle = core.launcher.handles["s"]
+    assert handle.signals == [signal.SIGTERM, signal.SIGKILL]
+    handle.on_exit(signal.SIGKILL, True)
+    assert core.get_status("s") == "offline"
+    assert "s" not in core.limit_hits
+    assert not events_of(core, "limit_hit")
+
+
+def test_force_stop_sigkill_is_not_a_cpu_limit_hit(core):
+    core.start_server(config(resource_limits=ResourceLimits(cpu_seconds=5)))
+    core.force_stop("s")
+    core.launcher.handles["s"].on_exit(signal.SIGKILL, True)
+    assert core.get_status("s") == "offline"
+    assert "s" not in core.limit_hits
+
+
+def test_unrequested_sigkill_with_a_cpu_limit_is_a_limit_hit(core):
+    core.start_server(config(resource_limits=ResourceLimits(cpu_seconds=5)))
+    core.launcher.handles["s"].on_exit(signal.SIGKILL, True)
+    assert core.get_status("s") == "error"
+    assert core.limit_hits["s"] == "CPU time limit of 5s reached (SIGKILL at hard limit)"
+    assert events_of(core, "limit_hit")[-1]["reason"] == core.limit_hits["s"]
+
+
+def test_exit_of_a_replaced_handle_is_ignored(core):
+    core.start_server(config())
+    old = core.launcher.handles["s"]
+    core.stop_server("s")
+    old.on_exit(0, False)
+    core.start_server(config())
+    old.on_exit(0, False)
+    assert core.is_running("s")
+    assert core.get_status("s") == "online"
+
+
+def test_find_orphans_hides_only_managed_groups(core, monkeypatch):
+    core.start_server(config())
+    core.process_groups["s"] = 4242
+    found = {"s": [1111, 4242], "other": [4242]}
+    monkeypatch.setattr(process_tree, "find_orphans", lambda exclude_pids=(): found)
+    assert core.find_orphans() == {"s": [1111]}
+
+
+def test_write_stdin_goes_to_the_running_server(core):
+    assert not core.write_stdin("s", b"x")
+    core.start_server(config())
+    assert core.write_stdin("s", b'{"id": 1}\n')
+    assert core.launcher.handles["s"].written == b'{"id": 1}\n'
@@ -0,0 +1,78 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PyQt6.QtWidgets")
+
+import toast  # noqa: E402
+from toast import ToastConfig, ToastLevel, ToastManager  # noqa: E402
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(toast.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def manager(clock):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    window = QtWidgets.QMainWindow()
+    manager = ToastManager(window, ToastConfig(position="status-bar", rate_limits={"error": 3}))
+    manager.shown = []
+    manager._show_in_status_bar = lambda message, level, duration_ms=None: manager.shown.append(message)
+    yield manager
+    manager._timer.stop()
+    window.deleteLater()
+    app.processEvents()
+
+
+def drain(manager):
+    while manager._current:
+        manager._dismiss_current()
+
+
+def test_repeats_of_the_toast_on_screen_are_counted(manager):
+    for _ in range(3):
+        manager.error("Server crashed")
+    assert manager.shown == ["Server crashed", "Server crashed \u00d72", "Server crashed \u00d73"]
+    assert not manager._queue
+
+
+def test_repeats_of_a_queued_toast_are_counted(manager):
+    manager.info("first")
+    manager.info("second")
+    manager.info("second")
+    manager.warning("second")
+    drain(manager)
+    assert manager.shown == ["first", "second \u00d72", "second"]
+
+
+def test_levels_over_their_rate_limit_are_summarized(manager, clock):
+    for i in range(6):
+        manager.error(f"error {i}")
+    drain(manager)
+    assert manager.shown == ["error 0", "error 1", "error 2", "3 more error messages not shown"]
+    clock[0] += manager._cfg.rate_window_ms / 1000
+    manager.error("later")
+    assert manager.shown[-1] == "later"
+
+
+def test_stale_queued_toasts_are_dropped(manager, clock):
+    manager.info("on screen")
+    manager.info("waiting")
+    clock[0] += manager._cfg.max_age_ms / 1000 + 1
+    manager.success("fresh")
+    drain(manager)
+    assert manager.shown == ["on screen", "fresh"]
+
+
+def test_queue_is_bounded(manager):
+    manager._cfg.max_queue = 2
+    for i in range(4):
+        manager.show_toast(f"toast {i}", "info")
+    drain(manager)
+    assert manager.shown == ["toast 0", "toast 2", "toast 3"]
+    assert ToastLevel("info") is ToastLevel.INFO
@@ -2,8 +2,9 @@ from __future__ import annotations
 
 import contextlib
 import logging
+import time
 from collections import deque
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 
 from PyQt6.QtCore import QEasingCurve, QEvent, QPoint, QPropertyAnimation, Qt, QTimer
@@ -21,6 +22,10 @@ class ToastLevel(str, Enum):
 logger = logging.getLogger(__name__)
 
 
+def _default_rate_limits() -> dict[str, int]:
+    return {"info": 4, "success": 4, "warning": 6, "error": 8}
+
+
 @dataclass
 class ToastConfig:
     duration_ms: int = 3500
@@ -28,6 +33,25 @@ class ToastConfig:
     margin: int = 16
     max_queue: int = 50
     width: int = 320
+    max_age_ms: int = 10000  # queued toasts older than this are dropped instead of shown late
+    rate_window_ms: int = 10000
+    # Toasts accepted per level within rate_window_ms; the rest are only counted
+    rate_limits: dict[str, int] = field(default_factory=_default_rate_limits)
+
+
+class _QueuedToast:
+    """A queued message with the number of times it was raised while waiting"""
+
+    __slots__ = ("count", "level", "message", "queued_at")
+
+    def __init__(self, message: str, level: ToastLevel, now: float):
+        self.message = message
+        self.level = level
+        self.count = 1
+        self.queued_at = now  # time.monotonic() of the latest occurrence
+
+    def text(self) -> str:
+        return self.message if self.count == 1 else f"{self.message} \u00d7{self.count}"
 
 
 class ToastWidget(QWidget):
@@ -52,6 +76,7 @@ class ToastWidget(QWidget):
         f.setPointSize(10)
         label.setFont(f)
         layout.addWidget(label)
+        self._label = label
 
         outer = QVBoxLayout(self)
         outer.setContentsMargins(0, 0, 0, 0)
@@ -74,6 +99,10 @@ class ToastWidget(QWidget):
         self._fade_anim.setDuration(220)
         self._fade_anim.setEasingCurve(QEasingCurve.Type.InOutQuad)
 
+    def set_message(self, message: str):
+        self._label.setText(message)
+        self.adjustSize()
+
     def fade_in(self):
         self._fade_anim.stop()
         self._fade_anim.setStartValue(0.0)
@@ -97,15 +126,27 @@ class ToastManager(QWidget):
     Two modes:
     - overlay (default): floating toast widgets in a corner
     - status-bar: queued messages displayed via QMainWindow.statusBar()
+
+    Bursts are kept short: a message equal to the one on screen or one already
+    queued is counted into it ("Server crashed \u00d712") instead of queued again,
+    each level accepts at most ``rate_limits[level]`` new toasts per
+    ``rate_window_ms`` (the rest are summarized once the queue drains), and
+    queued toasts older than ``max_age_ms`` are dropped rather than shown late.
     """
 
     def __init__(self, parent: QWidget, config: ToastConfig | None = None):
         super().__init__(parent)
         self.setObjectName("ToastManager")
         self._cfg = config or ToastConfig()
-        self._queue: deque[tuple[str, ToastLevel]] = deque()
+        self._queue: dict[tuple[ToastLevel, str], _QueuedToast] = {}  # in arrival order
         self._current: ToastWidget | bool | None = None  # bool used as placeholder in status-bar mode
-        self._timer: QTimer | None = None
+        self._current_toast: _QueuedToast | None = None
+        self._accepted: dict[ToastLevel, deque[float]] = {}  # level: times of toasts let through
+        self._suppressed: dict[ToastLevel, int] = {}  # level: toasts over the rate limit since the last summary
+        # One timer for every toast's display time
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._dismiss_current)
         self._parent = parent
 
         # Ensure we stay on top of parent contents
@@ -142,14 +183,42 @@ class ToastManager(QWidget):
 
     def show_toast(self, message: str, level: ToastLevel | str = ToastLevel.INFO):
         lvl = ToastLevel(level) if not isinstance(level, ToastLevel) else level
+        now = time.monotonic()
+        current = self._current_toast
+        if self._current and current is not None and current.level == lvl and current.message == message:
+            current.count += 1
+            self._update_current()
+            return
+        queued = self._queue.get((lvl, message))
+        if queued is not None:
+            queued.count += 1
+            queued.queued_at = now
+            return
+        if not self._admit(lvl, now):
+            self._suppressed[lvl] = self._suppressed.get(lvl, 0) + 1
+            return
         # Enforce max queue length
         if len(self._queue) >= self._cfg.max_queue:
             # Drop oldest to keep memory bounded
-            self._queue.popleft()
-        self._queue.append((message, lvl))
+            del self._queue[next(iter(self._queue))]
+        self._queue[(lvl, message)] = _QueuedToast(message, lvl, now)
         if not self._current:
             self._dequeue_and_show()
 
+    def _admit(self, level: ToastLevel, now: float) -> bool:
+        """Return True if the level is within its rate limit, counting the toast if so"""
+        limit = self._cfg.rate_limits.get(level.value)
+        if not limit:
+            return True
+        accepted = self._accepted.setdefault(level, deque())
+        horizon = now - self._cfg.rate_window_ms / 1000
+        while accepted and accepted[0] <= horizon:
+            accepted.popleft()
+        if len(accepted) >= limit:
+            return False
+        accepted.append(now)
+        return True
+
     # Public convenience shortcuts
     def info(self, msg: str):
         self.show_toast(msg, ToastLevel.INFO)
@@ -163,14 +232,30 @@ class ToastManager(QWidget):
     def error(self, msg: str):
         self.show_toast(msg, ToastLevel.ERROR)
 
+    def _next_toast(self) -> _QueuedToast | None:
+        """Pop the oldest queued toast that is still recent, or a summary of rate-limited ones"""
+        horizon = time.monotonic() - self._cfg.max_age_ms / 1000
+        while self._queue:
+            toast = self._queue.pop(next(iter(self._queue)))
+            if toast.queued_at >= horizon:
+                return toast
+            logger.debug("ToastManager: dropped stale toast: %s", toast.text())
+        for level, count in list(self._suppressed.items()):
+            del self._suppressed[level]
+            noun = "message" if count == 1 else "messages"
+            return _QueuedToast(f"{count} more {level.value} {noun} not shown", level, time.monotonic())
+        return None
+
     def _dequeue_and_show(self):
-        if not self._queue:
+        toast = self._next_toast()
+        self._current_toast = toast
+        if toast is None:
             self._current = None
             if self._cfg.position != "status-bar":
                 self.hide()
             return
 
-        msg, lvl = self._queue.popleft()
+        msg, lvl = toast.text(), toast.level
 
         if self._cfg.position == "status-bar" and self._parent and hasattr(self._parent, "statusBar"):
             # Status bar mode: show message with styling, use timer for queueing
@@ -185,11 +270,17 @@ class ToastManager(QWidget):
             self._current.fade_in()
 
         # Duration timer
-        self._timer = QTimer(self)
-        self._timer.setSingleShot(True)
-        self._timer.timeout.connect(self._dismiss_current)
         self._timer.start(self._cfg.duration_ms)
 
+    def _update_current(self):
+        """Show the new count of the toast on screen for the rest of its display time"""
+        text = self._current_toast.text()
+        if isinstance(self._current, ToastWidget):
+            self._current.set_message(text)
+            self._position_current()
+        elif self._cfg.position == "status-bar":
+            self._show_in_status_bar(text, self._current_toast.level, max(1, self._timer.remainingTime()))
+
     def _dismiss_current(self):
         if not self._current:
             self._dequeue_and_show()
@@ -205,9 +296,12 @@ class ToastManager(QWidget):
             except Exception as exc:
                 logger.debug("ToastManager._dismiss_current: error accessing status bar: %s", exc)
             self._current = None
+            self._current_toast = None
             self._dequeue_and_show()
             return
 
+        self._current_toast = None
+
         def _after():
             if self._current:
                 self._current.hide()
@@ -264,7 +358,7 @@ class ToastManager(QWidget):
         return False
 
     # ---------- Status bar helpers ----------
-    def _show_in_status_bar(self, message: str, level: ToastLevel):
+    def _show_in_status_bar(self, message: str, level: ToastLevel, duration_ms: int | None = None):
         try:
             if not self._parent or not hasattr(self._parent, "statusBar"):
                 return
@@ -276,7 +370,7 @@ class ToastManager(QWidget):
             sb.setStyleSheet("QStatusBar { background-color: #E9ECEF; color: #212529; }")
 
             # Show plain message without emojis or level-specific prefixes
-            sb.showMessage(message, self._cfg.duration_ms)
+            sb.showMessage(message, duration_ms or self._cfg.duration_ms)
         except Exception as exc:
             # Log and continue (styling issues should not be fatal)
             logger.debug("ToastManager._show_in_status_bar: failed to show message: %s", exc)
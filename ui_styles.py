@@ -127,6 +127,13 @@ def get_style_sheet() -> str:
             #ServerListItem {
                 background: transparent;
             }
+            #AlertBadge {
+                background-color: #FFF3CD;
+                color: #856404;
+                border-radius: 4px;
+                padding: 0px 4px;
+                font-size: 11px;
+            }
             #LogDisplay {
                 font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, "Liberation Mono", "Courier New", monospace;
                 background-color: #0B1020;